@@ -0,0 +1,429 @@
+"""
+Benchmarks de las rutas de cálculo del sistema pensional.
+
+Genera poblaciones sintéticas de afiliados (los tres tipos de pensión, con
+una fracción de filas inválidas) y mide:
+
+- calcular_tasa_reemplazo (una solicitud a la vez)
+- calcular_pension
+- validaciones check_* solamente, y por máscara (validar, validar_lote)
+- calcular_lote (columnas) y LoteSolicitudes.calcular
+- CacheTasaReemplazo
+- Modo masivo de punta a punta: archivo CSV (procesar_archivo) y formato
+  binario (calcular_archivo), sin contar la escritura de la entrada
+- calcular_en_paralelo con EjecutorParalelo (incluye el arranque del pool)
+
+Para cada ruta reporta registros por segundo, percentiles de latencia por
+llamada (sobre una muestra) y memoria pico. Los resultados se guardan en
+JSON y se pueden comparar con una ejecución base.
+
+Uso:
+----
+    python benchmarks/benchmark_calcupension.py --escala 100K --salida actual.json
+    python benchmarks/benchmark_calcupension.py --escala 100K --base base.json --umbral 0.15
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import deque
+sys.path.append("src")
+from calcupension.model import binario_calcupension
+from calcupension.model import cache_calcupension
+from calcupension.model import logica_calcupension
+from calcupension.model import paralelo_calcupension
+from calcupension.view import lote_calcupension
+from calcupension.view.registro_calcupension import CAMPOS_ENTRADA
+
+
+ESCALAS = {
+    "1K": 1_000,
+    "100K": 100_000,
+    "10M": 10_000_000,
+}
+
+MUESTRA_LATENCIA = 10_000
+
+PROCESOS_PARALELO = 2
+
+ERRORES = tuple(logica_calcupension.CODIGOS_ERROR)
+
+
+def generar_poblacion(cantidad: int, semilla: int = 2026, proporcion_invalidas: float = 0.2):
+    """
+    Genera afiliados sintéticos como tuplas en el orden de SolicitudPension.
+
+    Distribuciones:
+    ---------------
+    - Tipo: 70% Vejez, 15% Sobreviviente, 15% Invalidez.
+    - IBL: lognormal con mediana cercana a 1,5 SMMLV.
+    - Semanas: normal con media 1400 y desviación 350 (sin negativas), de
+      modo que cerca del 40 % de las solicitudes de vejez no alcanza
+      las semanas mínimas y se rechaza por esa validación.
+    - Edad: entre 57 y 75 años; PCL entre 50 y 100.
+    - Además, una fracción `proporcion_invalidas` de filas incumple alguna
+      regla (IBL cero, semanas o edad insuficientes, PCL baja o semanas
+      negativas).
+    """
+    aleatorio = random.Random(semilla)
+    smmlv = 1_750_905
+
+    for _ in range(cantidad):
+        tipo = aleatorio.choices(logica_calcupension.TIPOS_PENSION, (70, 15, 15))[0]
+        ingreso = round(smmlv * 1.5 * math.exp(aleatorio.gauss(0, 0.6)))
+        semanas = max(0, int(aleatorio.gauss(1400, 350)))
+        genero = aleatorio.choice(logica_calcupension.GENEROS)
+        edad = aleatorio.randint(62 if genero == "Hombre" else 57, 75)
+        pcl = round(aleatorio.uniform(50.1, 100), 1) if tipo == "Invalidez" else 0
+
+        if tipo == "Sobreviviente":
+            genero = None
+            edad = None
+
+        if aleatorio.random() < proporcion_invalidas:
+            falla = aleatorio.randrange(5)
+            if falla == 0:
+                ingreso = 0
+            elif falla == 1:
+                semanas = -aleatorio.randint(1, 50)
+            elif falla == 2 and tipo == "Vejez":
+                semanas = aleatorio.randint(500, 1299)
+            elif falla == 3 and tipo == "Vejez":
+                edad = aleatorio.randint(40, 56)
+            else:
+                tipo = "Invalidez"
+                pcl = round(aleatorio.uniform(0, 50), 1)
+                edad = edad or aleatorio.randint(30, 60)
+
+        yield (tipo, ingreso, semanas, genero, edad, pcl)
+
+
+def percentil(valores: list, porcentaje: float) -> float:
+    """
+    Percentil por el método del rango más cercano sobre valores ya ordenados.
+    """
+    if not valores:
+        return 0.0
+    return valores[max(0, math.ceil(porcentaje / 100 * len(valores)) - 1)]
+
+
+# =========================
+# RUTAS MEDIDAS
+# =========================
+
+def ruta_tasa_reemplazo(solicitudes: list):
+    calcular = logica_calcupension.CalculadoraPension.calcular_tasa_reemplazo
+    for solicitud in solicitudes:
+        try:
+            calcular(solicitud)
+        except ERRORES:
+            pass
+
+
+def ruta_calcular_pension(solicitudes: list):
+    calcular = logica_calcupension.CalculadoraPension.calcular_pension
+    for solicitud in solicitudes:
+        calcular(60.0, solicitud.ingreso_base_liquidacion, solicitud.tipo)
+
+
+def ruta_validacion(solicitudes: list):
+    calculadora = logica_calcupension.CalculadoraPension
+    for solicitud in solicitudes:
+        try:
+            calculadora.check_tipo(solicitud.tipo)
+            calculadora.check_valores(solicitud)
+            calculadora.check_ibl(solicitud.ingreso_base_liquidacion)
+            if solicitud.tipo == "Vejez":
+                calculadora.check_semanas(solicitud.semanas)
+                calculadora.check_edad(solicitud.genero, solicitud.edad)
+            if solicitud.tipo == "Invalidez":
+                calculadora.check_pcl(solicitud.porcentaje_perdida_capacidad_laboral)
+        except ERRORES:
+            pass
+
+
+def ruta_validar(solicitudes: list):
+    validar = logica_calcupension.CalculadoraPension.validar
+    for solicitud in solicitudes:
+        validar(solicitud)
+
+
+def ruta_cache(solicitudes: list):
+    cache = cache_calcupension.CacheTasaReemplazo(maximo=65_536)
+    for solicitud in solicitudes:
+        try:
+            cache.calcular_tasa_reemplazo(solicitud)
+        except ERRORES:
+            pass
+
+
+RUTAS_INDIVIDUALES = {
+    "calcular_tasa_reemplazo": ruta_tasa_reemplazo,
+    "calcular_pension": ruta_calcular_pension,
+    "validacion_check": ruta_validacion,
+    "validacion_mascara": ruta_validar,
+    "cache_tasa_reemplazo": ruta_cache,
+}
+
+
+def ruta_calcular_lote(columnas: tuple):
+    logica_calcupension.CalculadoraPension.calcular_lote(*columnas)
+
+
+def ruta_validar_lote(columnas: tuple):
+    logica_calcupension.CalculadoraPension.validar_lote(*columnas)
+
+
+def ruta_lote_compacto(lote: logica_calcupension.LoteSolicitudes):
+    lote.calcular()
+
+
+def ruta_paralelo(filas: list):
+    deque(paralelo_calcupension.calcular_en_paralelo(filas, PROCESOS_PARALELO), maxlen=0)
+
+
+def preparar_lote_archivo(filas: list, directorio: str) -> tuple:
+    """
+    Escribe las filas como CSV de entrada del modo masivo.
+    """
+    entrada = os.path.join(directorio, "entrada.csv")
+    with open(entrada, "w", newline="", encoding="utf-8") as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(CAMPOS_ENTRADA)
+        escritor.writerows(tuple("" if valor is None else valor for valor in fila) for fila in filas)
+    return entrada, os.path.join(directorio, "salida.csv"), os.path.join(directorio, "rechazos.csv")
+
+
+def ruta_lote_archivo(rutas: tuple):
+    lote_calcupension.procesar_archivo(*rutas)
+
+
+def preparar_binario(filas: list, directorio: str) -> tuple:
+    """
+    Escribe las filas en el formato binario por columnas.
+    """
+    entrada = os.path.join(directorio, "entrada.cpb")
+    binario_calcupension.escribir_filas(entrada, filas)
+    return entrada, os.path.join(directorio, "salida.cpb")
+
+
+def ruta_binario(rutas: tuple):
+    binario_calcupension.calcular_archivo(*rutas)
+
+
+RUTAS_ARCHIVO = {
+    "lote_archivo_csv": (preparar_lote_archivo, ruta_lote_archivo),
+    "binario_archivo": (preparar_binario, ruta_binario),
+}
+"""
+Rutas que leen y escriben archivos: (preparar, medir). La preparación
+escribe la entrada en un directorio temporal y no se mide.
+"""
+
+
+# =========================
+# MEDICIÓN
+# =========================
+
+def medir(funcion, datos, cantidad: int, memoria: bool) -> dict:
+    """
+    Mide el tiempo total de `funcion(datos)` y, opcionalmente, la memoria pico.
+    """
+    inicio = time.perf_counter()
+    funcion(datos)
+    segundos = time.perf_counter() - inicio
+
+    resultado = {
+        "registros": cantidad,
+        "segundos": segundos,
+        "registros_por_segundo": cantidad / segundos if segundos > 0 else 0.0,
+    }
+
+    if memoria:
+        tracemalloc.start()
+        funcion(datos)
+        resultado["memoria_pico_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return resultado
+
+
+def medir_latencias(funcion, solicitudes: list) -> dict:
+    """
+    Mide la latencia de cada llamada sobre una muestra de solicitudes.
+    """
+    latencias = []
+    reloj = time.perf_counter_ns
+    for solicitud in solicitudes[:MUESTRA_LATENCIA]:
+        muestra = [solicitud]
+        inicio = reloj()
+        funcion(muestra)
+        latencias.append((reloj() - inicio) / 1000)
+
+    latencias.sort()
+    return {
+        "latencia_p50_us": percentil(latencias, 50),
+        "latencia_p90_us": percentil(latencias, 90),
+        "latencia_p99_us": percentil(latencias, 99),
+    }
+
+
+def ejecutar(cantidad: int, semilla: int = 2026, memoria: bool = True, rutas: list | None = None) -> dict:
+    """
+    Ejecuta los benchmarks sobre una población de `cantidad` afiliados.
+
+    Retorna:
+    --------
+    dict:
+        Resultados por ruta, más los datos del entorno.
+    """
+    lote = logica_calcupension.LoteSolicitudes()
+    for fila in generar_poblacion(cantidad, semilla):
+        lote.agregar(*fila)
+
+    resultados = {}
+
+    def incluida(nombre: str) -> bool:
+        return rutas is None or nombre in rutas
+
+    if incluida("calcular_lote") or incluida("validar_lote"):
+        columnas = tuple(list(columna) for columna in lote.columnas())
+        if incluida("calcular_lote"):
+            resultados["calcular_lote"] = medir(ruta_calcular_lote, columnas, cantidad, memoria)
+        if incluida("validar_lote"):
+            resultados["validar_lote"] = medir(ruta_validar_lote, columnas, cantidad, memoria)
+        del columnas
+
+    if incluida("lote_compacto"):
+        resultados["lote_compacto"] = medir(ruta_lote_compacto, lote, cantidad, memoria)
+
+    nombres = [nombre for nombre in RUTAS_ARCHIVO if incluida(nombre)]
+    if nombres or incluida("paralelo"):
+        filas = list(zip(*lote.columnas()))
+        if incluida("paralelo"):
+            # La memoria pico solo cuenta el proceso principal.
+            resultados["paralelo"] = medir(ruta_paralelo, filas, cantidad, memoria)
+        if nombres:
+            with tempfile.TemporaryDirectory() as directorio:
+                for nombre in nombres:
+                    preparar, funcion = RUTAS_ARCHIVO[nombre]
+                    resultados[nombre] = medir(funcion, preparar(filas, directorio), cantidad, memoria)
+        del filas
+
+    nombres = [nombre for nombre in RUTAS_INDIVIDUALES if incluida(nombre)]
+    if nombres:
+        solicitudes = [vista.a_solicitud() for vista in lote]
+        for nombre in nombres:
+            funcion = RUTAS_INDIVIDUALES[nombre]
+            resultados[nombre] = medir(funcion, solicitudes, cantidad, memoria)
+            resultados[nombre].update(medir_latencias(funcion, solicitudes))
+
+    return {
+        "registros": cantidad,
+        "semilla": semilla,
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "resultados": resultados,
+    }
+
+
+def comparar(actual: dict, base: dict, umbral: float) -> list:
+    """
+    Compara el rendimiento actual con una ejecución base.
+
+    Parámetros:
+    -----------
+    actual, base : dict
+        Resultados producidos por ejecutar().
+    umbral : float
+        Caída relativa de registros/s permitida (0.15 = 15%).
+
+    Retorna:
+    --------
+    list[str]:
+        Descripción de cada ruta cuyo rendimiento cayó más que el umbral.
+    """
+    regresiones = []
+    for nombre, resultado_base in base["resultados"].items():
+        resultado = actual["resultados"].get(nombre)
+        if resultado is None:
+            continue
+
+        anterior = resultado_base["registros_por_segundo"]
+        nuevo = resultado["registros_por_segundo"]
+        if anterior > 0 and nuevo < anterior * (1 - umbral):
+            regresiones.append(
+                f"{nombre}: {nuevo:,.0f} registros/s frente a {anterior:,.0f} "
+                f"({(1 - nuevo / anterior):.1%} más lento)"
+            )
+    return regresiones
+
+
+def imprimir(resultados: dict):
+    """
+    Muestra los resultados en forma de tabla.
+    """
+    print(f"Registros: {resultados['registros']:,}  Python {resultados['python']}")
+    print(f"{'ruta':<26}{'registros/s':>14}{'p50 us':>10}{'p99 us':>10}{'memoria MB':>12}")
+    for nombre, resultado in resultados["resultados"].items():
+        memoria = resultado.get("memoria_pico_bytes")
+        print(
+            f"{nombre:<26}{resultado['registros_por_segundo']:>14,.0f}"
+            f"{resultado.get('latencia_p50_us', math.nan):>10.2f}"
+            f"{resultado.get('latencia_p99_us', math.nan):>10.2f}"
+            f"{(memoria / 1e6 if memoria is not None else math.nan):>12.1f}"
+        )
+
+
+def main(argumentos: list | None = None) -> int:
+    """
+    Ejecuta los benchmarks desde la línea de comandos.
+
+    Retorna 1 si alguna ruta es más lenta que la base por encima del umbral.
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks de las rutas de cálculo pensional.")
+    parser.add_argument("--escala", choices=ESCALAS, default="1K")
+    parser.add_argument("--registros", type=int, help="Cantidad exacta de registros (ignora --escala).")
+    parser.add_argument("--semilla", type=int, default=2026)
+    parser.add_argument("--ruta", action="append", dest="rutas", help="Medir solo esta ruta (repetible).")
+    parser.add_argument("--sin-memoria", action="store_true", help="No medir memoria pico.")
+    parser.add_argument("--salida", help="Archivo JSON donde guardar los resultados.")
+    parser.add_argument("--base", help="Archivo JSON de una ejecución base para comparar.")
+    parser.add_argument("--umbral", type=float, default=0.15, help="Caída de rendimiento permitida.")
+    opciones = parser.parse_args(argumentos)
+
+    cantidad = opciones.registros or ESCALAS[opciones.escala]
+    resultados = ejecutar(cantidad, opciones.semilla, not opciones.sin_memoria, opciones.rutas)
+    imprimir(resultados)
+
+    if opciones.salida:
+        with open(opciones.salida, "w", encoding="utf-8") as archivo:
+            json.dump(resultados, archivo, indent=2)
+
+    if opciones.base:
+        with open(opciones.base, encoding="utf-8") as archivo:
+            base = json.load(archivo)
+        regresiones = comparar(resultados, base, opciones.umbral)
+        if regresiones:
+            print("\nRegresiones de rendimiento:")
+            for regresion in regresiones:
+                print(f"- {regresion}")
+            return 1
+        print("\nSin regresiones frente a la base.")
+
+    return 0
+
+
+if __name__ == "__main__":
+    """
+    Punto de entrada de los benchmarks.
+    """
+    sys.exit(main())
@@ -0,0 +1,501 @@
+"""
+Agregación en una pasada de los resultados de un portafolio.
+
+Consume la salida de CalculadoraPension.calcular_lote (junto con las
+columnas de entrada) y mantiene, por grupo (tipo, género, banda de edad,
+banda de PCL):
+
+- Cantidad de filas, calculadas y rechazadas (por código de error).
+- Sumas, mínimo y máximo de tasa y mesada.
+- Filas en el tope o el piso de la tasa y en la mesada mínima (SMMLV).
+- Histogramas de tasa (puntos porcentuales) y de mesada (en SMMLV).
+- Cuantiles aproximados de tasa y mesada.
+
+La memoria no depende del número de filas: los grupos son combinaciones de
+pocas categorías y los cuantiles se estiman con cubetas logarítmicas
+(error relativo acotado por la precisión). Dos agregadores con las mismas
+reglas se pueden combinar, por lo que cada proceso o fragmento puede
+agregar por su cuenta y el resultado se une al final.
+
+Uso:
+----
+    agregador = AgregadorPortafolio()
+    agregador.agregar_lote(*columnas, *CalculadoraPension.calcular_lote(*columnas))
+    agregador.como_dict(("tipo", "genero"))
+"""
+
+import math
+from bisect import bisect_left
+from functools import partial
+
+from calcupension.model import logica_calcupension
+from calcupension.model import paralelo_calcupension
+from calcupension.model import reglas_calcupension
+
+
+DIMENSIONES = ("tipo", "genero", "banda_edad", "banda_pcl")
+"""
+Dimensiones de agrupación, en el orden de las claves de los grupos.
+"""
+
+SIN_INFORMAR = "sin informar"
+
+BANDAS_EDAD = (
+    (40, "<40"),
+    (50, "40-49"),
+    (57, "50-56"),
+    (62, "57-61"),
+    (70, "62-69"),
+    (math.inf, "70+"),
+)
+"""
+(edad límite exclusiva, etiqueta).
+"""
+
+BANDAS_PCL = (
+    (50, "0-50"),
+    (66, "50-66"),
+    (math.inf, "66-100"),
+)
+"""
+(PCL límite inclusiva, etiqueta), alineadas con el mínimo de invalidez y las bandas de tasa.
+"""
+
+LIMITES_TASA = (40, 45, 50, 55, 60, 65, 70, 75, 80)
+"""
+Límites superiores (inclusivos, en puntos porcentuales) del histograma de tasa.
+"""
+
+LIMITES_MESADA_SMMLV = (1, 1.5, 2, 3, 4, 5, 7, 10, 15, 20, 25)
+"""
+Límites superiores (inclusivos, en SMMLV) del histograma de mesada.
+"""
+
+CUANTILES = (0.5, 0.9, 0.99)
+
+PRECISION_CUANTILES = 0.005
+"""
+Error relativo máximo de los cuantiles aproximados.
+"""
+
+_NOMBRES_ERROR = {
+    codigo: error.__name__ for error, codigo in logica_calcupension.CODIGOS_ERROR.items()
+}
+
+
+def _etiquetas_histograma(limites: tuple, unidad: str = "") -> tuple:
+    return tuple(f"<={limite}{unidad}" for limite in limites) + (f">{limites[-1]}{unidad}",)
+
+
+ETIQUETAS_TASA = _etiquetas_histograma(LIMITES_TASA)
+
+ETIQUETAS_MESADA = _etiquetas_histograma(LIMITES_MESADA_SMMLV, " SMMLV")
+
+
+def banda_edad(edad) -> str:
+    if edad is None:
+        return SIN_INFORMAR
+    for limite, etiqueta in BANDAS_EDAD:
+        if edad < limite:
+            return etiqueta
+
+
+def banda_pcl(pcl) -> str:
+    if pcl is None:
+        return SIN_INFORMAR
+    for limite, etiqueta in BANDAS_PCL:
+        if pcl <= limite:
+            return etiqueta
+
+
+class BocetoCuantiles:
+    """
+    Cuantiles aproximados con cubetas logarítmicas.
+
+    Cada valor positivo cae en la cubeta ceil(log(valor) / log(gamma)), con
+    gamma = (1 + precision) / (1 - precision); el cuantil se estima con el
+    centro de su cubeta, a menos de `precision` en error relativo. El número
+    de cubetas depende del rango de los valores, no de cuántos son.
+    """
+
+    __slots__ = ("precision", "_log_gamma", "cubetas", "ceros", "cantidad", "minimo", "maximo")
+
+    def __init__(self, precision: float = PRECISION_CUANTILES):
+        self.precision = precision
+        self._log_gamma = math.log((1 + precision) / (1 - precision))
+        self.cubetas = {}
+        self.ceros = 0
+        self.cantidad = 0
+        self.minimo = math.inf
+        self.maximo = -math.inf
+
+    def registrar(self, valor: float):
+        if valor > 0:
+            indice = math.ceil(math.log(valor) / self._log_gamma)
+            self.cubetas[indice] = self.cubetas.get(indice, 0) + 1
+        else:
+            self.ceros += 1
+        self.cantidad += 1
+        if valor < self.minimo:
+            self.minimo = valor
+        if valor > self.maximo:
+            self.maximo = valor
+
+    def combinar(self, otro: "BocetoCuantiles"):
+        """
+        Suma en este boceto los valores de `otro`.
+
+        Raises:
+        -------
+        ValueError:
+            Si los bocetos tienen distinta precisión.
+        """
+        if otro.precision != self.precision:
+            raise ValueError("No se pueden combinar bocetos con distinta precisión.")
+
+        for indice, cantidad in otro.cubetas.items():
+            self.cubetas[indice] = self.cubetas.get(indice, 0) + cantidad
+        self.ceros += otro.ceros
+        self.cantidad += otro.cantidad
+        self.minimo = min(self.minimo, otro.minimo)
+        self.maximo = max(self.maximo, otro.maximo)
+
+    def cuantil(self, q: float) -> float | None:
+        """
+        Valor aproximado del cuantil q (entre 0 y 1). None si no hay valores.
+        """
+        if not self.cantidad:
+            return None
+
+        rango = q * (self.cantidad - 1)
+        acumulado = self.ceros
+        if acumulado > rango:
+            return max(self.minimo, 0.0)
+
+        for indice in sorted(self.cubetas):
+            acumulado += self.cubetas[indice]
+            if acumulado > rango:
+                valor = 2 * math.exp(indice * self._log_gamma) / (math.exp(self._log_gamma) + 1)
+                return min(max(valor, self.minimo), self.maximo)
+        return self.maximo
+
+
+class EstadisticaGrupo:
+    """
+    Acumulados de un grupo de filas.
+    """
+
+    __slots__ = (
+        "filas", "rechazos", "suma_tasa", "suma_mesada", "mesada_minima", "mesada_maxima",
+        "en_tope", "en_piso", "en_mesada_minima", "histograma_tasa", "histograma_mesada",
+        "cuantiles_tasa", "cuantiles_mesada",
+    )
+
+    def __init__(self, precision: float = PRECISION_CUANTILES):
+        self.filas = 0
+        self.rechazos = {}
+        self.suma_tasa = 0.0
+        self.suma_mesada = 0.0
+        self.mesada_minima = math.inf
+        self.mesada_maxima = -math.inf
+        self.en_tope = 0
+        self.en_piso = 0
+        self.en_mesada_minima = 0
+        self.histograma_tasa = [0] * len(ETIQUETAS_TASA)
+        self.histograma_mesada = [0] * len(ETIQUETAS_MESADA)
+        self.cuantiles_tasa = BocetoCuantiles(precision)
+        self.cuantiles_mesada = BocetoCuantiles(precision)
+
+    @property
+    def rechazadas(self) -> int:
+        return sum(self.rechazos.values())
+
+    @property
+    def calculadas(self) -> int:
+        return self.filas - self.rechazadas
+
+    def combinar(self, otro: "EstadisticaGrupo"):
+        """
+        Suma en este grupo los acumulados de `otro`.
+        """
+        self.filas += otro.filas
+        for codigo, cantidad in otro.rechazos.items():
+            self.rechazos[codigo] = self.rechazos.get(codigo, 0) + cantidad
+        self.suma_tasa += otro.suma_tasa
+        self.suma_mesada += otro.suma_mesada
+        self.mesada_minima = min(self.mesada_minima, otro.mesada_minima)
+        self.mesada_maxima = max(self.mesada_maxima, otro.mesada_maxima)
+        self.en_tope += otro.en_tope
+        self.en_piso += otro.en_piso
+        self.en_mesada_minima += otro.en_mesada_minima
+        self.histograma_tasa = [a + b for a, b in zip(self.histograma_tasa, otro.histograma_tasa)]
+        self.histograma_mesada = [a + b for a, b in zip(self.histograma_mesada, otro.histograma_mesada)]
+        self.cuantiles_tasa.combinar(otro.cuantiles_tasa)
+        self.cuantiles_mesada.combinar(otro.cuantiles_mesada)
+
+    def como_dict(self) -> dict:
+        calculadas = self.calculadas
+
+        def proporcion(cantidad: int) -> float:
+            return cantidad / calculadas if calculadas else 0.0
+
+        return {
+            "filas": self.filas,
+            "calculadas": calculadas,
+            "rechazadas": self.rechazadas,
+            "rechazos": {_NOMBRES_ERROR[codigo]: cantidad for codigo, cantidad in sorted(self.rechazos.items())},
+            "total_mesadas": self.suma_mesada,
+            "tasa_promedio": self.suma_tasa / calculadas if calculadas else None,
+            "mesada_promedio": self.suma_mesada / calculadas if calculadas else None,
+            "mesada_minima": self.mesada_minima if calculadas else None,
+            "mesada_maxima": self.mesada_maxima if calculadas else None,
+            "proporcion_tope": proporcion(self.en_tope),
+            "proporcion_piso": proporcion(self.en_piso),
+            "proporcion_mesada_minima": proporcion(self.en_mesada_minima),
+            "cuantiles_tasa": {f"p{q * 100:g}": self.cuantiles_tasa.cuantil(q) for q in CUANTILES},
+            "cuantiles_mesada": {f"p{q * 100:g}": self.cuantiles_mesada.cuantil(q) for q in CUANTILES},
+            "histograma_tasa": dict(zip(ETIQUETAS_TASA, self.histograma_tasa)),
+            "histograma_mesada": dict(zip(ETIQUETAS_MESADA, self.histograma_mesada)),
+        }
+
+
+class AgregadorPortafolio:
+    """
+    Agregados por grupo de los resultados de un portafolio.
+
+    Atributos:
+    ----------
+    reglas : ReglasPension
+        Reglas con las que se calcularon los resultados (para tope, piso,
+        mesada mínima y SMMLV).
+    grupos : dict
+        (tipo, genero, banda_edad, banda_pcl) -> EstadisticaGrupo.
+    """
+
+    def __init__(
+        self,
+        reglas: reglas_calcupension.ReglasPension | None = None,
+        precision: float = PRECISION_CUANTILES
+    ):
+        if reglas is None:
+            reglas = reglas_calcupension.REGLAS_VIGENTES
+
+        self.reglas = reglas
+        self.precision = precision
+        self.grupos = {}
+        self._limites_mesada = tuple(limite * reglas.smmlv for limite in LIMITES_MESADA_SMMLV)
+        self._limites_tasa = {
+            tipo: (
+                math.inf if parametros["tope"] is None else parametros["tope"],
+                -math.inf if parametros["piso"] is None else parametros["piso"],
+                reglas.mesadas_minimas.get(tipo),
+            )
+            for tipo, parametros in reglas.definicion["tipos"].items()
+        }
+
+    def __getstate__(self):
+        return self.reglas, self.precision, self.grupos
+
+    def __setstate__(self, estado):
+        reglas, precision, grupos = estado
+        self.__init__(reglas, precision)
+        self.grupos = grupos
+
+    def _grupo(self, tipo, genero, edad, pcl) -> EstadisticaGrupo:
+        clave = (tipo, genero if genero is not None else SIN_INFORMAR, banda_edad(edad), banda_pcl(pcl))
+        grupo = self.grupos.get(clave)
+        if grupo is None:
+            grupo = self.grupos[clave] = EstadisticaGrupo(self.precision)
+        return grupo
+
+    def agregar_lote(
+        self,
+        tipos,
+        ingresos_base_liquidacion,
+        semanas,
+        generos,
+        edades,
+        porcentajes_perdida_capacidad_laboral,
+        tasas,
+        mesadas,
+        codigos
+    ):
+        """
+        Agrega un lote: las columnas de entrada y el resultado de calcular_lote.
+        """
+        limites_tasa = self._limites_tasa
+        limites_mesada = self._limites_mesada
+
+        filas = zip(
+            tipos, ingresos_base_liquidacion, generos, edades,
+            porcentajes_perdida_capacidad_laboral, tasas, mesadas, codigos
+        )
+        for tipo, ibl, genero, edad, pcl, tasa, mesada, codigo in filas:
+            grupo = self._grupo(tipo, genero, edad, pcl)
+            grupo.filas += 1
+
+            if codigo:
+                grupo.rechazos[codigo] = grupo.rechazos.get(codigo, 0) + 1
+                continue
+
+            tope, piso, mesada_minima = limites_tasa[tipo]
+            grupo.suma_tasa += tasa
+            grupo.suma_mesada += mesada
+            if mesada < grupo.mesada_minima:
+                grupo.mesada_minima = mesada
+            if mesada > grupo.mesada_maxima:
+                grupo.mesada_maxima = mesada
+            if tasa >= tope:
+                grupo.en_tope += 1
+            elif tasa <= piso:
+                grupo.en_piso += 1
+            # La misma expresión de calcular_pension, para decidir igual que ella.
+            if mesada_minima is not None and (tasa / 100) * ibl < mesada_minima:
+                grupo.en_mesada_minima += 1
+
+            grupo.histograma_tasa[bisect_left(LIMITES_TASA, tasa)] += 1
+            grupo.histograma_mesada[bisect_left(limites_mesada, mesada)] += 1
+            grupo.cuantiles_tasa.registrar(tasa)
+            grupo.cuantiles_mesada.registrar(mesada)
+
+    def combinar(self, otro: "AgregadorPortafolio") -> "AgregadorPortafolio":
+        """
+        Suma en este agregador los grupos de `otro` (por ejemplo, de otro fragmento).
+
+        Raises:
+        -------
+        ValueError:
+            Si los agregadores usan distintas reglas (versión o definición,
+            ver ReglasPension.huella) o precisión.
+        """
+        if (
+            otro.reglas.version != self.reglas.version
+            or otro.reglas.huella != self.reglas.huella
+            or otro.precision != self.precision
+        ):
+            raise ValueError("No se pueden combinar agregados de distintas reglas o precisión.")
+
+        for clave, grupo in otro.grupos.items():
+            propio = self.grupos.get(clave)
+            if propio is None:
+                propio = self.grupos[clave] = EstadisticaGrupo(self.precision)
+            propio.combinar(grupo)
+        return self
+
+    def resumen(self, dimensiones: tuple = DIMENSIONES) -> dict:
+        """
+        Agrupa por un subconjunto de las dimensiones.
+
+        Retorna:
+        --------
+        dict:
+            Tupla con los valores de `dimensiones` -> EstadisticaGrupo.
+            Con dimensiones vacías, la única clave es () (el total).
+
+        Raises:
+        -------
+        ValueError:
+            Si alguna dimensión no existe.
+        """
+        for dimension in dimensiones:
+            if dimension not in DIMENSIONES:
+                raise ValueError(f"Dimensión desconocida: {dimension}")
+        posiciones = [DIMENSIONES.index(dimension) for dimension in dimensiones]
+
+        resumen = {}
+        for clave, grupo in self.grupos.items():
+            proyectada = tuple(clave[posicion] for posicion in posiciones)
+            acumulado = resumen.get(proyectada)
+            if acumulado is None:
+                acumulado = resumen[proyectada] = EstadisticaGrupo(self.precision)
+            acumulado.combinar(grupo)
+        return dict(sorted(resumen.items()))
+
+    def como_dict(self, dimensiones: tuple = ("tipo",)) -> dict:
+        """
+        Reporte con el total del portafolio y un renglón por grupo.
+        """
+        total = self.resumen(()).get((), EstadisticaGrupo(self.precision))
+        return {
+            "version": self.reglas.version,
+            "dimensiones": list(dimensiones),
+            "total": total.como_dict(),
+            "grupos": [
+                dict(zip(dimensiones, clave), **grupo.como_dict())
+                for clave, grupo in self.resumen(dimensiones).items()
+            ],
+        }
+
+    def como_texto(self, dimensiones: tuple = ("tipo",)) -> str:
+        """
+        Reporte en texto plano: una línea por grupo y el total.
+        """
+        lineas = []
+        filas = list(self.resumen(dimensiones).items()) + [(("Total",), self.resumen(()).get(()))]
+
+        for clave, grupo in filas:
+            if grupo is None:
+                continue
+            datos = grupo.como_dict()
+            if datos["calculadas"]:
+                detalle = (
+                    f"tasa promedio {datos['tasa_promedio']:.2f} %, "
+                    f"mesada promedio {datos['mesada_promedio']:,.0f}, "
+                    f"mesada p50 {datos['cuantiles_mesada']['p50']:,.0f}, "
+                    f"tope {datos['proporcion_tope']:.1%}, piso {datos['proporcion_piso']:.1%}, "
+                    f"mínima {datos['proporcion_mesada_minima']:.1%}"
+                )
+            else:
+                detalle = "sin filas calculadas"
+            lineas.append(
+                f"{' / '.join(map(str, clave))}: {datos['calculadas']:,} calculadas, "
+                f"{datos['rechazadas']:,} rechazadas, total {datos['total_mesadas']:,.0f}; {detalle}"
+            )
+
+        return "\n".join(lineas)
+
+
+def _agregar_fragmento(filas: list, reglas: reglas_calcupension.ReglasPension, precision: float):
+    """
+    Calcula y agrega un fragmento de filas; se ejecuta en los procesos del pool.
+    """
+    columnas = list(zip(*filas))
+    agregador = AgregadorPortafolio(reglas, precision)
+    agregador.agregar_lote(*columnas, *logica_calcupension.CalculadoraPension.calcular_lote(*columnas, reglas))
+    return agregador
+
+
+def agregar_portafolio(
+    filas,
+    reglas: reglas_calcupension.ReglasPension | None = None,
+    procesos: int | None = 1,
+    tamano_fragmento: int = paralelo_calcupension.TAMANO_FRAGMENTO,
+    precision: float = PRECISION_CUANTILES
+) -> AgregadorPortafolio:
+    """
+    Calcula y agrega un portafolio por fragmentos, sin guardar los resultados.
+
+    Parámetros:
+    -----------
+    filas : iterable[tuple]
+        Tuplas con los datos de SolicitudPension.
+    reglas : ReglasPension | None
+        Versión de reglas a aplicar. Por defecto, las reglas vigentes.
+    procesos : int | None
+        Procesos del pool; cada uno agrega sus fragmentos y los agregados
+        parciales se combinan. Con 1 (por defecto) todo se hace en el
+        proceso actual; None usa todos los núcleos.
+    tamano_fragmento : int
+    precision : float
+        Error relativo de los cuantiles aproximados.
+    """
+    if reglas is None:
+        reglas = reglas_calcupension.REGLAS_VIGENTES
+
+    agregador = AgregadorPortafolio(reglas, precision)
+    ejecutor = paralelo_calcupension.EjecutorParalelo(procesos)
+    funcion = partial(_agregar_fragmento, reglas=reglas, precision=precision)
+
+    for _, parcial in ejecutor.mapear(funcion, paralelo_calcupension.fragmentar(filas, tamano_fragmento)):
+        agregador.combinar(parcial)
+    return agregador
@@ -0,0 +1,367 @@
+"""
+Almacén persistente (SQLite) de resultados de cálculo.
+
+Guarda cada cálculo exitoso con los datos de la solicitud, la tasa, la
+mesada, la versión de reglas y la fecha. Antes de calcular se busca un
+resultado con los mismos datos y las mismas reglas (por un hash de los
+datos y de la huella de la definición de reglas, así que reemplazar una
+versión con registrar_reglas no devuelve resultados de la anterior); si no
+existe, se calcula con CalculadoraPension y se guarda.
+
+Como CacheTasaReemplazo, las solicitudes inválidas no se guardan: se
+delegan a la calculadora, que lanza la excepción correspondiente (en el
+cálculo por lote, el código de error). Tampoco se guardan resultados no
+finitos (por ejemplo con IBL NaN), que SQLite no puede representar.
+
+Uso:
+----
+    with AlmacenResultados("resultados.db") as almacen:
+        tasa, mesada = almacen.calcular(solicitud, afiliado="CC-123")
+        almacen.historial("CC-123")
+"""
+
+import hashlib
+import json
+import math
+import sqlite3
+from array import array
+from datetime import datetime, timezone
+
+from calcupension.model import logica_calcupension
+from calcupension.model import reglas_calcupension
+
+
+TAMANO_CONSULTA = 500
+"""
+Hashes por consulta al buscar un lote (por debajo del límite de parámetros de SQLite).
+"""
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS resultados (
+    id INTEGER PRIMARY KEY,
+    afiliado TEXT,
+    hash TEXT NOT NULL,
+    version TEXT NOT NULL,
+    tipo TEXT NOT NULL,
+    ingreso_base_liquidacion REAL NOT NULL,
+    semanas INTEGER NOT NULL,
+    genero TEXT,
+    edad INTEGER,
+    porcentaje_perdida_capacidad_laboral REAL,
+    tasa_reemplazo REAL NOT NULL,
+    mesada REAL NOT NULL,
+    fecha TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS resultados_afiliado ON resultados (afiliado, id);
+CREATE INDEX IF NOT EXISTS resultados_hash ON resultados (hash, version);
+"""
+
+_INSERTAR = """
+INSERT INTO resultados (
+    afiliado, hash, version, tipo, ingreso_base_liquidacion, semanas, genero, edad,
+    porcentaje_perdida_capacidad_laboral, tasa_reemplazo, mesada, fecha
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_CAMPOS_HISTORIAL = (
+    "version",
+    "tipo",
+    "ingreso_base_liquidacion",
+    "semanas",
+    "genero",
+    "edad",
+    "porcentaje_perdida_capacidad_laboral",
+    "tasa_reemplazo",
+    "mesada",
+    "fecha",
+)
+
+
+def hash_datos(
+    tipo,
+    ingreso_base_liquidacion,
+    semanas,
+    genero,
+    edad,
+    porcentaje_perdida_capacidad_laboral,
+    huella: str = ""
+) -> str:
+    """
+    Hash de los datos de una solicitud y de la huella de las reglas (ReglasPension.huella).
+
+    Los valores numéricos se normalizan (3000000 y 3000000.0 dan el mismo
+    hash), por lo que solicitudes con los mismos datos comparten resultado.
+    Las semanas y la edad con decimales no se truncan: 1400.9 y 1400 son
+    solicitudes distintas.
+    """
+    texto = json.dumps([
+        tipo,
+        float(ingreso_base_liquidacion),
+        _normalizar_entero(semanas),
+        genero,
+        _normalizar_entero(edad),
+        None if porcentaje_perdida_capacidad_laboral is None else float(porcentaje_perdida_capacidad_laboral),
+        huella,
+    ])
+    return hashlib.blake2b(texto.encode(), digest_size=16).hexdigest()
+
+
+def _normalizar_entero(valor):
+    """
+    Convierte a int un valor entero (1400.0 -> 1400); un valor con decimales se conserva como float.
+    """
+    if valor is None:
+        return None
+    valor = float(valor)
+    return int(valor) if valor.is_integer() else valor
+
+
+def hash_solicitud(solicitud: logica_calcupension.SolicitudPension, huella: str = "") -> str:
+    return hash_datos(
+        solicitud.tipo,
+        solicitud.ingreso_base_liquidacion,
+        solicitud.semanas,
+        solicitud.genero,
+        solicitud.edad,
+        solicitud.porcentaje_perdida_capacidad_laboral,
+        huella,
+    )
+
+
+def _ahora() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class AlmacenResultados:
+    """
+    Resultados de cálculo guardados en una base SQLite.
+
+    Atributos:
+    ----------
+    conexion : sqlite3.Connection
+    aciertos : int
+        Consultas respondidas con un resultado guardado.
+    fallos : int
+        Consultas que hubo que calcular.
+    """
+
+    def __init__(self, ruta: str = ":memory:"):
+        """
+        Parámetros:
+        -----------
+        ruta : str
+            Archivo de la base de datos; se crea si no existe.
+            Por defecto, una base en memoria.
+        """
+        self.ruta = ruta
+        self.conexion = sqlite3.connect(ruta)
+        if ruta != ":memory:":
+            self.conexion.execute("PRAGMA journal_mode=WAL")
+            self.conexion.execute("PRAGMA synchronous=NORMAL")
+        with self.conexion:
+            self.conexion.executescript(_ESQUEMA)
+        self.aciertos = 0
+        self.fallos = 0
+
+    def consultar(
+        self,
+        solicitud: logica_calcupension.SolicitudPension,
+        reglas: reglas_calcupension.ReglasPension | None = None
+    ) -> tuple | None:
+        """
+        Retorna (tasa, mesada) guardados para los datos de la solicitud y
+        las reglas, o None si no hay.
+        """
+        if reglas is None:
+            reglas = reglas_calcupension.REGLAS_VIGENTES
+
+        fila = self.conexion.execute(
+            "SELECT tasa_reemplazo, mesada FROM resultados WHERE hash = ? AND version = ? LIMIT 1",
+            (hash_solicitud(solicitud, reglas.huella), reglas.version)
+        ).fetchone()
+        return fila
+
+    def calcular(
+        self,
+        solicitud: logica_calcupension.SolicitudPension,
+        afiliado: str | None = None,
+        reglas: reglas_calcupension.ReglasPension | None = None
+    ) -> tuple:
+        """
+        Retorna (tasa, mesada): el resultado guardado o, si no hay, el que
+        calcula CalculadoraPension (que se guarda a nombre de `afiliado`).
+
+        Raises:
+        -------
+        Las mismas excepciones que calcular_tasa_reemplazo.
+        """
+        if reglas is None:
+            reglas = reglas_calcupension.REGLAS_VIGENTES
+
+        guardado = self.consultar(solicitud, reglas)
+        if guardado is not None:
+            self.aciertos += 1
+            return guardado
+
+        self.fallos += 1
+        calculadora = logica_calcupension.CalculadoraPension
+        tasa = calculadora.calcular_tasa_reemplazo(solicitud, reglas)
+        mesada = calculadora.calcular_pension(tasa, solicitud.ingreso_base_liquidacion, solicitud.tipo, reglas)
+        if not (math.isfinite(tasa) and math.isfinite(mesada)):
+            return tasa, mesada
+
+        with self.conexion:
+            self.conexion.execute(_INSERTAR, (
+                afiliado,
+                hash_solicitud(solicitud, reglas.huella),
+                reglas.version,
+                solicitud.tipo,
+                solicitud.ingreso_base_liquidacion,
+                solicitud.semanas,
+                solicitud.genero,
+                solicitud.edad,
+                solicitud.porcentaje_perdida_capacidad_laboral,
+                tasa,
+                mesada,
+                _ahora(),
+            ))
+        return tasa, mesada
+
+    def guardar_lote(
+        self,
+        afiliados,
+        filas,
+        tasas,
+        mesadas,
+        codigos,
+        reglas: reglas_calcupension.ReglasPension | None = None
+    ) -> int:
+        """
+        Guarda en una sola transacción los resultados exitosos (y finitos) de un lote.
+
+        Parámetros:
+        -----------
+        afiliados : iterable[str | None]
+        filas : iterable[tuple]
+            Tuplas con los datos de SolicitudPension.
+        tasas, mesadas, codigos :
+            Resultado de calcular_lote para esas filas.
+
+        Retorna:
+        --------
+        int:
+            Número de resultados guardados.
+        """
+        if reglas is None:
+            reglas = reglas_calcupension.REGLAS_VIGENTES
+
+        version = reglas.version
+        huella = reglas.huella
+        fecha = _ahora()
+        isfinite = math.isfinite
+        registros = [
+            (afiliado, hash_datos(*fila, huella), version, *fila, tasa, mesada, fecha)
+            for afiliado, fila, tasa, mesada, codigo in zip(afiliados, filas, tasas, mesadas, codigos)
+            if not codigo and isfinite(tasa) and isfinite(mesada)
+        ]
+
+        with self.conexion:
+            self.conexion.executemany(_INSERTAR, registros)
+        return len(registros)
+
+    def calcular_lote(
+        self,
+        afiliados,
+        filas,
+        reglas: reglas_calcupension.ReglasPension | None = None
+    ) -> tuple:
+        """
+        Igual que CalculadoraPension.calcular_lote, usando los resultados guardados.
+
+        Solo las filas sin resultado guardado se calculan (en un solo lote)
+        y se guardan (en una sola transacción). Las filas con los mismos
+        datos se calculan y guardan una sola vez, a nombre del primer
+        afiliado que las trae.
+
+        Parámetros:
+        -----------
+        afiliados : sequence[str | None]
+            Identificador de afiliado por fila.
+        filas : sequence[tuple]
+            Tuplas con los datos de SolicitudPension.
+
+        Retorna:
+        --------
+        tuple[array, array, array]:
+            (tasas, mesadas, codigos), como calcular_lote.
+        """
+        if reglas is None:
+            reglas = reglas_calcupension.REGLAS_VIGENTES
+
+        n = len(filas)
+        huella = reglas.huella
+        hashes = [hash_datos(*fila, huella) for fila in filas]
+        guardados = {}
+        unicos = list(dict.fromkeys(hashes))
+        for inicio in range(0, len(unicos), TAMANO_CONSULTA):
+            parte = unicos[inicio:inicio + TAMANO_CONSULTA]
+            marcadores = ", ".join("?" * len(parte))
+            consulta = (
+                "SELECT hash, tasa_reemplazo, mesada FROM resultados "
+                f"WHERE version = ? AND hash IN ({marcadores})"
+            )
+            for hash_fila, tasa, mesada in self.conexion.execute(consulta, (reglas.version, *parte)):
+                guardados[hash_fila] = (tasa, mesada)
+
+        tasas = array("d", bytes(8 * n))
+        mesadas = array("d", bytes(8 * n))
+        codigos = array("B", bytes(n))
+        # Primera fila de cada hash sin resultado guardado -> filas con ese hash.
+        pendientes = {}
+        for i, hash_fila in enumerate(hashes):
+            guardado = guardados.get(hash_fila)
+            if guardado is None:
+                pendientes.setdefault(hash_fila, []).append(i)
+            else:
+                tasas[i], mesadas[i] = guardado
+
+        calcular = len(pendientes)
+        self.fallos += calcular
+        self.aciertos += n - calcular
+        if not pendientes:
+            return tasas, mesadas, codigos
+
+        primeras = [indices[0] for indices in pendientes.values()]
+        filas_pendientes = [filas[i] for i in primeras]
+        calculados = logica_calcupension.CalculadoraPension.calcular_lote(*zip(*filas_pendientes), reglas)
+        for indices, tasa, mesada, codigo in zip(pendientes.values(), *calculados):
+            for i in indices:
+                tasas[i], mesadas[i], codigos[i] = tasa, mesada, codigo
+
+        self.guardar_lote([afiliados[i] for i in primeras], filas_pendientes, *calculados, reglas)
+        return tasas, mesadas, codigos
+
+    def historial(self, afiliado: str) -> list:
+        """
+        Resultados guardados de un afiliado, del más antiguo al más reciente.
+        """
+        consulta = f"SELECT {', '.join(_CAMPOS_HISTORIAL)} FROM resultados WHERE afiliado = ? ORDER BY id"
+        return [dict(zip(_CAMPOS_HISTORIAL, fila)) for fila in self.conexion.execute(consulta, (afiliado,))]
+
+    def estadisticas(self) -> dict:
+        consultas = self.aciertos + self.fallos
+        return {
+            "resultados": self.conexion.execute("SELECT COUNT(*) FROM resultados").fetchone()[0],
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "tasa_aciertos": self.aciertos / consultas if consultas else 0.0,
+        }
+
+    def cerrar(self):
+        self.conexion.close()
+
+    def __enter__(self) -> "AlmacenResultados":
+        return self
+
+    def __exit__(self, tipo_excepcion, excepcion, traza):
+        self.cerrar()
@@ -0,0 +1,290 @@
+"""
+Barridos de parámetros y análisis de sensibilidad de la tasa de reemplazo.
+
+Permite evaluar una grilla completa IBL × semanas (con un vector de edades)
+sin construir una SolicitudPension por punto, y calcular directamente los
+puntos de quiebre de la pensión de vejez: dónde empieza a aplicar el piso
+o el tope de la tasa y desde qué IBL la mesada se eleva al SMMLV.
+"""
+
+import math
+from array import array
+from bisect import bisect_left
+
+from calcupension.model import reglas_calcupension
+
+
+class ResultadoBarrido:
+    """
+    Resultado de un barrido IBL × semanas.
+
+    Atributos:
+    ----------
+    ingresos : list[float]
+    semanas : list[int]
+    edades : list[int | None]
+    edades_validas : list[bool]
+        Si cada edad cumple la edad mínima (la tasa no depende de la edad).
+    tasas : list[array]
+        tasas[i][j] es la tasa para ingresos[i] y semanas[j] (NaN si es inválida).
+    mesadas : list[array]
+        mesadas[i][j] con la misma forma que tasas.
+    """
+
+    def __init__(self, ingresos, semanas, edades, edades_validas, tasas, mesadas):
+        self.ingresos = ingresos
+        self.semanas = semanas
+        self.edades = edades
+        self.edades_validas = edades_validas
+        self.tasas = tasas
+        self.mesadas = mesadas
+
+    def tasa(self, i: int, j: int, k: int = 0) -> float:
+        """
+        Tasa para ingresos[i], semanas[j] y edades[k] (NaN si la edad no es válida).
+        """
+        return self.tasas[i][j] if self.edades_validas[k] else math.nan
+
+    def mesada(self, i: int, j: int, k: int = 0) -> float:
+        """
+        Mesada para ingresos[i], semanas[j] y edades[k] (NaN si la edad no es válida).
+        """
+        return self.mesadas[i][j] if self.edades_validas[k] else math.nan
+
+
+def parametros_tipo(tipo: str, pcl: float, reglas: reglas_calcupension.ReglasPension) -> tuple:
+    """
+    Retorna (base, incremento, pendiente, umbral, paso, tope, piso) de un tipo para una PCL.
+
+    Se leen de la tabla compilada (reglas.tablas), con la misma selección de
+    banda que el cálculo. El umbral, el paso y el incremento son los del
+    tramo de semanas que sigue al umbral.
+
+    Raises:
+    -------
+    ValueError:
+        Si la banda no tiene exactamente un umbral de semanas (por ejemplo,
+        una tabla con tramos de transición); las fórmulas cerradas de este
+        módulo y del cálculo inverso suponen un solo tramo con incremento.
+    """
+    tabla = reglas.tablas[tipo]
+    base, limites_semanas, tramos_semanas = tabla.bandas[tabla.indice_banda(pcl)]
+    if len(limites_semanas) != 1 or len(tramos_semanas) != 2 or tramos_semanas[1][3] != 0:
+        raise ValueError(
+            f"La tabla de {tipo} tiene {len(limites_semanas)} umbrales de semanas; "
+            "solo se admiten tablas con un umbral."
+        )
+    umbral, paso, incremento, _ = tramos_semanas[1]
+    piso, tope = tabla.limites_tasa
+    return base, incremento, tabla.pendiente_ibl, umbral, paso, tope, piso
+
+
+def barrer(
+    tipo: str,
+    ingresos,
+    semanas,
+    edades=(None,),
+    genero: str | None = None,
+    porcentaje_perdida_capacidad_laboral: float = 0,
+    reglas: reglas_calcupension.ReglasPension | None = None
+) -> ResultadoBarrido:
+    """
+    Calcula la grilla de tasas y mesadas para todas las combinaciones IBL × semanas.
+
+    Se evalúa la tabla compilada de las reglas (reglas.tablas): la parte que
+    depende del IBL y el tramo de semanas se calculan una sola vez por valor
+    y luego se combinan, con las mismas operaciones que la función de tasa
+    compilada (los resultados coinciden bit a bit con calcular_lote).
+
+    Parámetros:
+    -----------
+    tipo : str
+    ingresos : iterable[float]
+    semanas : iterable[int]
+    edades : iterable[int | None]
+        Edades a evaluar; solo determinan si el punto es válido (en vejez,
+        una edad None no cumple la edad mínima).
+    genero : str | None
+    porcentaje_perdida_capacidad_laboral : float
+    reglas : ReglasPension | None
+        Versión de reglas a aplicar. Por defecto, las reglas vigentes.
+
+    Retorna:
+    --------
+    ResultadoBarrido
+    """
+    if reglas is None:
+        reglas = reglas_calcupension.REGLAS_VIGENTES
+
+    pcl = porcentaje_perdida_capacidad_laboral
+    tabla = reglas.tablas[tipo]
+    base, limites_semanas, tramos_semanas = tabla.bandas[tabla.indice_banda(pcl)]
+    pendiente = tabla.pendiente_ibl
+    piso, tope = tabla.limites_tasa
+    smmlv = tabla.smmlv
+    mesada_minima = reglas.mesadas_minimas.get(tipo)
+
+    ingresos = list(ingresos)
+    semanas = list(semanas)
+    edades = list(edades)
+
+    semanas_minimas = reglas.semanas_minimas_vejez if tipo == "Vejez" else 0
+    # Misma comparación que las validaciones, para que una PCL NaN se trate igual.
+    pcl_valida = tipo != "Invalidez" or not pcl <= reglas.pcl_minima_invalidez
+
+    edades_validas = []
+    for edad in edades:
+        valida = pcl_valida and (edad is None or edad >= 0)
+        if valida and tipo == "Vejez":
+            edad_minima = reglas.edades_minimas.get(genero)
+            valida = edad_minima is None or (edad is not None and edad >= edad_minima)
+        edades_validas.append(valida)
+
+    # (acumulado, incremento) del tramo de semanas de cada punto: None en el
+    # primer tramo, que no suma nada, y NaN si las semanas son inválidas.
+    incrementos = []
+    for semanas_punto in semanas:
+        if semanas_punto < 0 or semanas_punto < semanas_minimas:
+            incrementos.append((math.nan, math.nan))
+            continue
+        tramo = tramos_semanas[bisect_left(limites_semanas, semanas_punto)]
+        if tramo is None:
+            incrementos.append(None)
+        else:
+            desde, paso, incremento, acumulado = tramo
+            incrementos.append((acumulado, (semanas_punto - desde) / paso * incremento))
+
+    tasas = []
+    mesadas = []
+    for ingreso in ingresos:
+        fila_tasas = array("d")
+        fila_mesadas = array("d")
+
+        if ingreso <= 0:
+            fila_tasas.extend(math.nan for _ in semanas)
+            fila_mesadas.extend(math.nan for _ in semanas)
+        else:
+            tasa_base = base - (ingreso / smmlv) * pendiente if pendiente else base
+
+            for incremento_punto in incrementos:
+                if incremento_punto is None:
+                    tasa_total = tasa_base
+                else:
+                    tasa_total = (tasa_base + incremento_punto[0]) + incremento_punto[1]
+
+                if tasa_total > tope:
+                    tasa_total = tope
+                elif tasa_total < piso:
+                    tasa_total = piso
+
+                mesada = (tasa_total / 100) * ingreso
+                if mesada_minima is not None and mesada < mesada_minima:
+                    mesada = mesada_minima
+
+                fila_tasas.append(tasa_total)
+                fila_mesadas.append(mesada)
+
+        tasas.append(fila_tasas)
+        mesadas.append(fila_mesadas)
+
+    return ResultadoBarrido(ingresos, semanas, edades, edades_validas, tasas, mesadas)
+
+
+def quiebres_ibl_vejez(semanas: int, reglas: reglas_calcupension.ReglasPension | None = None) -> dict:
+    """
+    Puntos de quiebre en IBL de la pensión de vejez para un número de semanas.
+
+    Parámetros:
+    -----------
+    semanas : int
+    reglas : ReglasPension | None
+
+    Retorna:
+    --------
+    dict:
+        - "ibl_tope": IBL por debajo del cual la tasa queda en el tope
+          (0 si el tope nunca aplica).
+        - "ibl_piso": IBL por encima del cual la tasa queda en el piso.
+        - "ibl_mesada_minima": IBL por debajo del cual la mesada se eleva
+          al SMMLV.
+
+        Un quiebre que no ocurre para ningún IBL vale math.inf (por ejemplo,
+        sin pendiente por IBL la tasa nunca baja hasta el piso).
+    """
+    if reglas is None:
+        reglas = reglas_calcupension.REGLAS_VIGENTES
+
+    base, incremento, pendiente, umbral, paso, tope, piso = parametros_tipo("Vejez", 0, reglas)
+    smmlv = reglas.smmlv
+
+    tasa_sin_ibl = base + ((semanas - umbral) / paso * incremento if semanas > umbral else 0)
+
+    if not pendiente:
+        # La tasa no depende del IBL: queda en el tope (o en el piso) para todo IBL o para ninguno.
+        tasa = min(max(tasa_sin_ibl, piso), tope)
+        return {
+            "ibl_tope": math.inf if tasa_sin_ibl >= tope else 0.0,
+            "ibl_piso": 0.0 if tasa_sin_ibl <= piso else math.inf,
+            "ibl_mesada_minima": 100 * smmlv / tasa if tasa > 0 else math.inf,
+        }
+
+    # tasa(ibl) = tasa_sin_ibl - ibl / smmlv * pendiente, recortada a [piso, tope]
+    ibl_tope = max((tasa_sin_ibl - tope) / pendiente * smmlv, 0.0)
+    ibl_piso = max((tasa_sin_ibl - piso) / pendiente * smmlv, 0.0)
+
+    # La mesada crece con el IBL; se busca dónde vale exactamente el SMMLV en cada tramo.
+    ibl_mesada_minima = 100 * smmlv / tope if tope > 0 else math.inf
+    if ibl_mesada_minima > ibl_tope:
+        # (tasa_sin_ibl - b * ibl) * ibl / 100 = smmlv, con b = pendiente / smmlv
+        b = pendiente / smmlv
+        discriminante = tasa_sin_ibl ** 2 - 400 * b * smmlv
+        ibl_mesada_minima = math.inf
+        if discriminante >= 0:
+            raiz = (tasa_sin_ibl - math.sqrt(discriminante)) / (2 * b)
+            if ibl_tope <= raiz <= ibl_piso:
+                ibl_mesada_minima = raiz
+        if ibl_mesada_minima == math.inf and piso > 0:
+            ibl_mesada_minima = 100 * smmlv / piso
+
+    return {
+        "ibl_tope": ibl_tope,
+        "ibl_piso": ibl_piso,
+        "ibl_mesada_minima": ibl_mesada_minima,
+    }
+
+
+def quiebres_semanas_vejez(
+    ingreso_base_liquidacion: float,
+    reglas: reglas_calcupension.ReglasPension | None = None
+) -> dict:
+    """
+    Puntos de quiebre en semanas de la pensión de vejez para un IBL.
+
+    Retorna:
+    --------
+    dict:
+        - "semanas_sobre_piso": semanas desde las cuales la tasa supera el piso.
+        - "semanas_tope": semanas desde las cuales la tasa queda en el tope.
+
+        Ambos valores son reales (el cálculo usa semanas enteras) y nunca
+        menores que las semanas mínimas de vejez. Si la tasa no llega al
+        valor con ninguna cantidad de semanas (incremento 0), vale math.inf.
+    """
+    if reglas is None:
+        reglas = reglas_calcupension.REGLAS_VIGENTES
+
+    base, incremento, pendiente, umbral, paso, tope, piso = parametros_tipo("Vejez", 0, reglas)
+    tasa_base = base - (ingreso_base_liquidacion / reglas.smmlv) * pendiente
+    minimo = reglas.semanas_minimas_vejez
+
+    def semanas_para(tasa: float) -> float:
+        if tasa_base >= tasa:
+            return float(minimo)
+        if incremento <= 0:
+            return math.inf
+        return max(umbral + (tasa - tasa_base) / incremento * paso, float(minimo))
+
+    return {
+        "semanas_sobre_piso": semanas_para(piso),
+        "semanas_tope": semanas_para(tope),
+    }
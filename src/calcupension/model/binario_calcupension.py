@@ -0,0 +1,393 @@
+"""
+Formato binario por columnas para portafolios de solicitudes.
+
+Un archivo .cpb guarda las solicitudes (y opcionalmente sus resultados)
+como columnas contiguas de ancho fijo, con los mismos códigos que
+LoteSolicitudes: tipo y género en 1 byte, semanas y edad como enteros de
+32 bits, IBL y PCL como float de 64 bits. El lector mapea el archivo en
+memoria y expone cada columna como un memoryview, de modo que el
+calculador lee directamente las páginas del archivo sin convertir texto
+ni crear objetos por fila.
+
+Estructura del archivo (little-endian):
+---------------------------------------
+- Encabezado: MAGICO, versión del formato, número de columnas y de filas.
+- Directorio: por cada columna, su nombre, código de tipo de array y
+  posición en el archivo.
+- Datos: cada columna empieza alineada a ALINEACION bytes.
+"""
+
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+
+from calcupension.model import logica_calcupension
+from calcupension.model import reglas_calcupension
+
+
+EXTENSION = ".cpb"
+
+MAGICO = b"CALCPENS"
+
+VERSION_FORMATO = 1
+
+ALINEACION = 64
+
+TAMANO_FRAGMENTO = 100_000
+
+_ENCABEZADO = struct.Struct("<8sHHIQ")
+
+_ENTRADA_DIRECTORIO = struct.Struct("<40sc7xQ")
+
+COLUMNAS_SOLICITUD = (
+    ("tipos", "b"),
+    ("ingresos_base_liquidacion", "d"),
+    ("semanas", "i"),
+    ("generos", "b"),
+    ("edades", "i"),
+    ("porcentajes_perdida_capacidad_laboral", "d"),
+)
+"""
+Columnas de la solicitud, en el orden de SolicitudPension, con su código de tipo.
+"""
+
+COLUMNAS_RESULTADO = (
+    ("tasas", "d"),
+    ("mesadas", "d"),
+    ("codigos", "B"),
+)
+"""
+Columnas de resultado, como las retorna CalculadoraPension.calcular_lote.
+"""
+
+_MISMO_ORDEN = sys.byteorder == "little"
+
+
+class ErrorFormatoBinario(Exception):
+    """
+    Excepción lanzada cuando un archivo no tiene el formato binario esperado.
+    """
+    pass
+
+
+def _alinear(posicion: int) -> int:
+    return -(-posicion // ALINEACION) * ALINEACION
+
+
+def _buffer(columna, codigo: str):
+    """
+    Retorna la columna como buffer little-endian del código de tipo dado.
+
+    Los array y memoryview que ya tienen ese formato se usan sin copiar.
+    """
+    formato = columna.typecode if isinstance(columna, array) else getattr(columna, "format", None)
+    if formato != codigo or not _MISMO_ORDEN:
+        columna = array(codigo, columna)
+        if not _MISMO_ORDEN:
+            columna.byteswap()
+    return columna
+
+
+class EscritorBinario:
+    """
+    Escribe un archivo binario por fragmentos, sin conocer antes el número de filas.
+
+    Cada columna se acumula en un archivo temporal; al cerrar se escribe
+    el encabezado y las columnas se copian una tras otra. El archivo final
+    se reemplaza de forma atómica, por lo que un proceso interrumpido no
+    deja un archivo a medio escribir.
+    """
+
+    def __init__(self, ruta: str, con_resultados: bool = False):
+        """
+        Parámetros:
+        -----------
+        ruta : str
+            Archivo de salida.
+        con_resultados : bool
+            Si se guardan también tasas, mesadas y códigos.
+        """
+        self.ruta = ruta
+        self.columnas = COLUMNAS_SOLICITUD + (COLUMNAS_RESULTADO if con_resultados else ())
+        self.filas = 0
+        directorio = os.path.dirname(os.path.abspath(ruta))
+        self.temporales = [tempfile.TemporaryFile(dir=directorio) for _ in self.columnas]
+
+    @property
+    def con_resultados(self) -> bool:
+        return len(self.columnas) > len(COLUMNAS_SOLICITUD)
+
+    def agregar_columnas(self, *columnas):
+        """
+        Agrega un fragmento dado como columnas ya codificadas.
+
+        Parámetros:
+        -----------
+        *columnas
+            Una secuencia por columna, en el orden de COLUMNAS_SOLICITUD
+            (seguidas de las de COLUMNAS_RESULTADO si el archivo las lleva).
+        """
+        if len(columnas) != len(self.columnas):
+            raise ValueError(f"Se esperaban {len(self.columnas)} columnas, se recibieron {len(columnas)}.")
+
+        filas = len(columnas[0])
+        if any(len(columna) != filas for columna in columnas):
+            raise ValueError("Todas las columnas del lote deben tener la misma longitud.")
+
+        for temporal, (_, codigo), columna in zip(self.temporales, self.columnas, columnas):
+            temporal.write(_buffer(columna, codigo))
+        self.filas += filas
+
+    def agregar_lote(self, lote: logica_calcupension.LoteSolicitudes, resultados: tuple | None = None):
+        """
+        Agrega un LoteSolicitudes y, si el archivo los lleva, sus resultados.
+
+        Parámetros:
+        -----------
+        lote : LoteSolicitudes
+        resultados : tuple | None
+            (tasas, mesadas, codigos) de calcular_lote para el lote.
+        """
+        columnas = (
+            lote.tipos,
+            lote.ingresos_base_liquidacion,
+            lote.semanas,
+            lote.generos,
+            lote.edades,
+            lote.porcentajes_perdida_capacidad_laboral,
+        )
+        if self.con_resultados:
+            if resultados is None:
+                raise ValueError("El archivo lleva resultados y no se recibieron.")
+            columnas += tuple(resultados)
+        self.agregar_columnas(*columnas)
+
+    def cerrar(self):
+        """
+        Escribe el archivo final y libera los temporales.
+        """
+        directorio = []
+        posicion = _alinear(_ENCABEZADO.size + _ENTRADA_DIRECTORIO.size * len(self.columnas))
+        for nombre, codigo in self.columnas:
+            directorio.append((nombre, codigo, posicion))
+            posicion = _alinear(posicion + self.filas * array(codigo).itemsize)
+
+        temporal_final = self.ruta + ".tmp"
+        with open(temporal_final, "wb") as archivo:
+            archivo.write(_ENCABEZADO.pack(MAGICO, VERSION_FORMATO, len(self.columnas), 0, self.filas))
+            for nombre, codigo, inicio in directorio:
+                archivo.write(_ENTRADA_DIRECTORIO.pack(nombre.encode("ascii"), codigo.encode("ascii"), inicio))
+
+            for temporal, (_, _, inicio) in zip(self.temporales, directorio):
+                archivo.write(bytes(inicio - archivo.tell()))
+                temporal.seek(0)
+                shutil.copyfileobj(temporal, archivo, 1024 * 1024)
+                temporal.close()
+
+            archivo.write(bytes(posicion - archivo.tell()))
+            archivo.flush()
+            os.fsync(archivo.fileno())
+
+        os.replace(temporal_final, self.ruta)
+        self.temporales = []
+
+    def descartar(self):
+        """
+        Libera los temporales sin escribir el archivo.
+        """
+        for temporal in self.temporales:
+            temporal.close()
+        self.temporales = []
+
+    def __enter__(self) -> "EscritorBinario":
+        return self
+
+    def __exit__(self, tipo_excepcion, excepcion, traza):
+        if tipo_excepcion is None:
+            self.cerrar()
+        else:
+            self.descartar()
+
+
+class ArchivoBinario:
+    """
+    Archivo binario abierto y mapeado en memoria.
+
+    Las columnas son memoryview sobre el mapa: no se copian al abrir y
+    solo se leen del disco las páginas que se usan. Las vistas dejan de
+    ser válidas al cerrar el archivo.
+    """
+
+    def __init__(self, ruta: str):
+        """
+        Raises:
+        -------
+        ErrorFormatoBinario:
+            Si el archivo no es un archivo binario de solicitudes válido.
+        """
+        self.ruta = ruta
+        self.vistas = []
+        with open(ruta, "rb") as archivo:
+            tamano = os.fstat(archivo.fileno()).st_size
+            if tamano < _ENCABEZADO.size:
+                raise ErrorFormatoBinario(f"{ruta}: archivo demasiado corto.")
+            self.mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            magico, version, numero_columnas, _, self.filas = _ENCABEZADO.unpack_from(self.mapa, 0)
+            if magico != MAGICO:
+                raise ErrorFormatoBinario(f"{ruta}: no es un archivo binario de solicitudes.")
+            if version != VERSION_FORMATO:
+                raise ErrorFormatoBinario(f"{ruta}: versión de formato {version} no soportada.")
+
+            self.directorio = {}
+            for i in range(numero_columnas):
+                nombre, codigo, inicio = _ENTRADA_DIRECTORIO.unpack_from(
+                    self.mapa, _ENCABEZADO.size + i * _ENTRADA_DIRECTORIO.size
+                )
+                codigo = codigo.decode("ascii")
+                if inicio + self.filas * array(codigo).itemsize > tamano:
+                    raise ErrorFormatoBinario(f"{ruta}: archivo truncado.")
+                self.directorio[nombre.rstrip(b"\0").decode("ascii")] = (codigo, inicio)
+
+            faltantes = [nombre for nombre, _ in COLUMNAS_SOLICITUD if nombre not in self.directorio]
+            if faltantes:
+                raise ErrorFormatoBinario(f"{ruta}: faltan las columnas {faltantes}.")
+        except (struct.error, UnicodeDecodeError, ValueError) as error:
+            self.mapa.close()
+            raise ErrorFormatoBinario(f"{ruta}: encabezado inválido ({error}).") from error
+        except ErrorFormatoBinario:
+            self.mapa.close()
+            raise
+
+    def __len__(self) -> int:
+        return self.filas
+
+    @property
+    def con_resultados(self) -> bool:
+        return all(nombre in self.directorio for nombre, _ in COLUMNAS_RESULTADO)
+
+    def columna(self, nombre: str):
+        """
+        Retorna una columna como memoryview (o como array en plataformas big-endian).
+        """
+        codigo, inicio = self.directorio[nombre]
+        fin = inicio + self.filas * array(codigo).itemsize
+
+        if not _MISMO_ORDEN:
+            columna = array(codigo, self.mapa[inicio:fin])
+            columna.byteswap()
+            return columna
+
+        base = memoryview(self.mapa)[inicio:fin]
+        vista = base.cast(codigo)
+        self.vistas.extend((vista, base))
+        return vista
+
+    def lote(self) -> logica_calcupension.LoteSolicitudes:
+        """
+        Retorna un LoteSolicitudes de solo lectura sobre las columnas del archivo.
+        """
+        return logica_calcupension.LoteSolicitudes.desde_buffers(
+            *(self.columna(nombre) for nombre, _ in COLUMNAS_SOLICITUD)
+        )
+
+    def resultados(self) -> tuple | None:
+        """
+        Retorna (tasas, mesadas, codigos) si el archivo los lleva, o None.
+        """
+        if not self.con_resultados:
+            return None
+        return tuple(self.columna(nombre) for nombre, _ in COLUMNAS_RESULTADO)
+
+    def cerrar(self):
+        """
+        Libera las vistas entregadas y el mapa de memoria.
+        """
+        for vista in reversed(self.vistas):
+            vista.release()
+        self.vistas = []
+        self.mapa.close()
+
+    def __enter__(self) -> "ArchivoBinario":
+        return self
+
+    def __exit__(self, tipo_excepcion, excepcion, traza):
+        self.cerrar()
+
+
+def escribir_lote(
+    ruta: str,
+    lote: logica_calcupension.LoteSolicitudes,
+    resultados: tuple | None = None
+):
+    """
+    Escribe un LoteSolicitudes completo (y opcionalmente sus resultados).
+    """
+    with EscritorBinario(ruta, resultados is not None) as escritor:
+        escritor.agregar_lote(lote, resultados)
+
+
+def escribir_filas(ruta: str, filas, tamano_fragmento: int = TAMANO_FRAGMENTO) -> int:
+    """
+    Escribe filas (tuplas en el orden de SolicitudPension) por fragmentos.
+
+    Retorna:
+    --------
+    int:
+        Número de filas escritas.
+
+    Raises:
+    -------
+    ErrorTipoPension, ErrorGenero:
+        Si una fila tiene un tipo o género que no se puede codificar.
+    """
+    with EscritorBinario(ruta) as escritor:
+        lote = logica_calcupension.LoteSolicitudes()
+        for fila in filas:
+            lote.agregar(*fila)
+            if len(lote) >= tamano_fragmento:
+                escritor.agregar_lote(lote)
+                lote = logica_calcupension.LoteSolicitudes()
+        escritor.agregar_lote(lote)
+        return escritor.filas
+
+
+def calcular_archivo(
+    ruta_entrada: str,
+    ruta_salida: str,
+    reglas: reglas_calcupension.ReglasPension | None = None,
+    tamano_fragmento: int = TAMANO_FRAGMENTO
+) -> tuple:
+    """
+    Calcula un archivo binario completo y escribe otro con los resultados.
+
+    La entrada se lee por fragmentos directamente desde el mapa de memoria.
+
+    Retorna:
+    --------
+    tuple[int, int]:
+        (filas calculadas, filas rechazadas)
+    """
+    calculadas = 0
+    with ArchivoBinario(ruta_entrada) as entrada, EscritorBinario(ruta_salida, con_resultados=True) as salida:
+        columnas = [entrada.columna(nombre) for nombre, _ in COLUMNAS_SOLICITUD]
+
+        for inicio in range(0, len(entrada), tamano_fragmento):
+            lote = logica_calcupension.LoteSolicitudes.desde_buffers(
+                *(columna[inicio:inicio + tamano_fragmento] for columna in columnas)
+            )
+            resultados = lote.calcular(reglas)
+            salida.agregar_lote(lote, resultados)
+            calculadas += resultados[2].count(logica_calcupension.CODIGO_OK)
+
+            for columna in (lote.tipos, lote.ingresos_base_liquidacion, lote.semanas,
+                            lote.generos, lote.edades, lote.porcentajes_perdida_capacidad_laboral):
+                if isinstance(columna, memoryview):
+                    columna.release()
+
+        return calculadas, len(entrada) - calculadas
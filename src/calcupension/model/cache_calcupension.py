@@ -0,0 +1,175 @@
+"""
+Caché LRU opcional para la tasa de reemplazo.
+
+En simulaciones muchas solicitudes se reducen a pocas combinaciones de
+datos que realmente afectan la tasa. CacheTasaReemplazo guarda la tasa por
+esa combinación normalizada y evita repetir validaciones y cálculo en los
+aciertos.
+"""
+
+from collections import OrderedDict
+
+from calcupension.model import logica_calcupension
+from calcupension.model import reglas_calcupension
+
+
+class CacheTasaReemplazo:
+    """
+    Caché acotada (LRU) de calcular_tasa_reemplazo.
+
+    La clave incluye solo lo que afecta el resultado de cada tipo:
+
+    - IBL exacto solo si el tipo tiene pendiente por IBL (Vejez); en los
+      demás tipos solo importa que sea positivo.
+    - Semanas, tomando como iguales todas las que no superan el umbral
+      de incremento.
+    - La banda de PCL (Invalidez: hasta 66 o más de 66).
+
+    Género y edad solo se usan para validar. Las solicitudes inválidas no
+    se guardan: se delegan a la calculadora, que lanza la excepción
+    correspondiente.
+
+    Si cambian las reglas usadas (otra versión, otro SMMLV o las reglas
+    vigentes), la caché se vacía automáticamente.
+    """
+
+    def __init__(self, maximo: int = 4096):
+        """
+        Parámetros:
+        -----------
+        maximo : int
+            Número máximo de entradas guardadas.
+        """
+        if maximo <= 0:
+            raise ValueError("El tamaño máximo de la caché debe ser mayor que 0.")
+
+        self.maximo = maximo
+        self.entradas = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self.invalidaciones = 0
+        self.reglas = None
+        self.parametros = {}
+
+    def _preparar(self, reglas: reglas_calcupension.ReglasPension):
+        """
+        Vacía la caché y precalcula los parámetros de normalización de `reglas`.
+        """
+        if self.reglas is not None:
+            self.invalidaciones += 1
+
+        self.entradas.clear()
+        self.reglas = reglas
+        self.parametros = {
+            tipo: (
+                bool(parametros["pendiente_ibl"]),
+                parametros["semanas_umbral"],
+                reglas.tablas[tipo].limites_pcl,
+            )
+            for tipo, parametros in reglas.definicion["tipos"].items()
+        }
+
+    def _clave(self, solicitud, reglas: reglas_calcupension.ReglasPension) -> tuple | None:
+        """
+        Retorna la clave normalizada de una solicitud válida, o None si es inválida.
+        """
+        tipo = solicitud.tipo
+        parametros = self.parametros.get(tipo)
+        if parametros is None:
+            return None
+
+        ingreso_base_liquidacion = solicitud.ingreso_base_liquidacion
+        semanas = solicitud.semanas
+        edad = solicitud.edad
+        pcl = solicitud.porcentaje_perdida_capacidad_laboral
+
+        if semanas < 0 or (edad is not None and edad < 0) or ingreso_base_liquidacion <= 0:
+            return None
+
+        if tipo == "Vejez":
+            if semanas < reglas.semanas_minimas_vejez:
+                return None
+            edad_minima = reglas.edades_minimas.get(solicitud.genero)
+            if edad_minima is not None and (edad is None or edad < edad_minima):
+                return None
+
+        if tipo == "Invalidez" and pcl <= reglas.pcl_minima_invalidez:
+            return None
+
+        depende_ibl, umbral, limites_pcl = parametros
+
+        return (
+            tipo,
+            ingreso_base_liquidacion if depende_ibl else True,
+            semanas if semanas > umbral else umbral,
+            reglas_calcupension.indice_banda_pcl(limites_pcl, pcl),
+        )
+
+    def calcular_tasa_reemplazo(
+        self,
+        solicitud: logica_calcupension.SolicitudPension,
+        reglas: reglas_calcupension.ReglasPension | None = None
+    ) -> float:
+        """
+        Igual que CalculadoraPension.calcular_tasa_reemplazo, usando la caché.
+
+        Parámetros:
+        -----------
+        solicitud : SolicitudPension
+        reglas : ReglasPension | None
+            Versión de reglas a aplicar. Por defecto, las reglas vigentes.
+
+        Retorna:
+        --------
+        float:
+            Tasa de reemplazo (en porcentaje).
+        """
+        if reglas is None:
+            reglas = reglas_calcupension.REGLAS_VIGENTES
+        if reglas is not self.reglas:
+            self._preparar(reglas)
+
+        clave = self._clave(solicitud, reglas)
+        if clave is None:
+            return logica_calcupension.CalculadoraPension.calcular_tasa_reemplazo(solicitud, reglas)
+
+        entradas = self.entradas
+        tasa = entradas.get(clave)
+        if tasa is not None:
+            self.aciertos += 1
+            entradas.move_to_end(clave)
+            return tasa
+
+        self.fallos += 1
+        tasa = logica_calcupension.CalculadoraPension.calcular_tasa_reemplazo(solicitud, reglas)
+        entradas[clave] = tasa
+        if len(entradas) > self.maximo:
+            entradas.popitem(last=False)
+            self.desalojos += 1
+        return tasa
+
+    def limpiar(self):
+        """
+        Vacía la caché y reinicia los contadores.
+        """
+        self.entradas.clear()
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self.invalidaciones = 0
+
+    def estadisticas(self) -> dict:
+        """
+        Retorna los contadores de la caché.
+        """
+        consultas = self.aciertos + self.fallos
+        return {
+            "entradas": len(self.entradas),
+            "maximo": self.maximo,
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "desalojos": self.desalojos,
+            "invalidaciones": self.invalidaciones,
+            "tasa_aciertos": self.aciertos / consultas if consultas else 0.0,
+        }
@@ -0,0 +1,319 @@
+"""
+Cálculo exacto en punto fijo (enteros) de tasa y mesada.
+
+El cálculo con float puede diferir en un peso o un centavo del sistema de
+nómina al redondear. Este módulo calcula solo con enteros:
+
+- IBL y mesada en centavos.
+- Tasa en millonésimas de punto porcentual (64.643300 % -> 64_643_300).
+
+Los parámetros de las reglas se convierten una sola vez a fracciones
+exactas (a partir de su representación decimal) y luego a coeficientes
+enteros sobre un denominador común, por lo que cada fila se calcula con
+unas pocas multiplicaciones y divisiones enteras.
+
+Redondeo:
+---------
+La tasa se redondea a la millonésima y la mesada al centavo (o al peso
+con unidad_mesada=UNIDAD_PESO), siempre al valor más cercano y los
+empates lejos de cero. El tope, el piso y la mesada mínima se aplican
+sobre los valores ya redondeados; como son valores exactos en esas
+unidades, el resultado es el mismo que aplicarlos antes.
+"""
+
+from array import array
+from fractions import Fraction
+from math import isfinite, lcm
+import weakref
+
+from calcupension.model import logica_calcupension
+from calcupension.model import reglas_calcupension
+
+
+ESCALA_TASA = 1_000_000
+"""
+Unidades de tasa por punto porcentual.
+"""
+
+UNIDAD_CENTAVO = 1
+
+UNIDAD_PESO = 100
+"""
+Valores de unidad_mesada: redondear la mesada al centavo o al peso.
+"""
+
+_COMPILADAS = weakref.WeakKeyDictionary()
+"""
+Coeficientes compilados por objeto de reglas; se liberan junto con las reglas.
+"""
+
+
+def dividir_redondeando(numerador: int, denominador: int) -> int:
+    """
+    Cociente entero más cercano, con los empates lejos de cero.
+    """
+    if denominador < 0:
+        numerador, denominador = -numerador, -denominador
+    if numerador >= 0:
+        return (2 * numerador + denominador) // (2 * denominador)
+    return -((-2 * numerador + denominador) // (2 * denominador))
+
+
+def _fraccion(valor) -> Fraction:
+    """
+    Valor exacto de un parámetro según su representación decimal (0.1 -> 1/10).
+    """
+    if isinstance(valor, float):
+        return Fraction(repr(valor))
+    return Fraction(valor)
+
+
+def _a_escala(valor) -> int:
+    """
+    Convierte una tasa en puntos porcentuales a millonésimas.
+    """
+    fraccion = _fraccion(valor) * ESCALA_TASA
+    return dividir_redondeando(fraccion.numerator, fraccion.denominator)
+
+
+def a_centavos(valor) -> int:
+    """
+    Convierte pesos (int, float, str o Decimal) en centavos enteros.
+
+    Los float se interpretan por su representación decimal más corta
+    (1.005 -> "1.005"), de modo que 1.005 pesos son 101 centavos. Las
+    fracciones de centavo se redondean al más cercano, empates lejos de cero.
+
+    Raises:
+    -------
+    ValueError:
+        Si el valor no es finito (NaN o infinito) o el texto no es un número.
+    """
+    if isinstance(valor, int):
+        return valor * 100
+    if not isinstance(valor, str) and not isfinite(valor):
+        raise ValueError(f"No se puede convertir a centavos un valor no finito: {valor!r}")
+
+    texto = repr(valor) if isinstance(valor, float) else str(valor)
+    if "e" in texto or "E" in texto or "/" in texto:
+        fraccion = _fraccion(valor) * 100
+        return dividir_redondeando(fraccion.numerator, fraccion.denominator)
+
+    negativo = texto.startswith("-")
+    entero, _, decimales = texto.lstrip("+-").partition(".")
+    try:
+        centavos = int(entero or "0") * 100 + int((decimales + "00")[:2])
+    except ValueError:
+        raise ValueError(f"No se puede convertir a centavos: {valor!r}") from None
+    if decimales[2:3] >= "5":
+        centavos += 1
+    return -centavos if negativo else centavos
+
+
+def formatear_centavos(centavos: int) -> str:
+    """
+    Texto con dos decimales de un valor en centavos (193929901 -> "1939299.01").
+    """
+    signo = "-" if centavos < 0 else ""
+    pesos, resto = divmod(abs(centavos), 100)
+    return f"{signo}{pesos}.{resto:02d}"
+
+
+def formatear_tasa(tasa: int) -> str:
+    """
+    Texto con seis decimales de una tasa en millonésimas (64643300 -> "64.643300").
+    """
+    signo = "-" if tasa < 0 else ""
+    entero, resto = divmod(abs(tasa), ESCALA_TASA)
+    return f"{signo}{entero}.{resto:06d}"
+
+
+def _compilar(reglas: reglas_calcupension.ReglasPension) -> dict:
+    """
+    Coeficientes enteros por tipo y banda de PCL para unas reglas (se calculan una vez).
+
+    Para cada banda, tasa × ESCALA_TASA = (k_base - ibl_centavos × k_ibl +
+    semanas_sobre_umbral × k_semanas) / denominador.
+    """
+    compilada = _COMPILADAS.get(reglas)
+    if compilada is not None:
+        return compilada
+
+    smmlv_centavos = a_centavos(reglas.smmlv)
+    compilada = {}
+
+    for tipo, parametros in reglas.definicion["tipos"].items():
+        pendiente = _fraccion(parametros["pendiente_ibl"]) * ESCALA_TASA / smmlv_centavos
+        tope = parametros["tope"]
+        piso = parametros["piso"]
+
+        bandas = []
+        for banda in parametros["bandas_pcl"]:
+            base = _fraccion(banda["base"]) * ESCALA_TASA
+            incremento = _fraccion(banda["incremento"]) * ESCALA_TASA / _fraccion(parametros["semanas_paso"])
+            denominador = lcm(base.denominator, pendiente.denominator, incremento.denominator)
+            bandas.append((
+                banda["pcl_hasta"],
+                int(base * denominador),
+                int(pendiente * denominador),
+                int(incremento * denominador),
+                denominador,
+            ))
+
+        compilada[tipo] = (
+            tuple(bandas),
+            parametros["semanas_umbral"],
+            None if tope is None else _a_escala(tope),
+            None if piso is None else _a_escala(piso),
+            smmlv_centavos if parametros["mesada_minima_smmlv"] else None,
+        )
+
+    _COMPILADAS[reglas] = compilada
+    return compilada
+
+
+def _calcular_fila(
+    compilada: tuple,
+    ibl_centavos: int,
+    semanas: int,
+    pcl: float,
+    unidad_mesada: int
+) -> tuple:
+    """
+    Retorna (tasa en millonésimas, mesada en centavos) de una fila ya validada.
+    """
+    bandas, umbral, tope, piso, mesada_minima = compilada
+
+    for pcl_hasta, k_base, k_ibl, k_semanas, denominador in bandas:
+        if pcl_hasta is None or pcl <= pcl_hasta:
+            break
+
+    numerador = k_base - ibl_centavos * k_ibl
+    if semanas > umbral:
+        numerador += (semanas - umbral) * k_semanas
+    tasa = dividir_redondeando(numerador, denominador)
+
+    if tope is not None and tasa > tope:
+        tasa = tope
+    elif piso is not None and tasa < piso:
+        tasa = piso
+
+    divisor = 100 * ESCALA_TASA * unidad_mesada
+    mesada = dividir_redondeando(tasa * ibl_centavos, divisor) * unidad_mesada
+    if mesada_minima is not None and mesada < mesada_minima:
+        mesada = mesada_minima
+
+    return tasa, mesada
+
+
+def calcular_centavos(
+    solicitud: logica_calcupension.SolicitudPension,
+    reglas: reglas_calcupension.ReglasPension | None = None,
+    unidad_mesada: int = UNIDAD_CENTAVO
+) -> tuple:
+    """
+    Calcula tasa y mesada de una solicitud en punto fijo.
+
+    Aplica las mismas validaciones (y lanza las mismas excepciones) que
+    CalculadoraPension.calcular_tasa_reemplazo.
+
+    Parámetros:
+    -----------
+    solicitud : SolicitudPension
+        El IBL se interpreta en pesos (ver a_centavos).
+    reglas : ReglasPension | None
+        Versión de reglas a aplicar. Por defecto, las reglas vigentes.
+    unidad_mesada : int
+        UNIDAD_CENTAVO o UNIDAD_PESO.
+
+    Retorna:
+    --------
+    tuple[int, int]:
+        (tasa en millonésimas de punto porcentual, mesada en centavos)
+    """
+    if reglas is None:
+        reglas = reglas_calcupension.REGLAS_VIGENTES
+
+    calculadora = logica_calcupension.CalculadoraPension
+    calculadora.check_tipo(solicitud.tipo)
+    calculadora.check_valores(solicitud)
+    calculadora.check_ibl(solicitud.ingreso_base_liquidacion)
+
+    if solicitud.tipo == "Vejez":
+        calculadora.check_semanas(solicitud.semanas, reglas)
+        calculadora.check_edad(solicitud.genero, solicitud.edad, reglas)
+
+    if solicitud.tipo == "Invalidez":
+        calculadora.check_pcl(solicitud.porcentaje_perdida_capacidad_laboral, reglas)
+
+    return _calcular_fila(
+        _compilar(reglas)[solicitud.tipo],
+        a_centavos(solicitud.ingreso_base_liquidacion),
+        solicitud.semanas,
+        solicitud.porcentaje_perdida_capacidad_laboral,
+        unidad_mesada
+    )
+
+
+def calcular_lote_centavos(
+    tipos,
+    ingresos_base_liquidacion,
+    semanas,
+    generos,
+    edades,
+    porcentajes_perdida_capacidad_laboral,
+    reglas: reglas_calcupension.ReglasPension | None = None,
+    unidad_mesada: int = UNIDAD_CENTAVO,
+    ingresos_en_centavos: bool = False
+) -> tuple:
+    """
+    Igual que CalculadoraPension.calcular_lote, en punto fijo.
+
+    Parámetros:
+    -----------
+    Las mismas columnas que calcular_lote.
+    reglas : ReglasPension | None
+    unidad_mesada : int
+        UNIDAD_CENTAVO o UNIDAD_PESO.
+    ingresos_en_centavos : bool
+        True si la columna de IBL ya viene en centavos enteros.
+
+    Retorna:
+    --------
+    tuple[array, array, array]:
+        (tasas, mesadas, codigos). tasas (millonésimas) y mesadas (centavos)
+        son array('q'); codigos es array('B') con CODIGO_OK o el código de
+        la primera validación que falla. Un IBL no finito (NaN o infinito)
+        se reporta con CODIGO_ERROR_IBL. Las filas inválidas tienen tasa y
+        mesada 0.
+    """
+    if reglas is None:
+        reglas = reglas_calcupension.REGLAS_VIGENTES
+
+    mascaras = logica_calcupension.CalculadoraPension.validar_lote(
+        tipos, ingresos_base_liquidacion, semanas, generos, edades,
+        porcentajes_perdida_capacidad_laboral, reglas
+    )
+
+    n = len(mascaras)
+    compilada = _compilar(reglas)
+    tasas = array("q", bytes(8 * n))
+    mesadas = array("q", bytes(8 * n))
+    codigos = array("B", bytes(n))
+    primer_error = logica_calcupension.primer_error
+
+    filas = zip(mascaras, tipos, ingresos_base_liquidacion, semanas, porcentajes_perdida_capacidad_laboral)
+    for i, (mascara, tipo, ibl, semanas_fila, pcl) in enumerate(filas):
+        if mascara:
+            codigos[i] = primer_error(mascara)
+            continue
+
+        if not isfinite(ibl):
+            # El punto fijo no representa un IBL no finito: la fila se rechaza como IBL inválido.
+            codigos[i] = logica_calcupension.CODIGO_ERROR_IBL
+            continue
+
+        ibl_centavos = ibl if ingresos_en_centavos else a_centavos(ibl)
+        tasas[i], mesadas[i] = _calcular_fila(compilada[tipo], ibl_centavos, semanas_fila, pcl, unidad_mesada)
+
+    return tasas, mesadas, codigos
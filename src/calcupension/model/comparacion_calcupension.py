@@ -0,0 +1,317 @@
+"""
+Comparación de solicitudes contra varias versiones de reglas.
+
+Para afiliados cercanos a un cambio de régimen se necesita la mejor de
+varias versiones (por ejemplo, los parámetros del decreto anterior y los
+vigentes). En lugar de llamar a calcular_tasa_reemplazo una vez por
+versión, comparar_lote recorre las filas una sola vez: las validaciones
+que no dependen de las reglas (tipo, valores negativos, IBL) se hacen una
+vez por fila y, para cada versión, solo se comparan sus umbrales y se
+evalúa su función de tasa. El costo crece linealmente con el número de
+versiones.
+
+Los resultados de cada versión coinciden bit a bit con
+CalculadoraPension.calcular_lote con esas reglas.
+"""
+
+from array import array
+import math
+
+from calcupension.model import logica_calcupension
+from calcupension.model import reglas_calcupension
+
+
+CRITERIO_MESADA = "mesada"
+"""
+Gana la versión con la mesada más alta.
+"""
+
+CRITERIO_TASA = "tasa"
+"""
+Gana la versión con la tasa de reemplazo más alta.
+"""
+
+CRITERIOS = (CRITERIO_MESADA, CRITERIO_TASA)
+
+SIN_GANADORA = -1
+"""
+Índice de versión ganadora cuando ninguna versión acepta la solicitud.
+"""
+
+
+def resolver_versiones(reglas) -> tuple:
+    """
+    Convierte una secuencia de ReglasPension o versiones registradas en reglas compiladas.
+
+    Raises:
+    -------
+    ValueError:
+        Si no se indica ninguna versión.
+    KeyError:
+        Si alguna versión no está registrada.
+    """
+    versiones = tuple(
+        reglas_calcupension.obtener_reglas(regla) if isinstance(regla, str) else regla
+        for regla in reglas
+    )
+    if not versiones:
+        raise ValueError("Se necesita al menos una versión de reglas.")
+    return versiones
+
+
+class ResultadoComparacion:
+    """
+    Resultado de comparar una solicitud contra varias versiones de reglas.
+
+    Atributos:
+    ----------
+    versiones : tuple[str, ...]
+        Versión de cada columna, en el orden en que se pasaron las reglas.
+    tasas, mesadas : tuple[float, ...]
+        Tasa y mesada por versión (NaN si la versión no acepta la solicitud).
+    codigos : tuple[int, ...]
+        CODIGO_OK o el código de la primera validación que falla, por versión.
+    ganadora : int | None
+        Índice de la versión ganadora, o None si ninguna acepta la solicitud.
+    """
+
+    __slots__ = ("versiones", "tasas", "mesadas", "codigos", "ganadora")
+
+    def __init__(self, versiones: tuple, tasas: tuple, mesadas: tuple, codigos: tuple, ganadora: int | None):
+        self.versiones = versiones
+        self.tasas = tasas
+        self.mesadas = mesadas
+        self.codigos = codigos
+        self.ganadora = ganadora
+
+    @property
+    def version_ganadora(self) -> str | None:
+        return None if self.ganadora is None else self.versiones[self.ganadora]
+
+    def como_dict(self) -> dict:
+        ganadora = self.ganadora
+        return {
+            "version_ganadora": self.version_ganadora,
+            "tasa": None if ganadora is None else self.tasas[ganadora],
+            "mesada": None if ganadora is None else self.mesadas[ganadora],
+            "versiones": [
+                {
+                    "version": version,
+                    "tasa": tasa if codigo == logica_calcupension.CODIGO_OK else None,
+                    "mesada": mesada if codigo == logica_calcupension.CODIGO_OK else None,
+                    "codigo": codigo,
+                }
+                for version, tasa, mesada, codigo in zip(self.versiones, self.tasas, self.mesadas, self.codigos)
+            ],
+        }
+
+
+def comparar(
+    solicitud: logica_calcupension.SolicitudPension,
+    reglas,
+    criterio: str = CRITERIO_MESADA
+) -> ResultadoComparacion:
+    """
+    Compara una solicitud contra varias versiones de reglas.
+
+    Parámetros:
+    -----------
+    solicitud : SolicitudPension | VistaSolicitud
+    reglas : secuencia de ReglasPension o str
+        Versiones a comparar.
+    criterio : str
+        CRITERIO_MESADA (por defecto) o CRITERIO_TASA.
+    """
+    versiones = resolver_versiones(reglas)
+    ganadoras, tasas, mesadas, codigos = comparar_lote(
+        (solicitud.tipo,),
+        (solicitud.ingreso_base_liquidacion,),
+        (solicitud.semanas,),
+        (solicitud.genero,),
+        (solicitud.edad,),
+        (solicitud.porcentaje_perdida_capacidad_laboral,),
+        versiones,
+        criterio,
+    )
+    return ResultadoComparacion(
+        tuple(regla.version for regla in versiones),
+        tuple(columna[0] for columna in tasas),
+        tuple(columna[0] for columna in mesadas),
+        tuple(columna[0] for columna in codigos),
+        None if ganadoras[0] == SIN_GANADORA else ganadoras[0],
+    )
+
+
+def comparar_lote(
+    tipos,
+    ingresos_base_liquidacion,
+    semanas,
+    generos,
+    edades,
+    porcentajes_perdida_capacidad_laboral,
+    reglas,
+    criterio: str = CRITERIO_MESADA
+) -> tuple:
+    """
+    Calcula un lote contra varias versiones de reglas en una sola pasada.
+
+    Parámetros:
+    -----------
+    tipos, ingresos_base_liquidacion, semanas, generos, edades, porcentajes_perdida_capacidad_laboral
+        Columnas del lote, como en CalculadoraPension.calcular_lote (por
+        ejemplo, LoteSolicitudes.columnas()).
+    reglas : secuencia de ReglasPension o str
+        Versiones a comparar.
+    criterio : str
+        CRITERIO_MESADA (por defecto) o CRITERIO_TASA. En empate gana la
+        versión que aparece primero.
+
+    Retorna:
+    --------
+    tuple[array, list[array], list[array], list[array]]:
+        (ganadoras, tasas, mesadas, codigos). ganadoras es array('i') con
+        el índice de la versión ganadora de cada fila (SIN_GANADORA si
+        ninguna la acepta); tasas, mesadas y codigos tienen una columna por
+        versión, iguales a las de calcular_lote con esas reglas.
+
+    Raises:
+    -------
+    ValueError:
+        Si las columnas tienen distinta longitud, no hay versiones o el
+        criterio no existe.
+    """
+    if criterio not in CRITERIOS:
+        raise ValueError(f"Criterio desconocido: {criterio}")
+
+    n = len(tipos)
+    columnas = (
+        ingresos_base_liquidacion, semanas, generos, edades,
+        porcentajes_perdida_capacidad_laboral
+    )
+    if any(len(columna) != n for columna in columnas):
+        raise ValueError("Todas las columnas del lote deben tener la misma longitud.")
+
+    versiones = resolver_versiones(reglas)
+    invalido = float("nan")
+    ganadoras = array("i", [SIN_GANADORA]) * n
+    tasas = [array("d", [invalido]) * n for _ in versiones]
+    mesadas = [array("d", [invalido]) * n for _ in versiones]
+    codigos = [array("B", bytes(n)) for _ in versiones]
+    por_mesada = criterio == CRITERIO_MESADA
+
+    # Parámetros de cada versión agrupados por tipo (y por género en vejez), para que el
+    # recorrido por versión solo haga las comparaciones de ese tipo.
+    sin_tipo = {tipo: [] for tipo in logica_calcupension.TIPOS_PENSION}
+    vejez = {genero: [] for genero in logica_calcupension.GENEROS}
+    vejez_sin_genero = []
+    sobreviviente = []
+    invalidez = []
+    for indice, regla in enumerate(versiones):
+        columnas_version = (tasas[indice], mesadas[indice], codigos[indice])
+        for tipo in logica_calcupension.TIPOS_PENSION:
+            funcion = regla.tasas.get(tipo)
+            if funcion is None:
+                sin_tipo[tipo].append(codigos[indice])
+                continue
+            mesada_minima = regla.mesadas_minimas.get(tipo, -math.inf)
+            if tipo == "Vejez":
+                for genero, codigo_edad in (
+                    ("Hombre", logica_calcupension.CODIGO_ERROR_EDAD_HOMBRES),
+                    ("Mujer", logica_calcupension.CODIGO_ERROR_EDAD_MUJERES),
+                ):
+                    vejez[genero].append((
+                        indice, funcion, mesada_minima, regla.semanas_minimas_vejez,
+                        regla.edades_minimas[genero], codigo_edad, *columnas_version
+                    ))
+                vejez_sin_genero.append((
+                    indice, funcion, mesada_minima, regla.semanas_minimas_vejez,
+                    None, None, *columnas_version
+                ))
+            elif tipo == "Invalidez":
+                invalidez.append((indice, funcion, mesada_minima, regla.pcl_minima_invalidez, *columnas_version))
+            else:
+                sobreviviente.append((indice, funcion, mesada_minima, *columnas_version))
+
+    codigo_semanas = logica_calcupension.CODIGO_ERROR_SEMANAS
+    codigo_pcl = logica_calcupension.CODIGO_ERROR_PCL
+    codigo_tipo = logica_calcupension.CODIGO_ERROR_TIPO
+
+    filas = zip(tipos, ingresos_base_liquidacion, semanas, generos, edades,
+                porcentajes_perdida_capacidad_laboral)
+
+    for i, (tipo, ibl, semanas_fila, genero, edad, pcl) in enumerate(filas):
+
+        # Validaciones que no dependen de las reglas: una vez por fila.
+        if tipo != "Vejez" and tipo != "Sobreviviente" and tipo != "Invalidez":
+            comun = codigo_tipo
+        elif semanas_fila < 0 or (edad is not None and edad < 0):
+            comun = logica_calcupension.CODIGO_ERROR_VALORES_NEGATIVOS
+        elif ibl <= 0:
+            comun = logica_calcupension.CODIGO_ERROR_IBL
+        else:
+            comun = logica_calcupension.CODIGO_OK
+
+        if comun:
+            for columna in codigos:
+                columna[i] = comun
+            continue
+
+        for columna in sin_tipo[tipo]:
+            columna[i] = codigo_tipo
+
+        ganadora = SIN_GANADORA
+        mejor = -math.inf
+
+        if tipo == "Vejez":
+            for (indice, funcion, mesada_minima, semanas_minimas, edad_minima, codigo_edad,
+                 tasas_version, mesadas_version, codigos_version) in vejez.get(genero, vejez_sin_genero):
+                if semanas_fila < semanas_minimas:
+                    codigos_version[i] = codigo_semanas
+                    continue
+                if edad_minima is not None and (edad is None or edad < edad_minima):
+                    codigos_version[i] = codigo_edad
+                    continue
+                tasa = funcion(ibl, semanas_fila, pcl)
+                mesada = (tasa / 100) * ibl
+                if mesada < mesada_minima:
+                    mesada = mesada_minima
+                tasas_version[i] = tasa
+                mesadas_version[i] = mesada
+                valor = mesada if por_mesada else tasa
+                if valor > mejor:
+                    mejor = valor
+                    ganadora = indice
+
+        elif tipo == "Invalidez":
+            for (indice, funcion, mesada_minima, pcl_minima,
+                 tasas_version, mesadas_version, codigos_version) in invalidez:
+                if pcl <= pcl_minima:
+                    codigos_version[i] = codigo_pcl
+                    continue
+                tasa = funcion(ibl, semanas_fila, pcl)
+                mesada = (tasa / 100) * ibl
+                if mesada < mesada_minima:
+                    mesada = mesada_minima
+                tasas_version[i] = tasa
+                mesadas_version[i] = mesada
+                valor = mesada if por_mesada else tasa
+                if valor > mejor:
+                    mejor = valor
+                    ganadora = indice
+
+        else:
+            for indice, funcion, mesada_minima, tasas_version, mesadas_version, codigos_version in sobreviviente:
+                tasa = funcion(ibl, semanas_fila, pcl)
+                mesada = (tasa / 100) * ibl
+                if mesada < mesada_minima:
+                    mesada = mesada_minima
+                tasas_version[i] = tasa
+                mesadas_version[i] = mesada
+                valor = mesada if por_mesada else tasa
+                if valor > mejor:
+                    mejor = valor
+                    ganadora = indice
+
+        ganadoras[i] = ganadora
+
+    return ganadoras, tasas, mesadas, codigos
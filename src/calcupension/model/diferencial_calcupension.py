@@ -0,0 +1,714 @@
+"""
+Pruebas diferenciales de las rutas de cálculo contra la calculadora de referencia.
+
+Genera solicitudes aleatorias con un generador con semilla, concentradas en
+las fronteras de las reglas (umbral de semanas y sus pasos de 50, semanas
+mínimas, edades mínimas, PCL mínima y límites de bandas, IBL donde la tasa
+llega al tope o al piso y donde la mesada llega al SMMLV), y compara el
+resultado de cada ruta de cálculo con el de
+CalculadoraPension.calcular_tasa_reemplazo y calcular_pension (el oráculo).
+
+También se generan valores que ninguna regla espera (IBL y PCL NaN o
+infinitos, vejez sin edad): en esas filas se compara el desenlace, sea un
+resultado, un código de error o una excepción. Una excepción (del oráculo
+o de una ruta) se reporta con su nombre en lugar del código.
+
+Las comparaciones se hacen por fragmentos: cada ruta calcula el fragmento
+completo (por columnas) y luego se compara fila a fila. De cada ruta se
+reportan las primeras discrepancias, reducidas (shrinking) a la solicitud
+más simple que sigue fallando.
+
+Uso:
+----
+    PYTHONPATH=src python -m calcupension.model.diferencial_calcupension --casos 1000000 --semilla 1
+
+Termina con código 1 si alguna ruta no coincide con el oráculo.
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from array import array
+from functools import partial
+
+from calcupension.model import almacen_calcupension
+from calcupension.model import barrido_calcupension
+from calcupension.model import binario_calcupension
+from calcupension.model import cache_calcupension
+from calcupension.model import centavos_calcupension
+from calcupension.model import logica_calcupension
+from calcupension.model import paralelo_calcupension
+from calcupension.model import reglas_calcupension
+
+
+CASOS = 100_000
+
+TAMANO_FRAGMENTO = 20_000
+
+MAXIMO_DISCREPANCIAS = 5
+"""
+Discrepancias que se guardan (y reducen) por ruta.
+"""
+
+PROPORCION_FRONTERA = 0.7
+"""
+Fracción de los valores que se toman de las fronteras de las reglas.
+"""
+
+COMPARACION_EXACTA = "exacta"
+
+COMPARACION_CODIGOS = "codigos"
+
+COMPARACION_CENTAVOS = "centavos"
+
+_NAN = float("nan")
+
+NO_FINITOS = (_NAN, math.inf, -math.inf)
+"""
+Valores no finitos que se generan para el IBL y la PCL.
+"""
+
+
+def oraculo(fila: tuple, reglas: reglas_calcupension.ReglasPension) -> tuple:
+    """
+    Resultado de referencia de una fila: (tasa, mesada, codigo).
+
+    Las solicitudes inválidas tienen tasa y mesada NaN y el código de la
+    excepción que lanza calcular_tasa_reemplazo. Cualquier otra excepción
+    se reporta con su nombre como código, para compararla con lo que
+    retorna cada ruta.
+    """
+    calculadora = logica_calcupension.CalculadoraPension
+    solicitud = logica_calcupension.SolicitudPension(*fila)
+    try:
+        tasa = calculadora.calcular_tasa_reemplazo(solicitud, reglas)
+        mesada = calculadora.calcular_pension(tasa, solicitud.ingreso_base_liquidacion, solicitud.tipo, reglas)
+    except tuple(logica_calcupension.CODIGOS_ERROR) as error:
+        return _NAN, _NAN, logica_calcupension.CODIGOS_ERROR[type(error)]
+    except Exception as error:
+        return _NAN, _NAN, type(error).__name__
+    return tasa, mesada, 0
+
+
+def _ruta_lote(filas: list, reglas) -> tuple:
+    return logica_calcupension.CalculadoraPension.calcular_lote(*zip(*filas), reglas)
+
+
+def _ruta_lote_solicitudes(filas: list, reglas) -> tuple:
+    lote = logica_calcupension.LoteSolicitudes()
+    for fila in filas:
+        lote.agregar(*fila)
+    return lote.calcular(reglas)
+
+
+def _ruta_validar(filas: list, reglas) -> tuple:
+    validar = logica_calcupension.CalculadoraPension.validar
+    primer_error = logica_calcupension.primer_error
+    codigos = array("B", (
+        primer_error(validar(logica_calcupension.SolicitudPension(*fila), reglas)) for fila in filas
+    ))
+    return None, None, codigos
+
+
+def _ruta_validar_lote(filas: list, reglas) -> tuple:
+    mascaras = logica_calcupension.CalculadoraPension.validar_lote(*zip(*filas), reglas)
+    primer_error = logica_calcupension.primer_error
+    return None, None, array("B", (primer_error(mascara) for mascara in mascaras))
+
+
+def _ruta_cache(filas: list, reglas) -> tuple:
+    # Caché pequeña para que también se ejerciten los desalojos.
+    cache = cache_calcupension.CacheTasaReemplazo(maximo=256)
+    calcular_pension = logica_calcupension.CalculadoraPension.calcular_pension
+    tasas, mesadas, codigos = array("d"), array("d"), array("B")
+
+    for fila in filas:
+        solicitud = logica_calcupension.SolicitudPension(*fila)
+        try:
+            tasa = cache.calcular_tasa_reemplazo(solicitud, reglas)
+        except tuple(logica_calcupension.CODIGOS_ERROR) as error:
+            tasas.append(_NAN)
+            mesadas.append(_NAN)
+            codigos.append(logica_calcupension.CODIGOS_ERROR[type(error)])
+            continue
+        tasas.append(tasa)
+        mesadas.append(calcular_pension(tasa, solicitud.ingreso_base_liquidacion, solicitud.tipo, reglas))
+        codigos.append(0)
+
+    return tasas, mesadas, codigos
+
+
+def _ruta_paralelo(filas: list, reglas) -> tuple:
+    # calcular_en_paralelo usa las reglas vigentes.
+    if reglas is not reglas_calcupension.REGLAS_VIGENTES:
+        return _ruta_lote(filas, reglas)
+
+    tasas, mesadas, codigos = array("d"), array("d"), array("B")
+    for tasa, mesada, codigo in paralelo_calcupension.calcular_en_paralelo(
+        filas, procesos=2, tamano_fragmento=max(1, len(filas) // 4)
+    ):
+        tasas.append(tasa)
+        mesadas.append(mesada)
+        codigos.append(codigo)
+    return tasas, mesadas, codigos
+
+
+def _ruta_binario(filas: list, reglas) -> tuple:
+    with tempfile.TemporaryDirectory() as directorio:
+        entrada = os.path.join(directorio, "entrada" + binario_calcupension.EXTENSION)
+        salida = os.path.join(directorio, "salida" + binario_calcupension.EXTENSION)
+        binario_calcupension.escribir_filas(entrada, filas)
+        binario_calcupension.calcular_archivo(entrada, salida, reglas)
+
+        with binario_calcupension.ArchivoBinario(salida) as archivo:
+            return tuple(array(columna.format, columna) for columna in archivo.resultados())
+
+
+def _ruta_almacen(filas: list, reglas) -> tuple:
+    with almacen_calcupension.AlmacenResultados() as almacen:
+        afiliados = [None] * len(filas)
+        # Se guarda antes la mitad, para que el lote combine resultados guardados y calculados.
+        mitad = len(filas) // 2
+        almacen.calcular_lote(afiliados[:mitad], filas[:mitad], reglas)
+        return almacen.calcular_lote(afiliados, filas, reglas)
+
+
+def _ruta_centavos(filas: list, reglas) -> tuple:
+    return centavos_calcupension.calcular_lote_centavos(*zip(*filas), reglas)
+
+
+RUTAS = {
+    "lote": (_ruta_lote, COMPARACION_EXACTA),
+    "lote_solicitudes": (_ruta_lote_solicitudes, COMPARACION_EXACTA),
+    "validar": (_ruta_validar, COMPARACION_CODIGOS),
+    "validar_lote": (_ruta_validar_lote, COMPARACION_CODIGOS),
+    "cache": (_ruta_cache, COMPARACION_EXACTA),
+    "paralelo": (_ruta_paralelo, COMPARACION_EXACTA),
+    "binario": (_ruta_binario, COMPARACION_EXACTA),
+    "almacen": (_ruta_almacen, COMPARACION_EXACTA),
+    "centavos": (_ruta_centavos, COMPARACION_CENTAVOS),
+}
+"""
+Ruta de cálculo -> (función(filas, reglas) -> (tasas, mesadas, codigos), comparación).
+
+Las rutas de solo validación retornan tasas y mesadas None.
+"""
+
+
+def _igual(esperado: float, obtenido: float) -> bool:
+    """
+    Igualdad exacta en la que NaN es igual a NaN.
+    """
+    return esperado == obtenido or (esperado != esperado and obtenido != obtenido)
+
+
+def _coincide(comparacion: str, fila: tuple, esperado: tuple, obtenido: tuple) -> bool:
+    tasa, mesada, codigo = esperado
+    tasa_obtenida, mesada_obtenida, codigo_obtenido = obtenido
+
+    if comparacion == COMPARACION_CENTAVOS and codigo == 0 and not math.isfinite(fila[1]):
+        # El punto fijo no representa un IBL no finito: debe rechazar la fila como IBL inválido.
+        return codigo_obtenido == logica_calcupension.CODIGO_ERROR_IBL
+    if codigo != codigo_obtenido:
+        return False
+    if codigo or comparacion == COMPARACION_CODIGOS:
+        return True
+    if comparacion == COMPARACION_EXACTA:
+        return _igual(tasa, tasa_obtenida) and _igual(mesada, mesada_obtenida)
+
+    # Punto fijo: la tasa se redondea a la millonésima (más el redondeo del
+    # IBL al centavo) y la mesada al centavo, calculada con la tasa redondeada.
+    ibl = fila[1]
+    tolerancia_tasa = 0.5e-6 + 1e-9 + 1e-12 * abs(tasa)
+    tolerancia_mesada = 0.5e-8 * abs(ibl) + 0.01 + 1e-12 * abs(mesada)
+    return (
+        abs(tasa_obtenida / centavos_calcupension.ESCALA_TASA - tasa) <= tolerancia_tasa
+        and abs(mesada_obtenida / 100 - mesada) <= tolerancia_mesada
+    )
+
+
+def _resultado_fila(resultados: tuple, i: int) -> tuple:
+    tasas, mesadas, codigos = resultados
+    return (
+        _NAN if tasas is None else tasas[i],
+        _NAN if mesadas is None else mesadas[i],
+        codigos[i],
+    )
+
+
+def fronteras(reglas: reglas_calcupension.ReglasPension) -> dict:
+    """
+    Valores de frontera de semanas, edad y PCL para unas reglas.
+    """
+    semanas = {0, 1, reglas.semanas_minimas_vejez - 1, reglas.semanas_minimas_vejez, reglas.semanas_minimas_vejez + 1}
+    pcl = {0.0, 100.0}
+    for parametros in reglas.definicion["tipos"].values():
+        umbral = parametros["semanas_umbral"]
+        paso = parametros["semanas_paso"]
+        for pasos in range(0, 41):
+            for delta in (-1, 0, 1):
+                semanas.add(umbral + pasos * paso + delta)
+        for banda in parametros["bandas_pcl"]:
+            if banda["pcl_hasta"] is not None:
+                limite = float(banda["pcl_hasta"])
+                pcl.update((limite, math.nextafter(limite, -math.inf), math.nextafter(limite, math.inf)))
+
+    minima = float(reglas.pcl_minima_invalidez)
+    pcl.update((minima, math.nextafter(minima, -math.inf), math.nextafter(minima, math.inf)))
+
+    edades = {0, 18, 100}
+    for edad in reglas.edades_minimas.values():
+        edades.update((edad - 1, edad, edad + 1))
+
+    return {
+        "semanas": sorted(semana for semana in semanas if semana >= 0),
+        "edades": sorted(edades),
+        "pcl": sorted(pcl),
+    }
+
+
+def fronteras_ibl(
+    tipo: str,
+    semanas: int,
+    pcl: float,
+    reglas: reglas_calcupension.ReglasPension
+) -> list:
+    """
+    IBL en los que la tasa llega al tope o al piso y la mesada al SMMLV.
+    """
+    base, incremento, pendiente, umbral, paso, tope, piso = barrido_calcupension.parametros_tipo(tipo, pcl, reglas)
+    smmlv = reglas.smmlv
+    tasa_sin_ibl = base + (max(semanas - umbral, 0) / paso) * incremento
+    candidatos = [smmlv, 1.0]
+
+    for limite in (tope, piso):
+        if math.isfinite(limite):
+            candidatos.append(100 * smmlv / limite)
+            if pendiente:
+                candidatos.append((tasa_sin_ibl - limite) * smmlv / pendiente)
+
+    if pendiente:
+        # (tasa_sin_ibl - k * ibl) * ibl = 100 * smmlv, con k = pendiente / smmlv.
+        k = pendiente / smmlv
+        discriminante = tasa_sin_ibl ** 2 - 400 * k * smmlv
+        if discriminante >= 0:
+            candidatos.append((tasa_sin_ibl - math.sqrt(discriminante)) / (2 * k))
+    elif tasa_sin_ibl > 0:
+        candidatos.append(100 * smmlv / tasa_sin_ibl)
+
+    valores = []
+    for candidato in candidatos:
+        if candidato > 0 and math.isfinite(candidato):
+            valores.extend((
+                candidato,
+                math.nextafter(candidato, -math.inf),
+                math.nextafter(candidato, math.inf),
+                round(candidato),
+                round(candidato, 2),
+            ))
+    return valores
+
+
+def generar_casos(generador: random.Random, cantidad: int, reglas: reglas_calcupension.ReglasPension):
+    """
+    Genera `cantidad` filas en el orden de SolicitudPension.
+
+    Cada valor se toma de las fronteras con probabilidad PROPORCION_FRONTERA
+    y si no, al azar en un rango amplio (incluyendo valores negativos o
+    cero, IBL y PCL no finitos y vejez sin edad con baja probabilidad).
+    """
+    limites = fronteras(reglas)
+    semanas_frontera = limites["semanas"]
+    edades_frontera = limites["edades"]
+    pcl_frontera = limites["pcl"]
+    tipos = logica_calcupension.TIPOS_PENSION
+    generos = logica_calcupension.GENEROS + (None,)
+    aleatorio = generador.random
+    smmlv = reglas.smmlv
+    tablas = reglas.tablas
+    ibl_frontera = {}
+
+    for _ in range(cantidad):
+        tipo = generador.choice(tipos)
+        genero = generador.choice(generos)
+
+        if aleatorio() < PROPORCION_FRONTERA:
+            semanas = generador.choice(semanas_frontera)
+        else:
+            semanas = generador.randint(-5, 4000) if aleatorio() < 0.01 else generador.randint(0, 4000)
+
+        sorteo = aleatorio()
+        if sorteo < PROPORCION_FRONTERA:
+            pcl = generador.choice(pcl_frontera)
+        elif sorteo < PROPORCION_FRONTERA + 0.01:
+            pcl = generador.choice(NO_FINITOS)
+        else:
+            pcl = generador.uniform(0, 100)
+
+        if aleatorio() < (0.3 if tipo != "Vejez" else 0.02):
+            edad = None
+        elif aleatorio() < PROPORCION_FRONTERA:
+            edad = generador.choice(edades_frontera)
+        else:
+            edad = generador.randint(-1, 100) if aleatorio() < 0.01 else generador.randint(18, 100)
+
+        sorteo = aleatorio()
+        if sorteo < 0.5:
+            clave = (tipo, semanas, tablas[tipo].indice_banda(pcl))
+            valores = ibl_frontera.get(clave)
+            if valores is None:
+                valores = ibl_frontera[clave] = fronteras_ibl(tipo, semanas, pcl, reglas)
+            ibl = generador.choice(valores)
+        elif sorteo < 0.52:
+            ibl = generador.choice((0.0, -1.0, 1e-3, -smmlv) + NO_FINITOS)
+        else:
+            ibl = smmlv * math.exp(generador.uniform(-3, 4))
+            if aleatorio() < 0.5:
+                ibl = round(ibl, generador.choice((0, 2)))
+
+        yield (tipo, ibl, semanas, genero, edad, pcl)
+
+
+class Discrepancia:
+    """
+    Una fila en la que una ruta no coincide con el oráculo.
+
+    Atributos:
+    ----------
+    ruta : str
+    fila : tuple
+        Fila original.
+    reducida : tuple
+        Fila más simple encontrada que sigue fallando.
+    esperado, obtenido : tuple
+        (tasa, mesada, codigo) del oráculo y de la ruta para la fila reducida.
+    """
+
+    def __init__(self, ruta: str, fila: tuple, reducida: tuple, esperado: tuple, obtenido: tuple):
+        self.ruta = ruta
+        self.fila = fila
+        self.reducida = reducida
+        self.esperado = esperado
+        self.obtenido = obtenido
+
+    def __repr__(self) -> str:
+        return (
+            f"Discrepancia({self.ruta}: {self.reducida!r}, esperado={self.esperado!r}, "
+            f"obtenido={self.obtenido!r})"
+        )
+
+
+class ResultadoDiferencial:
+    """
+    Resultado de una ejecución.
+
+    Atributos:
+    ----------
+    casos : int
+    semilla : int
+    rutas : tuple[str, ...]
+    fallas : dict[str, int]
+        Filas que no coinciden, por ruta.
+    discrepancias : dict[str, list[Discrepancia]]
+        Las primeras discrepancias de cada ruta, reducidas.
+    segundos : float
+    """
+
+    def __init__(self, casos: int, semilla: int, rutas: tuple):
+        self.casos = casos
+        self.semilla = semilla
+        self.rutas = rutas
+        self.fallas = {ruta: 0 for ruta in rutas}
+        self.discrepancias = {ruta: [] for ruta in rutas}
+        self.segundos = 0.0
+
+    @property
+    def exitoso(self) -> bool:
+        return not any(self.fallas.values())
+
+    def como_texto(self) -> str:
+        lineas = [
+            f"{self.casos:,} casos (semilla {self.semilla}) en {self.segundos:.1f} s; "
+            f"rutas: {', '.join(self.rutas)}"
+        ]
+        for ruta in self.rutas:
+            if not self.fallas[ruta]:
+                continue
+            lineas.append(f"{ruta}: {self.fallas[ruta]:,} filas no coinciden")
+            for discrepancia in self.discrepancias[ruta]:
+                lineas.append(
+                    f"  {discrepancia.reducida!r}: esperado {discrepancia.esperado!r}, "
+                    f"obtenido {discrepancia.obtenido!r}"
+                )
+        if self.exitoso:
+            lineas.append("Todas las rutas coinciden con el oráculo.")
+        return "\n".join(lineas)
+
+
+def _simplificaciones(indice: int, valor) -> list:
+    """
+    Valores más simples que `valor` para el campo `indice` de la fila, del más simple al menos simple.
+    """
+    if valor is None or isinstance(valor, str):
+        return []
+    if not math.isfinite(valor):
+        return [0]
+
+    candidatos = [0]
+    if indice == 1 or indice == 5:
+        for decimales in (-6, -5, -4, -3, -2, -1, 0, 2):
+            candidatos.append(float(round(valor, decimales)))
+    else:
+        for cifras in (1000, 100, 10):
+            candidatos.append(valor - valor % cifras)
+        candidatos.append(valor // 2)
+        candidatos.append(valor - 1 if valor > 0 else valor + 1)
+
+    return [candidato for candidato in dict.fromkeys(candidatos) if candidato != valor]
+
+
+def reducir(
+    fila: tuple,
+    falla,
+    maximo_intentos: int = 200
+) -> tuple:
+    """
+    Busca una fila más simple para la que `falla(fila)` sigue siendo True.
+
+    Prueba, campo por campo, valores más simples (cero, redondeos, mitades)
+    y acepta el primero que sigue fallando, hasta que ningún cambio falle o
+    se agoten los intentos.
+    """
+    fila = tuple(fila)
+    intentos = 0
+    cambio = True
+
+    while cambio and intentos < maximo_intentos:
+        cambio = False
+        for indice, valor in enumerate(fila):
+            for candidato in _simplificaciones(indice, valor):
+                intentos += 1
+                propuesta = fila[:indice] + (candidato,) + fila[indice + 1:]
+                if falla(propuesta):
+                    fila = propuesta
+                    cambio = True
+                    break
+                if intentos >= maximo_intentos:
+                    return fila
+    return fila
+
+
+def comparar_fragmento(
+    filas: list,
+    rutas: tuple,
+    reglas: reglas_calcupension.ReglasPension
+) -> dict:
+    """
+    Compara un fragmento en todas las rutas.
+
+    Retorna:
+    --------
+    dict:
+        ruta -> lista de (indice, esperado, obtenido) de las filas que no coinciden.
+    """
+    esperados = [oraculo(fila, reglas) for fila in filas]
+    codigos_esperados = [codigo for _, _, codigo in esperados]
+    validas = [i for i, codigo in enumerate(codigos_esperados) if codigo == 0]
+    tasas_esperadas = [esperados[i][0] for i in validas]
+    mesadas_esperadas = [esperados[i][1] for i in validas]
+    fallas = {}
+
+    for ruta in rutas:
+        funcion, comparacion = RUTAS[ruta]
+        try:
+            resultados = funcion(filas, reglas)
+        except Exception:
+            # La ruta no acepta alguna fila: se calcula fila por fila para ubicarla.
+            resultados = tuple(zip(*(_calcular_ruta_fila(ruta, fila, reglas) for fila in filas)))
+        tasas, mesadas, codigos = resultados
+
+        # Camino rápido: si todo coincide, se compara por listas completas (NaN
+        # nunca es igual a NaN, así que esas filas pasan a la comparación por fila).
+        if list(codigos) == codigos_esperados and (
+            comparacion == COMPARACION_CODIGOS
+            or comparacion == COMPARACION_EXACTA
+            and [tasas[i] for i in validas] == tasas_esperadas
+            and [mesadas[i] for i in validas] == mesadas_esperadas
+        ):
+            fallas[ruta] = []
+            continue
+
+        fallas[ruta] = [
+            (i, esperado, _resultado_fila(resultados, i))
+            for i, (fila, esperado) in enumerate(zip(filas, esperados))
+            if not _coincide(comparacion, fila, esperado, _resultado_fila(resultados, i))
+        ]
+
+    return fallas
+
+
+def _comparar_semilla(
+    fragmento: range,
+    semilla: int,
+    rutas: tuple,
+    maximo_discrepancias: int,
+    reglas: reglas_calcupension.ReglasPension
+) -> tuple:
+    """
+    Genera y compara un fragmento; se puede ejecutar en otro proceso.
+
+    El generador del fragmento depende solo de la semilla y de la posición
+    del fragmento, así los casos no dependen del número de procesos.
+
+    Retorna:
+    --------
+    tuple[dict, dict]:
+        (ruta -> filas que no coinciden, ruta -> primeras discrepancias reducidas)
+    """
+    generador = random.Random(f"{semilla}:{fragmento.start}")
+    filas = list(generar_casos(generador, len(fragmento), reglas))
+
+    fallas = {}
+    discrepancias = {}
+    for ruta, fallas_ruta in comparar_fragmento(filas, rutas, reglas).items():
+        fallas[ruta] = len(fallas_ruta)
+        discrepancias[ruta] = [
+            _discrepancia(ruta, filas[i], reglas) for i, _, _ in fallas_ruta[:maximo_discrepancias]
+        ]
+    return fallas, discrepancias
+
+
+def ejecutar(
+    casos: int = CASOS,
+    semilla: int = 0,
+    rutas: tuple | None = None,
+    tamano_fragmento: int = TAMANO_FRAGMENTO,
+    maximo_discrepancias: int = MAXIMO_DISCREPANCIAS,
+    procesos: int | None = 1,
+    reglas: reglas_calcupension.ReglasPension | None = None
+) -> ResultadoDiferencial:
+    """
+    Genera `casos` solicitudes y compara cada ruta con el oráculo.
+
+    Parámetros:
+    -----------
+    casos : int
+    semilla : int
+        Semilla de los generadores; con la misma semilla y el mismo tamaño
+        de fragmento se generan los mismos casos.
+    rutas : tuple[str, ...] | None
+        Rutas de RUTAS a comparar. Por defecto, todas.
+    tamano_fragmento : int
+        Filas que cada ruta calcula a la vez.
+    maximo_discrepancias : int
+        Discrepancias que se reducen y guardan por ruta.
+    procesos : int | None
+        Procesos entre los que se reparten los fragmentos. Con 1 (por
+        defecto) todo se hace en el proceso actual; None usa todos los núcleos.
+    reglas : ReglasPension | None
+        Versión de reglas a aplicar. Por defecto, las reglas vigentes.
+
+    Raises:
+    -------
+    ValueError:
+        Si alguna ruta no existe.
+    """
+    if reglas is None:
+        reglas = reglas_calcupension.REGLAS_VIGENTES
+    rutas = tuple(RUTAS) if rutas is None else tuple(rutas)
+    for ruta in rutas:
+        if ruta not in RUTAS:
+            raise ValueError(f"Ruta desconocida: {ruta}")
+
+    resultado = ResultadoDiferencial(casos, semilla, rutas)
+    inicio = time.perf_counter()
+    ejecutor = paralelo_calcupension.EjecutorParalelo(procesos)
+    funcion = partial(
+        _comparar_semilla,
+        semilla=semilla, rutas=rutas, maximo_discrepancias=maximo_discrepancias, reglas=reglas
+    )
+    fragmentos = (
+        range(desde, min(desde + tamano_fragmento, casos)) for desde in range(0, casos, tamano_fragmento)
+    )
+
+    for _, (fallas, discrepancias) in ejecutor.mapear(funcion, fragmentos):
+        for ruta in rutas:
+            resultado.fallas[ruta] += fallas[ruta]
+            guardadas = resultado.discrepancias[ruta]
+            guardadas.extend(discrepancias[ruta][:maximo_discrepancias - len(guardadas)])
+
+    resultado.segundos = time.perf_counter() - inicio
+    return resultado
+
+
+def _calcular_ruta_fila(ruta: str, fila: tuple, reglas: reglas_calcupension.ReglasPension) -> tuple:
+    """
+    Resultado de una ruta para una sola fila; una excepción se reporta por su nombre en el código.
+    """
+    try:
+        return _resultado_fila(RUTAS[ruta][0]([fila], reglas), 0)
+    except Exception as error:
+        return _NAN, _NAN, type(error).__name__
+
+
+def _discrepancia(ruta: str, fila: tuple, reglas: reglas_calcupension.ReglasPension) -> Discrepancia:
+    """
+    Reduce una fila que falla en `ruta` y arma su Discrepancia.
+    """
+    comparacion = RUTAS[ruta][1]
+
+    def falla(propuesta: tuple) -> bool:
+        try:
+            esperado = oraculo(propuesta, reglas)
+        except Exception:
+            # Si el oráculo no acepta la propuesta, no sirve como reducción.
+            return False
+        return not _coincide(comparacion, propuesta, esperado, _calcular_ruta_fila(ruta, propuesta, reglas))
+
+    reducida = reducir(fila, falla) if falla(fila) else fila
+    try:
+        esperado = oraculo(reducida, reglas)
+    except Exception as error:
+        esperado = (_NAN, _NAN, type(error).__name__)
+    return Discrepancia(ruta, fila, reducida, esperado, _calcular_ruta_fila(ruta, reducida, reglas))
+
+
+def main(argumentos: list | None = None) -> int:
+    """
+    Ejecuta las pruebas diferenciales desde la línea de comandos.
+
+    Retorna:
+    --------
+    int:
+        0 si todas las rutas coinciden, 1 si no.
+    """
+    parser = argparse.ArgumentParser(description="Pruebas diferenciales de las rutas de cálculo.")
+    parser.add_argument("--casos", type=int, default=CASOS, help="Solicitudes a generar.")
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla del generador.")
+    parser.add_argument("--rutas", nargs="+", choices=list(RUTAS), help="Rutas a comparar (por defecto, todas).")
+    parser.add_argument("--fragmento", type=int, default=TAMANO_FRAGMENTO, help="Filas por fragmento.")
+    parser.add_argument("--procesos", type=int, help="Procesos a usar (por defecto, todos los núcleos).")
+    parser.add_argument("--reglas", help="Versión de reglas (por defecto, las vigentes).")
+    opciones = parser.parse_args(argumentos)
+
+    resultado = ejecutar(
+        opciones.casos,
+        opciones.semilla,
+        opciones.rutas,
+        opciones.fragmento,
+        procesos=opciones.procesos,
+        reglas=reglas_calcupension.obtener_reglas(opciones.reglas),
+    )
+    print(resultado.como_texto())
+    return 0 if resultado.exitoso else 1
+
+
+if __name__ == "__main__":
+    """
+    Punto de entrada de la línea de comandos.
+    """
+    sys.exit(main())
@@ -0,0 +1,277 @@
+"""
+Recálculo incremental de un portafolio a partir de cambios.
+
+Mantiene una fotografía (snapshot) de los datos de entrada y de los
+resultados (tasa, mesada) por afiliado. Cada mes recibe solo los cambios
+(semanas nuevas, cambios de IBL, altas y bajas) y recalcula únicamente las
+filas afectadas, más las que dependen de un parámetro global que cambió
+(por ejemplo el SMMLV, que afecta la pendiente por IBL y la mesada mínima
+de vejez). Retorna las diferencias de mesada.
+"""
+
+import json
+import os
+
+from calcupension.model import logica_calcupension
+from calcupension.model import reglas_calcupension
+
+
+CAMPOS = (
+    "tipo",
+    "ingreso_base_liquidacion",
+    "semanas",
+    "genero",
+    "edad",
+    "porcentaje_perdida_capacidad_laboral",
+)
+
+CAMPO_BAJA = "baja"
+
+
+def tipos_afectados(anterior: dict, nueva: dict) -> set:
+    """
+    Tipos de pensión cuyo resultado puede cambiar entre dos definiciones de reglas.
+
+    Parámetros:
+    -----------
+    anterior, nueva : dict
+        Definiciones de reglas (formato de reglas_calcupension).
+
+    Retorna:
+    --------
+    set[str]
+    """
+    todos = set(anterior["tipos"]) | set(nueva["tipos"])
+    afectados = set()
+
+    for tipo in todos:
+        if anterior["tipos"].get(tipo) != nueva["tipos"].get(tipo):
+            afectados.add(tipo)
+
+    for clave in set(anterior) | set(nueva):
+        if clave in ("version", "tipos") or anterior.get(clave) == nueva.get(clave):
+            continue
+
+        if clave == "smmlv":
+            afectados.update(
+                tipo for tipo, parametros in nueva["tipos"].items()
+                if parametros["pendiente_ibl"] or parametros["mesada_minima_smmlv"]
+            )
+        elif clave in ("semanas_minimas_vejez", "edades_minimas"):
+            afectados.add("Vejez")
+        elif clave == "pcl_minima_invalidez":
+            afectados.add("Invalidez")
+        else:
+            return todos
+
+    return afectados
+
+
+def _igual(anterior, nuevo) -> bool:
+    """
+    Igualdad de resultados en la que NaN es igual a NaN (None solo es igual a None).
+    """
+    return anterior == nuevo or (anterior != anterior and nuevo != nuevo)
+
+
+class MotorIncremental:
+    """
+    Portafolio con resultados guardados que se recalcula por cambios.
+
+    Atributos:
+    ----------
+    afiliados : dict
+        id del afiliado -> [tipo, IBL, semanas, género, edad, PCL, tasa, mesada, código].
+        tasa y mesada son None cuando la solicitud es inválida.
+    reglas : ReglasPension
+        Reglas con las que se calcularon los resultados guardados.
+    """
+
+    def __init__(self, reglas: reglas_calcupension.ReglasPension | None = None):
+        self.afiliados = {}
+        self.reglas = reglas or reglas_calcupension.REGLAS_VIGENTES
+
+    def __len__(self) -> int:
+        return len(self.afiliados)
+
+    @staticmethod
+    def _calcular(filas: dict, reglas: reglas_calcupension.ReglasPension) -> list:
+        """
+        Recalcula las filas indicadas (id -> fila) y retorna las diferencias de resultado.
+
+        Los resultados se escriben en las filas solo después de calcular el
+        lote completo, así que un error no deja filas a medio actualizar.
+        """
+        if not filas:
+            return []
+
+        tasas, mesadas, codigos = logica_calcupension.CalculadoraPension.calcular_lote(
+            *(list(columna) for columna in zip(*(fila[:6] for fila in filas.values()))), reglas
+        )
+
+        diferencias = []
+        for i, (identificador, fila) in enumerate(filas.items()):
+            codigo = codigos[i]
+            valida = codigo == logica_calcupension.CODIGO_OK
+            tasa = tasas[i] if valida else None
+            mesada = mesadas[i] if valida else None
+
+            if not (_igual(fila[6], tasa) and _igual(fila[7], mesada) and fila[8] == codigo):
+                diferencias.append({
+                    "id": identificador,
+                    "tasa_anterior": fila[6],
+                    "tasa_nueva": tasa,
+                    "mesada_anterior": fila[7],
+                    "mesada_nueva": mesada,
+                    "codigo": codigo,
+                })
+            fila[6:9] = [tasa, mesada, codigo]
+
+        return diferencias
+
+    def cargar_inicial(self, registros) -> list:
+        """
+        Carga y calcula el portafolio completo.
+
+        Parámetros:
+        -----------
+        registros : iterable[tuple]
+            (id, tipo, IBL, semanas, género, edad, PCL) por afiliado.
+
+        Retorna:
+        --------
+        list[dict]:
+            Diferencias (todas las filas nuevas aparecen con valores anteriores None).
+        """
+        filas = {}
+        for identificador, *datos in registros:
+            filas[identificador] = list(datos) + [None, None, None]
+        diferencias = self._calcular(filas, self.reglas)
+        self.afiliados.update(filas)
+        return diferencias
+
+    def aplicar_cambios(self, cambios, reglas: reglas_calcupension.ReglasPension | None = None) -> list:
+        """
+        Aplica un lote de cambios y recalcula solo lo necesario.
+
+        Parámetros:
+        -----------
+        cambios : iterable[dict]
+            Cada cambio tiene "id" y los campos modificados (nombres de
+            CAMPOS). Un id nuevo debe traer todos los campos (alta). Con
+            {"id": ..., "baja": True} el afiliado se elimina.
+        reglas : ReglasPension | None
+            Reglas a aplicar desde ahora. Si difieren de las guardadas, se
+            recalculan también todas las filas de los tipos afectados.
+
+        Retorna:
+        --------
+        list[dict]:
+            Una entrada por afiliado cuyo resultado cambió, con "id",
+            "tasa_anterior", "tasa_nueva", "mesada_anterior",
+            "mesada_nueva" y "codigo". Las bajas aparecen con valores
+            nuevos None.
+
+        Raises:
+        -------
+        ValueError:
+            Si un cambio no trae "id", trae un campo desconocido o es un
+            alta incompleta.
+            Los cambios se aplican todos o ninguno: ante un error (de
+            validación o de cálculo) el portafolio queda como estaba.
+        """
+        reglas = reglas or self.reglas
+
+        # Se preparan todos los cambios sobre copias de las filas (None para las bajas);
+        # el portafolio solo se modifica cuando el lote completo se validó y calculó.
+        preparadas = {}
+        for cambio in cambios:
+            cambio = dict(cambio)
+            if "id" not in cambio:
+                raise ValueError(f"El cambio no indica el id del afiliado: {cambio}")
+            identificador = cambio.pop("id")
+
+            if cambio.pop(CAMPO_BAJA, False):
+                preparadas[identificador] = None
+                continue
+
+            desconocidos = set(cambio) - set(CAMPOS)
+            if desconocidos:
+                raise ValueError(f"Campos desconocidos en el cambio de {identificador}: {sorted(desconocidos)}")
+
+            if identificador in preparadas:
+                fila = preparadas[identificador]
+            else:
+                fila = self.afiliados.get(identificador)
+                fila = None if fila is None else list(fila)
+            if fila is None:
+                if set(cambio) != set(CAMPOS):
+                    raise ValueError(f"El alta de {identificador} debe incluir todos los campos.")
+                fila = [None] * 9
+
+            for campo, valor in cambio.items():
+                fila[CAMPOS.index(campo)] = valor
+            preparadas[identificador] = fila
+
+        pendientes = {identificador: fila for identificador, fila in preparadas.items() if fila is not None}
+        if reglas is not self.reglas:
+            afectados = tipos_afectados(self.reglas.definicion, reglas.definicion)
+            for identificador, fila in self.afiliados.items():
+                if identificador not in preparadas and (fila[0] in afectados or fila[0] not in reglas.tasas):
+                    pendientes[identificador] = list(fila)
+
+        calculadas = self._calcular(pendientes, reglas)
+
+        diferencias = []
+        for identificador, fila in preparadas.items():
+            if fila is None:
+                anterior = self.afiliados.pop(identificador, None)
+                if anterior is not None:
+                    diferencias.append({
+                        "id": identificador,
+                        "tasa_anterior": anterior[6],
+                        "tasa_nueva": None,
+                        "mesada_anterior": anterior[7],
+                        "mesada_nueva": None,
+                        "codigo": None,
+                    })
+        self.afiliados.update(pendientes)
+        self.reglas = reglas
+
+        diferencias.extend(calculadas)
+        return diferencias
+
+    def guardar(self, ruta: str):
+        """
+        Guarda la fotografía en JSON Lines de forma atómica.
+
+        La primera línea contiene la definición de reglas; cada línea
+        siguiente, un afiliado.
+        """
+        temporal = ruta + ".tmp"
+        with open(temporal, "w", encoding="utf-8") as archivo:
+            archivo.write(json.dumps({"reglas": self.reglas.definicion}, ensure_ascii=False) + "\n")
+            for identificador, fila in self.afiliados.items():
+                archivo.write(json.dumps([identificador] + fila, ensure_ascii=False) + "\n")
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        os.replace(temporal, ruta)
+
+    @classmethod
+    def cargar(cls, ruta: str) -> "MotorIncremental":
+        """
+        Carga una fotografía guardada con guardar().
+        """
+        with open(ruta, encoding="utf-8") as archivo:
+            definicion = json.loads(archivo.readline())["reglas"]
+            vigente = reglas_calcupension.DEFINICIONES.get(str(definicion["version"]))
+            if vigente == definicion:
+                reglas = reglas_calcupension.obtener_reglas(str(definicion["version"]))
+            else:
+                reglas = reglas_calcupension.ReglasPension(definicion)
+
+            motor = cls(reglas)
+            for linea in archivo:
+                identificador, *fila = json.loads(linea)
+                motor.afiliados[identificador] = fila
+        return motor
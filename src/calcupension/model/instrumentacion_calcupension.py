@@ -0,0 +1,382 @@
+"""
+Instrumentación opcional de las etapas de cálculo de CalculadoraPension.
+
+Mientras está activa, reemplaza las funciones de CalculadoraPension
+(validaciones check_*, calcular_tasa_reemplazo, calcular_pension,
+calcular_lote, validar y validar_lote) por envolturas que miden cada
+llamada, y las restaura al desactivarse. Desactivada no agrega ningún
+costo: las funciones son las originales.
+
+Uso:
+----
+    with Instrumentacion() as instrumentacion:
+        with etapa("lectura"):
+            filas = leer(...)
+        calcular(filas)
+    instrumentacion.exportar("perfil.prom")
+
+Los tiempos son inclusivos: calcular_tasa_reemplazo incluye el tiempo de
+las validaciones check_* que ejecuta, que también se reportan aparte.
+Solo se mide el proceso actual (no los procesos de un EjecutorParalelo).
+"""
+
+import json
+import os
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+
+from calcupension.model import logica_calcupension
+
+
+ETAPAS = (
+    "check_tipo",
+    "check_valores",
+    "check_ibl",
+    "check_semanas",
+    "check_edad",
+    "check_pcl",
+    "calcular_tasa_reemplazo",
+    "calcular_pension",
+    "validar",
+    "calcular_lote",
+    "validar_lote",
+)
+"""
+Funciones de CalculadoraPension que se instrumentan.
+"""
+
+LIMITES_HISTOGRAMA = (
+    1e-6, 2.5e-6, 5e-6,
+    1e-5, 2.5e-5, 5e-5,
+    1e-4, 2.5e-4, 5e-4,
+    1e-3, 2.5e-3, 5e-3,
+    1e-2, 2.5e-2, 5e-2,
+    0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0,
+)
+"""
+Límites superiores (en segundos) de las cubetas de los histogramas.
+"""
+
+RESULTADO_OK = "ok"
+
+_NOMBRES_ERROR = {
+    codigo: error.__name__ for error, codigo in logica_calcupension.CODIGOS_ERROR.items()
+}
+
+_ACTIVA = None
+
+
+def _tipo_solicitud(argumentos: tuple) -> str:
+    return argumentos[0].tipo if argumentos else ""
+
+
+def _tipo_pension(argumentos: tuple) -> str:
+    return argumentos[2] if len(argumentos) > 2 else ""
+
+
+def _tipo_directo(argumentos: tuple) -> str:
+    return argumentos[0] if argumentos else ""
+
+
+def _sin_tipo(argumentos: tuple) -> str:
+    return ""
+
+
+_ETIQUETAS_TIPO = {
+    "check_tipo": _tipo_directo,
+    "calcular_tasa_reemplazo": _tipo_solicitud,
+    "calcular_pension": _tipo_pension,
+    "validar": _tipo_solicitud,
+}
+
+
+class Histograma:
+    """
+    Histograma de duraciones con cubetas fijas (LIMITES_HISTOGRAMA).
+    """
+
+    __slots__ = ("cubetas", "cantidad", "suma", "maximo")
+
+    def __init__(self):
+        self.cubetas = [0] * (len(LIMITES_HISTOGRAMA) + 1)
+        self.cantidad = 0
+        self.suma = 0.0
+        self.maximo = 0.0
+
+    def registrar(self, segundos: float):
+        self.cubetas[bisect_left(LIMITES_HISTOGRAMA, segundos)] += 1
+        self.cantidad += 1
+        self.suma += segundos
+        if segundos > self.maximo:
+            self.maximo = segundos
+
+    def percentil(self, porcentaje: float) -> float:
+        """
+        Límite superior de la cubeta que contiene el percentil (máximo si es la última).
+        """
+        objetivo = porcentaje / 100 * self.cantidad
+        acumulado = 0
+        for limite, cantidad in zip(LIMITES_HISTOGRAMA, self.cubetas):
+            acumulado += cantidad
+            if acumulado >= objetivo and acumulado:
+                return min(limite, self.maximo)
+        return self.maximo
+
+    def como_dict(self) -> dict:
+        return {
+            "cantidad": self.cantidad,
+            "segundos": self.suma,
+            "maximo": self.maximo,
+            "cubetas": dict(zip(map(str, LIMITES_HISTOGRAMA + ("+Inf",)), self.cubetas)),
+        }
+
+
+class Instrumentacion:
+    """
+    Contadores e histogramas de tiempo por etapa, tipo de pensión y resultado.
+
+    Atributos:
+    ----------
+    histogramas : dict
+        (etapa, tipo, resultado) -> Histograma. resultado es RESULTADO_OK
+        o el nombre de la excepción lanzada.
+    filas : dict
+        etapa -> solicitudes procesadas (1 por llamada individual, el tamaño
+        del lote en calcular_lote y validar_lote).
+    fallos : dict
+        (etapa, error) -> solicitudes que no pasaron una validación.
+    """
+
+    def __init__(self):
+        self.histogramas = {}
+        self.filas = {}
+        self.fallos = {}
+        self.originales = None
+
+    def registrar(self, etapa: str, tipo: str, resultado: str, segundos: float, filas: int = 1):
+        """
+        Registra una llamada medida.
+        """
+        clave = (etapa, tipo, resultado)
+        histograma = self.histogramas.get(clave)
+        if histograma is None:
+            histograma = self.histogramas[clave] = Histograma()
+        histograma.registrar(segundos)
+        self.filas[etapa] = self.filas.get(etapa, 0) + filas
+
+    def contar_fallo(self, etapa: str, error: str, cantidad: int = 1):
+        if cantidad:
+            clave = (etapa, error)
+            self.fallos[clave] = self.fallos.get(clave, 0) + cantidad
+
+    def _contar_mascaras(self, etapa: str, mascaras):
+        """
+        Cuenta los errores de una máscara (validar) o de un array de máscaras o códigos.
+        """
+        if isinstance(mascaras, int):
+            mascaras = (mascaras,)
+        for codigo, nombre in _NOMBRES_ERROR.items():
+            self.contar_fallo(etapa, nombre, sum(1 for mascara in mascaras if mascara & codigo))
+
+    def _envolver(self, etapa: str, funcion):
+        """
+        Retorna una envoltura de `funcion` que mide cada llamada.
+        """
+        etiquetar = _ETIQUETAS_TIPO.get(etapa, _sin_tipo)
+        registrar = self.registrar
+        contar_fallo = self.contar_fallo
+        contar_mascaras = self._contar_mascaras
+        reloj = time.perf_counter
+
+        def envoltura(*argumentos, **opciones):
+            inicio = reloj()
+            try:
+                resultado = funcion(*argumentos, **opciones)
+            except Exception as error:
+                nombre = type(error).__name__
+                registrar(etapa, etiquetar(argumentos), nombre, reloj() - inicio)
+                contar_fallo(etapa, nombre)
+                raise
+
+            duracion = reloj() - inicio
+            if etapa == "calcular_lote":
+                registrar(etapa, "", RESULTADO_OK, duracion, len(resultado[2]))
+                contar_mascaras(etapa, resultado[2])
+            elif etapa == "validar_lote":
+                registrar(etapa, "", RESULTADO_OK, duracion, len(resultado))
+                contar_mascaras(etapa, resultado)
+            else:
+                registrar(etapa, etiquetar(argumentos), RESULTADO_OK, duracion)
+                if etapa == "validar":
+                    contar_mascaras(etapa, resultado)
+            return resultado
+
+        envoltura.__wrapped__ = funcion
+        envoltura.__doc__ = funcion.__doc__
+        envoltura.__name__ = funcion.__name__
+        return envoltura
+
+    def activar(self):
+        """
+        Reemplaza las funciones de CalculadoraPension por sus versiones medidas.
+
+        Raises:
+        -------
+        RuntimeError:
+            Si ya hay otra instrumentación activa.
+        """
+        global _ACTIVA
+        if _ACTIVA is not None:
+            raise RuntimeError("Ya hay una instrumentación activa.")
+
+        calculadora = logica_calcupension.CalculadoraPension
+        self.originales = {etapa: calculadora.__dict__[etapa] for etapa in ETAPAS}
+        for etapa, funcion in self.originales.items():
+            setattr(calculadora, etapa, self._envolver(etapa, funcion))
+        _ACTIVA = self
+
+    def desactivar(self):
+        """
+        Restaura las funciones originales de CalculadoraPension.
+        """
+        global _ACTIVA
+        if self.originales is None:
+            return
+
+        calculadora = logica_calcupension.CalculadoraPension
+        for etapa, funcion in self.originales.items():
+            setattr(calculadora, etapa, funcion)
+        self.originales = None
+        _ACTIVA = None
+
+    def __enter__(self) -> "Instrumentacion":
+        self.activar()
+        return self
+
+    def __exit__(self, tipo_excepcion, excepcion, traza):
+        self.desactivar()
+
+    @contextmanager
+    def etapa(self, nombre: str, tipo: str = "", filas: int = 1):
+        """
+        Mide un bloque de código propio (por ejemplo lectura o escritura de archivos).
+        """
+        inicio = time.perf_counter()
+        try:
+            yield
+        except Exception as error:
+            self.registrar(nombre, tipo, type(error).__name__, time.perf_counter() - inicio, filas)
+            raise
+        self.registrar(nombre, tipo, RESULTADO_OK, time.perf_counter() - inicio, filas)
+
+    def como_dict(self) -> dict:
+        """
+        Retorna todas las métricas como un diccionario serializable en JSON.
+        """
+        return {
+            "etapas": [
+                {"etapa": etapa, "tipo": tipo, "resultado": resultado, **histograma.como_dict()}
+                for (etapa, tipo, resultado), histograma in sorted(self.histogramas.items())
+            ],
+            "filas": dict(sorted(self.filas.items())),
+            "fallos": [
+                {"etapa": etapa, "error": error, "cantidad": cantidad}
+                for (etapa, error), cantidad in sorted(self.fallos.items())
+            ],
+        }
+
+    def como_texto(self) -> str:
+        """
+        Retorna un reporte en texto plano, ordenado por tiempo total.
+        """
+        lineas = [
+            f"{'etapa':<24} {'tipo':<14} {'resultado':<24} {'llamadas':>10} "
+            f"{'total ms':>11} {'prom. µs':>10} {'p50 µs':>9} {'p99 µs':>9}"
+        ]
+        ordenados = sorted(self.histogramas.items(), key=lambda item: -item[1].suma)
+        for (etapa, tipo, resultado), histograma in ordenados:
+            lineas.append(
+                f"{etapa:<24} {tipo or '-':<14} {resultado:<24} {histograma.cantidad:>10,} "
+                f"{histograma.suma * 1e3:>11.3f} {histograma.suma / histograma.cantidad * 1e6:>10.2f} "
+                f"{histograma.percentil(50) * 1e6:>9.2f} {histograma.percentil(99) * 1e6:>9.2f}"
+            )
+
+        if self.filas:
+            lineas.append("")
+            lineas.append("Solicitudes por etapa:")
+            lineas.extend(f"  {etapa:<24} {filas:>12,}" for etapa, filas in sorted(self.filas.items()))
+
+        if self.fallos:
+            lineas.append("")
+            lineas.append("Fallos de validación:")
+            lineas.extend(
+                f"  {etapa:<24} {error:<24} {cantidad:>12,}"
+                for (etapa, error), cantidad in sorted(self.fallos.items())
+            )
+
+        return "\n".join(lineas)
+
+    def como_prometheus(self) -> str:
+        """
+        Retorna las métricas en el formato de texto de Prometheus.
+        """
+        lineas = [
+            "# HELP calcupension_duracion_segundos Duración de cada llamada por etapa.",
+            "# TYPE calcupension_duracion_segundos histogram",
+        ]
+        for (etapa, tipo, resultado), histograma in sorted(self.histogramas.items()):
+            etiquetas = f'etapa="{etapa}",tipo="{tipo}",resultado="{resultado}"'
+            acumulado = 0
+            for limite, cantidad in zip(LIMITES_HISTOGRAMA + ("+Inf",), histograma.cubetas):
+                acumulado += cantidad
+                lineas.append(f'calcupension_duracion_segundos_bucket{{{etiquetas},le="{limite}"}} {acumulado}')
+            lineas.append(f"calcupension_duracion_segundos_sum{{{etiquetas}}} {histograma.suma!r}")
+            lineas.append(f"calcupension_duracion_segundos_count{{{etiquetas}}} {histograma.cantidad}")
+
+        lineas.append("# HELP calcupension_solicitudes_total Solicitudes procesadas por etapa.")
+        lineas.append("# TYPE calcupension_solicitudes_total counter")
+        for etapa, filas in sorted(self.filas.items()):
+            lineas.append(f'calcupension_solicitudes_total{{etapa="{etapa}"}} {filas}')
+
+        lineas.append("# HELP calcupension_fallos_total Solicitudes que no pasaron una validación.")
+        lineas.append("# TYPE calcupension_fallos_total counter")
+        for (etapa, error), cantidad in sorted(self.fallos.items()):
+            lineas.append(f'calcupension_fallos_total{{etapa="{etapa}",error="{error}"}} {cantidad}')
+
+        return "\n".join(lineas) + "\n"
+
+    def exportar(self, ruta: str):
+        """
+        Escribe el reporte de forma atómica según la extensión del archivo.
+
+        .json: como_dict en JSON; .prom: formato de Prometheus; otra: texto plano.
+        """
+        if ruta.lower().endswith(".json"):
+            contenido = json.dumps(self.como_dict(), ensure_ascii=False, indent=2)
+        elif ruta.lower().endswith(".prom"):
+            contenido = self.como_prometheus()
+        else:
+            contenido = self.como_texto() + "\n"
+
+        temporal = ruta + ".tmp"
+        with open(temporal, "w", encoding="utf-8") as archivo:
+            archivo.write(contenido)
+        os.replace(temporal, ruta)
+
+
+def activa() -> Instrumentacion | None:
+    """
+    Retorna la instrumentación activa, o None.
+    """
+    return _ACTIVA
+
+
+def etapa(nombre: str, tipo: str = "", filas: int = 1):
+    """
+    Mide un bloque con la instrumentación activa; sin instrumentación no hace nada.
+    """
+    if _ACTIVA is None:
+        return nullcontext()
+    return _ACTIVA.etapa(nombre, tipo, filas)
@@ -0,0 +1,472 @@
+"""
+Cálculo inverso: semanas, IBL o PCL mínimos para alcanzar una tasa o mesada.
+
+La tasa de reemplazo es lineal por tramos en cada variable (umbral de
+semanas con incremento por paso, pendiente por IBL, bandas de PCL, tope
+y piso) y la mesada tiene como mínimo el SMMLV en vejez. Cada función
+resuelve el tramo en forma cerrada y luego confirma el resultado con la
+misma función de tasa que usa CalculadoraPension, de modo que el valor
+retornado siempre alcanza el objetivo y el anterior no.
+"""
+
+import math
+
+from calcupension.model import logica_calcupension
+from calcupension.model import reglas_calcupension
+from calcupension.model.barrido_calcupension import parametros_tipo
+
+
+MOTIVO_TOPE = "tope"
+"""
+El objetivo supera la tasa máxima (tope) del tipo de pensión.
+"""
+
+MOTIVO_MAXIMO = "maximo"
+"""
+El objetivo está bajo el tope, pero la variable no puede llevar la tasa o la mesada hasta él.
+"""
+
+VARIABLES = ("semanas", "ingreso_base_liquidacion", "porcentaje_perdida_capacidad_laboral")
+
+_CODIGO_VARIABLE = {
+    "semanas": logica_calcupension.CODIGO_ERROR_SEMANAS,
+    "ingreso_base_liquidacion": logica_calcupension.CODIGO_ERROR_IBL,
+    "porcentaje_perdida_capacidad_laboral": logica_calcupension.CODIGO_ERROR_PCL,
+}
+"""
+Código de la validación que depende solo de la variable que se busca (se ignora).
+"""
+
+_VALOR_NEUTRO = {
+    "semanas": 0,
+    "ingreso_base_liquidacion": 1.0,
+    "porcentaje_perdida_capacidad_laboral": math.inf,
+}
+"""
+Valor que reemplaza al de la variable que se busca al validar el resto de la solicitud.
+"""
+
+_COLUMNA_VARIABLE = {"ingreso_base_liquidacion": 1, "semanas": 2, "porcentaje_perdida_capacidad_laboral": 5}
+
+_ERRORES_POR_CODIGO = {codigo: error for error, codigo in logica_calcupension.CODIGOS_ERROR.items()}
+
+_MAXIMO_AJUSTES = 64
+
+
+class ResultadoInverso:
+    """
+    Resultado de un cálculo inverso.
+
+    Atributos:
+    ----------
+    valor : int | float | None
+        Valor mínimo de la variable, o None si el objetivo no se alcanza.
+    estricto : bool
+        True si se necesita un valor estrictamente mayor que `valor`
+        (por ejemplo PCL mayor que 50).
+    motivo : str | None
+        MOTIVO_TOPE, MOTIVO_MAXIMO o el nombre de la validación que falla
+        (solo en resolver_lote) cuando el objetivo no se alcanza.
+    """
+
+    __slots__ = ("valor", "estricto", "motivo")
+
+    def __init__(self, valor=None, estricto: bool = False, motivo: str | None = None):
+        self.valor = valor
+        self.estricto = estricto
+        self.motivo = motivo
+
+    @property
+    def alcanzable(self) -> bool:
+        return self.valor is not None
+
+    def __eq__(self, otro) -> bool:
+        if not isinstance(otro, ResultadoInverso):
+            return NotImplemented
+        return (self.valor, self.estricto, self.motivo) == (otro.valor, otro.estricto, otro.motivo)
+
+    def __repr__(self) -> str:
+        return f"ResultadoInverso(valor={self.valor!r}, estricto={self.estricto!r}, motivo={self.motivo!r})"
+
+
+def _validar(
+    variable: str,
+    tipo: str,
+    ingreso_base_liquidacion: float,
+    semanas: int,
+    genero: str | None,
+    edad: int | None,
+    porcentaje_perdida_capacidad_laboral: float,
+    reglas: reglas_calcupension.ReglasPension
+):
+    """
+    Aplica las validaciones de CalculadoraPension, en el mismo orden, salvo
+    la de `variable`. Sin edad no se valida la edad (en vejez).
+    """
+    calculadora = logica_calcupension.CalculadoraPension
+    datos = dict(
+        tipo=tipo,
+        ingreso_base_liquidacion=ingreso_base_liquidacion,
+        semanas=semanas,
+        genero=genero,
+        edad=edad,
+        porcentaje_perdida_capacidad_laboral=porcentaje_perdida_capacidad_laboral,
+    )
+    datos[variable] = _VALOR_NEUTRO[variable]
+    solicitud = logica_calcupension.SolicitudPension(**datos)
+
+    calculadora.check_tipo(solicitud.tipo)
+    calculadora.check_valores(solicitud)
+    if variable != "ingreso_base_liquidacion":
+        calculadora.check_ibl(solicitud.ingreso_base_liquidacion)
+
+    if solicitud.tipo == "Vejez":
+        if variable != "semanas":
+            calculadora.check_semanas(solicitud.semanas, reglas)
+        if edad is not None:
+            calculadora.check_edad(solicitud.genero, solicitud.edad, reglas)
+
+    if solicitud.tipo == "Invalidez" and variable != "porcentaje_perdida_capacidad_laboral":
+        calculadora.check_pcl(solicitud.porcentaje_perdida_capacidad_laboral, reglas)
+
+
+def _criterio_tasa(tipo: str, tasa_objetivo, mesada_objetivo, reglas: reglas_calcupension.ReglasPension):
+    """
+    Retorna alcanza(tasa, ibl) -> bool: si una tasa ya calculada cumple el objetivo indicado.
+    """
+    if (tasa_objetivo is None) == (mesada_objetivo is None):
+        raise ValueError("Indique exactamente uno de tasa_objetivo o mesada_objetivo.")
+
+    if tasa_objetivo is not None:
+        return lambda tasa, ibl: tasa >= tasa_objetivo
+
+    mesada_minima = reglas.mesadas_minimas.get(tipo)
+    if mesada_minima is not None and mesada_minima >= mesada_objetivo:
+        return lambda tasa, ibl: True
+    return lambda tasa, ibl: (tasa / 100) * ibl >= mesada_objetivo
+
+
+def _criterio(tipo: str, tasa_objetivo, mesada_objetivo, reglas: reglas_calcupension.ReglasPension):
+    """
+    Retorna cumple(ibl, semanas, pcl) -> bool para el objetivo indicado.
+    """
+    alcanza = _criterio_tasa(tipo, tasa_objetivo, mesada_objetivo, reglas)
+    tasa = reglas.tasas[tipo]
+    return lambda ibl, semanas, pcl: alcanza(tasa(ibl, semanas, pcl), ibl)
+
+
+def _tasa_objetivo(ingreso_base_liquidacion: float, tasa_objetivo, mesada_objetivo) -> float:
+    """
+    Tasa necesaria para el objetivo (la mesada se convierte con el IBL).
+    """
+    if tasa_objetivo is not None:
+        return tasa_objetivo
+    return mesada_objetivo * 100 / ingreso_base_liquidacion
+
+
+def semanas_minimas(
+    tipo: str,
+    ingreso_base_liquidacion: float,
+    tasa_objetivo: float | None = None,
+    mesada_objetivo: float | None = None,
+    porcentaje_perdida_capacidad_laboral: float = 0,
+    reglas: reglas_calcupension.ReglasPension | None = None,
+    genero: str | None = None,
+    edad: int | None = None
+) -> ResultadoInverso:
+    """
+    Semanas mínimas para alcanzar una tasa o una mesada.
+
+    Parámetros:
+    -----------
+    tipo : str
+    ingreso_base_liquidacion : float
+    tasa_objetivo, mesada_objetivo : float | None
+        Se debe indicar exactamente uno.
+    porcentaje_perdida_capacidad_laboral : float
+    reglas : ReglasPension | None
+        Versión de reglas a aplicar. Por defecto, las reglas vigentes.
+    genero, edad : str | None, int | None
+        Si se indica la edad, en vejez también se valida la edad mínima.
+
+    Retorna:
+    --------
+    ResultadoInverso:
+        valor es un número entero de semanas, nunca menor que las semanas
+        mínimas de vejez (en vejez) ni que 0.
+
+    Raises:
+    -------
+    ErrorTipoPension, ErrorValoresNegativos, ErrorIBL, ErrorEdadMinimaHombres,
+    ErrorEdadMinimaMujeres, ErrorPCLInvalidez:
+        Si la solicitud no cumple una validación distinta de las semanas.
+    ValueError:
+        Si no se indica exactamente un objetivo.
+    """
+    if reglas is None:
+        reglas = reglas_calcupension.REGLAS_VIGENTES
+
+    _validar(
+        "semanas", tipo, ingreso_base_liquidacion, None, genero, edad,
+        porcentaje_perdida_capacidad_laboral, reglas
+    )
+
+    ibl = ingreso_base_liquidacion
+    pcl = porcentaje_perdida_capacidad_laboral
+    alcanza = _criterio_tasa(tipo, tasa_objetivo, mesada_objetivo, reglas)
+    tasa = reglas.tasas[tipo]
+    minimo = reglas.semanas_minimas_vejez if tipo == "Vejez" else 0
+
+    if alcanza(tasa(ibl, minimo, pcl), ibl):
+        return ResultadoInverso(minimo)
+
+    base, incremento, pendiente, umbral, paso, tope, piso = parametros_tipo(tipo, pcl, reglas)
+
+    # Se decide con el mismo criterio que el resultado: la tasa nunca supera el tope.
+    if not alcanza(tope, ibl):
+        return ResultadoInverso(motivo=MOTIVO_TOPE)
+    if incremento <= 0:
+        return ResultadoInverso(motivo=MOTIVO_MAXIMO)
+
+    # tasa(s) = tasa_sin_semanas + (s - umbral) / paso * incremento para s > umbral
+    tasa_sin_semanas = base - (ibl / reglas.smmlv) * pendiente if pendiente else base
+    objetivo = _tasa_objetivo(ibl, tasa_objetivo, mesada_objetivo)
+    semanas = max(minimo, umbral + math.ceil((objetivo - tasa_sin_semanas) / incremento * paso))
+
+    # Con tope, la búsqueda termina a más tardar en la semana en que la tasa lo alcanza,
+    # donde el objetivo se cumple.
+    if tope < math.inf:
+        semanas_tope = max(minimo, umbral + math.ceil((tope - tasa_sin_semanas) / incremento * paso))
+        while tasa(ibl, semanas_tope, pcl) < tope:
+            semanas_tope += 1
+        semanas = min(semanas, semanas_tope)
+    else:
+        semanas_tope = math.inf
+
+    # Corrige el redondeo de punto flotante con la función de tasa real.
+    while semanas < semanas_tope and not alcanza(tasa(ibl, semanas, pcl), ibl):
+        semanas += 1
+    while semanas > minimo and alcanza(tasa(ibl, semanas - 1, pcl), ibl):
+        semanas -= 1
+
+    return ResultadoInverso(semanas)
+
+
+def ibl_minimo(
+    tipo: str,
+    semanas: int,
+    mesada_objetivo: float,
+    porcentaje_perdida_capacidad_laboral: float = 0,
+    reglas: reglas_calcupension.ReglasPension | None = None,
+    genero: str | None = None,
+    edad: int | None = None
+) -> ResultadoInverso:
+    """
+    IBL mínimo para alcanzar una mesada.
+
+    Con pendiente por IBL (vejez) la mesada es tope × IBL hasta que la
+    tasa deja el tope, luego una parábola, y luego piso × IBL; se toma la
+    primera raíz en ese orden. La tasa nunca aumenta con el IBL, por lo que
+    solo se resuelve el objetivo de mesada.
+
+    Retorna:
+    --------
+    ResultadoInverso:
+        Si la mesada mínima (SMMLV) ya alcanza el objetivo, valor es 0.0 con
+        estricto=True (cualquier IBL positivo).
+
+    Raises:
+    -------
+    ErrorTipoPension, ErrorValoresNegativos, ErrorSemanasCotizadas,
+    ErrorEdadMinimaHombres, ErrorEdadMinimaMujeres, ErrorPCLInvalidez:
+        Si la solicitud no cumple una validación distinta del IBL (la edad
+        solo se valida si se indica).
+    """
+    if reglas is None:
+        reglas = reglas_calcupension.REGLAS_VIGENTES
+
+    _validar(
+        "ingreso_base_liquidacion", tipo, None, semanas, genero, edad,
+        porcentaje_perdida_capacidad_laboral, reglas
+    )
+
+    pcl = porcentaje_perdida_capacidad_laboral
+    cumple = _criterio(tipo, None, mesada_objetivo, reglas)
+    mesada_minima = reglas.mesadas_minimas.get(tipo)
+    if mesada_objetivo <= 0 or (mesada_minima is not None and mesada_minima >= mesada_objetivo):
+        return ResultadoInverso(0.0, estricto=True)
+
+    base, incremento, pendiente, umbral, paso, tope, piso = parametros_tipo(tipo, pcl, reglas)
+    tasa_sin_ibl = base + ((semanas - umbral) / paso * incremento if semanas > umbral else 0)
+
+    ibl = None
+    if not pendiente:
+        tasa = min(max(tasa_sin_ibl, piso), tope)
+        if tasa > 0:
+            ibl = mesada_objetivo * 100 / tasa
+    else:
+        # tasa(ibl) = tasa_sin_ibl - b * ibl, recortada a [piso, tope]
+        b = pendiente / reglas.smmlv
+        ibl_tope = max((tasa_sin_ibl - tope) / b, 0.0)
+        ibl_piso = (tasa_sin_ibl - piso) / b
+
+        if tope > 0 and mesada_objetivo * 100 / tope <= ibl_tope:
+            ibl = mesada_objetivo * 100 / tope
+        else:
+            discriminante = tasa_sin_ibl ** 2 - 400 * b * mesada_objetivo
+            if discriminante >= 0:
+                raiz = (tasa_sin_ibl - math.sqrt(discriminante)) / (2 * b)
+                if ibl_tope <= raiz <= ibl_piso:
+                    ibl = raiz
+            if ibl is None and piso > 0:
+                ibl = max(ibl_piso, mesada_objetivo * 100 / piso)
+
+    if ibl is None:
+        motivo = MOTIVO_TOPE if tope <= 0 else MOTIVO_MAXIMO
+        return ResultadoInverso(motivo=motivo)
+
+    # Corrige el redondeo de punto flotante con la función de tasa real.
+    for _ in range(_MAXIMO_AJUSTES):
+        if cumple(ibl, semanas, pcl):
+            break
+        ibl = math.nextafter(ibl, math.inf)
+    else:
+        while not cumple(ibl, semanas, pcl):
+            ibl *= 1 + 1e-12
+    for _ in range(_MAXIMO_AJUSTES):
+        anterior = math.nextafter(ibl, 0.0)
+        if anterior <= 0 or not cumple(anterior, semanas, pcl):
+            break
+        ibl = anterior
+
+    return ResultadoInverso(ibl)
+
+
+def pcl_minima(
+    tipo: str,
+    ingreso_base_liquidacion: float,
+    semanas: int,
+    tasa_objetivo: float | None = None,
+    mesada_objetivo: float | None = None,
+    reglas: reglas_calcupension.ReglasPension | None = None,
+    genero: str | None = None,
+    edad: int | None = None
+) -> ResultadoInverso:
+    """
+    PCL mínima para alcanzar una tasa o una mesada.
+
+    La tasa depende de la PCL solo a través de las bandas del tipo; se
+    busca la primera banda que alcanza el objetivo. En invalidez la PCL
+    debe superar la PCL mínima.
+
+    Retorna:
+    --------
+    ResultadoInverso:
+        valor es el límite inferior de la banda (con estricto=True cuando
+        la PCL debe ser mayor que ese límite).
+
+    Raises:
+    -------
+    ErrorTipoPension, ErrorValoresNegativos, ErrorIBL, ErrorSemanasCotizadas,
+    ErrorEdadMinimaHombres, ErrorEdadMinimaMujeres:
+        Si la solicitud no cumple una validación distinta de la PCL (la edad
+        solo se valida si se indica).
+    """
+    if reglas is None:
+        reglas = reglas_calcupension.REGLAS_VIGENTES
+
+    _validar(
+        "porcentaje_perdida_capacidad_laboral", tipo, ingreso_base_liquidacion, semanas,
+        genero, edad, None, reglas
+    )
+
+    cumple = _criterio(tipo, tasa_objetivo, mesada_objetivo, reglas)
+    limite = reglas.pcl_minima_invalidez if tipo == "Invalidez" else -math.inf
+    anterior = -math.inf
+
+    for banda in reglas.definicion["tipos"][tipo]["bandas_pcl"]:
+        hasta = math.inf if banda["pcl_hasta"] is None else banda["pcl_hasta"]
+        if hasta > limite:
+            inferior = max(anterior, limite)
+            pcl = hasta if hasta < math.inf else math.nextafter(max(inferior, 0.0), math.inf)
+            if cumple(ingreso_base_liquidacion, semanas, pcl):
+                if inferior == -math.inf:
+                    return ResultadoInverso(0)
+                return ResultadoInverso(inferior, estricto=True)
+        anterior = hasta
+
+    tope = parametros_tipo(tipo, 0, reglas)[5]
+    objetivo = _tasa_objetivo(ingreso_base_liquidacion, tasa_objetivo, mesada_objetivo)
+    return ResultadoInverso(motivo=MOTIVO_TOPE if objetivo > tope else MOTIVO_MAXIMO)
+
+
+def resolver_lote(
+    variable: str,
+    filas,
+    objetivos,
+    objetivo: str = "mesada",
+    reglas: reglas_calcupension.ReglasPension | None = None
+) -> list:
+    """
+    Resuelve el cálculo inverso para una lista de clientes.
+
+    Parámetros:
+    -----------
+    variable : str
+        Una de VARIABLES: la que se busca para cada cliente.
+    filas : iterable[tuple]
+        Datos actuales de cada cliente en el orden de SolicitudPension; el
+        valor actual de `variable` se ignora. Se validan como en
+        CalculadoraPension.validar_lote, incluidos género y edad.
+    objetivos : iterable[float]
+        Tasa o mesada objetivo de cada cliente.
+    objetivo : str
+        "tasa" o "mesada".
+    reglas : ReglasPension | None
+        Versión de reglas a aplicar. Por defecto, las reglas vigentes.
+
+    Retorna:
+    --------
+    list[ResultadoInverso]:
+        Uno por cliente. Si los datos del cliente no son válidos, valor es
+        None y motivo es el nombre de la excepción de la primera validación
+        que falla.
+    """
+    if variable not in VARIABLES:
+        raise ValueError(f"Variable desconocida: {variable}. Use una de {VARIABLES}.")
+    if objetivo not in ("tasa", "mesada"):
+        raise ValueError("El objetivo debe ser 'tasa' o 'mesada'.")
+    if variable == "ingreso_base_liquidacion" and objetivo != "mesada":
+        raise ValueError("El IBL mínimo solo se resuelve para una mesada objetivo.")
+
+    if reglas is None:
+        reglas = reglas_calcupension.REGLAS_VIGENTES
+
+    filas = list(filas)
+    columnas = [list(columna) for columna in zip(*filas)] or [[] for _ in range(6)]
+    columnas[_COLUMNA_VARIABLE[variable]] = [_VALOR_NEUTRO[variable]] * len(filas)
+    mascaras = logica_calcupension.CalculadoraPension.validar_lote(*columnas, reglas)
+    ignorado = _CODIGO_VARIABLE[variable]
+
+    resultados = []
+    for (tipo, ibl, semanas, genero, edad, pcl), valor_objetivo, mascara in zip(filas, objetivos, mascaras):
+        codigo = logica_calcupension.primer_error(mascara & ~ignorado)
+        if codigo != logica_calcupension.CODIGO_OK:
+            resultados.append(ResultadoInverso(motivo=_ERRORES_POR_CODIGO[codigo].__name__))
+            continue
+
+        tasa_objetivo = valor_objetivo if objetivo == "tasa" else None
+        mesada_objetivo = valor_objetivo if objetivo == "mesada" else None
+        if variable == "semanas":
+            resultado = semanas_minimas(
+                tipo, ibl, tasa_objetivo, mesada_objetivo, pcl, reglas, genero, edad
+            )
+        elif variable == "ingreso_base_liquidacion":
+            resultado = ibl_minimo(tipo, semanas, mesada_objetivo, pcl, reglas, genero, edad)
+        else:
+            resultado = pcl_minima(
+                tipo, ibl, semanas, tasa_objetivo, mesada_objetivo, reglas, genero, edad
+            )
+        resultados.append(resultado)
+
+    return resultados
@@ -0,0 +1,812 @@
+from array import array
+
+from calcupension.model import reglas_calcupension
+
+
+class ErrorIBL(Exception):
+    """
+    Excepción personalizada para indicar que el IBL es inválido.
+    Se lanza cuando el ingreso base de liquidación es menor o igual a cero.
+    """
+
+    def __init__(self, ingreso_base_liquidacion: float):
+        """
+        Parámetros:
+        -----------
+        ingreso_base_liquidacion : float
+            Ingreso Base de Liquidación ingresado.
+        """
+        super().__init__(f"ErrorIBL: IBL inválido ({ingreso_base_liquidacion}). Debe ser mayor que 0.")
+
+
+class ErrorSemanasCotizadas(Exception):
+    """
+    Excepción personalizada para indicar que las semanas cotizadas son insuficientes.
+    """
+
+    def __init__(self, semanas: int):
+        """
+        Parámetros:
+        -----------
+        semanas : int
+            Número de semanas cotizadas.
+        """
+        super().__init__(f"ErrorSemanasCotizadas: semanas insuficientes ({semanas}).")
+
+
+class ErrorEdadMinimaHombres(Exception):
+    """
+    Excepción personalizada para indicar que la edad mínima de hombres no se cumple.
+    """
+
+    def __init__(self, edad: int):
+        """
+        Parámetros:
+        -----------
+        edad : int
+            Edad del afiliado.
+        """
+        super().__init__(f"ErrorEdadMinimaHombres: edad inválida ({edad}).")
+
+
+class ErrorEdadMinimaMujeres(Exception):
+    """
+    Excepción personalizada para indicar que la edad mínima de mujeres no se cumple.
+    """
+
+    def __init__(self, edad: int):
+        """
+        Parámetros:
+        -----------
+        edad : int
+            Edad del afiliado.
+        """
+        super().__init__(f"ErrorEdadMinimaMujeres: edad inválida ({edad}).")
+
+
+class ErrorPCLInvalidez(Exception):
+    """
+    Excepción personalizada para indicar que la PCL no es válida.
+    """
+
+    def __init__(self, porcentaje_perdida_capacidad_laboral: float):
+        """
+        Parámetros:
+        -----------
+        porcentaje_perdida_capacidad_laboral : float
+            Porcentaje de pérdida de capacidad laboral.
+        """
+        super().__init__(f"ErrorPCLInvalidez: PCL inválido ({porcentaje_perdida_capacidad_laboral}).")
+
+
+class ErrorTipoPension(Exception):
+    """
+    Excepción personalizada para indicar que el tipo de pensión es inválido.
+    """
+
+    def __init__(self, tipo: str):
+        tipos_validos = ["Vejez", "Sobreviviente", "Invalidez"]
+        super().__init__(f"Tipo inválido: {tipo}. Valores válidos: {tipos_validos}")
+
+
+class ErrorGenero(Exception):
+    """
+    Excepción personalizada para indicar que el género es inválido.
+    """
+
+    def __init__(self, genero: str):
+        generos_validos = ["Hombre", "Mujer"]
+        super().__init__(f"Género inválido: {genero}. Valores válidos: {generos_validos}")
+
+
+class ErrorValoresNegativos(Exception):
+    """
+    Excepción personalizada para indicar valores negativos en parámetros.
+    """
+
+    def __init__(self, valor: float, nombre: str):
+        super().__init__(f"{nombre} negativo: {valor}")
+
+
+CODIGO_OK = 0
+CODIGO_ERROR_TIPO = 1
+CODIGO_ERROR_VALORES_NEGATIVOS = 2
+CODIGO_ERROR_IBL = 4
+CODIGO_ERROR_SEMANAS = 8
+CODIGO_ERROR_EDAD_HOMBRES = 16
+CODIGO_ERROR_EDAD_MUJERES = 32
+CODIGO_ERROR_PCL = 64
+CODIGO_ERROR_GENERO = 128
+
+CODIGOS_ERROR = {
+    ErrorTipoPension: CODIGO_ERROR_TIPO,
+    ErrorValoresNegativos: CODIGO_ERROR_VALORES_NEGATIVOS,
+    ErrorIBL: CODIGO_ERROR_IBL,
+    ErrorSemanasCotizadas: CODIGO_ERROR_SEMANAS,
+    ErrorEdadMinimaHombres: CODIGO_ERROR_EDAD_HOMBRES,
+    ErrorEdadMinimaMujeres: CODIGO_ERROR_EDAD_MUJERES,
+    ErrorPCLInvalidez: CODIGO_ERROR_PCL,
+    ErrorGenero: CODIGO_ERROR_GENERO,
+}
+"""
+Código de error por excepción personalizada.
+
+Los códigos son potencias de dos, ordenadas según el orden en que
+calcular_tasa_reemplazo ejecuta las validaciones. Así se pueden combinar
+en una máscara (CalculadoraPension.validar) y el bit más bajo de la
+máscara corresponde a la excepción que lanzaría el cálculo individual.
+"""
+
+
+def errores_de_mascara(mascara: int) -> list:
+    """
+    Retorna las clases de excepción incluidas en una máscara de errores.
+
+    Parámetros:
+    -----------
+    mascara : int
+        Combinación de códigos CODIGO_ERROR_*.
+
+    Retorna:
+    --------
+    list[type]:
+        Excepciones en el orden en que se validan.
+    """
+    return [error for error, codigo in CODIGOS_ERROR.items() if mascara & codigo]
+
+
+def primer_error(mascara: int) -> int:
+    """
+    Retorna el código del primer error de una máscara (CODIGO_OK si no hay errores).
+    """
+    return mascara & -mascara
+
+
+TIPOS_PENSION = ("Vejez", "Sobreviviente", "Invalidez")
+"""
+Tipos de pensión válidos. La posición de cada tipo es su código en LoteSolicitudes.
+"""
+
+GENEROS = ("Hombre", "Mujer")
+"""
+Géneros válidos. La posición de cada género es su código en LoteSolicitudes.
+"""
+
+GENERO_NO_INFORMADO = -1
+
+EDAD_NO_INFORMADA = -2_147_483_648
+"""
+Valor con el que LoteSolicitudes guarda una edad None (mínimo de un entero de 32 bits).
+"""
+
+_VALORES_CANONICOS = {valor: valor for valor in TIPOS_PENSION + GENEROS}
+
+
+class SolicitudPension:
+    """
+    Representa una solicitud de cálculo de pensión.
+
+    Agrupa todos los parámetros necesarios para evitar funciones con muchos argumentos.
+
+    Usa __slots__ y comparte una única cadena por cada tipo y género válidos,
+    para que mantener millones de solicitudes en memoria sea económico.
+    """
+
+    __slots__ = (
+        "tipo",
+        "ingreso_base_liquidacion",
+        "semanas",
+        "genero",
+        "edad",
+        "porcentaje_perdida_capacidad_laboral",
+    )
+
+    def __init__(
+        self,
+        tipo: str,
+        ingreso_base_liquidacion: float,
+        semanas: int,
+        genero: str,
+        edad: int | None,
+        porcentaje_perdida_capacidad_laboral: float
+    ):
+        self.tipo = _VALORES_CANONICOS.get(tipo, tipo)
+        self.ingreso_base_liquidacion = ingreso_base_liquidacion
+        self.semanas = semanas
+        self.genero = _VALORES_CANONICOS.get(genero, genero)
+        self.edad = edad
+        self.porcentaje_perdida_capacidad_laboral = porcentaje_perdida_capacidad_laboral
+
+
+class _ColumnaDecodificada:
+    """
+    Secuencia de solo lectura que decodifica los valores de un buffer al leerlos.
+    """
+
+    __slots__ = ("buffer", "decodificar")
+
+    def __init__(self, buffer, decodificar):
+        self.buffer = buffer
+        self.decodificar = decodificar
+
+    def __len__(self) -> int:
+        return len(self.buffer)
+
+    def __iter__(self):
+        return map(self.decodificar, self.buffer)
+
+    def __getitem__(self, indice: int):
+        return self.decodificar(self.buffer[indice])
+
+
+_TIPOS_POR_CODIGO = dict(enumerate(TIPOS_PENSION))
+
+_GENEROS_POR_CODIGO = {GENERO_NO_INFORMADO: None, **dict(enumerate(GENEROS))}
+
+
+def _decodificar_tipo(codigo: int) -> str | int:
+    """
+    Un código fuera de rango (por ejemplo de un archivo dañado) se retorna
+    tal cual: no es un tipo válido, así que la fila se rechaza con
+    CODIGO_ERROR_TIPO en lugar de leerse como otro tipo (-1 no es Invalidez).
+    """
+    return _TIPOS_POR_CODIGO.get(codigo, codigo)
+
+
+def _decodificar_genero(codigo: int) -> str | int | None:
+    """
+    Como _decodificar_tipo: un código fuera de rango no es un género válido.
+    """
+    return _GENEROS_POR_CODIGO.get(codigo, codigo)
+
+
+def _decodificar_edad(edad: int) -> int | None:
+    return None if edad == EDAD_NO_INFORMADA else edad
+
+
+class VistaSolicitud:
+    """
+    Vista liviana de una fila de LoteSolicitudes.
+
+    Expone los mismos atributos que SolicitudPension leyendo directamente
+    los buffers del lote, por lo que puede pasarse a calcular_tasa_reemplazo.
+    """
+
+    __slots__ = ("lote", "indice")
+
+    def __init__(self, lote: "LoteSolicitudes", indice: int):
+        self.lote = lote
+        self.indice = indice
+
+    @property
+    def tipo(self) -> str:
+        return _decodificar_tipo(self.lote.tipos[self.indice])
+
+    @property
+    def ingreso_base_liquidacion(self) -> float:
+        return self.lote.ingresos_base_liquidacion[self.indice]
+
+    @property
+    def semanas(self) -> int:
+        return self.lote.semanas[self.indice]
+
+    @property
+    def genero(self) -> str | None:
+        return _decodificar_genero(self.lote.generos[self.indice])
+
+    @property
+    def edad(self) -> int | None:
+        return _decodificar_edad(self.lote.edades[self.indice])
+
+    @property
+    def porcentaje_perdida_capacidad_laboral(self) -> float:
+        return self.lote.porcentajes_perdida_capacidad_laboral[self.indice]
+
+    def a_solicitud(self) -> SolicitudPension:
+        """
+        Retorna una SolicitudPension independiente con los datos de la fila.
+        """
+        return SolicitudPension(
+            self.tipo,
+            self.ingreso_base_liquidacion,
+            self.semanas,
+            self.genero,
+            self.edad,
+            self.porcentaje_perdida_capacidad_laboral
+        )
+
+
+class LoteSolicitudes:
+    """
+    Conjunto de solicitudes almacenado por columnas en buffers contiguos.
+
+    Cada solicitud ocupa 26 bytes: tipo y género como códigos de 1 byte,
+    semanas y edad como enteros de 32 bits, IBL y PCL como float de 64 bits.
+    """
+
+    def __init__(self):
+        self.tipos = array("b")
+        self.ingresos_base_liquidacion = array("d")
+        self.semanas = array("i")
+        self.generos = array("b")
+        self.edades = array("i")
+        self.porcentajes_perdida_capacidad_laboral = array("d")
+
+    @classmethod
+    def desde_buffers(
+        cls,
+        tipos,
+        ingresos_base_liquidacion,
+        semanas,
+        generos,
+        edades,
+        porcentajes_perdida_capacidad_laboral
+    ) -> "LoteSolicitudes":
+        """
+        Crea un lote sobre columnas ya codificadas, sin copiarlas.
+
+        Las columnas deben usar los mismos códigos y tipos de dato que un
+        lote creado con agregar (por ejemplo memoryview sobre un archivo
+        mapeado en memoria). Si no admiten append, el lote es de solo lectura.
+
+        Raises:
+        -------
+        ValueError:
+            Si las columnas no tienen la misma longitud.
+        """
+        columnas = (
+            tipos, ingresos_base_liquidacion, semanas, generos, edades,
+            porcentajes_perdida_capacidad_laboral
+        )
+        if any(len(columna) != len(tipos) for columna in columnas):
+            raise ValueError("Todas las columnas del lote deben tener la misma longitud.")
+
+        lote = cls.__new__(cls)
+        lote.tipos = tipos
+        lote.ingresos_base_liquidacion = ingresos_base_liquidacion
+        lote.semanas = semanas
+        lote.generos = generos
+        lote.edades = edades
+        lote.porcentajes_perdida_capacidad_laboral = porcentajes_perdida_capacidad_laboral
+        return lote
+
+    def agregar(
+        self,
+        tipo: str,
+        ingreso_base_liquidacion: float,
+        semanas: int,
+        genero: str | None,
+        edad: int | None,
+        porcentaje_perdida_capacidad_laboral: float
+    ):
+        """
+        Agrega una solicitud al final del lote.
+
+        Raises:
+        -------
+        ErrorTipoPension:
+            Si el tipo no está en TIPOS_PENSION (no tiene código).
+        ErrorGenero:
+            Si el género no es None ni está en GENEROS.
+        """
+        if tipo not in TIPOS_PENSION:
+            raise ErrorTipoPension(tipo)
+
+        if genero is None:
+            codigo_genero = GENERO_NO_INFORMADO
+        elif genero in GENEROS:
+            codigo_genero = GENEROS.index(genero)
+        else:
+            raise ErrorGenero(genero)
+
+        self.tipos.append(TIPOS_PENSION.index(tipo))
+        self.ingresos_base_liquidacion.append(ingreso_base_liquidacion)
+        self.semanas.append(semanas)
+        self.generos.append(codigo_genero)
+        self.edades.append(EDAD_NO_INFORMADA if edad is None else edad)
+        self.porcentajes_perdida_capacidad_laboral.append(porcentaje_perdida_capacidad_laboral)
+
+    def agregar_solicitud(self, solicitud: SolicitudPension):
+        """
+        Agrega una SolicitudPension al final del lote.
+        """
+        self.agregar(
+            solicitud.tipo,
+            solicitud.ingreso_base_liquidacion,
+            solicitud.semanas,
+            solicitud.genero,
+            solicitud.edad,
+            solicitud.porcentaje_perdida_capacidad_laboral
+        )
+
+    def __len__(self) -> int:
+        return len(self.tipos)
+
+    def __getitem__(self, indice: int) -> VistaSolicitud:
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("Índice fuera del lote")
+        return VistaSolicitud(self, indice)
+
+    def __iter__(self):
+        for indice in range(len(self)):
+            yield VistaSolicitud(self, indice)
+
+    def columnas(self) -> tuple:
+        """
+        Retorna las seis columnas del lote en el orden de SolicitudPension.
+
+        Tipo, género y edad se decodifican al leerse, sin copiar los buffers.
+        """
+        return (
+            _ColumnaDecodificada(self.tipos, _decodificar_tipo),
+            self.ingresos_base_liquidacion,
+            self.semanas,
+            _ColumnaDecodificada(self.generos, _decodificar_genero),
+            _ColumnaDecodificada(self.edades, _decodificar_edad),
+            self.porcentajes_perdida_capacidad_laboral,
+        )
+
+    def calcular(self, reglas: reglas_calcupension.ReglasPension | None = None) -> tuple:
+        """
+        Calcula tasa y mesada de todo el lote con CalculadoraPension.calcular_lote.
+        """
+        return CalculadoraPension.calcular_lote(*self.columnas(), reglas)
+
+    def validar(self, reglas: reglas_calcupension.ReglasPension | None = None) -> array:
+        """
+        Retorna la máscara de errores de cada solicitud con CalculadoraPension.validar_lote.
+        """
+        return CalculadoraPension.validar_lote(*self.columnas(), reglas)
+
+
+class CalculadoraPension:
+    """
+    Clase para realizar cálculos pensionales.
+
+    Encapsula la lógica de validación y cálculo, siguiendo el principio
+    de responsabilidad única y el estilo del profesor.
+    """
+
+    def calcular_tasa_reemplazo(
+        solicitud: SolicitudPension,
+        reglas: reglas_calcupension.ReglasPension | None = None
+    ) -> float:
+        """
+        Calcula la tasa de reemplazo pensional según el tipo de pensión.
+
+        Parámetros:
+        -----------
+        solicitud : SolicitudPension
+            Objeto con todos los datos del afiliado.
+        reglas : ReglasPension | None
+            Versión de reglas a aplicar. Por defecto, las reglas vigentes.
+
+        Retorna:
+        --------
+        float:
+            Tasa de reemplazo calculada (en porcentaje).
+
+        Descripción:
+        ------------
+        - Vejez: requiere edad y semanas mínimas.
+        - Sobreviviente: tasa base con incremento por semanas.
+        - Invalidez: depende de la Pérdida de Capacidad Laboral.
+        """
+
+        if reglas is None:
+            reglas = reglas_calcupension.REGLAS_VIGENTES
+
+        CalculadoraPension.check_tipo(solicitud.tipo)
+        CalculadoraPension.check_valores(solicitud)
+        CalculadoraPension.check_ibl(solicitud.ingreso_base_liquidacion)
+
+        if solicitud.tipo == "Vejez":
+            CalculadoraPension.check_semanas(solicitud.semanas, reglas)
+            CalculadoraPension.check_edad(solicitud.genero, solicitud.edad, reglas)
+
+        if solicitud.tipo == "Invalidez":
+            CalculadoraPension.check_pcl(solicitud.porcentaje_perdida_capacidad_laboral, reglas)
+
+        return reglas.tasas[solicitud.tipo](
+            solicitud.ingreso_base_liquidacion,
+            solicitud.semanas,
+            solicitud.porcentaje_perdida_capacidad_laboral
+        )
+
+    def calcular_pension(
+        tasa_total: float,
+        ingreso_base_liquidacion: float,
+        tipo: str,
+        reglas: reglas_calcupension.ReglasPension | None = None
+    ) -> float:
+        """
+        Calcula el valor de la mesada pensional.
+
+        Parámetros:
+        -----------
+        tasa_total : float
+        ingreso_base_liquidacion : float
+        tipo : str
+        reglas : ReglasPension | None
+            Versión de reglas a aplicar. Por defecto, las reglas vigentes.
+
+        Retorna:
+        --------
+        float:
+            Valor de la mesada pensional.
+        """
+
+        if reglas is None:
+            reglas = reglas_calcupension.REGLAS_VIGENTES
+
+        mesada = (tasa_total / 100) * ingreso_base_liquidacion
+
+        mesada_minima = reglas.mesadas_minimas.get(tipo)
+        if mesada_minima is not None and mesada < mesada_minima:
+            mesada = mesada_minima
+
+        return mesada
+
+    def calcular_lote(
+        tipos,
+        ingresos_base_liquidacion,
+        semanas,
+        generos,
+        edades,
+        porcentajes_perdida_capacidad_laboral,
+        reglas: reglas_calcupension.ReglasPension | None = None
+    ) -> tuple:
+        """
+        Calcula tasa de reemplazo y mesada para un lote de afiliados en una sola pasada.
+
+        Parámetros:
+        -----------
+        tipos, generos : secuencias de str
+        ingresos_base_liquidacion, porcentajes_perdida_capacidad_laboral : secuencias de float
+        semanas, edades : secuencias de int (edad puede ser None)
+            Columnas del lote. Se aceptan listas, array.array, memoryview
+            o arreglos de NumPy; todas deben tener la misma longitud.
+        reglas : ReglasPension | None
+            Versión de reglas a aplicar. Por defecto, las reglas vigentes.
+
+        Retorna:
+        --------
+        tuple[array, array, array]:
+            (tasas, mesadas, codigos). tasas y mesadas son array('d');
+            codigos es array('B') con CODIGO_OK o el código de la primera
+            validación que falla (la misma excepción que lanzaría
+            calcular_tasa_reemplazo; una edad None en vejez es edad
+            insuficiente). Las filas inválidas tienen tasa y mesada NaN.
+
+        Descripción:
+        ------------
+        Aplica exactamente las mismas operaciones que calcular_tasa_reemplazo
+        y calcular_pension, por lo que los resultados coinciden bit a bit
+        con el cálculo individual.
+        """
+
+        n = len(tipos)
+        columnas = (
+            ingresos_base_liquidacion, semanas, generos, edades,
+            porcentajes_perdida_capacidad_laboral
+        )
+        if any(len(columna) != n for columna in columnas):
+            raise ValueError("Todas las columnas del lote deben tener la misma longitud.")
+
+        if reglas is None:
+            reglas = reglas_calcupension.REGLAS_VIGENTES
+
+        tasas_por_tipo = reglas.tasas
+        mesadas_minimas = reglas.mesadas_minimas
+        semanas_minimas = reglas.semanas_minimas_vejez
+        edad_minima_hombres = reglas.edades_minimas["Hombre"]
+        edad_minima_mujeres = reglas.edades_minimas["Mujer"]
+        pcl_minima = reglas.pcl_minima_invalidez
+        invalido = float("nan")
+
+        tasas = array("d", bytes(8 * n))
+        mesadas = array("d", bytes(8 * n))
+        codigos = array("B", bytes(n))
+
+        filas = zip(tipos, ingresos_base_liquidacion, semanas, generos, edades,
+                    porcentajes_perdida_capacidad_laboral)
+
+        for i, (tipo, ibl, semanas_fila, genero, edad, pcl) in enumerate(filas):
+
+            if tipo != "Vejez" and tipo != "Sobreviviente" and tipo != "Invalidez":
+                codigo = CODIGO_ERROR_TIPO
+            elif semanas_fila < 0 or (edad is not None and edad < 0):
+                codigo = CODIGO_ERROR_VALORES_NEGATIVOS
+            elif ibl <= 0:
+                codigo = CODIGO_ERROR_IBL
+            elif tipo == "Vejez" and semanas_fila < semanas_minimas:
+                codigo = CODIGO_ERROR_SEMANAS
+            elif tipo == "Vejez" and genero == "Hombre" and (edad is None or edad < edad_minima_hombres):
+                codigo = CODIGO_ERROR_EDAD_HOMBRES
+            elif tipo == "Vejez" and genero == "Mujer" and (edad is None or edad < edad_minima_mujeres):
+                codigo = CODIGO_ERROR_EDAD_MUJERES
+            elif tipo == "Invalidez" and pcl <= pcl_minima:
+                codigo = CODIGO_ERROR_PCL
+            else:
+                tasa = tasas_por_tipo[tipo](ibl, semanas_fila, pcl)
+                mesada = (tasa / 100) * ibl
+                mesada_minima = mesadas_minimas.get(tipo)
+                if mesada_minima is not None and mesada < mesada_minima:
+                    mesada = mesada_minima
+                tasas[i] = tasa
+                mesadas[i] = mesada
+                continue
+
+            codigos[i] = codigo
+            tasas[i] = invalido
+            mesadas[i] = invalido
+
+        return tasas, mesadas, codigos
+
+    def validar(
+        solicitud: SolicitudPension,
+        reglas: reglas_calcupension.ReglasPension | None = None
+    ) -> int:
+        """
+        Evalúa todas las validaciones de una solicitud sin lanzar excepciones.
+
+        Parámetros:
+        -----------
+        solicitud : SolicitudPension
+        reglas : ReglasPension | None
+            Versión de reglas a aplicar. Por defecto, las reglas vigentes.
+
+        Retorna:
+        --------
+        int:
+            Máscara con el código de cada regla incumplida (CODIGO_OK si la
+            solicitud es válida). A diferencia de calcular_tasa_reemplazo,
+            reporta todas las reglas incumplidas y no solo la primera.
+            Una edad None en vejez se reporta como edad insuficiente.
+        """
+        if reglas is None:
+            reglas = reglas_calcupension.REGLAS_VIGENTES
+
+        tipo = solicitud.tipo
+        semanas = solicitud.semanas
+        edad = solicitud.edad
+        mascara = CODIGO_OK
+
+        if tipo not in TIPOS_PENSION:
+            mascara |= CODIGO_ERROR_TIPO
+
+        if semanas < 0 or (edad is not None and edad < 0):
+            mascara |= CODIGO_ERROR_VALORES_NEGATIVOS
+
+        if solicitud.ingreso_base_liquidacion <= 0:
+            mascara |= CODIGO_ERROR_IBL
+
+        if tipo == "Vejez":
+            if semanas < reglas.semanas_minimas_vejez:
+                mascara |= CODIGO_ERROR_SEMANAS
+
+            genero = solicitud.genero
+            if genero == "Hombre" and (edad is None or edad < reglas.edades_minimas["Hombre"]):
+                mascara |= CODIGO_ERROR_EDAD_HOMBRES
+            elif genero == "Mujer" and (edad is None or edad < reglas.edades_minimas["Mujer"]):
+                mascara |= CODIGO_ERROR_EDAD_MUJERES
+
+        elif tipo == "Invalidez":
+            if solicitud.porcentaje_perdida_capacidad_laboral <= reglas.pcl_minima_invalidez:
+                mascara |= CODIGO_ERROR_PCL
+
+        return mascara
+
+    def validar_lote(
+        tipos,
+        ingresos_base_liquidacion,
+        semanas,
+        generos,
+        edades,
+        porcentajes_perdida_capacidad_laboral,
+        reglas: reglas_calcupension.ReglasPension | None = None
+    ) -> array:
+        """
+        Igual que validar, para un lote de solicitudes por columnas.
+
+        Parámetros:
+        -----------
+        Las mismas columnas que calcular_lote.
+
+        Retorna:
+        --------
+        array('B'):
+            Máscara de errores por fila.
+        """
+
+        n = len(tipos)
+        columnas = (
+            ingresos_base_liquidacion, semanas, generos, edades,
+            porcentajes_perdida_capacidad_laboral
+        )
+        if any(len(columna) != n for columna in columnas):
+            raise ValueError("Todas las columnas del lote deben tener la misma longitud.")
+
+        if reglas is None:
+            reglas = reglas_calcupension.REGLAS_VIGENTES
+
+        semanas_minimas = reglas.semanas_minimas_vejez
+        edad_minima_hombres = reglas.edades_minimas["Hombre"]
+        edad_minima_mujeres = reglas.edades_minimas["Mujer"]
+        pcl_minima = reglas.pcl_minima_invalidez
+
+        mascaras = array("B", bytes(n))
+
+        filas = zip(tipos, ingresos_base_liquidacion, semanas, generos, edades,
+                    porcentajes_perdida_capacidad_laboral)
+
+        for i, (tipo, ibl, semanas_fila, genero, edad, pcl) in enumerate(filas):
+            mascara = CODIGO_OK
+
+            if tipo != "Vejez" and tipo != "Sobreviviente" and tipo != "Invalidez":
+                mascara = CODIGO_ERROR_TIPO
+
+            if semanas_fila < 0 or (edad is not None and edad < 0):
+                mascara |= CODIGO_ERROR_VALORES_NEGATIVOS
+
+            if ibl <= 0:
+                mascara |= CODIGO_ERROR_IBL
+
+            if tipo == "Vejez":
+                if semanas_fila < semanas_minimas:
+                    mascara |= CODIGO_ERROR_SEMANAS
+                if genero == "Hombre" and (edad is None or edad < edad_minima_hombres):
+                    mascara |= CODIGO_ERROR_EDAD_HOMBRES
+                elif genero == "Mujer" and (edad is None or edad < edad_minima_mujeres):
+                    mascara |= CODIGO_ERROR_EDAD_MUJERES
+            elif tipo == "Invalidez" and pcl <= pcl_minima:
+                mascara |= CODIGO_ERROR_PCL
+
+            if mascara:
+                mascaras[i] = mascara
+
+        return mascaras
+
+    def check_tipo(tipo: str):
+        if tipo not in TIPOS_PENSION:
+            raise ErrorTipoPension(tipo)
+
+    def check_valores(solicitud: SolicitudPension):
+        if solicitud.semanas < 0:
+            raise ErrorValoresNegativos(solicitud.semanas, "semanas")
+
+        if solicitud.edad is not None and solicitud.edad < 0:
+            raise ErrorValoresNegativos(solicitud.edad, "edad")
+
+    def check_ibl(ingreso_base_liquidacion: float):
+        if ingreso_base_liquidacion <= 0:
+            raise ErrorIBL(ingreso_base_liquidacion)
+
+    def check_semanas(semanas: int, reglas: reglas_calcupension.ReglasPension | None = None):
+        if reglas is None:
+            reglas = reglas_calcupension.REGLAS_VIGENTES
+
+        if semanas < reglas.semanas_minimas_vejez:
+            raise ErrorSemanasCotizadas(semanas)
+
+    def check_edad(genero: str, edad: int, reglas: reglas_calcupension.ReglasPension | None = None):
+        if reglas is None:
+            reglas = reglas_calcupension.REGLAS_VIGENTES
+
+        if genero == "Hombre" and (edad is None or edad < reglas.edades_minimas["Hombre"]):
+            raise ErrorEdadMinimaHombres(edad)
+
+        if genero == "Mujer" and (edad is None or edad < reglas.edades_minimas["Mujer"]):
+            raise ErrorEdadMinimaMujeres(edad)
+
+    def check_pcl(
+        porcentaje_perdida_capacidad_laboral: float,
+        reglas: reglas_calcupension.ReglasPension | None = None
+    ):
+        if reglas is None:
+            reglas = reglas_calcupension.REGLAS_VIGENTES
+
+        if porcentaje_perdida_capacidad_laboral <= reglas.pcl_minima_invalidez:
+            raise ErrorPCLInvalidez(porcentaje_perdida_capacidad_laboral)
\ No newline at end of file
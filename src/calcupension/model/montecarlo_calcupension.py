@@ -0,0 +1,368 @@
+"""
+Simulación Monte Carlo de la carrera de cotización de afiliados activos.
+
+Para asesoría antes del retiro la mesada no es un valor único: las semanas
+que faltan por cotizar, la evolución del IBL y la edad de retiro son
+inciertas. Por cada afiliado se simulan N escenarios con un ModeloCarrera:
+
+- Edad de retiro: la edad mínima del género más un retraso aleatorio (que
+  puede ser negativo: solicitudes anticipadas que no cumplen la edad).
+- Densidad de cotización: fracción de las 52 semanas del año que se cotizan,
+  por escenario (distribución de Kumaraswamy, de forma parecida a una Beta
+  pero con inversa cerrada, así se muestrea con un solo número aleatorio).
+- IBL: crecimiento real lognormal año a año hasta el retiro.
+- Invalidez: probabilidad anual de invalidez antes del retiro; en ese
+  caso el escenario termina en una solicitud de Invalidez con una PCL
+  aleatoria.
+
+Cada escenario es una fila de un lote que se calcula con
+CalculadoraPension.calcular_lote (las mismas validaciones y fórmulas de
+calcular_tasa_reemplazo y calcular_pension). De cada afiliado se reportan
+percentiles de tasa y mesada (de los escenarios que cumplen los requisitos)
+y la probabilidad de cumplir cada requisito.
+
+Los afiliados se procesan por fragmentos de a lo sumo TAMANO_FRAGMENTO
+escenarios, que se pueden repartir en un pool de procesos. El generador
+aleatorio de cada afiliado depende solo de la semilla y de su posición en
+la entrada, por lo que el resultado no depende del número de procesos ni
+del tamaño del fragmento.
+"""
+
+import math
+import random
+from bisect import bisect_right
+from functools import partial
+from itertools import accumulate
+
+from calcupension.model import logica_calcupension
+from calcupension.model import paralelo_calcupension
+from calcupension.model import reglas_calcupension
+
+
+ESCENARIOS = 1000
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+SEMANAS_POR_ANIO = 52
+
+TAMANO_FRAGMENTO = 100_000
+"""
+Escenarios (afiliados × N) que se calculan en un mismo lote.
+"""
+
+_MASCARA_EDAD = logica_calcupension.CODIGO_ERROR_EDAD_HOMBRES | logica_calcupension.CODIGO_ERROR_EDAD_MUJERES
+
+
+class ModeloCarrera:
+    """
+    Modelo estocástico de la carrera de un afiliado hasta su solicitud.
+
+    Se puede reemplazar por una subclase que redefina `simular` para usar
+    otras distribuciones.
+    """
+
+    def __init__(
+        self,
+        crecimiento_ibl: float = 0.01,
+        volatilidad_ibl: float = 0.05,
+        densidad_cotizacion: tuple = (3.0, 1.5),
+        retrasos_retiro: tuple = ((-2, 0.05), (0, 0.55), (1, 0.15), (2, 0.1), (3, 0.1), (5, 0.05)),
+        probabilidad_invalidez: float = 0.003,
+        pcl_invalidez: tuple = (30.0, 100.0)
+    ):
+        """
+        Parámetros:
+        -----------
+        crecimiento_ibl : float
+            Media anual del logaritmo del crecimiento real del IBL.
+        volatilidad_ibl : float
+            Desviación estándar anual de ese logaritmo.
+        densidad_cotizacion : tuple[float, float]
+            Parámetros (a, b) de la distribución de Kumaraswamy de la
+            fracción de semanas cotizadas por año.
+        retrasos_retiro : tuple[tuple[int, float], ...]
+            (años sobre la edad mínima, probabilidad) de la edad a la que se
+            solicita la pensión.
+        probabilidad_invalidez : float
+            Probabilidad anual de invalidez antes del retiro.
+        pcl_invalidez : tuple[float, float]
+            Rango (uniforme) de la PCL cuando hay invalidez.
+
+        Raises:
+        -------
+        ValueError:
+            Si las probabilidades de retraso no son positivas o la
+            probabilidad de invalidez no está en [0, 1).
+        """
+        if not retrasos_retiro or any(probabilidad < 0 for _, probabilidad in retrasos_retiro):
+            raise ValueError("Los retrasos de retiro deben tener probabilidades no negativas.")
+        if not 0 <= probabilidad_invalidez < 1:
+            raise ValueError("La probabilidad de invalidez debe estar en [0, 1).")
+
+        self.crecimiento_ibl = crecimiento_ibl
+        self.volatilidad_ibl = volatilidad_ibl
+        self.densidad_cotizacion = densidad_cotizacion
+        self.retrasos_retiro = tuple(retrasos_retiro)
+        self.probabilidad_invalidez = probabilidad_invalidez
+        self.pcl_invalidez = pcl_invalidez
+
+        acumuladas = list(accumulate(probabilidad for _, probabilidad in self.retrasos_retiro))
+        self._acumuladas = [probabilidad / acumuladas[-1] for probabilidad in acumuladas]
+        self._retrasos = [retraso for retraso, _ in self.retrasos_retiro]
+
+    def simular(
+        self,
+        generador: random.Random,
+        fila: tuple,
+        cantidad: int,
+        reglas: reglas_calcupension.ReglasPension,
+        columnas: tuple
+    ):
+        """
+        Agrega a `columnas` (las seis listas de calcular_lote) `cantidad`
+        solicitudes simuladas para un afiliado.
+
+        Parámetros:
+        -----------
+        fila : tuple
+            Datos actuales del afiliado en el orden de SolicitudPension;
+            se usan IBL, semanas, género y edad.
+        """
+        _, ibl, semanas, genero, edad, _ = fila
+        tipos, ibls, semanas_columna, generos, edades, pcls = columnas
+
+        edad_minima = reglas.edades_minimas[genero]
+        mu = self.crecimiento_ibl
+        sigma = self.volatilidad_ibl
+        a, b = self.densidad_cotizacion
+        inverso_a, inverso_b = 1 / a, 1 / b
+        pcl_minima, pcl_maxima = self.pcl_invalidez
+        probabilidad_invalidez = self.probabilidad_invalidez
+        log_sobrevivir = math.log1p(-probabilidad_invalidez) if probabilidad_invalidez else 0.0
+        acumuladas, retrasos = self._acumuladas, self._retrasos
+
+        aleatorio = generador.random
+        gauss = generador.gauss
+
+        for _ in range(cantidad):
+            retraso = retrasos[min(bisect_right(acumuladas, aleatorio()), len(retrasos) - 1)]
+            edad_solicitud = max(edad, edad_minima + retraso)
+            anios = edad_solicitud - edad
+            tipo = "Vejez"
+            pcl = 0.0
+
+            if log_sobrevivir:
+                # Años hasta la invalidez: distribución geométrica.
+                anio_invalidez = int(math.log(1.0 - aleatorio()) / log_sobrevivir)
+                if anio_invalidez < anios:
+                    anios = anio_invalidez
+                    edad_solicitud = edad + anios
+                    tipo = "Invalidez"
+                    pcl = pcl_minima + (pcl_maxima - pcl_minima) * aleatorio()
+
+            if anios:
+                densidad = (1.0 - (1.0 - aleatorio()) ** inverso_b) ** inverso_a
+                semanas_solicitud = semanas + round(SEMANAS_POR_ANIO * anios * densidad)
+                ibl_solicitud = ibl * math.exp(gauss(mu * anios, sigma * math.sqrt(anios)))
+            else:
+                semanas_solicitud = semanas
+                ibl_solicitud = ibl
+
+            tipos.append(tipo)
+            ibls.append(ibl_solicitud)
+            semanas_columna.append(semanas_solicitud)
+            generos.append(genero)
+            edades.append(edad_solicitud)
+            pcls.append(pcl)
+
+
+class ResultadoMonteCarlo:
+    """
+    Distribución simulada del resultado de un afiliado.
+
+    Atributos:
+    ----------
+    escenarios : int
+        Escenarios simulados (0 si el afiliado no tiene edad, género o IBL válidos).
+    probabilidad_elegible : float
+        Fracción de escenarios que cumplen todos los requisitos.
+    probabilidad_semanas : float
+        Fracción de escenarios de Vejez que cumplen las semanas mínimas.
+    probabilidad_edad : float
+        Fracción de escenarios de Vejez que cumplen la edad mínima.
+    probabilidad_invalidez : float
+        Fracción de escenarios que terminan en invalidez.
+    percentiles_tasa, percentiles_mesada : dict[int, float] | None
+        Percentil -> valor, sobre los escenarios elegibles (None si no hay).
+    """
+
+    __slots__ = (
+        "escenarios", "probabilidad_elegible", "probabilidad_semanas", "probabilidad_edad",
+        "probabilidad_invalidez", "percentiles_tasa", "percentiles_mesada",
+    )
+
+    def __init__(self, escenarios: int = 0):
+        self.escenarios = escenarios
+        self.probabilidad_elegible = 0.0
+        self.probabilidad_semanas = 0.0
+        self.probabilidad_edad = 0.0
+        self.probabilidad_invalidez = 0.0
+        self.percentiles_tasa = None
+        self.percentiles_mesada = None
+
+    def como_dict(self) -> dict:
+        return {nombre: getattr(self, nombre) for nombre in self.__slots__}
+
+
+def percentiles(valores: list, puntos: tuple = PERCENTILES) -> dict | None:
+    """
+    Percentiles con interpolación lineal de una lista ya ordenada.
+    """
+    if not valores:
+        return None
+
+    resultado = {}
+    ultimo = len(valores) - 1
+    for punto in puntos:
+        posicion = punto / 100 * ultimo
+        inferior = int(posicion)
+        superior = min(inferior + 1, ultimo)
+        fraccion = posicion - inferior
+        resultado[punto] = valores[inferior] + (valores[superior] - valores[inferior]) * fraccion
+    return resultado
+
+
+def _simulable(fila: tuple, reglas: reglas_calcupension.ReglasPension) -> bool:
+    _, ibl, semanas, genero, edad, _ = fila
+    return (
+        edad is not None and edad >= 0 and semanas is not None and semanas >= 0
+        and ibl is not None and ibl > 0 and genero in reglas.edades_minimas
+    )
+
+
+def _simular_fragmento(
+    fragmento: list,
+    escenarios: int,
+    modelo: ModeloCarrera,
+    semilla: int,
+    puntos: tuple,
+    reglas: reglas_calcupension.ReglasPension
+) -> list:
+    """
+    Simula un fragmento de (posición, fila) y retorna un ResultadoMonteCarlo por fila.
+    """
+    columnas = ([], [], [], [], [], [])
+    simulados = []
+    for posicion, fila in fragmento:
+        if _simulable(fila, reglas):
+            generador = random.Random(f"{semilla}:{posicion}")
+            modelo.simular(generador, fila, escenarios, reglas, columnas)
+            simulados.append(True)
+        else:
+            simulados.append(False)
+
+    tasas, mesadas, codigos = logica_calcupension.CalculadoraPension.calcular_lote(*columnas, reglas)
+    mascaras = logica_calcupension.CalculadoraPension.validar_lote(*columnas, reglas)
+    tipos = columnas[0]
+
+    resultados = []
+    inicio = 0
+    for simulado in simulados:
+        if not simulado:
+            resultados.append(ResultadoMonteCarlo())
+            continue
+
+        fin = inicio + escenarios
+        resultado = ResultadoMonteCarlo(escenarios)
+        tasas_validas = []
+        mesadas_validas = []
+        vejez = semanas_ok = edad_ok = 0
+
+        for i in range(inicio, fin):
+            if tipos[i] == "Vejez":
+                vejez += 1
+                mascara = mascaras[i]
+                if not mascara & logica_calcupension.CODIGO_ERROR_SEMANAS:
+                    semanas_ok += 1
+                if not mascara & _MASCARA_EDAD:
+                    edad_ok += 1
+            if not codigos[i]:
+                tasas_validas.append(tasas[i])
+                mesadas_validas.append(mesadas[i])
+
+        tasas_validas.sort()
+        mesadas_validas.sort()
+        resultado.probabilidad_elegible = len(tasas_validas) / escenarios
+        resultado.probabilidad_invalidez = (escenarios - vejez) / escenarios
+        resultado.probabilidad_semanas = semanas_ok / vejez if vejez else 0.0
+        resultado.probabilidad_edad = edad_ok / vejez if vejez else 0.0
+        resultado.percentiles_tasa = percentiles(tasas_validas, puntos)
+        resultado.percentiles_mesada = percentiles(mesadas_validas, puntos)
+        resultados.append(resultado)
+        inicio = fin
+
+    return resultados
+
+
+def simular(
+    filas,
+    escenarios: int = ESCENARIOS,
+    modelo: ModeloCarrera | None = None,
+    semilla: int = 0,
+    procesos: int | None = 1,
+    tamano_fragmento: int = TAMANO_FRAGMENTO,
+    puntos: tuple = PERCENTILES,
+    reglas: reglas_calcupension.ReglasPension | None = None
+):
+    """
+    Simula `escenarios` carreras por afiliado.
+
+    Parámetros:
+    -----------
+    filas : iterable[tuple]
+        Datos actuales de cada afiliado en el orden de SolicitudPension
+        (el tipo y la PCL se ignoran).
+    escenarios : int
+        Escenarios por afiliado.
+    modelo : ModeloCarrera | None
+        Modelo de carrera. Por defecto, ModeloCarrera().
+    semilla : int
+        Semilla de los generadores aleatorios.
+    procesos : int | None
+        Procesos del pool. Con 1 (por defecto) todo se calcula en el
+        proceso actual; None usa todos los núcleos.
+    tamano_fragmento : int
+        Escenarios por lote; cada fragmento tiene tamano_fragmento //
+        escenarios afiliados (al menos uno).
+    puntos : tuple[int, ...]
+        Percentiles a reportar.
+    reglas : ReglasPension | None
+        Versión de reglas a aplicar. Por defecto, las reglas vigentes.
+
+    Retorna:
+    --------
+    generator[ResultadoMonteCarlo]:
+        Un resultado por afiliado, en el orden de entrada.
+
+    Raises:
+    -------
+    ValueError:
+        Si escenarios no es positivo.
+    """
+    if escenarios <= 0:
+        raise ValueError("El número de escenarios debe ser mayor que 0.")
+    if modelo is None:
+        modelo = ModeloCarrera()
+    if reglas is None:
+        reglas = reglas_calcupension.REGLAS_VIGENTES
+
+    afiliados_por_fragmento = max(1, tamano_fragmento // escenarios)
+    ejecutor = paralelo_calcupension.EjecutorParalelo(procesos)
+    funcion = partial(
+        _simular_fragmento,
+        escenarios=escenarios, modelo=modelo, semilla=semilla, puntos=puntos, reglas=reglas
+    )
+    fragmentos = paralelo_calcupension.fragmentar(enumerate(filas), afiliados_por_fragmento)
+
+    for _, resultados in ejecutor.mapear(funcion, fragmentos):
+        yield from resultados
@@ -0,0 +1,211 @@
+"""
+Ejecución en paralelo de cálculos pensionales con un pool de procesos.
+
+Divide un conjunto de solicitudes en fragmentos, los reparte entre varios
+procesos y entrega los resultados en el mismo orden de entrada. Cada
+fragmento viaja entre procesos como un solo mensaje, no como un objeto
+SolicitudPension por fila.
+"""
+
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from calcupension.model import logica_calcupension
+
+
+TAMANO_FRAGMENTO = 10_000
+
+
+def _ejecutar_medido(funcion, fragmento) -> tuple:
+    """
+    Ejecuta `funcion(fragmento)` y mide el tiempo en el proceso que la ejecuta.
+
+    Retorna:
+    --------
+    tuple:
+        (pid, registros, segundos, resultado)
+    """
+    inicio = time.perf_counter()
+    resultado = funcion(fragmento)
+    return os.getpid(), len(fragmento), time.perf_counter() - inicio, resultado
+
+
+def _calcular_columnas(filas: list) -> tuple:
+    """
+    Calcula un fragmento de filas (tuplas con los datos de SolicitudPension).
+    """
+    return logica_calcupension.CalculadoraPension.calcular_lote(*zip(*filas))
+
+
+class ReporteRendimiento:
+    """
+    Acumula registros procesados y tiempo de trabajo por proceso.
+    """
+
+    def __init__(self):
+        self.por_proceso = {}
+        self.inicio = time.perf_counter()
+        self.fin = None
+
+    def registrar(self, pid: int, registros: int, segundos: float):
+        """
+        Suma un fragmento procesado por el proceso `pid`.
+        """
+        acumulado = self.por_proceso.get(pid, (0, 0.0))
+        self.por_proceso[pid] = (acumulado[0] + registros, acumulado[1] + segundos)
+
+    def terminar(self):
+        """
+        Marca el final de la ejecución.
+        """
+        self.fin = time.perf_counter()
+
+    @property
+    def registros(self) -> int:
+        return sum(registros for registros, _ in self.por_proceso.values())
+
+    @property
+    def segundos(self) -> float:
+        fin = self.fin if self.fin is not None else time.perf_counter()
+        return fin - self.inicio
+
+    def como_texto(self) -> str:
+        """
+        Retorna el reporte de rendimiento en texto plano.
+        """
+        lineas = []
+        for numero, (pid, (registros, segundos)) in enumerate(sorted(self.por_proceso.items()), 1):
+            velocidad = registros / segundos if segundos > 0 else 0.0
+            lineas.append(
+                f"Proceso {numero} (pid {pid}): {registros:,} registros en {segundos:.2f} s "
+                f"({velocidad:,.0f} registros/s)"
+            )
+
+        segundos = self.segundos
+        velocidad = self.registros / segundos if segundos > 0 else 0.0
+        lineas.append(
+            f"Total: {self.registros:,} registros en {segundos:.2f} s ({velocidad:,.0f} registros/s)"
+        )
+        return "\n".join(lineas)
+
+
+class EjecutorParalelo:
+    """
+    Reparte fragmentos de trabajo entre un pool de procesos y entrega los
+    resultados en el orden de entrada.
+
+    Solo mantiene en vuelo un número acotado de fragmentos, por lo que la
+    memoria no depende del tamaño total de la entrada.
+    """
+
+    def __init__(self, procesos: int | None = None, fragmentos_en_vuelo: int | None = None):
+        """
+        Parámetros:
+        -----------
+        procesos : int | None
+            Número de procesos del pool. None usa todos los núcleos.
+            Con 1 el trabajo se ejecuta en el proceso actual.
+        fragmentos_en_vuelo : int | None
+            Máximo de fragmentos enviados y aún no entregados.
+            Por defecto, el doble del número de procesos.
+        """
+        self.procesos = procesos or os.cpu_count() or 1
+        self.fragmentos_en_vuelo = fragmentos_en_vuelo or 2 * self.procesos
+        self.reporte = ReporteRendimiento()
+
+    def mapear(self, funcion, fragmentos):
+        """
+        Aplica `funcion` a cada fragmento en paralelo.
+
+        Parámetros:
+        -----------
+        funcion : callable
+            Función de nivel de módulo (debe poder serializarse con pickle).
+        fragmentos : iterable
+            Fragmentos de trabajo; cada uno debe soportar len().
+
+        Retorna:
+        --------
+        generator[tuple]:
+            (fragmento, resultado de `funcion`) por fragmento, en el orden
+            de entrada.
+        """
+        self.reporte = ReporteRendimiento()
+
+        if self.procesos == 1:
+            for fragmento in fragmentos:
+                pid, registros, segundos, resultado = _ejecutar_medido(funcion, fragmento)
+                self.reporte.registrar(pid, registros, segundos)
+                yield fragmento, resultado
+            self.reporte.terminar()
+            return
+
+        with ProcessPoolExecutor(max_workers=self.procesos) as pool:
+            pendientes = deque()
+            iterador = iter(fragmentos)
+
+            for fragmento in islice(iterador, self.fragmentos_en_vuelo):
+                pendientes.append((fragmento, pool.submit(_ejecutar_medido, funcion, fragmento)))
+
+            while pendientes:
+                fragmento, futuro = pendientes.popleft()
+                pid, registros, segundos, resultado = futuro.result()
+                self.reporte.registrar(pid, registros, segundos)
+
+                for siguiente in islice(iterador, 1):
+                    pendientes.append((siguiente, pool.submit(_ejecutar_medido, funcion, siguiente)))
+
+                yield fragmento, resultado
+
+        self.reporte.terminar()
+
+
+def fragmentar(iterable, tamano: int = TAMANO_FRAGMENTO):
+    """
+    Agrupa un iterable en listas de a lo sumo `tamano` elementos.
+    """
+    iterador = iter(iterable)
+    while True:
+        fragmento = list(islice(iterador, tamano))
+        if not fragmento:
+            return
+        yield fragmento
+
+
+def calcular_en_paralelo(
+    filas,
+    procesos: int | None = None,
+    tamano_fragmento: int = TAMANO_FRAGMENTO,
+    ejecutor: EjecutorParalelo | None = None
+):
+    """
+    Calcula tasa y mesada para un conjunto de solicitudes usando varios procesos.
+
+    Parámetros:
+    -----------
+    filas : iterable[tuple]
+        Tuplas (tipo, ingreso_base_liquidacion, semanas, genero, edad,
+        porcentaje_perdida_capacidad_laboral).
+    procesos : int | None
+        Número de procesos del pool.
+    tamano_fragmento : int
+        Filas enviadas a un proceso en cada mensaje.
+    ejecutor : EjecutorParalelo | None
+        Ejecutor a usar; permite consultar su reporte al terminar.
+
+    Retorna:
+    --------
+    generator[tuple]:
+        (tasa, mesada, codigo) por fila, en el orden de entrada, con los
+        mismos valores que CalculadoraPension.calcular_lote.
+    """
+    if ejecutor is None:
+        ejecutor = EjecutorParalelo(procesos)
+
+    for _, (tasas, mesadas, codigos) in ejecutor.mapear(
+        _calcular_columnas, fragmentar(filas, tamano_fragmento)
+    ):
+        yield from zip(tasas, mesadas, codigos)
@@ -0,0 +1,273 @@
+"""
+Proyección de mesadas a varios años para un portafolio de pensionados.
+
+Parte de la mesada del primer año (CalculadoraPension.calcular_lote) y la
+proyecta año a año con:
+
+- Indexación anual por IPC.
+- Crecimiento del SMMLV: las pensiones de tipos con mesada mínima (Vejez)
+  nunca quedan por debajo del SMMLV de cada año.
+- Ponderación por supervivencia con una tabla de mortalidad (por defecto
+  Gompertz por género).
+
+Los cálculos se hacen por vectores (un array por año con una posición
+por pensionado) que se actualizan en el lugar, y los totales por año se
+acumulan por fragmentos, por lo que la memoria no crece con
+años × pensionados.
+"""
+
+import math
+from array import array
+from itertools import islice
+
+from calcupension.model import logica_calcupension
+from calcupension.model import reglas_calcupension
+
+
+ANIOS = 30
+
+IPC = 0.04
+
+MESADAS_POR_ANIO = 13
+
+EDAD_SIN_INFORMAR = 60
+"""
+Edad supuesta para la mortalidad cuando la solicitud no trae edad (por ejemplo sobrevivientes).
+"""
+
+TAMANO_FRAGMENTO = 10_000
+
+
+class MortalidadGompertz:
+    """
+    Tabla de mortalidad de Gompertz: fuerza de mortalidad a * e^(b * edad).
+
+    Se usa como función: mortalidad(edad, genero) retorna la probabilidad
+    de morir durante el año a esa edad.
+    """
+
+    def __init__(self, a_hombres: float = 5e-5, a_mujeres: float = 3e-5, b: float = 0.1):
+        self.parametros = {"Hombre": a_hombres, "Mujer": a_mujeres}
+        self.a_sin_genero = (a_hombres + a_mujeres) / 2
+        self.b = b
+
+    def __call__(self, edad: float, genero: str | None) -> float:
+        a = self.parametros.get(genero, self.a_sin_genero)
+        b = self.b
+        # q = 1 - exp(-integral de la fuerza de mortalidad entre edad y edad + 1)
+        return min(1.0, 1 - math.exp(-a / b * math.exp(b * edad) * (math.exp(b) - 1)))
+
+
+class ResultadoProyeccion:
+    """
+    Totales por año de una proyección.
+
+    Atributos:
+    ----------
+    smmlv : list[float]
+        SMMLV proyectado de cada año.
+    pensionados_esperados : list[float]
+        Suma de las probabilidades de supervivencia de cada año.
+    mesada_esperada : list[float]
+        Suma de mesada × supervivencia de cada año (valor mensual).
+    flujo_anual : list[float]
+        mesada_esperada × mesadas por año.
+    valor_presente : float
+        Suma de los flujos anuales descontados (0 si no hay tasa de descuento).
+    pensionados : int
+        Solicitudes válidas proyectadas.
+    rechazados : int
+        Solicitudes inválidas (no se proyectan).
+    """
+
+    def __init__(self, anios: int):
+        self.smmlv = [0.0] * anios
+        self.pensionados_esperados = [0.0] * anios
+        self.mesada_esperada = [0.0] * anios
+        self.flujo_anual = [0.0] * anios
+        self.valor_presente = 0.0
+        self.pensionados = 0
+        self.rechazados = 0
+
+
+def _por_anio(valor, anios: int, nombre: str) -> list:
+    """
+    Convierte una tasa fija o una secuencia de tasas en una lista de anios - 1 valores.
+    """
+    if isinstance(valor, (int, float)):
+        return [float(valor)] * max(anios - 1, 0)
+
+    valores = [float(tasa) for tasa in islice(valor, max(anios - 1, 0))]
+    if len(valores) < anios - 1:
+        raise ValueError(f"{nombre} debe tener al menos {anios - 1} valores.")
+    return valores
+
+
+def proyectar_anios(
+    filas,
+    anios: int = ANIOS,
+    ipc=IPC,
+    crecimiento_smmlv=None,
+    mortalidad=None,
+    edad_sin_informar: int = EDAD_SIN_INFORMAR,
+    reglas: reglas_calcupension.ReglasPension | None = None
+):
+    """
+    Proyecta un grupo de solicitudes y genera un vector de mesadas por año.
+
+    Parámetros:
+    -----------
+    filas : iterable[tuple]
+        Datos de cada solicitud en el orden de SolicitudPension.
+    anios : int
+        Años a proyectar (el año 0 es el de la primera mesada).
+    ipc : float | secuencia de float
+        Inflación anual; ipc[t] se aplica al pasar del año t al t + 1.
+    crecimiento_smmlv : float | secuencia de float | None
+        Crecimiento anual del SMMLV, con el mismo formato. Por defecto, el IPC.
+    mortalidad : callable | None
+        mortalidad(edad, genero) -> probabilidad de morir en el año. Por
+        defecto MortalidadGompertz(). Con mortalidad=False no se pondera
+        por supervivencia.
+    edad_sin_informar : int
+        Edad usada para la mortalidad cuando la solicitud no trae edad.
+    reglas : ReglasPension | None
+        Versión de reglas a aplicar. Por defecto, las reglas vigentes.
+
+    Retorna:
+    --------
+    generator[tuple]:
+        (anio, smmlv, mesadas, supervivencia, codigos). mesadas y
+        supervivencia son array('d') con una posición por solicitud válida
+        y se actualizan en el lugar de un año al siguiente (copiarlos si se
+        necesitan después). codigos es el array('B') de calcular_lote para
+        todas las filas, para relacionar las posiciones con la entrada.
+    """
+    if reglas is None:
+        reglas = reglas_calcupension.REGLAS_VIGENTES
+    if mortalidad is None:
+        mortalidad = MortalidadGompertz()
+
+    ipc = _por_anio(ipc, anios, "ipc")
+    crecimiento_smmlv = ipc if crecimiento_smmlv is None else _por_anio(
+        crecimiento_smmlv, anios, "crecimiento_smmlv"
+    )
+
+    filas = list(filas)
+    if filas:
+        _, mesadas_iniciales, codigos = logica_calcupension.CalculadoraPension.calcular_lote(*zip(*filas), reglas)
+    else:
+        mesadas_iniciales, codigos = array("d"), array("B")
+
+    factores_minimos = {tipo: minima / reglas.smmlv for tipo, minima in reglas.mesadas_minimas.items()}
+
+    mesadas = array("d")
+    pisos = array("d")
+    edades = array("d")
+    generos = []
+    for fila, mesada, codigo in zip(filas, mesadas_iniciales, codigos):
+        if codigo != logica_calcupension.CODIGO_OK:
+            continue
+        tipo, _, _, genero, edad, _ = fila
+        mesadas.append(mesada)
+        pisos.append(factores_minimos.get(tipo, 0.0))
+        edades.append(edad_sin_informar if edad is None else edad)
+        generos.append(genero)
+
+    supervivencia = array("d", [1.0]) * len(mesadas)
+    # La mortalidad se evalúa una vez por año para cada grupo (edad inicial, género).
+    grupos = list(zip(edades, generos))
+    distintos = set(grupos)
+    smmlv = reglas.smmlv
+
+    for anio in range(anios):
+        if anio:
+            factor_ipc = 1 + ipc[anio - 1]
+            smmlv *= 1 + crecimiento_smmlv[anio - 1]
+
+            mesadas[:] = array("d", [
+                mesada if mesada >= piso else piso
+                for mesada, piso in zip(map(factor_ipc.__mul__, mesadas), map(smmlv.__mul__, pisos))
+            ])
+
+            if mortalidad:
+                sobrevive = {
+                    grupo: 1 - mortalidad(grupo[0] + anio - 1, grupo[1]) for grupo in distintos
+                }
+                supervivencia[:] = array("d", map(float.__mul__, supervivencia, map(sobrevive.__getitem__, grupos)))
+
+        yield anio, smmlv, mesadas, supervivencia, codigos
+
+
+def proyectar(
+    filas,
+    anios: int = ANIOS,
+    ipc=IPC,
+    crecimiento_smmlv=None,
+    mortalidad=None,
+    mesadas_por_anio: int = MESADAS_POR_ANIO,
+    tasa_descuento: float | None = None,
+    edad_sin_informar: int = EDAD_SIN_INFORMAR,
+    reglas: reglas_calcupension.ReglasPension | None = None,
+    tamano_fragmento: int = TAMANO_FRAGMENTO
+) -> ResultadoProyeccion:
+    """
+    Proyecta un portafolio completo y acumula los totales de cada año.
+
+    Las filas se leen y proyectan por fragmentos; la memoria usada depende
+    del tamaño del fragmento y del número de años, no de su producto por
+    el número de pensionados.
+
+    Parámetros:
+    -----------
+    filas : iterable[tuple]
+        Datos de cada solicitud en el orden de SolicitudPension.
+    mesadas_por_anio : int
+        Mesadas pagadas por año.
+    tasa_descuento : float | None
+        Tasa anual para el valor presente de los flujos (el año 0 no se descuenta).
+    Los demás parámetros son los de proyectar_anios.
+
+    Retorna:
+    --------
+    ResultadoProyeccion
+    """
+    if reglas is None:
+        reglas = reglas_calcupension.REGLAS_VIGENTES
+
+    ipc = _por_anio(ipc, anios, "ipc")
+    crecimiento_smmlv = ipc if crecimiento_smmlv is None else _por_anio(
+        crecimiento_smmlv, anios, "crecimiento_smmlv"
+    )
+
+    resultado = ResultadoProyeccion(anios)
+    smmlv = reglas.smmlv
+    for anio in range(anios):
+        if anio:
+            smmlv *= 1 + crecimiento_smmlv[anio - 1]
+        resultado.smmlv[anio] = smmlv
+
+    filas = iter(filas)
+
+    while True:
+        fragmento = list(islice(filas, tamano_fragmento))
+        if not fragmento:
+            break
+
+        proyeccion = proyectar_anios(
+            fragmento, anios, ipc, crecimiento_smmlv, mortalidad, edad_sin_informar, reglas
+        )
+        for anio, _, mesadas, supervivencia, codigos in proyeccion:
+            resultado.pensionados_esperados[anio] += math.fsum(supervivencia)
+            resultado.mesada_esperada[anio] += math.fsum(map(float.__mul__, mesadas, supervivencia))
+
+        validos = codigos.count(logica_calcupension.CODIGO_OK)
+        resultado.pensionados += validos
+        resultado.rechazados += len(codigos) - validos
+
+    for anio in range(anios):
+        resultado.flujo_anual[anio] = resultado.mesada_esperada[anio] * mesadas_por_anio
+        if tasa_descuento is not None:
+            resultado.valor_presente += resultado.flujo_anual[anio] / (1 + tasa_descuento) ** anio
+
+    return resultado
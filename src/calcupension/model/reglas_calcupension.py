@@ -0,0 +1,462 @@
+"""
+Reglas pensionales versionadas (por año o decreto).
+
+Cada versión se describe con un diccionario de parámetros (el mismo formato
+que se puede cargar desde un archivo JSON) y se compila una sola vez en un
+objeto ReglasPension con una función de tasa por tipo de pensión. Así el
+cálculo hace una búsqueda en un diccionario y la aritmética, y se pueden
+usar varias versiones a la vez sin cambiar el código.
+
+Formato:
+--------
+{
+    "version": "2026",
+    "smmlv": 1750905,
+    "semanas_minimas_vejez": 1300,
+    "edades_minimas": {"Hombre": 62, "Mujer": 57},
+    "pcl_minima_invalidez": 50,
+    "tipos": {
+        "<tipo>": {
+            "pendiente_ibl": ...,        # puntos que resta cada SMMLV de IBL
+            "semanas_umbral": ...,       # semanas a partir de las cuales hay incremento
+            "semanas_paso": ...,         # cada cuántas semanas se suma el incremento
+            "tope": ... | null,          # tasa máxima
+            "piso": ... | null,          # tasa mínima
+            "mesada_minima_smmlv": bool, # la mesada no puede ser menor al SMMLV
+            "bandas_pcl": [              # en orden; la última puede tener pcl_hasta null
+                {"pcl_hasta": ... | null, "base": ..., "incremento": ...}
+            ]
+        }
+    }
+}
+"""
+
+from bisect import bisect_left
+import math
+
+INFINITO = float("inf")
+
+REGLAS_2026 = {
+    "version": "2026",
+    "smmlv": 1_750_905,
+    "semanas_minimas_vejez": 1300,
+    "edades_minimas": {"Hombre": 62, "Mujer": 57},
+    "pcl_minima_invalidez": 50,
+    "tipos": {
+        "Vejez": {
+            "pendiente_ibl": 0.50,
+            "semanas_umbral": 1300,
+            "semanas_paso": 50,
+            "tope": 80,
+            "piso": 55,
+            "mesada_minima_smmlv": True,
+            "bandas_pcl": [
+                {"pcl_hasta": None, "base": 65.50, "incremento": 1.5},
+            ],
+        },
+        "Sobreviviente": {
+            "pendiente_ibl": 0,
+            "semanas_umbral": 500,
+            "semanas_paso": 50,
+            "tope": 75,
+            "piso": None,
+            "mesada_minima_smmlv": False,
+            "bandas_pcl": [
+                {"pcl_hasta": None, "base": 45, "incremento": 2},
+            ],
+        },
+        "Invalidez": {
+            "pendiente_ibl": 0,
+            "semanas_umbral": 500,
+            "semanas_paso": 50,
+            "tope": 75,
+            "piso": 45,
+            "mesada_minima_smmlv": False,
+            "bandas_pcl": [
+                {"pcl_hasta": 66, "base": 45, "incremento": 1.5},
+                {"pcl_hasta": None, "base": 54, "incremento": 2},
+            ],
+        },
+    },
+}
+
+VERSION_VIGENTE = "2026"
+
+DEFINICIONES = {"2026": REGLAS_2026}
+"""
+Definiciones de reglas disponibles, por versión.
+"""
+
+
+class TablaTasa:
+    """
+    Tabla de tramos lineales de la tasa de un tipo de pensión.
+
+    La tasa es lineal por tramos en cada variable, y cada tramo se guarda
+    explícitamente para evaluarlo con búsqueda binaria (bisect) en lugar
+    de recorrer condiciones:
+
+    1. Banda de PCL: `limites_pcl` son los pcl_hasta finitos; la banda es
+       la primera cuyo límite es mayor o igual a la PCL.
+    2. IBL: un único tramo, base - (IBL / SMMLV) * pendiente_ibl.
+    3. Semanas: `limites_semanas` separa los tramos de cada banda; cada
+       tramo (desde, paso, incremento, acumulado) suma
+       acumulado + (semanas - desde) / paso * incremento. El primer tramo
+       no suma nada.
+    4. Límites de la tasa: `limites_tasa` = (piso, tope); por debajo del
+       piso la tasa es el piso, por encima del tope es el tope. Son siempre
+       dos tramos constantes, así que se aplican con dos comparaciones.
+
+    Las operaciones se hacen en el mismo orden que la regla escrita, por lo
+    que el resultado es el mismo bit a bit. Un régimen nuevo o de
+    transición agrega tramos a la tabla, no condiciones al cálculo.
+
+    Atributos:
+    ----------
+    tipo : str
+    smmlv : float
+    pendiente_ibl : float
+    limites_pcl : tuple[float, ...]
+    bandas : tuple[tuple[float, tuple, tuple], ...]
+        (base, limites_semanas, tramos_semanas) por banda de PCL.
+    limites_tasa : tuple[float, float]
+        (piso, tope); -inf o inf si no hay límite.
+    """
+
+    def __init__(self, tipo: str, parametros: dict, smmlv: float):
+        """
+        Parámetros:
+        -----------
+        tipo : str
+        parametros : dict
+            Parámetros del tipo en el formato descrito en el módulo.
+        smmlv : float
+
+        Raises:
+        -------
+        ValueError:
+            Si las bandas de PCL no están en orden creciente o si solo la
+            última no tiene pcl_hasta.
+        """
+        self.tipo = tipo
+        self.smmlv = smmlv
+        self.pendiente_ibl = parametros["pendiente_ibl"]
+
+        limites_pcl = [banda["pcl_hasta"] for banda in parametros["bandas_pcl"]]
+        if None in limites_pcl[:-1] or limites_pcl[:-1] != sorted(limites_pcl[:-1]):
+            raise ValueError(f"Las bandas de PCL de {tipo} deben estar en orden creciente.")
+        if limites_pcl[-1] is None:
+            limites_pcl.pop()
+        self.limites_pcl = tuple(limites_pcl)
+
+        umbral = parametros["semanas_umbral"]
+        paso = parametros["semanas_paso"]
+        self.bandas = tuple(
+            (banda["base"], (umbral,), (None, (umbral, paso, banda["incremento"], 0)))
+            for banda in parametros["bandas_pcl"]
+        )
+
+        self.limites_tasa = (
+            -INFINITO if parametros["piso"] is None else parametros["piso"],
+            INFINITO if parametros["tope"] is None else parametros["tope"],
+        )
+
+    def indice_banda(self, porcentaje_perdida_capacidad_laboral: float) -> int:
+        """
+        Índice en `bandas` de la banda que aplica a una PCL (ver indice_banda_pcl).
+        """
+        return indice_banda_pcl(self.limites_pcl, porcentaje_perdida_capacidad_laboral)
+
+    def tramos(self) -> list:
+        """
+        Tramos de la tabla, uno por banda de PCL y tramo de semanas.
+
+        Cada tramo indica los rangos de PCL (pcl_desde excluido, pcl_hasta
+        incluido) y de semanas (semanas_desde excluido, semanas_hasta
+        incluido) en los que aplica y su tasa sin límites:
+        ordenada + pendiente_semanas * (semanas - semanas_desde)
+        + pendiente_ibl_smmlv * IBL / SMMLV, que luego se lleva al piso o al
+        tope. None en un extremo significa sin límite.
+        """
+        tramos = []
+        pcl_desde = None
+        for indice, (base, limites_semanas, tramos_semanas) in enumerate(self.bandas):
+            pcl_hasta = self.limites_pcl[indice] if indice < len(self.limites_pcl) else None
+            semanas_desde = None
+            for numero, tramo in enumerate(tramos_semanas):
+                semanas_hasta = limites_semanas[numero] if numero < len(limites_semanas) else None
+                if tramo is None:
+                    ordenada, pendiente_semanas = base, 0
+                else:
+                    _, paso, incremento, acumulado = tramo
+                    ordenada, pendiente_semanas = base + acumulado, incremento / paso
+                tramos.append({
+                    "pcl_desde": pcl_desde,
+                    "pcl_hasta": pcl_hasta,
+                    "semanas_desde": semanas_desde,
+                    "semanas_hasta": semanas_hasta,
+                    "ordenada": ordenada,
+                    "pendiente_semanas": pendiente_semanas,
+                    "pendiente_ibl_smmlv": -self.pendiente_ibl,
+                })
+                semanas_desde = semanas_hasta
+            pcl_desde = pcl_hasta
+        return tramos
+
+    def como_dict(self) -> dict:
+        """
+        La tabla como diccionario serializable en JSON, para inspección o auditoría.
+        """
+        piso, tope = self.limites_tasa
+        return {
+            "tipo": self.tipo,
+            "smmlv": self.smmlv,
+            "piso": piso if math.isfinite(piso) else None,
+            "tope": tope if math.isfinite(tope) else None,
+            "tramos": self.tramos(),
+        }
+
+    def como_texto(self) -> str:
+        """
+        La tabla en texto, un tramo por línea.
+        """
+        def rango(desde, hasta) -> str:
+            return f"({'-inf' if desde is None else desde}, {'inf' if hasta is None else hasta}]"
+
+        datos = self.como_dict()
+        lineas = [f"{self.tipo}: piso {datos['piso']}, tope {datos['tope']}, SMMLV {self.smmlv}"]
+        for tramo in datos["tramos"]:
+            formula = f"{tramo['ordenada']}"
+            if tramo["pendiente_semanas"]:
+                formula += f" + {tramo['pendiente_semanas']} * (semanas - {tramo['semanas_desde']})"
+            if tramo["pendiente_ibl_smmlv"]:
+                formula += f" - {-tramo['pendiente_ibl_smmlv']} * IBL/SMMLV"
+            lineas.append(
+                f"  PCL {rango(tramo['pcl_desde'], tramo['pcl_hasta'])}, "
+                f"semanas {rango(tramo['semanas_desde'], tramo['semanas_hasta'])}: {formula}"
+            )
+        return "\n".join(lineas)
+
+
+def indice_banda_pcl(limites_pcl: tuple, porcentaje_perdida_capacidad_laboral: float) -> int:
+    """
+    Índice de la banda de PCL que aplica según los límites de una TablaTasa.
+
+    Es la primera banda cuyo límite es mayor o igual a la PCL. Una PCL NaN
+    no cumple ninguna comparación y queda en la última banda, igual que
+    con las condiciones de la regla escrita. Toda selección de banda
+    (cálculo y cachés) debe pasar por aquí para que no diverjan.
+    """
+    if porcentaje_perdida_capacidad_laboral == porcentaje_perdida_capacidad_laboral:
+        return bisect_left(limites_pcl, porcentaje_perdida_capacidad_laboral)
+    return len(limites_pcl)
+
+
+def _compilar_tasa(tabla: TablaTasa):
+    """
+    Compila una tabla de tramos en una función de tasa.
+
+    La función recibe (ingreso_base_liquidacion, semanas,
+    porcentaje_perdida_capacidad_laboral) ya validados y retorna la tasa
+    de reemplazo en porcentaje.
+    """
+    smmlv = tabla.smmlv
+    pendiente = tabla.pendiente_ibl
+    limites_pcl = tabla.limites_pcl
+    bandas = tabla.bandas
+    ultima_banda = bandas[-1]
+    piso, tope = tabla.limites_tasa
+
+    def tasa(ingreso_base_liquidacion: float, semanas: int, porcentaje_perdida_capacidad_laboral: float):
+        if limites_pcl:
+            base, limites_semanas, tramos_semanas = bandas[
+                indice_banda_pcl(limites_pcl, porcentaje_perdida_capacidad_laboral)
+            ]
+        else:
+            base, limites_semanas, tramos_semanas = ultima_banda
+
+        if pendiente:
+            tasa_total = base - (ingreso_base_liquidacion / smmlv) * pendiente
+        else:
+            tasa_total = base
+
+        tramo = tramos_semanas[bisect_left(limites_semanas, semanas)]
+        if tramo is not None:
+            desde, paso, incremento, acumulado = tramo
+            tasa_total = (tasa_total + acumulado) + (semanas - desde) / paso * incremento
+
+        if tasa_total > tope:
+            tasa_total = tope
+        elif tasa_total < piso:
+            tasa_total = piso
+
+        return tasa_total
+
+    return tasa
+
+
+class ReglasPension:
+    """
+    Versión compilada de una definición de reglas pensionales.
+
+    Atributos:
+    ----------
+    version : str
+    smmlv : float
+    semanas_minimas_vejez : int
+    edades_minimas : dict[str, int]
+    pcl_minima_invalidez : float
+    tablas : dict[str, TablaTasa]
+        Tabla de tramos de la tasa por tipo de pensión.
+    tasas : dict[str, callable]
+        Función de tasa por tipo de pensión, compilada desde su tabla.
+    mesadas_minimas : dict[str, float]
+        Mesada mínima por tipo (solo los tipos con mesada_minima_smmlv).
+    definicion : dict
+        Parámetros originales, para inspección o exportación.
+    huella : str
+        Hash de la definición completa (ver la propiedad).
+    """
+
+    def __init__(self, definicion: dict):
+        """
+        Parámetros:
+        -----------
+        definicion : dict
+            Parámetros de la versión en el formato descrito en el módulo.
+        """
+        self.definicion = definicion
+        self.version = str(definicion["version"])
+        self.smmlv = definicion["smmlv"]
+        self.semanas_minimas_vejez = definicion["semanas_minimas_vejez"]
+        self.edades_minimas = dict(definicion["edades_minimas"])
+        self.pcl_minima_invalidez = definicion["pcl_minima_invalidez"]
+
+        self.tablas = {
+            tipo: TablaTasa(tipo, parametros, self.smmlv)
+            for tipo, parametros in definicion["tipos"].items()
+        }
+        self.tasas = {tipo: _compilar_tasa(tabla) for tipo, tabla in self.tablas.items()}
+        self.mesadas_minimas = {
+            tipo: self.smmlv
+            for tipo, parametros in definicion["tipos"].items()
+            if parametros["mesada_minima_smmlv"]
+        }
+        self._huella = None
+
+    @property
+    def huella(self) -> str:
+        """
+        Hash de todos los parámetros de la definición.
+
+        A diferencia de `version`, cambia si se registra otra definición con
+        el mismo nombre de versión, así que sirve para identificar
+        resultados guardados. Se calcula la primera vez que se usa.
+        """
+        if self._huella is None:
+            import hashlib
+            import json
+
+            texto = json.dumps(self.definicion, sort_keys=True, ensure_ascii=False)
+            self._huella = hashlib.blake2b(texto.encode(), digest_size=16).hexdigest()
+        return self._huella
+
+    def __reduce__(self):
+        # Las funciones compiladas no se pueden serializar; se recompilan al deserializar.
+        return ReglasPension, (self.definicion,)
+
+    def __repr__(self) -> str:
+        return f"ReglasPension(version={self.version!r}, smmlv={self.smmlv!r})"
+
+
+_COMPILADAS = {}
+
+
+def registrar_reglas(definicion: dict) -> ReglasPension:
+    """
+    Compila una definición y la deja disponible por su versión.
+
+    Si ya existía una versión con el mismo nombre, se reemplaza.
+    """
+    reglas = ReglasPension(definicion)
+    DEFINICIONES[reglas.version] = definicion
+    _COMPILADAS[reglas.version] = reglas
+    return reglas
+
+
+def obtener_reglas(version: str | None = None) -> ReglasPension:
+    """
+    Retorna las reglas compiladas de una versión (por defecto, la vigente).
+
+    Cada versión se compila una sola vez.
+
+    Raises:
+    -------
+    KeyError:
+        Si la versión no está registrada.
+    """
+    if version is None:
+        return REGLAS_VIGENTES
+
+    reglas = _COMPILADAS.get(version)
+    if reglas is None:
+        reglas = _COMPILADAS[version] = ReglasPension(DEFINICIONES[version])
+    return reglas
+
+
+def cargar_reglas(ruta: str) -> ReglasPension:
+    """
+    Carga una definición de reglas desde un archivo JSON y la registra.
+    """
+    import json
+
+    with open(ruta, encoding="utf-8") as archivo:
+        return registrar_reglas(json.load(archivo))
+
+
+def exportar_tablas(reglas: ReglasPension | None = None, ruta: str | None = None) -> dict:
+    """
+    Exporta las tablas de tramos de una versión de reglas (por defecto, la vigente).
+
+    Si se indica `ruta`, además las escribe en un archivo JSON.
+
+    Retorna:
+    --------
+    dict:
+        {"version": ..., "tipos": {tipo: TablaTasa.como_dict()}}
+    """
+    import json
+
+    if reglas is None:
+        reglas = REGLAS_VIGENTES
+    datos = {
+        "version": reglas.version,
+        "tipos": {tipo: tabla.como_dict() for tipo, tabla in reglas.tablas.items()},
+    }
+    if ruta is not None:
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            json.dump(datos, archivo, ensure_ascii=False, indent=2)
+    return datos
+
+
+def establecer_reglas_vigentes(reglas: ReglasPension | str) -> ReglasPension:
+    """
+    Cambia las reglas que usa la calculadora cuando no se indican explícitamente.
+
+    Parámetros:
+    -----------
+    reglas : ReglasPension | str
+        Reglas compiladas o versión registrada.
+    """
+    global REGLAS_VIGENTES
+
+    if isinstance(reglas, str):
+        reglas = obtener_reglas(reglas)
+    REGLAS_VIGENTES = reglas
+    return reglas
+
+
+REGLAS_VIGENTES = obtener_reglas(VERSION_VIGENTE)
+"""
+Reglas usadas por CalculadoraPension cuando no se pasan reglas explícitas.
+"""
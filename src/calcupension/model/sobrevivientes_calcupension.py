@@ -0,0 +1,361 @@
+"""
+Reparto de la pensión de sobrevivientes entre los beneficiarios de un hogar.
+
+Cada fallecimiento genera una mesada de sobreviviente (calculada con
+CalculadoraPension) que se reparte entre cónyuges o compañeros, hijos y
+padres según quiénes tengan derecho en cada momento:
+
+- Con cónyuges e hijos, la mitad es para los cónyuges y la mitad para los
+  hijos, en partes iguales dentro de cada grupo.
+- Si solo hay cónyuges o solo hay hijos, el grupo recibe toda la mesada.
+- Los padres solo reciben si no hay cónyuges ni hijos con derecho.
+
+Cuando un beneficiario pierde el derecho (por ejemplo un hijo que cumple
+la edad límite), su parte acrece la de los demás. Cada beneficiario tiene
+una ventana de derecho [desde, hasta) en meses contados desde el
+fallecimiento. En lugar de recorrer mes a mes, el reparto ordena las
+entradas y salidas de los beneficiarios y solo recalcula las partes en
+esos meses, de modo que el costo depende del número de beneficiarios y no
+de la duración de la pensión.
+"""
+
+from functools import partial
+
+from calcupension.model import logica_calcupension
+from calcupension.model import paralelo_calcupension
+from calcupension.model import reglas_calcupension
+
+
+CONYUGE = "Conyuge"
+HIJO = "Hijo"
+PADRE = "Padre"
+
+PARENTESCOS = (CONYUGE, HIJO, PADRE)
+
+PORCION_CONYUGES_CON_HIJOS = 0.5
+"""
+Parte de la mesada para los cónyuges cuando también hay hijos con derecho.
+"""
+
+TAMANO_FRAGMENTO = 10_000
+"""
+Hogares por lote de cálculo (y por tarea cuando se usan varios procesos).
+"""
+
+
+class Beneficiario:
+    """
+    Beneficiario de una pensión de sobrevivientes.
+
+    Atributos:
+    ----------
+    identificador : str
+    parentesco : str
+        CONYUGE, HIJO o PADRE.
+    desde : int
+        Primer mes con derecho, contado desde el fallecimiento (mes 0).
+    hasta : int | None
+        Primer mes sin derecho, o None si el derecho no termina.
+    """
+
+    __slots__ = ("identificador", "parentesco", "desde", "hasta")
+
+    def __init__(self, identificador: str, parentesco: str, desde: int = 0, hasta: int | None = None):
+        """
+        Raises:
+        -------
+        ValueError:
+            Si el parentesco no existe, desde es negativo o hasta no es mayor que desde.
+        """
+        if parentesco not in PARENTESCOS:
+            raise ValueError(f"Parentesco inválido: {parentesco}")
+        if desde < 0:
+            raise ValueError(f"El mes de inicio no puede ser negativo: {desde}")
+        if hasta is not None and hasta <= desde:
+            raise ValueError(f"El derecho de {identificador} termina antes de empezar ({desde}, {hasta}).")
+        self.identificador = identificador
+        self.parentesco = parentesco
+        self.desde = desde
+        self.hasta = hasta
+
+    def __repr__(self) -> str:
+        return f"Beneficiario({self.identificador!r}, {self.parentesco!r}, {self.desde!r}, {self.hasta!r})"
+
+
+class Tramo:
+    """
+    Periodo [desde, hasta) en el que un beneficiario recibe la misma mesada.
+
+    Atributos:
+    ----------
+    beneficiario : str
+        Identificador del beneficiario.
+    desde : int
+    hasta : int | None
+        None si el tramo no termina.
+    porcion : float
+        Parte de la mesada total (entre 0 y 1).
+    mesada : float
+    """
+
+    __slots__ = ("beneficiario", "desde", "hasta", "porcion", "mesada")
+
+    def __init__(self, beneficiario: str, desde: int, hasta: int | None, porcion: float, mesada: float):
+        self.beneficiario = beneficiario
+        self.desde = desde
+        self.hasta = hasta
+        self.porcion = porcion
+        self.mesada = mesada
+
+    def como_tupla(self) -> tuple:
+        return self.beneficiario, self.desde, self.hasta, self.porcion, self.mesada
+
+    def __repr__(self) -> str:
+        return f"Tramo{self.como_tupla()!r}"
+
+
+class ResultadoHogar:
+    """
+    Reparto de la pensión de un hogar.
+
+    Atributos:
+    ----------
+    codigo : int
+        CODIGO_OK, o el código de la validación que falla en la solicitud
+        del fallecido (CODIGO_ERROR_TIPO si no es de tipo Sobreviviente).
+    tasa : float | None
+    mesada : float | None
+        Mesada total del hogar (None si la solicitud no es válida).
+    tramos : list[Tramo]
+        Línea de tiempo de mesadas por beneficiario, ordenada por mes de
+        inicio y luego por el orden de los beneficiarios.
+    """
+
+    __slots__ = ("codigo", "tasa", "mesada", "tramos")
+
+    def __init__(self, codigo: int, tasa: float | None = None, mesada: float | None = None, tramos: list | None = None):
+        self.codigo = codigo
+        self.tasa = tasa
+        self.mesada = mesada
+        self.tramos = tramos or []
+
+    def mesadas_en(self, mes: int) -> dict:
+        """
+        Mesada de cada beneficiario con derecho en un mes.
+        """
+        return {
+            tramo.beneficiario: tramo.mesada
+            for tramo in self.tramos
+            if tramo.desde <= mes and (tramo.hasta is None or mes < tramo.hasta)
+        }
+
+    def como_dict(self) -> dict:
+        return {
+            "codigo": self.codigo,
+            "tasa": self.tasa,
+            "mesada": self.mesada,
+            "tramos": [
+                dict(zip(Tramo.__slots__, tramo.como_tupla()))
+                for tramo in self.tramos
+            ],
+        }
+
+
+def porciones(conyuges: int, hijos: int, padres: int) -> tuple:
+    """
+    Parte de la mesada de cada beneficiario según cuántos tienen derecho en cada parentesco.
+
+    Retorna:
+    --------
+    tuple[float, float, float]:
+        Parte de cada cónyuge, cada hijo y cada padre, en el orden de
+        PARENTESCOS (0 si el parentesco no recibe).
+    """
+    if conyuges and hijos:
+        return PORCION_CONYUGES_CON_HIJOS / conyuges, (1 - PORCION_CONYUGES_CON_HIJOS) / hijos, 0.0
+    if conyuges:
+        return 1 / conyuges, 0.0, 0.0
+    if hijos:
+        return 0.0, 1 / hijos, 0.0
+    if padres:
+        return 0.0, 0.0, 1 / padres
+    return 0.0, 0.0, 0.0
+
+
+_GRUPOS = {parentesco: posicion for posicion, parentesco in enumerate(PARENTESCOS)}
+
+
+def repartir(mesada: float, beneficiarios: list) -> list:
+    """
+    Línea de tiempo de mesadas por beneficiario para una mesada total.
+
+    Ordena los meses en que algún beneficiario entra o sale y recalcula
+    las partes solo en esos meses. Un beneficiario que sigue con la misma
+    parte conserva su tramo.
+
+    Parámetros:
+    -----------
+    mesada : float
+        Mesada total del hogar.
+    beneficiarios : list[Beneficiario]
+
+    Retorna:
+    --------
+    list[Tramo]:
+        Ordenados por mes de inicio y luego por el orden de los beneficiarios.
+    """
+    eventos = []
+    for indice, beneficiario in enumerate(beneficiarios):
+        eventos.append((beneficiario.desde, indice))
+        if beneficiario.hasta is not None:
+            eventos.append((beneficiario.hasta, indice))
+    eventos.sort()
+
+    # Beneficiarios con derecho por parentesco, con el inicio de su tramo abierto.
+    grupos = ({}, {}, {})
+    activos = [0, 0, 0]
+    partes = (0.0, 0.0, 0.0)
+    tramos = []
+    total = len(eventos)
+    posicion = 0
+
+    while posicion < total:
+        mes = eventos[posicion][0]
+        entradas = []
+        while posicion < total and eventos[posicion][0] == mes:
+            indice = eventos[posicion][1]
+            numero = _GRUPOS[beneficiarios[indice].parentesco]
+            grupo = grupos[numero]
+            if indice in grupo:
+                desde = grupo.pop(indice)
+                if partes[numero]:
+                    tramos.append((desde, indice, mes, partes[numero]))
+                activos[numero] -= 1
+            else:
+                entradas.append((indice, grupo))
+                activos[numero] += 1
+            posicion += 1
+
+        nuevas = porciones(*activos)
+        if nuevas != partes:
+            for grupo, anterior, nueva in zip(grupos, partes, nuevas):
+                if nueva != anterior:
+                    # Cambió la parte del grupo: se cierran los tramos de quienes siguen.
+                    for indice, desde in grupo.items():
+                        if anterior:
+                            tramos.append((desde, indice, mes, anterior))
+                        grupo[indice] = mes
+            partes = nuevas
+        for indice, grupo in entradas:
+            grupo[indice] = mes
+
+    for grupo, parte in zip(grupos, partes):
+        if parte:
+            for indice, desde in grupo.items():
+                tramos.append((desde, indice, None, parte))
+
+    # (desde, indice) no se repite, así que el orden no compara los demás campos.
+    tramos.sort()
+    return [
+        Tramo(beneficiarios[indice].identificador, desde, hasta, porcion, mesada * porcion)
+        for desde, indice, hasta, porcion in tramos
+    ]
+
+
+def _fila(solicitud) -> tuple:
+    """
+    Datos de una solicitud (SolicitudPension, VistaSolicitud o tupla) en el orden de SolicitudPension.
+    """
+    if isinstance(solicitud, tuple):
+        return solicitud
+    return (
+        solicitud.tipo,
+        solicitud.ingreso_base_liquidacion,
+        solicitud.semanas,
+        solicitud.genero,
+        solicitud.edad,
+        solicitud.porcentaje_perdida_capacidad_laboral,
+    )
+
+
+def _asignar_fragmento(fragmento: list, reglas: reglas_calcupension.ReglasPension) -> list:
+    """
+    Calcula las mesadas de un fragmento de (fila, beneficiarios) en un lote y reparte cada una.
+    """
+    filas = [fila for fila, _ in fragmento]
+    tasas, mesadas, codigos = logica_calcupension.CalculadoraPension.calcular_lote(*zip(*filas), reglas)
+
+    resultados = []
+    for i, (fila, beneficiarios) in enumerate(fragmento):
+        codigo = codigos[i]
+        if not codigo and fila[0] != "Sobreviviente":
+            codigo = logica_calcupension.CODIGO_ERROR_TIPO
+        if codigo:
+            resultados.append(ResultadoHogar(codigo))
+            continue
+        resultados.append(ResultadoHogar(codigo, tasas[i], mesadas[i], repartir(mesadas[i], beneficiarios)))
+    return resultados
+
+
+def asignar(
+    solicitud,
+    beneficiarios: list,
+    reglas: reglas_calcupension.ReglasPension | None = None
+) -> ResultadoHogar:
+    """
+    Reparte la pensión de sobrevivientes de un fallecido entre sus beneficiarios.
+
+    Parámetros:
+    -----------
+    solicitud : SolicitudPension | VistaSolicitud | tuple
+        Solicitud de tipo Sobreviviente con los datos del fallecido.
+    beneficiarios : list[Beneficiario]
+    reglas : ReglasPension | None
+        Versión de reglas a aplicar. Por defecto, las reglas vigentes.
+    """
+    if reglas is None:
+        reglas = reglas_calcupension.REGLAS_VIGENTES
+    return _asignar_fragmento([(_fila(solicitud), beneficiarios)], reglas)[0]
+
+
+def asignar_lote(
+    hogares,
+    procesos: int | None = 1,
+    tamano_fragmento: int = TAMANO_FRAGMENTO,
+    reglas: reglas_calcupension.ReglasPension | None = None
+):
+    """
+    Reparte la pensión de muchos hogares.
+
+    Las mesadas totales se calculan con calcular_lote por fragmentos de
+    hogares y cada hogar se reparte con un barrido de sus eventos.
+
+    Parámetros:
+    -----------
+    hogares : iterable[tuple]
+        (solicitud, beneficiarios) por hogar; la solicitud puede ser una
+        SolicitudPension o una tupla en el mismo orden.
+    procesos : int | None
+        Procesos del pool. Con 1 (por defecto) todo se calcula en el
+        proceso actual; None usa todos los núcleos.
+    tamano_fragmento : int
+        Hogares por fragmento.
+    reglas : ReglasPension | None
+        Versión de reglas a aplicar. Por defecto, las reglas vigentes.
+
+    Retorna:
+    --------
+    generator[ResultadoHogar]:
+        Un resultado por hogar, en el orden de entrada.
+    """
+    if reglas is None:
+        reglas = reglas_calcupension.REGLAS_VIGENTES
+
+    ejecutor = paralelo_calcupension.EjecutorParalelo(procesos)
+    funcion = partial(_asignar_fragmento, reglas=reglas)
+    fragmentos = paralelo_calcupension.fragmentar(
+        ((_fila(solicitud), beneficiarios) for solicitud, beneficiarios in hogares), tamano_fragmento
+    )
+
+    for _, resultados in ejecutor.mapear(funcion, fragmentos):
+        yield from resultados
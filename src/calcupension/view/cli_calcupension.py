@@ -0,0 +1,206 @@
+"""
+Línea de comandos de un solo cálculo para el sistema de cálculo pensional.
+
+Pensada para ser lanzada como subproceso: calcula un caso a partir de
+opciones, imprime el resultado en JSON y termina. Solo importa lo que el
+cálculo necesita, para que el arranque sea rápido.
+
+Uso:
+----
+    calcupension --tipo Vejez --ibl 3000000 --semanas 1300 --genero Hombre --edad 62
+    calcupension servidor < solicitudes.jsonl
+
+En modo servidor lee una solicitud JSON por línea (con los mismos campos
+del modo masivo y un "id" opcional que se devuelve tal cual) y responde
+una línea JSON por solicitud, sin cerrar el proceso entre casos.
+
+Las respuestas son JSON estricto: un IBL o una PCL no finitos ("nan",
+"inf") son datos de entrada inválidos, y en modo servidor también se
+rechazan las constantes NaN e Infinity de JSON.
+
+Códigos de salida:
+------------------
+0: cálculo exitoso. 1: la solicitud no cumple una validación.
+2: opciones o datos de entrada inválidos.
+"""
+
+import json
+import sys
+
+from calcupension.model import logica_calcupension
+from calcupension.model import reglas_calcupension
+from calcupension.view.consola_calcupension import MENSAJES_ERROR, MENSAJE_ENTRADA_INVALIDA
+from calcupension.view.registro_calcupension import convertir_registro
+
+
+OPCIONES = {
+    "--tipo": "tipo",
+    "--ibl": "ingreso_base_liquidacion",
+    "--semanas": "semanas",
+    "--genero": "genero",
+    "--edad": "edad",
+    "--pcl": "porcentaje_perdida_capacidad_laboral",
+    "--reglas": "reglas",
+}
+"""
+Opción de línea de comandos -> campo del registro.
+"""
+
+AYUDA = """Uso:
+  calcupension --tipo TIPO --ibl IBL --semanas SEMANAS [--genero GENERO]
+               [--edad EDAD] [--pcl PCL] [--reglas VERSION]
+  calcupension servidor [--reglas VERSION]
+
+Calcula tasa de reemplazo y mesada e imprime el resultado en JSON.
+En modo servidor lee una solicitud JSON por línea desde la entrada estándar."""
+
+SALIDA_OK = 0
+
+SALIDA_ERROR_VALIDACION = 1
+
+SALIDA_ERROR_USO = 2
+
+
+def leer_opciones(argumentos: list) -> dict:
+    """
+    Convierte la lista de argumentos en un registro (campo -> texto).
+
+    Acepta "--opcion valor" y "--opcion=valor".
+
+    Raises:
+    -------
+    ValueError:
+        Si una opción es desconocida o no tiene valor.
+    """
+    registro = {}
+    argumentos = iter(argumentos)
+
+    for argumento in argumentos:
+        opcion, igual, valor = argumento.partition("=")
+        campo = OPCIONES.get(opcion)
+        if campo is None:
+            raise ValueError(f"Opción desconocida: {opcion}")
+
+        if not igual:
+            valor = next(argumentos, None)
+            if valor is None:
+                raise ValueError(f"Falta el valor de {opcion}")
+        registro[campo] = valor
+
+    return registro
+
+
+def calcular_registro(registro: dict, reglas: reglas_calcupension.ReglasPension | None = None) -> tuple:
+    """
+    Calcula un registro y retorna (código de salida, respuesta JSON).
+
+    Parámetros:
+    -----------
+    registro : dict
+        Campos de la solicitud (texto o valores JSON) y un "id" opcional.
+    reglas : ReglasPension | None
+        Versión de reglas a aplicar. Por defecto, las reglas vigentes.
+
+    Retorna:
+    --------
+    tuple[int, dict]:
+        {"tasa_reemplazo": ..., "mesada": ...} o
+        {"error": {"codigo": ..., "mensaje": ...}}.
+    """
+    respuesta = {"id": registro["id"]} if isinstance(registro, dict) and "id" in registro else {}
+
+    try:
+        solicitud = logica_calcupension.SolicitudPension(*convertir_registro(registro))
+    except (AttributeError, KeyError, TypeError, ValueError):
+        respuesta["error"] = {"codigo": "EntradaInvalida", "mensaje": MENSAJE_ENTRADA_INVALIDA}
+        return SALIDA_ERROR_USO, respuesta
+
+    try:
+        tasa = logica_calcupension.CalculadoraPension.calcular_tasa_reemplazo(solicitud, reglas)
+        mesada = logica_calcupension.CalculadoraPension.calcular_pension(
+            tasa, solicitud.ingreso_base_liquidacion, solicitud.tipo, reglas
+        )
+    except tuple(MENSAJES_ERROR) as error:
+        respuesta["error"] = {"codigo": type(error).__name__, "mensaje": MENSAJES_ERROR[type(error)]}
+        return SALIDA_ERROR_VALIDACION, respuesta
+
+    respuesta["tasa_reemplazo"] = tasa
+    respuesta["mesada"] = mesada
+    return SALIDA_OK, respuesta
+
+
+def _rechazar_constante(constante: str):
+    """
+    Rechaza NaN, Infinity y -Infinity al leer JSON (json.loads los acepta por defecto).
+    """
+    raise ValueError(f"Valor JSON no válido: {constante}")
+
+
+def servidor(entrada, salida, reglas: reglas_calcupension.ReglasPension | None = None) -> int:
+    """
+    Atiende solicitudes JSON por línea hasta que se cierre la entrada.
+
+    Cada respuesta se escribe y se vacía de inmediato, para que el proceso
+    que llama pueda esperar la respuesta de cada caso.
+    """
+    for linea in entrada:
+        if not linea.strip():
+            continue
+
+        try:
+            registro = json.loads(linea, parse_constant=_rechazar_constante)
+        except ValueError:
+            respuesta = {"error": {"codigo": "EntradaInvalida", "mensaje": MENSAJE_ENTRADA_INVALIDA}}
+        else:
+            _, respuesta = calcular_registro(registro, reglas)
+
+        salida.write(json.dumps(respuesta, ensure_ascii=False, allow_nan=False) + "\n")
+        salida.flush()
+
+    return SALIDA_OK
+
+
+def main(argumentos: list | None = None) -> int:
+    """
+    Función principal de la línea de comandos.
+
+    Retorna:
+    --------
+    int:
+        Código de salida del proceso.
+    """
+    if argumentos is None:
+        argumentos = sys.argv[1:]
+
+    if "-h" in argumentos or "--help" in argumentos:
+        print(AYUDA)
+        return SALIDA_OK
+
+    modo_servidor = bool(argumentos) and argumentos[0] == "servidor"
+    if modo_servidor:
+        argumentos = argumentos[1:]
+
+    try:
+        registro = leer_opciones(argumentos)
+        version = registro.pop("reglas", None)
+        reglas = reglas_calcupension.obtener_reglas(version)
+    except (KeyError, ValueError) as error:
+        print(f"{error}\n\n{AYUDA}", file=sys.stderr)
+        return SALIDA_ERROR_USO
+
+    if modo_servidor:
+        if registro:
+            print(f"El modo servidor solo acepta --reglas.\n\n{AYUDA}", file=sys.stderr)
+            return SALIDA_ERROR_USO
+        return servidor(sys.stdin, sys.stdout, reglas)
+
+    codigo, respuesta = calcular_registro(registro, reglas)
+    print(json.dumps(respuesta, ensure_ascii=False, allow_nan=False))
+    return codigo
+
+
+if __name__ == "__main__":
+    """
+    Punto de entrada de la línea de comandos.
+    """
+    sys.exit(main())
@@ -18,9 +18,26 @@ Dependencias:
 - Módulo logica_calcupension (modelo del sistema)
 """
 
-import sys
-sys.path.append("src")
-from model import logica_calcupension
+from calcupension.model import logica_calcupension
+
+
+MENSAJES_ERROR = {
+    logica_calcupension.ErrorIBL: "Error: El Ingreso Base de Liquidación debe ser mayor a 0.",
+    logica_calcupension.ErrorSemanasCotizadas: "Error: No cumple con las 1300 semanas mínimas.",
+    logica_calcupension.ErrorEdadMinimaHombres: "Error: Hombre menor de 62 años.",
+    logica_calcupension.ErrorEdadMinimaMujeres: "Error: Mujer menor de 57 años.",
+    logica_calcupension.ErrorPCLInvalidez: (
+        "Error: El Porcentaje de Pérdida de Capacidad Laboral debe ser mayor al 50%."
+    ),
+    logica_calcupension.ErrorTipoPension: "Error: Tipo de pensión inválido.",
+    logica_calcupension.ErrorGenero: "Error: Género inválido.",
+    logica_calcupension.ErrorValoresNegativos: "Error: No se permiten valores negativos.",
+}
+"""
+Mensaje mostrado al usuario por cada excepción personalizada del modelo.
+"""
+
+MENSAJE_ENTRADA_INVALIDA = "Error: Entrada inválida. Verifique los datos."
 
 
 def mostrar_menu_principal():
@@ -189,32 +206,11 @@ def main():
         # =========================
         # MANEJO DE ERRORES
         # =========================
-        except logica_calcupension.ErrorIBL:
-            print("Error: El Ingreso Base de Liquidación debe ser mayor a 0.")
-
-        except logica_calcupension.ErrorSemanasCotizadas:
-            print("Error: No cumple con las 1300 semanas mínimas.")
-
-        except logica_calcupension.ErrorEdadMinimaHombres:
-            print("Error: Hombre menor de 62 años.")
-
-        except logica_calcupension.ErrorEdadMinimaMujeres:
-            print("Error: Mujer menor de 57 años.")
-
-        except logica_calcupension.ErrorPCLInvalidez:
-            print("Error: El Porcentaje de Pérdida de Capacidad Laboral debe ser mayor al 50%.")
-
-        except logica_calcupension.ErrorTipoPension:
-            print("Error: Tipo de pensión inválido.")
-
-        except logica_calcupension.ErrorGenero:
-            print("Error: Género inválido.")
-
-        except logica_calcupension.ErrorValoresNegativos:
-            print("Error: No se permiten valores negativos.")
+        except tuple(MENSAJES_ERROR) as error:
+            print(MENSAJES_ERROR[type(error)])
 
         except ValueError:
-            print("Error: Entrada inválida. Verifique los datos.")
+            print(MENSAJE_ENTRADA_INVALIDA)
 
 
 if __name__ == "__main__":
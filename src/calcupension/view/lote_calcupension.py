@@ -0,0 +1,652 @@
+"""
+Módulo de cálculo masivo (no interactivo) para el sistema de cálculo pensional.
+
+Procesa archivos CSV o JSONL con un afiliado por fila sin pasar por el
+menú de consola. Los registros fluyen por una cadena de generadores
+(lectura, construcción de columnas, cálculo, escritura) en fragmentos de
+tamaño fijo, por lo que la memoria usada no depende del tamaño del archivo.
+
+Uso:
+----
+    python -m calcupension.view.lote_calcupension lote entrada.csv salida.csv
+    python -m calcupension.view.lote_calcupension lote entrada.jsonl salida.jsonl --rechazos rechazos.jsonl
+    python -m calcupension.view.lote_calcupension convertir entrada.csv portafolio.cpb
+    python -m calcupension.view.lote_calcupension lote portafolio.cpb resultados.cpb
+
+Columnas de entrada:
+--------------------
+tipo, ingreso_base_liquidacion, semanas, genero, edad,
+porcentaje_perdida_capacidad_laboral. Cualquier otra columna (por ejemplo
+un identificador del afiliado) se copia tal cual a la salida.
+
+Las filas rechazadas se escriben en un archivo aparte con la columna
+"error", que contiene el mismo mensaje que muestra la consola. Una línea
+JSONL mal formada (o que no es un objeto) o una fila CSV con más columnas
+que el encabezado también se rechaza, con el mensaje de entrada inválida;
+de una línea JSONL mal formada se guarda el texto en la columna "entrada".
+
+El subcomando "convertir" pasa un CSV o JSONL al formato binario por
+columnas (.cpb, ver binario_calcupension), que luego se calcula sin volver
+a interpretar texto. El formato binario guarda solo los campos de la
+solicitud: las filas se identifican por su posición.
+
+Puntos de control:
+------------------
+Con --checkpoint (o --reanudar) el estado se guarda en un archivo JSON
+después de cada fragmento escrito: registros de entrada ya procesados,
+totales parciales y el tamaño confirmado de los archivos de salida y de
+rechazos. Se guarda primero la salida (con fsync) y luego el punto de
+control, reemplazándolo de forma atómica. Si la ejecución se interrumpe,
+--reanudar recorta los archivos al tamaño confirmado (lo escrito después
+del último punto de control se descarta) y continúa desde el registro
+siguiente, de modo que el resultado es el mismo que el de una ejecución
+sin interrupciones. Al terminar bien, el punto de control se borra.
+
+    python -m calcupension.view.lote_calcupension lote entrada.csv salida.csv --reanudar
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+from calcupension.model import binario_calcupension
+from calcupension.model import instrumentacion_calcupension
+from calcupension.model import logica_calcupension
+from calcupension.model import paralelo_calcupension
+from calcupension.model.paralelo_calcupension import fragmentar
+from calcupension.view.consola_calcupension import MENSAJES_ERROR, MENSAJE_ENTRADA_INVALIDA
+from calcupension.view.registro_calcupension import CAMPOS_ENTRADA, convertir_registro
+
+
+CAMPOS_RESULTADO = ("tasa_reemplazo", "mesada")
+
+CAMPO_ERROR = "error"
+
+CAMPO_ENTRADA = "entrada"
+
+TAMANO_FRAGMENTO = 10_000
+
+FORMATO_PUNTO_CONTROL = 1
+
+EXTENSION_PUNTO_CONTROL = ".checkpoint"
+
+MENSAJES_POR_CODIGO = {
+    codigo: MENSAJES_ERROR[error]
+    for error, codigo in logica_calcupension.CODIGOS_ERROR.items()
+}
+"""
+Mensaje de consola para cada código de error de calcular_lote.
+"""
+
+
+def es_jsonl(ruta: str) -> bool:
+    """
+    Indica si la ruta corresponde a un archivo JSON Lines (.jsonl o .ndjson).
+    """
+    return ruta.lower().endswith((".jsonl", ".ndjson"))
+
+
+def es_binario(ruta: str) -> bool:
+    """
+    Indica si la ruta corresponde al formato binario por columnas.
+    """
+    return ruta.lower().endswith(binario_calcupension.EXTENSION)
+
+
+class RegistroInvalido(dict):
+    """
+    Registro que no se pudo leer del archivo y se rechaza sin calcularlo.
+
+    Contiene las columnas que sí se pudieron leer, o el texto de la línea
+    en CAMPO_ENTRADA si no era JSON válido.
+    """
+
+
+def leer_registros(archivo, jsonl: bool):
+    """
+    Genera los registros de un archivo abierto, uno a la vez.
+
+    Una línea que no se puede leer no detiene la lectura: se genera como
+    RegistroInvalido para que vaya a los rechazos.
+
+    Parámetros:
+    -----------
+    archivo : archivo de texto abierto
+    jsonl : bool
+        True si el archivo es JSON Lines, False si es CSV con encabezado.
+
+    Retorna:
+    --------
+    generator[dict]:
+        Un diccionario por fila.
+    """
+    if not jsonl:
+        for fila in csv.DictReader(archivo):
+            if None in fila:
+                # Más columnas que el encabezado: DictReader las guarda con la clave None.
+                del fila[None]
+                fila = RegistroInvalido(fila)
+            yield fila
+        return
+
+    for linea in archivo:
+        if linea.strip():
+            try:
+                registro = json.loads(linea)
+            except ValueError:
+                registro = None
+            if not isinstance(registro, dict):
+                registro = RegistroInvalido({CAMPO_ENTRADA: linea.rstrip("\r\n")})
+            yield registro
+
+
+def calcular_fragmento(registros: list):
+    """
+    Calcula tasa y mesada para un fragmento de registros.
+
+    Parámetros:
+    -----------
+    registros : list[dict]
+        Fragmento de registros leídos del archivo.
+
+    Retorna:
+    --------
+    generator[tuple]:
+        (registro, tasa, mesada, mensaje_error) por cada registro, en el
+        mismo orden de entrada. mensaje_error es None si el cálculo fue
+        exitoso; en caso contrario tasa y mesada son None.
+    """
+    filas = []
+    errores = []
+
+    for registro in registros:
+        if isinstance(registro, RegistroInvalido):
+            errores.append(MENSAJE_ENTRADA_INVALIDA)
+            continue
+        try:
+            filas.append(convertir_registro(registro))
+            errores.append(None)
+        except (KeyError, TypeError, ValueError):
+            errores.append(MENSAJE_ENTRADA_INVALIDA)
+
+    if filas:
+        tasas, mesadas, codigos = logica_calcupension.CalculadoraPension.calcular_lote(*zip(*filas))
+
+    j = 0
+    for registro, error in zip(registros, errores):
+        if error is not None:
+            yield registro, None, None, error
+            continue
+
+        codigo = codigos[j]
+        if codigo == logica_calcupension.CODIGO_OK:
+            yield registro, tasas[j], mesadas[j], None
+        else:
+            yield registro, None, None, MENSAJES_POR_CODIGO[codigo]
+        j += 1
+
+
+def resultados_fragmento(registros: list) -> list:
+    """
+    Igual que calcular_fragmento, pero retorna solo (tasa, mesada, mensaje_error)
+    por registro, para no devolver los registros completos entre procesos.
+    """
+    return [resultado[1:] for resultado in calcular_fragmento(registros)]
+
+
+class EscritorRegistros:
+    """
+    Escribe registros en un archivo CSV o JSONL abierto.
+
+    Para CSV las columnas se fijan con el primer registro escrito; en los
+    siguientes se ignoran las columnas que no están en el encabezado y las
+    que faltan quedan vacías (un JSONL de entrada puede traer campos
+    distintos en cada línea).
+    """
+
+    def __init__(self, archivo, jsonl: bool, campos_extra: tuple, campos: list | None = None):
+        """
+        Parámetros:
+        -----------
+        archivo : archivo de texto abierto para escritura
+        jsonl : bool
+            True para JSON Lines, False para CSV.
+        campos_extra : tuple[str]
+            Columnas que se agregan a las del registro de entrada.
+        campos : list[str] | None
+            Columnas de un CSV que ya tiene encabezado (al reanudar); no se
+            vuelve a escribir el encabezado.
+        """
+        self.archivo = archivo
+        self.jsonl = jsonl
+        self.campos_extra = campos_extra
+        self.escritor_csv = None
+        if campos is not None and not jsonl:
+            self.escritor_csv = csv.DictWriter(
+                archivo, fieldnames=campos, lineterminator="\n", extrasaction="ignore"
+            )
+
+    @property
+    def campos(self) -> list | None:
+        """
+        Columnas del CSV, o None si todavía no se ha escrito el encabezado (o es JSONL).
+        """
+        return None if self.escritor_csv is None else list(self.escritor_csv.fieldnames)
+
+    def confirmar(self) -> int:
+        """
+        Lleva lo escrito al disco (flush y fsync) y retorna el tamaño del archivo en bytes.
+        """
+        self.archivo.flush()
+        os.fsync(self.archivo.fileno())
+        return os.fstat(self.archivo.fileno()).st_size
+
+    def escribir(self, filas: list):
+        """
+        Escribe una lista de registros (diccionarios).
+        """
+        if not filas:
+            return
+
+        if self.jsonl:
+            self.archivo.writelines(
+                json.dumps(fila, ensure_ascii=False) + "\n" for fila in filas
+            )
+            return
+
+        if self.escritor_csv is None:
+            campos = [campo for campo in filas[0] if campo not in self.campos_extra]
+            self.escritor_csv = csv.DictWriter(
+                self.archivo, fieldnames=campos + list(self.campos_extra), lineterminator="\n",
+                extrasaction="ignore"
+            )
+            self.escritor_csv.writeheader()
+
+        self.escritor_csv.writerows(filas)
+
+
+def ruta_punto_control_por_defecto(ruta_salida: str) -> str:
+    """
+    Deriva el nombre del punto de control a partir del archivo de salida.
+
+    Ejemplo: salida.csv -> salida.csv.checkpoint
+    """
+    return ruta_salida + EXTENSION_PUNTO_CONTROL
+
+
+def _identificar_entrada(ruta_entrada: str) -> dict:
+    """
+    Datos del archivo de entrada con los que se detecta si cambió entre ejecuciones.
+    """
+    informacion = os.stat(ruta_entrada)
+    return {
+        "entrada": os.path.abspath(ruta_entrada),
+        "tamano_entrada": informacion.st_size,
+        "modificacion_entrada": informacion.st_mtime_ns,
+    }
+
+
+def guardar_punto_control(ruta: str, estado: dict):
+    """
+    Guarda el punto de control de forma atómica.
+
+    Se escribe en un archivo temporal, se lleva al disco y se reemplaza el
+    anterior con os.replace, por lo que una interrupción deja siempre el
+    punto de control anterior o el nuevo completo.
+    """
+    temporal = ruta + ".tmp"
+    with open(temporal, "w", encoding="utf-8") as archivo:
+        json.dump(estado, archivo, ensure_ascii=False)
+        archivo.flush()
+        os.fsync(archivo.fileno())
+    os.replace(temporal, ruta)
+
+
+def cargar_punto_control(ruta: str) -> dict | None:
+    """
+    Carga un punto de control, o retorna None si no existe.
+    """
+    try:
+        with open(ruta, encoding="utf-8") as archivo:
+            return json.load(archivo)
+    except FileNotFoundError:
+        return None
+
+
+def _preparar_reanudacion(estado: dict, ruta_entrada: str, ruta_salida: str, ruta_rechazos: str):
+    """
+    Verifica que un punto de control corresponde a estos archivos y recorta
+    la salida y los rechazos al tamaño confirmado.
+
+    Raises:
+    -------
+    ValueError:
+        Si el punto de control es de otro formato, otra entrada (o la
+        entrada cambió), otros archivos de salida, o si la salida es más
+        corta que lo confirmado.
+    """
+    if estado.get("formato") != FORMATO_PUNTO_CONTROL:
+        raise ValueError("El punto de control tiene un formato desconocido.")
+    if any(estado[clave] != valor for clave, valor in _identificar_entrada(ruta_entrada).items()):
+        raise ValueError("El archivo de entrada cambió desde el punto de control.")
+
+    for ruta, clave in ((ruta_salida, "salida"), (ruta_rechazos, "rechazos")):
+        if estado[clave] != os.path.abspath(ruta):
+            raise ValueError(f"El punto de control corresponde a otro archivo de {clave}: {estado[clave]}")
+        posicion = estado["posicion_" + clave]
+        tamano = os.path.getsize(ruta) if os.path.exists(ruta) else 0
+        if tamano < posicion:
+            raise ValueError(f"El archivo de {clave} es más corto que lo confirmado en el punto de control.")
+        if tamano > posicion:
+            os.truncate(ruta, posicion)
+
+
+def procesar_archivo(
+    ruta_entrada: str,
+    ruta_salida: str,
+    ruta_rechazos: str,
+    tamano_fragmento: int = TAMANO_FRAGMENTO,
+    ejecutor: paralelo_calcupension.EjecutorParalelo | None = None,
+    ruta_punto_control: str | None = None,
+    reanudar: bool = False
+) -> tuple:
+    """
+    Procesa un archivo completo de solicitudes en fragmentos.
+
+    Parámetros:
+    -----------
+    ruta_entrada : str
+        Archivo CSV o JSONL con las solicitudes.
+    ruta_salida : str
+        Archivo donde se escriben las filas calculadas.
+    ruta_rechazos : str
+        Archivo donde se escriben las filas rechazadas con su mensaje de error.
+    tamano_fragmento : int
+        Número de registros procesados por fragmento.
+    ejecutor : EjecutorParalelo | None
+        Pool de procesos que calcula los fragmentos. Por defecto se
+        calcula en el proceso actual.
+    ruta_punto_control : str | None
+        Archivo donde se guarda el punto de control después de cada
+        fragmento. Por defecto no se guarda (salvo al reanudar).
+    reanudar : bool
+        Si existe el punto de control, continúa desde él; si no, empieza
+        desde el principio.
+
+    Retorna:
+    --------
+    tuple[int, int]:
+        (filas calculadas, filas rechazadas), incluyendo las de la
+        ejecución interrumpida si se reanudó.
+
+    Raises:
+    -------
+    ValueError:
+        Si el punto de control no corresponde a estos archivos.
+    """
+    if ejecutor is None:
+        ejecutor = paralelo_calcupension.EjecutorParalelo(procesos=1)
+    if reanudar and ruta_punto_control is None:
+        ruta_punto_control = ruta_punto_control_por_defecto(ruta_salida)
+
+    estado = cargar_punto_control(ruta_punto_control) if reanudar else None
+    if estado is not None:
+        _preparar_reanudacion(estado, ruta_entrada, ruta_salida, ruta_rechazos)
+    else:
+        estado = {
+            "formato": FORMATO_PUNTO_CONTROL,
+            **_identificar_entrada(ruta_entrada),
+            "salida": os.path.abspath(ruta_salida),
+            "rechazos": os.path.abspath(ruta_rechazos),
+            "registros": 0,
+            "calculadas": 0,
+            "rechazadas": 0,
+            "posicion_salida": 0,
+            "posicion_rechazos": 0,
+            "campos_salida": None,
+            "campos_rechazos": None,
+        }
+    modo = "a" if estado["registros"] else "w"
+
+    calculadas = estado["calculadas"]
+    rechazadas = estado["rechazadas"]
+
+    with open(ruta_entrada, newline="", encoding="utf-8") as entrada, \
+            open(ruta_salida, modo, newline="", encoding="utf-8") as salida, \
+            open(ruta_rechazos, modo, newline="", encoding="utf-8") as rechazos:
+
+        escritor_salida = EscritorRegistros(
+            salida, es_jsonl(ruta_salida), CAMPOS_RESULTADO, estado["campos_salida"]
+        )
+        escritor_rechazos = EscritorRegistros(
+            rechazos, es_jsonl(ruta_rechazos), (CAMPO_ERROR,), estado["campos_rechazos"]
+        )
+
+        registros = leer_registros(entrada, es_jsonl(ruta_entrada))
+        if estado["registros"]:
+            registros = itertools.islice(registros, estado["registros"], None)
+
+        fragmentos = fragmentar(registros, tamano_fragmento)
+
+        for fragmento, resultados in ejecutor.mapear(resultados_fragmento, fragmentos):
+            filas_salida = []
+            filas_rechazo = []
+
+            for registro, (tasa, mesada, error) in zip(fragmento, resultados):
+                if error is None:
+                    filas_salida.append({**registro, "tasa_reemplazo": tasa, "mesada": mesada})
+                else:
+                    filas_rechazo.append({**registro, CAMPO_ERROR: error})
+
+            with instrumentacion_calcupension.etapa("escritura", filas=len(fragmento)):
+                escritor_salida.escribir(filas_salida)
+                escritor_rechazos.escribir(filas_rechazo)
+            calculadas += len(filas_salida)
+            rechazadas += len(filas_rechazo)
+
+            if ruta_punto_control is not None:
+                with instrumentacion_calcupension.etapa("punto_control"):
+                    estado["registros"] += len(fragmento)
+                    estado["calculadas"] = calculadas
+                    estado["rechazadas"] = rechazadas
+                    estado["posicion_salida"] = escritor_salida.confirmar()
+                    estado["posicion_rechazos"] = escritor_rechazos.confirmar()
+                    estado["campos_salida"] = escritor_salida.campos
+                    estado["campos_rechazos"] = escritor_rechazos.campos
+                    guardar_punto_control(ruta_punto_control, estado)
+
+    if ruta_punto_control is not None and os.path.exists(ruta_punto_control):
+        os.remove(ruta_punto_control)
+
+    return calculadas, rechazadas
+
+
+def convertir_archivo(
+    ruta_entrada: str,
+    ruta_salida: str,
+    ruta_rechazos: str,
+    tamano_fragmento: int = TAMANO_FRAGMENTO
+) -> tuple:
+    """
+    Convierte un archivo CSV o JSONL al formato binario por columnas.
+
+    Las filas que no se pueden convertir (datos faltantes, tipo o género
+    sin código) se escriben en el archivo de rechazos con su mensaje.
+
+    Retorna:
+    --------
+    tuple[int, int]:
+        (filas escritas, filas rechazadas)
+    """
+    rechazadas = 0
+
+    with open(ruta_entrada, newline="", encoding="utf-8") as entrada, \
+            open(ruta_rechazos, "w", newline="", encoding="utf-8") as rechazos, \
+            binario_calcupension.EscritorBinario(ruta_salida) as escritor:
+
+        escritor_rechazos = EscritorRegistros(rechazos, es_jsonl(ruta_rechazos), (CAMPO_ERROR,))
+
+        for fragmento in fragmentar(leer_registros(entrada, es_jsonl(ruta_entrada)), tamano_fragmento):
+            lote = logica_calcupension.LoteSolicitudes()
+            filas_rechazo = []
+
+            for registro in fragmento:
+                if isinstance(registro, RegistroInvalido):
+                    filas_rechazo.append({**registro, CAMPO_ERROR: MENSAJE_ENTRADA_INVALIDA})
+                    continue
+                try:
+                    lote.agregar(*convertir_registro(registro))
+                except (logica_calcupension.ErrorTipoPension, logica_calcupension.ErrorGenero) as error:
+                    filas_rechazo.append({**registro, CAMPO_ERROR: MENSAJES_ERROR[type(error)]})
+                except (KeyError, TypeError, ValueError):
+                    filas_rechazo.append({**registro, CAMPO_ERROR: MENSAJE_ENTRADA_INVALIDA})
+
+            escritor.agregar_lote(lote)
+            escritor_rechazos.escribir(filas_rechazo)
+            rechazadas += len(filas_rechazo)
+
+        return escritor.filas, rechazadas
+
+
+def ruta_rechazos_por_defecto(ruta_salida: str) -> str:
+    """
+    Deriva el nombre del archivo de rechazos a partir del archivo de salida.
+
+    Ejemplo: salida.csv -> salida_rechazos.csv
+    """
+    base, punto, extension = ruta_salida.rpartition(".")
+    if not punto:
+        return ruta_salida + "_rechazos"
+    return f"{base}_rechazos.{extension}"
+
+
+def crear_parser() -> argparse.ArgumentParser:
+    """
+    Construye el analizador de argumentos de línea de comandos.
+    """
+    parser = argparse.ArgumentParser(
+        description="Cálculo pensional masivo a partir de archivos CSV o JSONL."
+    )
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+
+    lote = subcomandos.add_parser("lote", help="Calcula tasa y mesada para un archivo de solicitudes.")
+    lote.add_argument("entrada", help="Archivo CSV o JSONL de entrada.")
+    lote.add_argument("salida", help="Archivo CSV o JSONL de salida.")
+    lote.add_argument("--rechazos", help="Archivo para las filas rechazadas.")
+    lote.add_argument(
+        "--tamano-fragmento", type=int, default=TAMANO_FRAGMENTO,
+        help="Registros procesados por fragmento."
+    )
+    lote.add_argument(
+        "--procesos", type=int, default=1,
+        help="Procesos en paralelo (0 usa todos los núcleos)."
+    )
+    lote.add_argument(
+        "--checkpoint", dest="punto_control",
+        help="Guarda un punto de control en este archivo después de cada fragmento "
+             f"(por defecto con --reanudar: salida{EXTENSION_PUNTO_CONTROL})."
+    )
+    lote.add_argument(
+        "--reanudar", "--resume", action="store_true",
+        help="Continúa desde el último punto de control, si existe."
+    )
+    lote.add_argument(
+        "--perfil",
+        help="Mide el tiempo de cada etapa y escribe el reporte en este archivo "
+             "(.json, .prom para Prometheus o texto plano)."
+    )
+
+    convertir = subcomandos.add_parser(
+        "convertir", help="Convierte un archivo CSV o JSONL al formato binario por columnas."
+    )
+    convertir.add_argument("entrada", help="Archivo CSV o JSONL de entrada.")
+    convertir.add_argument("salida", help=f"Archivo binario de salida ({binario_calcupension.EXTENSION}).")
+    convertir.add_argument("--rechazos", help="Archivo para las filas que no se pueden convertir.")
+    convertir.add_argument(
+        "--tamano-fragmento", type=int, default=TAMANO_FRAGMENTO,
+        help="Registros procesados por fragmento."
+    )
+
+    return parser
+
+
+def main(argumentos: list | None = None) -> int:
+    """
+    Función principal del modo masivo.
+
+    Retorna:
+    --------
+    int:
+        Código de salida del proceso.
+    """
+    parser = crear_parser()
+    opciones = parser.parse_args(argumentos)
+
+    if getattr(opciones, "perfil", None) is None:
+        return ejecutar(parser, opciones)
+
+    with instrumentacion_calcupension.Instrumentacion() as instrumentacion:
+        codigo = ejecutar(parser, opciones)
+    instrumentacion.exportar(opciones.perfil)
+    print(f"Perfil de ejecución: {opciones.perfil}")
+    return codigo
+
+
+def ejecutar(parser: argparse.ArgumentParser, opciones: argparse.Namespace) -> int:
+    """
+    Ejecuta el subcomando indicado en las opciones.
+    """
+    if opciones.comando == "convertir":
+        ruta_rechazos = opciones.rechazos or ruta_rechazos_por_defecto(opciones.entrada)
+        escritas, rechazadas = convertir_archivo(
+            opciones.entrada, opciones.salida, ruta_rechazos, opciones.tamano_fragmento
+        )
+        print(f"Filas convertidas: {escritas:,}")
+        print(f"Filas rechazadas: {rechazadas:,} ({ruta_rechazos})")
+        return 0
+
+    if es_binario(opciones.entrada):
+        if not es_binario(opciones.salida):
+            parser.error("Con entrada binaria la salida también debe ser binaria.")
+        if opciones.punto_control or opciones.reanudar:
+            parser.error("Los puntos de control solo aplican a entradas CSV o JSONL.")
+        calculadas, rechazadas = binario_calcupension.calcular_archivo(
+            opciones.entrada, opciones.salida, tamano_fragmento=opciones.tamano_fragmento
+        )
+        print(f"Filas calculadas: {calculadas:,}")
+        print(f"Filas rechazadas: {rechazadas:,} (código de error en {opciones.salida})")
+        return 0
+
+    ruta_rechazos = opciones.rechazos or ruta_rechazos_por_defecto(opciones.salida)
+
+    ejecutor = paralelo_calcupension.EjecutorParalelo(opciones.procesos or None)
+
+    ruta_punto_control = opciones.punto_control
+    if opciones.reanudar:
+        ruta_punto_control = ruta_punto_control or ruta_punto_control_por_defecto(opciones.salida)
+        estado = cargar_punto_control(ruta_punto_control)
+        if estado is not None:
+            print(f"Reanudando desde el registro {estado['registros']:,} ({ruta_punto_control})")
+
+    try:
+        calculadas, rechazadas = procesar_archivo(
+            opciones.entrada, opciones.salida, ruta_rechazos, opciones.tamano_fragmento, ejecutor,
+            ruta_punto_control, opciones.reanudar
+        )
+    except ValueError as error:
+        parser.error(str(error))
+
+    print(f"Filas calculadas: {calculadas:,}")
+    print(f"Filas rechazadas: {rechazadas:,} ({ruta_rechazos})")
+    if ejecutor.procesos > 1:
+        print(ejecutor.reporte.como_texto())
+    return 0
+
+
+if __name__ == "__main__":
+    """
+    Punto de entrada del modo masivo.
+    """
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+Conversión de registros externos (CSV, JSON) en datos de una solicitud.
+
+Módulo liviano (solo importa math) compartido por el modo masivo, el
+servicio HTTP y la línea de comandos.
+"""
+
+import math
+
+
+CAMPOS_ENTRADA = (
+    "tipo",
+    "ingreso_base_liquidacion",
+    "semanas",
+    "genero",
+    "edad",
+    "porcentaje_perdida_capacidad_laboral",
+)
+
+
+def _vacio(valor) -> bool:
+    return valor is None or valor == ""
+
+
+def _real(valor, campo: str) -> float:
+    """
+    Convierte un valor en float finito; rechaza booleanos, NaN e infinitos.
+    """
+    if isinstance(valor, bool):
+        raise ValueError(f"{campo} no es un número: {valor!r}")
+    numero = float(valor)
+    if not math.isfinite(numero):
+        raise ValueError(f"{campo} no es finito: {valor!r}")
+    return numero
+
+
+def _entero(valor, campo: str) -> int:
+    """
+    Convierte un valor en int sin truncar; rechaza booleanos y números con decimales.
+    """
+    if isinstance(valor, bool):
+        raise ValueError(f"{campo} no es un número: {valor!r}")
+    if isinstance(valor, float):
+        if not valor.is_integer():
+            raise ValueError(f"{campo} debe ser un número entero: {valor!r}")
+        return int(valor)
+    return int(valor)
+
+
+def convertir_registro(registro: dict) -> tuple:
+    """
+    Convierte un registro leído del archivo en la tupla de datos de una solicitud.
+
+    Parámetros:
+    -----------
+    registro : dict
+        Fila con los campos de CAMPOS_ENTRADA (como texto en CSV o como
+        valores JSON en JSONL).
+
+    Retorna:
+    --------
+    tuple:
+        (tipo, ingreso_base_liquidacion, semanas, genero, edad,
+        porcentaje_perdida_capacidad_laboral), en el mismo orden que los
+        parámetros de SolicitudPension.
+
+    Raises:
+    -------
+    ValueError:
+        Si falta un campo obligatorio o un valor numérico no es válido: el
+        IBL y la PCL deben ser finitos, y las semanas y la edad enteras
+        (no se truncan). Los booleanos JSON no se aceptan como números.
+    """
+    tipo = registro.get("tipo")
+    if _vacio(tipo):
+        raise ValueError("Falta el tipo de pensión")
+
+    ingreso_base_liquidacion = _real(registro["ingreso_base_liquidacion"], "ingreso_base_liquidacion")
+    semanas = _entero(registro["semanas"], "semanas")
+
+    genero = registro.get("genero")
+    if _vacio(genero):
+        genero = None
+
+    edad = registro.get("edad")
+    edad = None if _vacio(edad) else _entero(edad, "edad")
+
+    if tipo == "Vejez" and edad is None:
+        raise ValueError("La pensión de vejez requiere la edad")
+
+    porcentaje_perdida_capacidad_laboral = registro.get("porcentaje_perdida_capacidad_laboral")
+    if _vacio(porcentaje_perdida_capacidad_laboral):
+        porcentaje_perdida_capacidad_laboral = 0
+    else:
+        porcentaje_perdida_capacidad_laboral = _real(
+            porcentaje_perdida_capacidad_laboral, "porcentaje_perdida_capacidad_laboral"
+        )
+
+    return (
+        tipo,
+        ingreso_base_liquidacion,
+        semanas,
+        genero,
+        edad,
+        porcentaje_perdida_capacidad_laboral
+    )
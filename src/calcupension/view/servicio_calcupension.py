@@ -0,0 +1,414 @@
+"""
+Servicio HTTP/JSON local para el sistema de cálculo pensional.
+
+Implementado solo con la biblioteca estándar (asyncio), funciona sin
+conexión. Las solicitudes que llegan casi al mismo tiempo (dentro de una
+ventana de pocos milisegundos) se agrupan y se calculan juntas con
+CalculadoraPension.calcular_lote, en un hilo aparte para no detener el
+bucle de eventos mientras se calcula el lote.
+
+Un IBL o una PCL no finitos en la entrada se rechazan como entrada
+inválida (400). Las respuestas son JSON estricto: si un resultado no es
+finito, se responde como null.
+
+Uso:
+----
+    python -m calcupension.view.servicio_calcupension --puerto 8080
+
+Rutas:
+------
+- POST /calcular   Un objeto JSON (o una lista) con los campos de la solicitud.
+- GET  /metricas   Latencia p50/p99, tamaño de la cola y de los lotes.
+- GET  /salud      Estado del servicio.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+from collections import deque
+from calcupension.model import logica_calcupension
+from calcupension.model import reglas_calcupension
+from calcupension.view.consola_calcupension import MENSAJES_ERROR, MENSAJE_ENTRADA_INVALIDA
+from calcupension.view.registro_calcupension import convertir_registro
+
+
+VENTANA_MS = 2.0
+
+MAXIMO_LOTE = 1024
+
+MUESTRAS_LATENCIA = 10_000
+
+NOMBRES_POR_CODIGO = {
+    codigo: error.__name__ for error, codigo in logica_calcupension.CODIGOS_ERROR.items()
+}
+
+MENSAJES_POR_CODIGO = {
+    codigo: MENSAJES_ERROR[error] for error, codigo in logica_calcupension.CODIGOS_ERROR.items()
+}
+
+ESTADOS_HTTP = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    422: "Unprocessable Entity",
+    500: "Internal Server Error",
+}
+
+ERROR_INTERNO = {"error": {"codigo": "ErrorInterno", "mensaje": "Error interno del servicio."}}
+
+TAMANO_MAXIMO_CUERPO = 16 * 1024 * 1024
+
+
+def percentil(valores: list, porcentaje: float) -> float:
+    """
+    Percentil por el método del rango más cercano (0 si no hay valores).
+    """
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    posicion = max(0, math.ceil(porcentaje / 100 * len(ordenados)) - 1)
+    return ordenados[posicion]
+
+
+def reemplazar_no_finitos(valor):
+    """
+    Copia de un valor JSON con los float no finitos (NaN, inf) reemplazados por None.
+    """
+    if isinstance(valor, float):
+        return valor if math.isfinite(valor) else None
+    if isinstance(valor, dict):
+        return {clave: reemplazar_no_finitos(elemento) for clave, elemento in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [reemplazar_no_finitos(elemento) for elemento in valor]
+    return valor
+
+
+class AgrupadorSolicitudes:
+    """
+    Agrupa en lotes las solicitudes recibidas dentro de una ventana de tiempo.
+
+    Cada solicitud espera como máximo `ventana` segundos (o hasta que el
+    lote alcance `maximo_lote`) antes de calcularse junto con las demás.
+    El lote se calcula en el ejecutor por defecto del bucle de eventos; si
+    calcular_lote falla, las filas se calculan una por una y solo las que
+    fallan reciben la excepción.
+    """
+
+    def __init__(
+        self,
+        ventana: float = VENTANA_MS / 1000,
+        maximo_lote: int = MAXIMO_LOTE,
+        reglas: reglas_calcupension.ReglasPension | None = None
+    ):
+        self.ventana = ventana
+        self.maximo_lote = maximo_lote
+        self.reglas = reglas
+        self.pendientes = []
+        self.temporizador = None
+        self.tareas = set()
+        self.lotes = 0
+        self.calculadas = 0
+        self.latencias = deque(maxlen=MUESTRAS_LATENCIA)
+
+    async def calcular(self, fila: tuple) -> tuple:
+        """
+        Encola una solicitud y espera su resultado.
+
+        Parámetros:
+        -----------
+        fila : tuple
+            Datos de la solicitud en el orden de SolicitudPension.
+
+        Retorna:
+        --------
+        tuple:
+            (tasa, mesada, codigo) como en calcular_lote.
+        """
+        loop = asyncio.get_running_loop()
+        futuro = loop.create_future()
+        self.pendientes.append((fila, futuro, time.perf_counter()))
+
+        if len(self.pendientes) >= self.maximo_lote:
+            self.procesar()
+        elif self.temporizador is None:
+            self.temporizador = loop.call_later(self.ventana, self.procesar)
+
+        return await futuro
+
+    def procesar(self):
+        """
+        Lanza el cálculo en un solo lote de todas las solicitudes pendientes.
+        """
+        if self.temporizador is not None:
+            self.temporizador.cancel()
+            self.temporizador = None
+
+        pendientes, self.pendientes = self.pendientes, []
+        if not pendientes:
+            return
+
+        tarea = asyncio.get_running_loop().create_task(self.calcular_pendientes(pendientes))
+        self.tareas.add(tarea)
+        tarea.add_done_callback(self.tareas.discard)
+
+    async def calcular_pendientes(self, pendientes: list):
+        """
+        Calcula un lote en el ejecutor y entrega a cada solicitud su resultado o su excepción.
+        """
+        filas = [fila for fila, _, _ in pendientes]
+        loop = asyncio.get_running_loop()
+        try:
+            resultados = await loop.run_in_executor(None, self.calcular_filas, filas)
+        except Exception as error:
+            resultados = [error] * len(filas)
+
+        ahora = time.perf_counter()
+        for resultado, (_, futuro, inicio) in zip(resultados, pendientes):
+            self.latencias.append(ahora - inicio)
+            if futuro.done():
+                continue
+            if isinstance(resultado, Exception):
+                futuro.set_exception(resultado)
+            else:
+                futuro.set_result(resultado)
+
+        self.lotes += 1
+        self.calculadas += len(pendientes)
+
+    def calcular_filas(self, filas: list) -> list:
+        """
+        Retorna por fila (tasa, mesada, codigo), o la excepción si la fila no se puede calcular.
+
+        Se ejecuta fuera del bucle de eventos.
+        """
+        calcular_lote = logica_calcupension.CalculadoraPension.calcular_lote
+        try:
+            return list(zip(*calcular_lote(*zip(*filas), self.reglas)))
+        except Exception:
+            pass
+
+        # Alguna fila hace fallar el lote: se calculan por separado para aislarla.
+        resultados = []
+        for fila in filas:
+            try:
+                tasas, mesadas, codigos = calcular_lote(*zip(fila), self.reglas)
+                resultados.append((tasas[0], mesadas[0], codigos[0]))
+            except Exception as error:
+                resultados.append(error)
+        return resultados
+
+    def metricas(self) -> dict:
+        """
+        Retorna las métricas de latencia, cola y lotes.
+        """
+        latencias = list(self.latencias)
+        return {
+            "calculadas": self.calculadas,
+            "lotes": self.lotes,
+            "tamano_promedio_lote": self.calculadas / self.lotes if self.lotes else 0.0,
+            "cola": len(self.pendientes),
+            "latencia_p50_ms": percentil(latencias, 50) * 1000,
+            "latencia_p99_ms": percentil(latencias, 99) * 1000,
+        }
+
+
+class ServicioCalculo:
+    """
+    Servidor HTTP mínimo sobre asyncio que expone el cálculo pensional.
+    """
+
+    def __init__(self, agrupador: AgrupadorSolicitudes | None = None):
+        self.agrupador = agrupador or AgrupadorSolicitudes()
+        self.conexiones = 0
+        self.servidor = None
+
+    async def iniciar(self, host: str = "127.0.0.1", puerto: int = 8080):
+        """
+        Abre el puerto de escucha. Con puerto 0 se elige uno libre.
+        """
+        self.servidor = await asyncio.start_server(self.atender, host, puerto)
+        return self.servidor
+
+    @property
+    def puerto(self) -> int:
+        return self.servidor.sockets[0].getsockname()[1]
+
+    async def cerrar(self):
+        """
+        Deja de aceptar conexiones.
+        """
+        self.servidor.close()
+        await self.servidor.wait_closed()
+
+    async def calcular_registro(self, registro) -> tuple:
+        """
+        Calcula un registro JSON y retorna (estado HTTP, cuerpo de respuesta).
+
+        Un error inesperado en el cálculo se responde con 500 solo para
+        este registro (en una lista, los demás se responden normalmente).
+        """
+        try:
+            fila = convertir_registro(registro)
+        except (AttributeError, KeyError, TypeError, ValueError):
+            return 400, {"error": {"codigo": "EntradaInvalida", "mensaje": MENSAJE_ENTRADA_INVALIDA}}
+
+        try:
+            tasa, mesada, codigo = await self.agrupador.calcular(fila)
+        except Exception:
+            return 500, ERROR_INTERNO
+
+        if codigo != logica_calcupension.CODIGO_OK:
+            return 422, {"error": {
+                "codigo": NOMBRES_POR_CODIGO[codigo],
+                "mensaje": MENSAJES_POR_CODIGO[codigo],
+            }}
+
+        return 200, {"tasa_reemplazo": tasa, "mesada": mesada}
+
+    async def responder_calculo(self, cuerpo: bytes) -> tuple:
+        """
+        Atiende POST /calcular con un objeto o una lista de objetos.
+        """
+        try:
+            datos = json.loads(cuerpo)
+        except ValueError:
+            return 400, {"error": {"codigo": "EntradaInvalida", "mensaje": MENSAJE_ENTRADA_INVALIDA}}
+
+        if isinstance(datos, list):
+            resultados = await asyncio.gather(*(self.calcular_registro(registro) for registro in datos))
+            return 200, [respuesta for _, respuesta in resultados]
+
+        return await self.calcular_registro(datos)
+
+    async def enrutar(self, metodo: str, ruta: str, cuerpo: bytes) -> tuple:
+        """
+        Retorna (estado HTTP, cuerpo JSON) para una petición.
+        """
+        if ruta == "/calcular":
+            if metodo != "POST":
+                return 405, {"error": {"codigo": "MetodoNoPermitido", "mensaje": "Use POST."}}
+            return await self.responder_calculo(cuerpo)
+
+        if ruta == "/metricas" and metodo == "GET":
+            return 200, {**self.agrupador.metricas(), "conexiones": self.conexiones}
+
+        if ruta == "/salud" and metodo == "GET":
+            return 200, {"estado": "ok"}
+
+        return 404, {"error": {"codigo": "RutaNoEncontrada", "mensaje": f"Ruta desconocida: {ruta}"}}
+
+    async def atender(self, lector: asyncio.StreamReader, escritor: asyncio.StreamWriter):
+        """
+        Atiende una conexión HTTP/1.1 (con keep-alive).
+        """
+        self.conexiones += 1
+        try:
+            while True:
+                linea = await lector.readline()
+                if not linea.strip():
+                    break
+
+                try:
+                    metodo, ruta, _ = linea.decode("latin-1").split(" ", 2)
+                except ValueError:
+                    await self.escribir(escritor, 400, {"error": {"codigo": "PeticionInvalida"}}, False)
+                    break
+
+                encabezados = {}
+                while True:
+                    linea = await lector.readline()
+                    if linea in (b"\r\n", b"\n", b""):
+                        break
+                    nombre, _, valor = linea.decode("latin-1").partition(":")
+                    encabezados[nombre.strip().lower()] = valor.strip()
+
+                try:
+                    longitud = int(encabezados.get("content-length", 0) or 0)
+                except ValueError:
+                    longitud = -1
+                if longitud < 0:
+                    await self.escribir(escritor, 400, {"error": {"codigo": "PeticionInvalida"}}, False)
+                    break
+                if longitud > TAMANO_MAXIMO_CUERPO:
+                    await self.escribir(escritor, 413, {"error": {"codigo": "CuerpoDemasiadoGrande"}}, False)
+                    break
+
+                cuerpo = await lector.readexactly(longitud) if longitud else b""
+                mantener = encabezados.get("connection", "").lower() != "close"
+
+                try:
+                    estado, respuesta = await self.enrutar(metodo, ruta.split("?", 1)[0], cuerpo)
+                except Exception:
+                    estado, respuesta = 500, ERROR_INTERNO
+                await self.escribir(escritor, estado, respuesta, mantener)
+
+                if not mantener:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.conexiones -= 1
+            escritor.close()
+
+    async def escribir(self, escritor: asyncio.StreamWriter, estado: int, respuesta, mantener: bool):
+        """
+        Escribe una respuesta HTTP con cuerpo JSON (los valores no finitos como null).
+        """
+        try:
+            texto = json.dumps(respuesta, ensure_ascii=False, allow_nan=False)
+        except ValueError:
+            texto = json.dumps(reemplazar_no_finitos(respuesta), ensure_ascii=False)
+        cuerpo = texto.encode("utf-8")
+        encabezado = (
+            f"HTTP/1.1 {estado} {ESTADOS_HTTP[estado]}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(cuerpo)}\r\n"
+            f"Connection: {'keep-alive' if mantener else 'close'}\r\n"
+            "\r\n"
+        ).encode("latin-1")
+        escritor.write(encabezado + cuerpo)
+        await escritor.drain()
+
+
+async def servir(host: str, puerto: int, ventana: float, maximo_lote: int):
+    """
+    Inicia el servicio y lo mantiene activo hasta que se interrumpa.
+    """
+    servicio = ServicioCalculo(AgrupadorSolicitudes(ventana, maximo_lote))
+    servidor = await servicio.iniciar(host, puerto)
+    print(f"Servicio de cálculo pensional en http://{host}:{servicio.puerto}")
+    async with servidor:
+        await servidor.serve_forever()
+
+
+def main(argumentos: list | None = None) -> int:
+    """
+    Función principal del servicio.
+    """
+    parser = argparse.ArgumentParser(description="Servicio HTTP local de cálculo pensional.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8080)
+    parser.add_argument(
+        "--ventana-ms", type=float, default=VENTANA_MS,
+        help="Milisegundos que se esperan para agrupar solicitudes."
+    )
+    parser.add_argument("--maximo-lote", type=int, default=MAXIMO_LOTE)
+    opciones = parser.parse_args(argumentos)
+
+    try:
+        asyncio.run(servir(opciones.host, opciones.puerto, opciones.ventana_ms / 1000, opciones.maximo_lote))
+    except KeyboardInterrupt:
+        print("\nServicio detenido.")
+    return 0
+
+
+if __name__ == "__main__":
+    """
+    Punto de entrada del servicio.
+    """
+    sys.exit(main())
@@ -0,0 +1,187 @@
+"""
+Módulo de pruebas unitarias para la agregación del portafolio.
+
+Las pruebas cubren:
+
+- Conteos y sumas por grupo comparados con un cálculo directo
+- Filas en tope, piso y mesada mínima
+- Rechazos por código de error
+- Combinación de agregados parciales
+- Precisión de los cuantiles aproximados
+- Dimensiones inválidas y agregados incompatibles
+"""
+
+import pickle
+import random
+import unittest
+import sys
+sys.path.append("src")
+from calcupension.model import agregacion_calcupension
+from calcupension.model import logica_calcupension
+from calcupension.model import reglas_calcupension
+
+
+def portafolio(cantidad, semilla=18):
+    generador = random.Random(semilla)
+    filas = []
+    for _ in range(cantidad):
+        tipo = generador.choice(logica_calcupension.TIPOS_PENSION)
+        edad = generador.randint(30, 85) if tipo == "Vejez" or generador.random() < 0.5 else None
+        filas.append((
+            tipo,
+            generador.uniform(1_000_000, 20_000_000),
+            generador.randint(1000, 2600),
+            generador.choice(("Hombre", "Mujer")),
+            edad,
+            generador.uniform(0, 100),
+        ))
+    return filas
+
+
+def agregar(filas):
+    columnas = list(zip(*filas))
+    agregador = agregacion_calcupension.AgregadorPortafolio()
+    agregador.agregar_lote(*columnas, *logica_calcupension.CalculadoraPension.calcular_lote(*columnas))
+    return agregador
+
+
+class TestAgregacionCalcupension(unittest.TestCase):
+    """
+    Pruebas de AgregadorPortafolio y agregar_portafolio.
+    """
+
+    def test_totales_por_tipo(self):
+        """
+        Filas, rechazos y total de mesadas por tipo coinciden con el cálculo directo.
+        """
+        filas = portafolio(3000)
+        columnas = list(zip(*filas))
+        tasas, mesadas, codigos = logica_calcupension.CalculadoraPension.calcular_lote(*columnas)
+        resumen = agregar(filas).resumen(("tipo",))
+
+        for tipo in logica_calcupension.TIPOS_PENSION:
+            indices = [i for i, fila in enumerate(filas) if fila[0] == tipo]
+            validas = [i for i in indices if not codigos[i]]
+            grupo = resumen[(tipo,)]
+
+            self.assertEqual(grupo.filas, len(indices))
+            self.assertEqual(grupo.calculadas, len(validas))
+            self.assertAlmostEqual(grupo.suma_mesada, sum(mesadas[i] for i in validas), delta=1e-3)
+            self.assertEqual(sum(grupo.histograma_tasa), len(validas))
+            self.assertEqual(grupo.mesada_maxima, max(mesadas[i] for i in validas))
+
+    def test_tope_piso_y_mesada_minima(self):
+        """
+        Se marcan las filas con la tasa en el tope o el piso y la mesada en el SMMLV.
+        """
+        filas = [
+            ("Vejez", 3_000_000, 2600, "Hombre", 62, 0),
+            ("Vejez", 50_000_000, 1300, "Hombre", 62, 0),
+            ("Vejez", 1_000_000, 1300, "Mujer", 57, 0),
+            ("Invalidez", 2_800_000, 400, "Mujer", 40, 55),
+            ("Sobreviviente", 2_000_000, 700, "Hombre", None, 0),
+        ]
+        datos = agregar(filas).como_dict(("tipo",))
+        grupos = {grupo["tipo"]: grupo for grupo in datos["grupos"]}
+
+        self.assertAlmostEqual(grupos["Vejez"]["proporcion_tope"], 1 / 3)
+        self.assertAlmostEqual(grupos["Vejez"]["proporcion_piso"], 1 / 3)
+        self.assertAlmostEqual(grupos["Vejez"]["proporcion_mesada_minima"], 1 / 3)
+        self.assertEqual(grupos["Invalidez"]["proporcion_piso"], 1.0)
+        self.assertEqual(grupos["Sobreviviente"]["proporcion_tope"], 0.0)
+        self.assertEqual(datos["total"]["calculadas"], 5)
+
+    def test_rechazos_por_error(self):
+        """
+        Las filas rechazadas se cuentan por nombre de error y no entran en las sumas.
+        """
+        filas = [
+            ("Vejez", 3_000_000, 1000, "Hombre", 62, 0),
+            ("Invalidez", 2_800_000, 900, "Mujer", 40, 30),
+            ("Vejez", 3_000_000, 1300, "Hombre", 62, 0),
+        ]
+        total = agregar(filas).como_dict()["total"]
+
+        self.assertEqual(total["rechazos"], {"ErrorSemanasCotizadas": 1, "ErrorPCLInvalidez": 1})
+        self.assertEqual(total["calculadas"], 1)
+        self.assertAlmostEqual(total["total_mesadas"], 1_939_299.0, delta=0.01)
+
+    def test_bandas(self):
+        """
+        Las bandas de edad y PCL agrupan los valores y los faltantes.
+        """
+        self.assertEqual(agregacion_calcupension.banda_edad(62), "62-69")
+        self.assertEqual(agregacion_calcupension.banda_edad(61), "57-61")
+        self.assertEqual(agregacion_calcupension.banda_edad(None), agregacion_calcupension.SIN_INFORMAR)
+        self.assertEqual(agregacion_calcupension.banda_pcl(66), "50-66")
+        self.assertEqual(agregacion_calcupension.banda_pcl(66.5), "66-100")
+
+    def test_combinar_igual_a_una_pasada(self):
+        """
+        Agregar por partes y combinar da lo mismo que agregar todo junto.
+        """
+        filas = portafolio(2000)
+        completo = agregar(filas)
+        combinado = agregar(filas[:700]).combinar(agregar(filas[700:1500])).combinar(agregar(filas[1500:]))
+
+        esperado = completo.como_dict(agregacion_calcupension.DIMENSIONES)
+        obtenido = combinado.como_dict(agregacion_calcupension.DIMENSIONES)
+        for grupo_esperado, grupo_obtenido in zip(esperado["grupos"], obtenido["grupos"]):
+            self.assertAlmostEqual(grupo_esperado.pop("total_mesadas"), grupo_obtenido.pop("total_mesadas"), delta=1e-3)
+            self.assertAlmostEqual(grupo_esperado.pop("tasa_promedio") or 0, grupo_obtenido.pop("tasa_promedio") or 0)
+            self.assertAlmostEqual(grupo_esperado.pop("mesada_promedio") or 0, grupo_obtenido.pop("mesada_promedio") or 0)
+            self.assertEqual(grupo_esperado, grupo_obtenido)
+
+    def test_en_procesos(self):
+        """
+        Agregar en varios procesos combina los agregados de cada fragmento.
+        """
+        filas = portafolio(3000)
+        secuencial = agregacion_calcupension.agregar_portafolio(filas)
+        paralelo = agregacion_calcupension.agregar_portafolio(filas, procesos=2, tamano_fragmento=500)
+        restaurado = pickle.loads(pickle.dumps(paralelo))
+
+        esperado = secuencial.como_dict()["total"]
+        obtenido = restaurado.como_dict()["total"]
+        self.assertEqual(esperado["calculadas"], obtenido["calculadas"])
+        self.assertEqual(esperado["histograma_mesada"], obtenido["histograma_mesada"])
+        self.assertEqual(esperado["cuantiles_tasa"], obtenido["cuantiles_tasa"])
+
+    def test_cuantiles(self):
+        """
+        Los cuantiles aproximados están dentro de la precisión relativa.
+        """
+        generador = random.Random(5)
+        valores = [generador.lognormvariate(15, 0.7) for _ in range(20_000)]
+        boceto = agregacion_calcupension.BocetoCuantiles()
+        for valor in valores:
+            boceto.registrar(valor)
+
+        valores.sort()
+        for q in (0.1, 0.5, 0.9, 0.99):
+            exacto = valores[int(q * (len(valores) - 1))]
+            self.assertLessEqual(abs(boceto.cuantil(q) / exacto - 1), agregacion_calcupension.PRECISION_CUANTILES)
+        self.assertLess(len(boceto.cubetas), 1000)
+
+    def test_errores(self):
+        """
+        Dimensiones desconocidas y agregados de otras reglas (aunque tengan la misma versión) se rechazan.
+        """
+        agregador = agregar(portafolio(10))
+        with self.assertRaises(ValueError):
+            agregador.resumen(("region",))
+
+        definicion = dict(reglas_calcupension.REGLAS_2026, version="prueba-agregacion")
+        otras = agregacion_calcupension.AgregadorPortafolio(reglas_calcupension.ReglasPension(definicion))
+        with self.assertRaises(ValueError):
+            agregador.combinar(otras)
+
+        definicion = dict(reglas_calcupension.REGLAS_2026, smmlv=2_000_000)
+        misma_version = agregacion_calcupension.AgregadorPortafolio(reglas_calcupension.ReglasPension(definicion))
+        self.assertEqual(misma_version.reglas.version, agregador.reglas.version)
+        with self.assertRaises(ValueError):
+            agregador.combinar(misma_version)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,195 @@
+"""
+Módulo de pruebas unitarias para el almacén de resultados.
+
+Las pruebas cubren:
+
+- Cálculo, guardado y consulta de un resultado
+- Coincidencia con CalculadoraPension
+- Versión de reglas como parte de la búsqueda
+- Huella de la definición: reemplazar una versión no reutiliza resultados
+- Solicitudes inválidas (no se guardan)
+- Cálculo por lote con resultados guardados y pendientes
+- Filas repetidas en un lote (se guardan una vez) y resultados no finitos (no se guardan)
+- Semanas con decimales (no comparten resultado con las semanas truncadas)
+- Historial por afiliado y persistencia en archivo
+"""
+
+import os
+import tempfile
+import unittest
+import sys
+sys.path.append("src")
+from calcupension.model import almacen_calcupension
+from calcupension.model import logica_calcupension
+from calcupension.model import reglas_calcupension
+
+
+FILAS = [
+    ("Vejez", 3_000_000, 1300, "Hombre", 62, 0),
+    ("Sobreviviente", 1_500_000, 700, "Mujer", None, 0),
+    ("Invalidez", 2_800_000, 900, "Mujer", 40, 65),
+    ("Vejez", 3_000_000, 1000, "Hombre", 62, 0),
+]
+
+
+class TestAlmacenCalcupension(unittest.TestCase):
+    """
+    Pruebas de AlmacenResultados.
+    """
+
+    def setUp(self):
+        self.almacen = almacen_calcupension.AlmacenResultados()
+
+    def tearDown(self):
+        self.almacen.cerrar()
+
+    def test_calcular_y_consultar(self):
+        """
+        El primer cálculo se guarda y el segundo se responde desde el almacén.
+        """
+        solicitud = logica_calcupension.SolicitudPension(*FILAS[0])
+        self.assertIsNone(self.almacen.consultar(solicitud))
+
+        tasa, mesada = self.almacen.calcular(solicitud, afiliado="CC-1")
+        self.assertEqual(self.almacen.calcular(solicitud, afiliado="CC-1"), (tasa, mesada))
+        self.assertEqual(self.almacen.consultar(solicitud), (tasa, mesada))
+
+        esperada = logica_calcupension.CalculadoraPension.calcular_tasa_reemplazo(solicitud)
+        self.assertEqual(tasa, esperada)
+        self.assertEqual(self.almacen.estadisticas()["resultados"], 1)
+        self.assertEqual((self.almacen.aciertos, self.almacen.fallos), (1, 1))
+
+    def test_hash_normaliza_numeros(self):
+        """
+        Los mismos datos con int o float comparten resultado.
+        """
+        self.assertEqual(
+            almacen_calcupension.hash_datos("Vejez", 3_000_000, 1300, "Hombre", 62, 0),
+            almacen_calcupension.hash_datos("Vejez", 3_000_000.0, 1300, "Hombre", 62, 0.0),
+        )
+        self.assertNotEqual(
+            almacen_calcupension.hash_datos("Vejez", 3_000_000, 1300, "Hombre", 62, 0),
+            almacen_calcupension.hash_datos("Vejez", 3_000_000, 1301, "Hombre", 62, 0),
+        )
+
+    def test_version_de_reglas(self):
+        """
+        Un resultado guardado con otras reglas no se reutiliza.
+        """
+        solicitud = logica_calcupension.SolicitudPension(*FILAS[0])
+        self.almacen.calcular(solicitud)
+
+        definicion = dict(reglas_calcupension.REGLAS_2026, version="prueba-almacen", smmlv=2_000_000)
+        reglas = reglas_calcupension.ReglasPension(definicion)
+        self.assertIsNone(self.almacen.consultar(solicitud, reglas))
+
+        tasa, _ = self.almacen.calcular(solicitud, reglas=reglas)
+        self.assertEqual(tasa, logica_calcupension.CalculadoraPension.calcular_tasa_reemplazo(solicitud, reglas))
+        self.assertEqual(self.almacen.estadisticas()["resultados"], 2)
+
+    def test_version_reemplazada(self):
+        """
+        Registrar otra definición con el mismo nombre de versión no reutiliza los resultados anteriores.
+        """
+        solicitud = logica_calcupension.SolicitudPension(*FILAS[0])
+        definicion = dict(reglas_calcupension.REGLAS_2026, version="prueba-reemplazo")
+        primera = reglas_calcupension.registrar_reglas(definicion)
+        self.almacen.calcular(solicitud, reglas=primera)
+
+        segunda = reglas_calcupension.registrar_reglas(dict(definicion, smmlv=2_000_000))
+        self.assertEqual(primera.version, segunda.version)
+        self.assertNotEqual(primera.huella, segunda.huella)
+        self.assertIsNone(self.almacen.consultar(solicitud, segunda))
+
+        tasas, mesadas, _ = self.almacen.calcular_lote(["CC-1"], [FILAS[0]], segunda)
+        esperado = logica_calcupension.CalculadoraPension.calcular_lote(*zip(FILAS[0]), segunda)
+        self.assertEqual((tasas[0], mesadas[0]), (esperado[0][0], esperado[1][0]))
+
+    def test_invalida_no_se_guarda(self):
+        """
+        Una solicitud inválida lanza su excepción y no queda guardada.
+        """
+        solicitud = logica_calcupension.SolicitudPension(*FILAS[3])
+
+        with self.assertRaises(logica_calcupension.ErrorSemanasCotizadas):
+            self.almacen.calcular(solicitud, afiliado="CC-4")
+        self.assertEqual(self.almacen.historial("CC-4"), [])
+
+    def test_lote(self):
+        """
+        El lote calcula solo lo que no está guardado y coincide con calcular_lote.
+        """
+        afiliados = ["CC-1", "CC-2", "CC-3", "CC-4"]
+        self.almacen.calcular(logica_calcupension.SolicitudPension(*FILAS[0]), afiliado="CC-1")
+
+        tasas, mesadas, codigos = self.almacen.calcular_lote(afiliados, FILAS)
+        esperado = logica_calcupension.CalculadoraPension.calcular_lote(*zip(*FILAS))
+
+        self.assertEqual(list(codigos), list(esperado[2]))
+        self.assertEqual(list(tasas[:3]), list(esperado[0][:3]))
+        self.assertEqual(list(mesadas[:3]), list(esperado[1][:3]))
+        self.assertEqual((self.almacen.aciertos, self.almacen.fallos), (1, 4))
+        self.assertEqual(self.almacen.estadisticas()["resultados"], 3)
+
+        self.almacen.calcular_lote(afiliados, FILAS)
+        self.assertEqual(self.almacen.aciertos, 4)
+
+    def test_lote_repetidas_y_no_finitas(self):
+        """
+        Las filas repetidas se calculan y guardan una vez; un IBL NaN no se guarda ni falla.
+        """
+        filas = [FILAS[0], FILAS[2], FILAS[0], ("Vejez", float("nan"), 1300, "Hombre", 62, 0)]
+        tasas, mesadas, codigos = self.almacen.calcular_lote(["CC-1", "CC-2", "CC-3", "CC-4"], filas)
+        esperado = logica_calcupension.CalculadoraPension.calcular_lote(*zip(*filas))
+
+        self.assertEqual(list(codigos), list(esperado[2]))
+        self.assertEqual(list(tasas[:3]), list(esperado[0][:3]))
+        self.assertEqual(list(mesadas[:3]), list(esperado[1][:3]))
+        self.assertNotEqual(tasas[3], tasas[3])
+        self.assertEqual(self.almacen.fallos, 3)
+        self.assertEqual(self.almacen.estadisticas()["resultados"], 2)
+        self.assertEqual(self.almacen.historial("CC-3"), [])
+
+        tasa, _ = self.almacen.calcular(logica_calcupension.SolicitudPension(*filas[3]))
+        self.assertNotEqual(tasa, tasa)
+        self.assertEqual(self.almacen.estadisticas()["resultados"], 2)
+
+    def test_semanas_con_decimales(self):
+        """
+        Una fila con 1400.9 semanas no reutiliza el resultado guardado para 1400.
+        """
+        self.assertEqual(
+            almacen_calcupension.hash_datos("Vejez", 3_000_000, 1400.0, "Hombre", 62.0, 0),
+            almacen_calcupension.hash_datos("Vejez", 3_000_000, 1400, "Hombre", 62, 0),
+        )
+
+        self.almacen.calcular(logica_calcupension.SolicitudPension("Vejez", 3_000_000, 1400, "Hombre", 62, 0))
+
+        fila = ("Vejez", 3_000_000, 1400.9, "Hombre", 62, 0)
+        tasas, mesadas, _ = self.almacen.calcular_lote(["CC-1"], [fila])
+        esperado = logica_calcupension.CalculadoraPension.calcular_lote(*zip(fila))
+
+        self.assertEqual((tasas[0], mesadas[0]), (esperado[0][0], esperado[1][0]))
+        self.assertAlmostEqual(tasas[0], 67.6703, places=4)
+        self.assertEqual(self.almacen.aciertos, 0)
+
+    def test_historial_y_archivo(self):
+        """
+        Los resultados persisten en el archivo y se consultan por afiliado.
+        """
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "resultados.db")
+            with almacen_calcupension.AlmacenResultados(ruta) as almacen:
+                almacen.calcular(logica_calcupension.SolicitudPension(*FILAS[0]), afiliado="CC-1")
+                almacen.calcular(logica_calcupension.SolicitudPension(*FILAS[2]), afiliado="CC-1")
+
+            with almacen_calcupension.AlmacenResultados(ruta) as almacen:
+                historial = almacen.historial("CC-1")
+                self.assertEqual([registro["tipo"] for registro in historial], ["Vejez", "Invalidez"])
+                self.assertEqual(historial[0]["version"], reglas_calcupension.REGLAS_VIGENTES.version)
+                self.assertTrue(historial[0]["fecha"])
+                self.assertIsNotNone(almacen.consultar(logica_calcupension.SolicitudPension(*FILAS[2])))
+
+
+if __name__ == "__main__":
+    unittest.main()
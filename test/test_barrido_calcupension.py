@@ -0,0 +1,172 @@
+"""
+Módulo de pruebas unitarias para los barridos de parámetros.
+
+Las pruebas cubren:
+
+- Grilla IBL × semanas igual al cálculo individual (vejez sin edad es inválida)
+- Grilla con otras reglas y PCL de frontera o NaN igual a calcular_lote
+- Puntos de quiebre de vejez (piso, tope y mesada mínima)
+- Puntos de quiebre sin pendiente por IBL ni incremento por semanas (math.inf)
+- Tablas con más de un umbral de semanas (ValueError)
+"""
+
+import copy
+import math
+import unittest
+import sys
+sys.path.append("src")
+from calcupension.model import barrido_calcupension
+from calcupension.model import logica_calcupension
+from calcupension.model import reglas_calcupension
+
+
+class TestBarridoCalcupension(unittest.TestCase):
+    """
+    Pruebas de barrer y de los puntos de quiebre analíticos.
+    """
+
+    def test_grilla_coincide_con_individual(self):
+        """
+        Cada punto válido de la grilla coincide exactamente con calcular_tasa_reemplazo.
+        """
+        ingresos = [0, 1_000_000, 3_000_000, 20_000_000, 60_000_000]
+        semanas = [1000, 1300, 1350, 1777, 2500]
+        edades = [50, 62, 70, None]
+
+        resultado = barrido_calcupension.barrer("Vejez", ingresos, semanas, edades, "Hombre")
+
+        for i, ingreso in enumerate(ingresos):
+            for j, semanas_punto in enumerate(semanas):
+                for k, edad in enumerate(edades):
+                    solicitud = logica_calcupension.SolicitudPension(
+                        "Vejez", ingreso, semanas_punto, "Hombre", edad, 0
+                    )
+                    try:
+                        tasa = logica_calcupension.CalculadoraPension.calcular_tasa_reemplazo(solicitud)
+                    except Exception:
+                        self.assertTrue(math.isnan(resultado.tasa(i, j, k)))
+                        continue
+
+                    mesada = logica_calcupension.CalculadoraPension.calcular_pension(tasa, ingreso, "Vejez")
+                    self.assertEqual(resultado.tasa(i, j, k), tasa)
+                    self.assertEqual(resultado.mesada(i, j, k), mesada)
+
+    def test_grilla_invalidez(self):
+        """
+        El barrido también aplica a otros tipos de pensión.
+        """
+        resultado = barrido_calcupension.barrer(
+            "Invalidez", [4_000_000], [400, 1000], porcentaje_perdida_capacidad_laboral=70
+        )
+
+        self.assertEqual(list(resultado.tasas[0]), [54.0, 74.0])
+
+    def test_grilla_otras_reglas(self):
+        """
+        Con reglas sin tope y bandas de PCL propias, la grilla coincide bit a bit con calcular_lote.
+        """
+        definicion = copy.deepcopy(reglas_calcupension.REGLAS_2026)
+        definicion["version"] = "prueba-barrido"
+        invalidez = definicion["tipos"]["Invalidez"]
+        invalidez.update(tope=None, pendiente_ibl=0.25)
+        invalidez["bandas_pcl"] = [
+            {"pcl_hasta": 60, "base": 40, "incremento": 1},
+            {"pcl_hasta": 80, "base": 50, "incremento": 1.75},
+            {"pcl_hasta": None, "base": 58, "incremento": 2.5},
+        ]
+        reglas = reglas_calcupension.ReglasPension(definicion)
+        ingresos = [-1, 1_000_000, 4_000_000, 30_000_000]
+        semanas = [0, 500, 501, 777, 3000]
+
+        for pcl in (55, 60, 60.5, 80, 95, math.nan):
+            resultado = barrido_calcupension.barrer("Invalidez", ingresos, semanas, (40,), None, pcl, reglas)
+            for i, ingreso in enumerate(ingresos):
+                filas = [("Invalidez", ingreso, semanas_punto, None, 40, pcl) for semanas_punto in semanas]
+                tasas, mesadas, codigos = logica_calcupension.CalculadoraPension.calcular_lote(*zip(*filas), reglas)
+                for j, codigo in enumerate(codigos):
+                    if codigo:
+                        self.assertTrue(math.isnan(resultado.tasa(i, j)))
+                    else:
+                        self.assertEqual(resultado.tasa(i, j).hex(), tasas[j].hex())
+                        self.assertEqual(resultado.mesada(i, j).hex(), mesadas[j].hex())
+
+    def test_quiebres_ibl(self):
+        """
+        Alrededor de cada quiebre en IBL la tasa o la mesada cambian de régimen.
+        """
+        semanas = 1800
+        quiebres = barrido_calcupension.quiebres_ibl_vejez(semanas)
+
+        def tasa_y_mesada(ingreso):
+            solicitud = logica_calcupension.SolicitudPension("Vejez", ingreso, semanas, "Mujer", 60, 0)
+            tasa = logica_calcupension.CalculadoraPension.calcular_tasa_reemplazo(solicitud)
+            return tasa, logica_calcupension.CalculadoraPension.calcular_pension(tasa, ingreso, "Vejez")
+
+        self.assertEqual(tasa_y_mesada(quiebres["ibl_tope"] * 0.999)[0], 80)
+        self.assertLess(tasa_y_mesada(quiebres["ibl_tope"] * 1.001)[0], 80)
+        self.assertGreater(tasa_y_mesada(quiebres["ibl_piso"] * 0.999)[0], 55)
+        self.assertEqual(tasa_y_mesada(quiebres["ibl_piso"] * 1.001)[0], 55)
+        self.assertEqual(tasa_y_mesada(quiebres["ibl_mesada_minima"] * 0.999)[1], 1_750_905)
+        self.assertGreater(tasa_y_mesada(quiebres["ibl_mesada_minima"] * 1.001)[1], 1_750_905)
+
+    def test_quiebres_semanas(self):
+        """
+        Desde semanas_tope la tasa queda en 80%.
+        """
+        quiebres = barrido_calcupension.quiebres_semanas_vejez(3_000_000)
+
+        semanas_tope = math.ceil(quiebres["semanas_tope"])
+        solicitud = logica_calcupension.SolicitudPension("Vejez", 3_000_000, semanas_tope, "Hombre", 62, 0)
+        anterior = logica_calcupension.SolicitudPension("Vejez", 3_000_000, semanas_tope - 1, "Hombre", 62, 0)
+
+        self.assertEqual(logica_calcupension.CalculadoraPension.calcular_tasa_reemplazo(solicitud), 80)
+        self.assertLess(logica_calcupension.CalculadoraPension.calcular_tasa_reemplazo(anterior), 80)
+        self.assertEqual(quiebres["semanas_sobre_piso"], 1300)
+
+    def test_quiebres_sin_pendiente(self):
+        """
+        Sin pendiente por IBL ni incremento por semanas, los quiebres que no ocurren valen math.inf.
+        """
+        definicion = copy.deepcopy(reglas_calcupension.REGLAS_2026)
+        definicion["version"] = "prueba-quiebres"
+        vejez = definicion["tipos"]["Vejez"]
+        vejez["pendiente_ibl"] = 0
+        vejez["bandas_pcl"] = [{"pcl_hasta": None, "base": 65.5, "incremento": 0}]
+        reglas = reglas_calcupension.ReglasPension(definicion)
+
+        quiebres = barrido_calcupension.quiebres_ibl_vejez(1800, reglas)
+        self.assertEqual(quiebres["ibl_tope"], 0.0)
+        self.assertEqual(quiebres["ibl_piso"], math.inf)
+
+        ingreso = quiebres["ibl_mesada_minima"]
+        for factor, esperado in ((0.999, reglas.smmlv), (1.001, None)):
+            solicitud = logica_calcupension.SolicitudPension("Vejez", ingreso * factor, 1800, "Hombre", 62, 0)
+            tasa = logica_calcupension.CalculadoraPension.calcular_tasa_reemplazo(solicitud, reglas)
+            mesada = logica_calcupension.CalculadoraPension.calcular_pension(tasa, ingreso * factor, "Vejez", reglas)
+            if esperado is None:
+                self.assertGreater(mesada, reglas.smmlv)
+            else:
+                self.assertEqual(mesada, esperado)
+
+        quiebres = barrido_calcupension.quiebres_semanas_vejez(3_000_000, reglas)
+        self.assertEqual(quiebres, {"semanas_sobre_piso": 1300.0, "semanas_tope": math.inf})
+
+    def test_tabla_con_varios_umbrales(self):
+        """
+        Una tabla con tramos de semanas de transición se rechaza en lugar de leer solo el primero.
+        """
+        definicion = copy.deepcopy(reglas_calcupension.REGLAS_2026)
+        definicion["version"] = "prueba-umbrales"
+        reglas = reglas_calcupension.ReglasPension(definicion)
+        tabla = reglas.tablas["Vejez"]
+        base, _, (_, tramo) = tabla.bandas[0]
+        tabla.bandas = ((base, (1300, 2000), (None, tramo, (2000, 50, 1.0, 21.0))),)
+
+        with self.assertRaises(ValueError):
+            barrido_calcupension.parametros_tipo("Vejez", 0, reglas)
+        with self.assertRaises(ValueError):
+            barrido_calcupension.quiebres_semanas_vejez(3_000_000, reglas)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+Módulo de pruebas unitarias para la suite de benchmarks.
+
+Las pruebas cubren:
+
+- Población sintética determinística con filas válidas e inválidas (incluidas
+  las de vejez que no alcanzan las semanas mínimas)
+- Ejecución de los benchmarks a escala pequeña, incluidas las rutas de archivo y paralela
+- Selección de rutas (validar_lote sin calcular_lote)
+- Comparación contra una ejecución base
+"""
+
+import unittest
+import sys
+sys.path.append("src")
+sys.path.append("benchmarks")
+import benchmark_calcupension
+from calcupension.model import logica_calcupension
+
+
+class TestBenchmarkCalcupension(unittest.TestCase):
+    """
+    Pruebas de la suite de benchmarks.
+    """
+
+    def test_poblacion_determinista_y_mixta(self):
+        """
+        La población depende solo de la semilla e incluye los tres tipos y filas inválidas.
+        """
+        poblacion = list(benchmark_calcupension.generar_poblacion(2000, semilla=3))
+
+        self.assertEqual(poblacion, list(benchmark_calcupension.generar_poblacion(2000, semilla=3)))
+        self.assertEqual({fila[0] for fila in poblacion}, set(logica_calcupension.TIPOS_PENSION))
+
+        _, _, codigos = logica_calcupension.CalculadoraPension.calcular_lote(*zip(*poblacion))
+        invalidas = sum(1 for codigo in codigos if codigo != logica_calcupension.CODIGO_OK)
+        self.assertGreater(invalidas, 500)
+        self.assertLess(invalidas, 1100)
+
+        vejez = [codigo for fila, codigo in zip(poblacion, codigos) if fila[0] == "Vejez"]
+        sin_semanas = vejez.count(logica_calcupension.CODIGO_ERROR_SEMANAS)
+        self.assertGreater(sin_semanas / len(vejez), 0.25)
+
+    def test_ejecutar(self):
+        """
+        Cada ruta reporta rendimiento y las rutas individuales, latencias.
+        """
+        resultados = benchmark_calcupension.ejecutar(300, memoria=False)
+
+        for nombre, resultado in resultados["resultados"].items():
+            self.assertGreater(resultado["registros_por_segundo"], 0, nombre)
+        self.assertIn("latencia_p99_us", resultados["resultados"]["calcular_tasa_reemplazo"])
+        for nombre in ("validar_lote", "paralelo", "lote_archivo_csv", "binario_archivo"):
+            self.assertIn(nombre, resultados["resultados"])
+
+    def test_seleccion_de_rutas(self):
+        """
+        Solo se miden las rutas pedidas, aunque no incluyan calcular_lote.
+        """
+        resultados = benchmark_calcupension.ejecutar(200, memoria=False, rutas=["validar_lote", "binario_archivo"])
+
+        self.assertEqual(set(resultados["resultados"]), {"validar_lote", "binario_archivo"})
+
+    def test_comparar(self):
+        """
+        Solo se reportan las rutas que caen más que el umbral.
+        """
+        base = {"resultados": {"a": {"registros_por_segundo": 1000}, "b": {"registros_por_segundo": 1000}}}
+        actual = {"resultados": {"a": {"registros_por_segundo": 950}, "b": {"registros_por_segundo": 700}}}
+
+        regresiones = benchmark_calcupension.comparar(actual, base, 0.10)
+
+        self.assertEqual(len(regresiones), 1)
+        self.assertTrue(regresiones[0].startswith("b:"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+"""
+Módulo de pruebas unitarias para el formato binario por columnas.
+
+Las pruebas cubren:
+
+- Escritura y lectura sin pérdida de datos
+- Cálculo directo desde el archivo mapeado (igual a calcular_lote)
+- Vejez sin edad (error de edad) y códigos de tipo o género fuera de rango
+- Conversión desde CSV con rechazos
+- Archivos inválidos
+"""
+
+import os
+import tempfile
+import unittest
+import sys
+sys.path.append("src")
+from calcupension.model import binario_calcupension
+from calcupension.model import logica_calcupension
+from calcupension.view import lote_calcupension
+
+
+FILAS = [
+    ("Vejez", 3_000_000, 1300, "Hombre", 62, 0),
+    ("Vejez", 2_000_000, 400, "Mujer", 58, 0),
+    ("Sobreviviente", 3_500_000, 700, None, None, 0),
+    ("Invalidez", 2_800_000, 900, "Mujer", 53, 65),
+    ("Invalidez", 4_000_000, 1000, "Hombre", 55, 40),
+    ("Vejez", 1_400_000, 1400, "Mujer", 57, 0),
+]
+
+
+class TestBinarioCalcupension(unittest.TestCase):
+    """
+    Pruebas de EscritorBinario, ArchivoBinario y calcular_archivo.
+    """
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+
+    def ruta(self, nombre: str) -> str:
+        return os.path.join(self.directorio.name, nombre)
+
+    def test_ida_y_vuelta(self):
+        """
+        Las filas leídas del archivo son iguales a las escritas.
+        """
+        ruta = self.ruta("portafolio.cpb")
+
+        escritas = binario_calcupension.escribir_filas(ruta, FILAS, tamano_fragmento=4)
+
+        self.assertEqual(escritas, len(FILAS))
+        with binario_calcupension.ArchivoBinario(ruta) as archivo:
+            self.assertEqual(len(archivo), len(FILAS))
+            self.assertFalse(archivo.con_resultados)
+            self.assertIsNone(archivo.resultados())
+            self.assertIsInstance(archivo.columna("semanas"), memoryview)
+
+            lote = archivo.lote()
+            leidas = [
+                (vista.tipo, vista.ingreso_base_liquidacion, vista.semanas, vista.genero,
+                 vista.edad, vista.porcentaje_perdida_capacidad_laboral)
+                for vista in lote
+            ]
+        self.assertEqual(leidas, FILAS)
+
+    def test_calcular_archivo(self):
+        """
+        Calcular desde el archivo da los mismos resultados que calcular_lote.
+        """
+        entrada = self.ruta("portafolio.cpb")
+        salida = self.ruta("resultados.cpb")
+        binario_calcupension.escribir_filas(entrada, FILAS)
+
+        calculadas, rechazadas = binario_calcupension.calcular_archivo(entrada, salida, tamano_fragmento=4)
+
+        esperados = logica_calcupension.CalculadoraPension.calcular_lote(*zip(*FILAS))
+        self.assertEqual((calculadas, rechazadas), (4, 2))
+        with binario_calcupension.ArchivoBinario(salida) as archivo:
+            for columna, esperado in zip(archivo.resultados(), esperados):
+                self.assertEqual(columna.tobytes(), esperado.tobytes())
+
+    def test_edad_y_codigos_invalidos(self):
+        """
+        Vejez sin edad da error de edad; un código de tipo o género dañado no se lee como otro valor.
+        """
+        entrada = self.ruta("portafolio.cpb")
+        salida = self.ruta("resultados.cpb")
+        filas = [
+            ("Vejez", 3_000_000, 1300, "Hombre", None, 0),
+            ("Vejez", 3_000_000, 1300, "Mujer", None, 0),
+            ("Invalidez", 2_800_000, 900, "Mujer", 53, 65),
+            ("Invalidez", 2_800_000, 900, "Mujer", 53, 65),
+            ("Invalidez", 2_800_000, 900, "Mujer", 53, 65),
+        ]
+        lote = logica_calcupension.LoteSolicitudes()
+        for fila in filas:
+            lote.agregar(*fila)
+        lote.tipos[2] = -1
+        lote.tipos[3] = len(logica_calcupension.TIPOS_PENSION)
+        lote.generos[4] = -2
+        binario_calcupension.escribir_lote(entrada, lote)
+
+        binario_calcupension.calcular_archivo(entrada, salida)
+
+        with binario_calcupension.ArchivoBinario(entrada) as archivo:
+            vistas = list(archivo.lote())
+            self.assertEqual([vista.tipo for vista in vistas[2:4]], [-1, 3])
+            self.assertEqual(vistas[4].genero, -2)
+        with binario_calcupension.ArchivoBinario(salida) as archivo:
+            codigos = list(archivo.resultados()[2])
+        self.assertEqual(codigos[:4], [
+            logica_calcupension.CODIGO_ERROR_EDAD_HOMBRES,
+            logica_calcupension.CODIGO_ERROR_EDAD_MUJERES,
+            logica_calcupension.CODIGO_ERROR_TIPO,
+            logica_calcupension.CODIGO_ERROR_TIPO,
+        ])
+
+        with self.assertRaises(logica_calcupension.ErrorTipoPension):
+            logica_calcupension.CalculadoraPension.calcular_tasa_reemplazo(lote[2])
+
+    def test_convertir_csv(self):
+        """
+        El subcomando convertir escribe el binario y separa las filas inválidas.
+        """
+        entrada = self.ruta("entrada.csv")
+        with open(entrada, "w", encoding="utf-8") as archivo:
+            archivo.write(
+                "tipo,ingreso_base_liquidacion,semanas,genero,edad,porcentaje_perdida_capacidad_laboral\n"
+                "Vejez,3000000,1300,Hombre,62,0\n"
+                "Jubilacion,3000000,1300,Hombre,62,0\n"
+                "Invalidez,4000000,1000,Hombre,55,abc\n"
+                "Sobreviviente,3500000,700,,,\n"
+            )
+
+        codigo = lote_calcupension.main([
+            "convertir", entrada, self.ruta("portafolio.cpb"), "--rechazos", self.ruta("rechazos.jsonl")
+        ])
+        lote_calcupension.main(["lote", self.ruta("portafolio.cpb"), self.ruta("resultados.cpb")])
+
+        self.assertEqual(codigo, 0)
+        with open(self.ruta("rechazos.jsonl"), encoding="utf-8") as archivo:
+            self.assertEqual(len(archivo.readlines()), 2)
+        with binario_calcupension.ArchivoBinario(self.ruta("resultados.cpb")) as archivo:
+            tasas, mesadas, codigos = archivo.resultados()
+            self.assertEqual(list(codigos), [0, 0])
+            self.assertAlmostEqual(mesadas[0], 1_939_299, 0)
+            self.assertAlmostEqual(tasas[1], 53.00, 2)
+
+    def test_archivo_invalido(self):
+        """
+        Un archivo que no es binario de solicitudes lanza ErrorFormatoBinario.
+        """
+        ruta = self.ruta("otro.cpb")
+        with open(ruta, "wb") as archivo:
+            archivo.write(b"tipo,ingreso_base_liquidacion,semanas\n" * 4)
+
+        with self.assertRaises(binario_calcupension.ErrorFormatoBinario):
+            binario_calcupension.ArchivoBinario(ruta)
+
+
+if __name__ == '__main__':
+    unittest.main()
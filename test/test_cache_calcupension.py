@@ -0,0 +1,131 @@
+"""
+Módulo de pruebas unitarias para la caché de tasa de reemplazo.
+
+Las pruebas cubren:
+
+- Resultados idénticos a la calculadora
+- Contadores de aciertos, fallos y desalojos
+- Invalidación al cambiar las reglas
+- Banda de PCL en los límites y con PCL NaN
+- Excepciones en solicitudes inválidas
+"""
+
+import copy
+import random
+import unittest
+import sys
+sys.path.append("src")
+from calcupension.model import cache_calcupension
+from calcupension.model import logica_calcupension
+from calcupension.model import reglas_calcupension
+
+
+class TestCacheCalcupension(unittest.TestCase):
+    """
+    Pruebas de CacheTasaReemplazo.
+    """
+
+    def test_coincide_con_calculadora(self):
+        """
+        La caché retorna exactamente lo mismo que la calculadora, o la misma excepción.
+        """
+        cache = cache_calcupension.CacheTasaReemplazo(maximo=64)
+        aleatorio = random.Random(7)
+
+        for _ in range(3000):
+            solicitud = logica_calcupension.SolicitudPension(
+                aleatorio.choice(logica_calcupension.TIPOS_PENSION),
+                aleatorio.choice([0, 1_500_000, 3_000_000, 8_000_000]),
+                aleatorio.randrange(-10, 2000, 10),
+                aleatorio.choice(logica_calcupension.GENEROS),
+                aleatorio.randint(50, 70),
+                aleatorio.choice([40, 50, 60, 66, 70, 90]),
+            )
+            try:
+                esperado = logica_calcupension.CalculadoraPension.calcular_tasa_reemplazo(solicitud)
+            except Exception as error:
+                with self.assertRaises(type(error)):
+                    cache.calcular_tasa_reemplazo(solicitud)
+                continue
+
+            self.assertEqual(cache.calcular_tasa_reemplazo(solicitud), esperado)
+
+        estadisticas = cache.estadisticas()
+        self.assertGreater(estadisticas["aciertos"], 0)
+        self.assertLessEqual(estadisticas["entradas"], 64)
+
+    def test_normalizacion_y_contadores(self):
+        """
+        Solicitudes que solo difieren en datos irrelevantes comparten entrada.
+        """
+        cache = cache_calcupension.CacheTasaReemplazo(maximo=2)
+
+        cache.calcular_tasa_reemplazo(
+            logica_calcupension.SolicitudPension("Sobreviviente", 3_500_000, 300, None, None, 0)
+        )
+        tasa = cache.calcular_tasa_reemplazo(
+            logica_calcupension.SolicitudPension("Sobreviviente", 1_000_000, 450, "Mujer", 40, 0)
+        )
+        cache.calcular_tasa_reemplazo(
+            logica_calcupension.SolicitudPension("Invalidez", 2_800_000, 900, "Mujer", 53, 65)
+        )
+        cache.calcular_tasa_reemplazo(
+            logica_calcupension.SolicitudPension("Invalidez", 2_800_000, 900, "Mujer", 53, 70)
+        )
+
+        self.assertEqual(tasa, 45)
+        estadisticas = cache.estadisticas()
+        self.assertEqual(estadisticas["aciertos"], 1)
+        self.assertEqual(estadisticas["fallos"], 3)
+        self.assertEqual(estadisticas["desalojos"], 1)
+
+    def test_invalidacion_por_reglas(self):
+        """
+        Cambiar de reglas vacía la caché y recalcula con el nuevo SMMLV.
+        """
+        cache = cache_calcupension.CacheTasaReemplazo()
+        solicitud = logica_calcupension.SolicitudPension("Vejez", 3_000_000, 1300, "Hombre", 62, 0)
+
+        cache.calcular_tasa_reemplazo(solicitud)
+
+        definicion = copy.deepcopy(reglas_calcupension.REGLAS_2026)
+        definicion["version"] = "prueba-cache"
+        definicion["smmlv"] = 2_000_000
+        reglas = reglas_calcupension.ReglasPension(definicion)
+
+        tasa = cache.calcular_tasa_reemplazo(solicitud, reglas)
+
+        self.assertAlmostEqual(tasa, 65.50 - 3_000_000 / 2_000_000 * 0.50, 10)
+        self.assertEqual(cache.estadisticas()["invalidaciones"], 1)
+        self.assertEqual(cache.estadisticas()["entradas"], 1)
+
+    def test_banda_pcl_frontera_y_nan(self):
+        """
+        La clave usa la misma banda de PCL que el cálculo, incluso en el límite y con PCL NaN.
+        """
+        cache = cache_calcupension.CacheTasaReemplazo()
+        calculadora = logica_calcupension.CalculadoraPension
+
+        for pcl in (60.0, float("nan"), 66.0, 66.000001, float("nan"), 60.0, 66.0, float("inf")):
+            solicitud = logica_calcupension.SolicitudPension("Invalidez", 3_000_000, 900, "Mujer", 40, pcl)
+            self.assertEqual(cache.calcular_tasa_reemplazo(solicitud), calculadora.calcular_tasa_reemplazo(solicitud))
+
+        nan = logica_calcupension.SolicitudPension("Invalidez", 3_000_000, 900, "Mujer", 40, float("nan"))
+        self.assertEqual(cache.calcular_tasa_reemplazo(nan), 70.0)
+        self.assertEqual(reglas_calcupension.REGLAS_VIGENTES.tablas["Invalidez"].indice_banda(float("nan")), 1)
+
+    def test_solicitud_invalida(self):
+        """
+        Las solicitudes inválidas lanzan la excepción de la calculadora y no se guardan.
+        """
+        cache = cache_calcupension.CacheTasaReemplazo()
+        solicitud = logica_calcupension.SolicitudPension("Vejez", 2_700_000, 1300, "Hombre", 50, 0)
+
+        with self.assertRaises(logica_calcupension.ErrorEdadMinimaHombres):
+            cache.calcular_tasa_reemplazo(solicitud)
+
+        self.assertEqual(cache.estadisticas()["entradas"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
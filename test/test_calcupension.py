@@ -17,10 +17,12 @@ Las pruebas cubren:
 - Casos de error por validaciones
 """
 
+import math
 import unittest
 import sys
+from array import array
 sys.path.append("src")
-from model import logica_calcupension
+from calcupension.model import logica_calcupension
 
 
 class TestCalculoPension(unittest.TestCase):
@@ -204,6 +206,238 @@ class TestCalculoPension(unittest.TestCase):
             logica_calcupension.CalculadoraPension.calcular_tasa_reemplazo(solicitud)
 
 
+class TestCalculoLote(unittest.TestCase):
+    """
+    Pruebas del cálculo por lotes (calcular_lote).
+
+    Verifican que el lote coincide bit a bit con el cálculo individual y que
+    las filas inválidas reciben el código de error correspondiente.
+    """
+
+    CASOS = [
+        ("Vejez", 3_000_000, 1300, "Hombre", 62, 0),
+        ("Vejez", 5_000_000, 1300, "Mujer", 57, 0),
+        ("Vejez", 4_500_000, 1300, "Hombre", 63, 0),
+        ("Vejez", 2_500_000, 1500, "Hombre", 62, 0),
+        ("Sobreviviente", 3_500_000, 700, "Hombre", None, 0),
+        ("Vejez", 1_400_000, 1400, "Mujer", 57, 0),
+        ("Vejez", 10_000_000, 2000, "Hombre", 62, 0),
+        ("Invalidez", 2_800_000, 900, "Mujer", 53, 65),
+        ("Invalidez", 4_000_000, 1000, "Hombre", 55, 70),
+        ("Vejez", 0, 1350, "Hombre", 63, 0),
+        ("Vejez", 2_000_000, 400, "Mujer", 58, 0),
+        ("Vejez", 2_700_000, 1300, "Hombre", 50, 0),
+        ("Vejez", 4_500_000, 1300, "Mujer", 45, 0),
+        ("Invalidez", 4_000_000, 1000, "Hombre", 55, 40),
+        ("Sobreviviente", 3_500_000, -1, None, None, 0),
+        ("Orfandad", 3_500_000, 700, None, None, 0),
+        ("Vejez", 3_000_000, 1300, "Hombre", None, 0),
+        ("Vejez", 3_000_000, 1300, "Mujer", None, 0),
+    ]
+
+    def calcular_individual(self, caso: tuple) -> tuple:
+        """
+        Calcula un caso con la API individual y retorna (tasa, mesada, codigo).
+        """
+        solicitud = logica_calcupension.SolicitudPension(*caso)
+        try:
+            tasa = logica_calcupension.CalculadoraPension.calcular_tasa_reemplazo(solicitud)
+        except tuple(logica_calcupension.CODIGOS_ERROR) as error:
+            return None, None, logica_calcupension.CODIGOS_ERROR[type(error)]
+        mesada = logica_calcupension.CalculadoraPension.calcular_pension(
+            tasa, solicitud.ingreso_base_liquidacion, solicitud.tipo
+        )
+        return tasa, mesada, logica_calcupension.CODIGO_OK
+
+    def test_lote_coincide_con_individual(self):
+        """
+        Cada fila del lote coincide exactamente con el cálculo individual.
+        """
+        columnas = [list(columna) for columna in zip(*self.CASOS)]
+
+        tasas, mesadas, codigos = logica_calcupension.CalculadoraPension.calcular_lote(*columnas)
+
+        for i, caso in enumerate(self.CASOS):
+            tasa, mesada, codigo = self.calcular_individual(caso)
+            self.assertEqual(codigos[i], codigo, caso)
+            if codigo == logica_calcupension.CODIGO_OK:
+                self.assertEqual(tasas[i], tasa, caso)
+                self.assertEqual(mesadas[i], mesada, caso)
+            else:
+                self.assertTrue(math.isnan(tasas[i]))
+                self.assertTrue(math.isnan(mesadas[i]))
+
+    def test_lote_con_buffers_array(self):
+        """
+        El lote acepta columnas numéricas en buffers array.array.
+        """
+        tasas, mesadas, codigos = logica_calcupension.CalculadoraPension.calcular_lote(
+            ["Vejez", "Invalidez"],
+            array("d", [3_000_000, 4_000_000]),
+            array("i", [1300, 1000]),
+            ["Hombre", "Hombre"],
+            array("i", [62, 55]),
+            array("d", [0, 70]),
+        )
+
+        self.assertEqual(list(codigos), [0, 0])
+        self.assertAlmostEqual(tasas[0], 64.64, 2)
+        self.assertAlmostEqual(mesadas[0], 1_939_299, 0)
+        self.assertAlmostEqual(tasas[1], 74.00, 2)
+
+    def test_lote_edad_no_informada(self):
+        """
+        Una solicitud de vejez sin edad recibe el código de edad insuficiente, como en validar_lote.
+        """
+        tasas, mesadas, codigos = logica_calcupension.CalculadoraPension.calcular_lote(
+            ["Vejez", "Vejez", "Vejez"],
+            [3_000_000, 3_000_000, 3_000_000],
+            [1300, 1300, 1300],
+            ["Hombre", "Mujer", None],
+            [None, None, None],
+            [0, 0, 0],
+        )
+
+        self.assertEqual(
+            list(codigos),
+            [logica_calcupension.CODIGO_ERROR_EDAD_HOMBRES, logica_calcupension.CODIGO_ERROR_EDAD_MUJERES, 0]
+        )
+        self.assertTrue(math.isnan(tasas[0]) and math.isnan(mesadas[1]))
+        with self.assertRaises(logica_calcupension.ErrorEdadMinimaHombres):
+            logica_calcupension.CalculadoraPension.calcular_tasa_reemplazo(
+                logica_calcupension.SolicitudPension("Vejez", 3_000_000, 1300, "Hombre", None, 0)
+            )
+
+    def test_lote_columnas_de_distinta_longitud(self):
+        """
+        Error si las columnas del lote no tienen la misma longitud.
+        """
+        with self.assertRaises(ValueError):
+            logica_calcupension.CalculadoraPension.calcular_lote(
+                ["Vejez"], [3_000_000, 1], [1300], ["Hombre"], [62], [0]
+            )
+
+
+class TestLoteSolicitudes(unittest.TestCase):
+    """
+    Pruebas de la representación compacta de solicitudes.
+    """
+
+    def crear_lote(self) -> logica_calcupension.LoteSolicitudes:
+        lote = logica_calcupension.LoteSolicitudes()
+        for caso in TestCalculoLote.CASOS[:9]:
+            lote.agregar(*caso)
+        return lote
+
+    def test_solicitud_sin_diccionario(self):
+        """
+        SolicitudPension usa __slots__ y comparte las cadenas de tipo y género.
+        """
+        solicitud = logica_calcupension.SolicitudPension(
+            "".join(["Ve", "jez"]), 3_000_000, 1300, "".join(["Hom", "bre"]), 62, 0
+        )
+
+        self.assertFalse(hasattr(solicitud, "__dict__"))
+        self.assertIs(solicitud.tipo, logica_calcupension.TIPOS_PENSION[0])
+        self.assertIs(solicitud.genero, logica_calcupension.GENEROS[0])
+
+    def test_vistas_del_lote(self):
+        """
+        Las vistas del lote devuelven los datos originales y sirven para el cálculo individual.
+        """
+        lote = self.crear_lote()
+
+        self.assertEqual(len(lote), 9)
+        for vista, caso in zip(lote, TestCalculoLote.CASOS):
+            solicitud = vista.a_solicitud()
+            self.assertEqual(
+                (solicitud.tipo, solicitud.ingreso_base_liquidacion, solicitud.semanas,
+                 solicitud.genero, solicitud.edad, solicitud.porcentaje_perdida_capacidad_laboral),
+                caso
+            )
+
+        tasa: float = logica_calcupension.CalculadoraPension.calcular_tasa_reemplazo(lote[-1])
+        self.assertAlmostEqual(tasa, 74.00, 2)
+
+    def test_calcular_lote_compacto(self):
+        """
+        Calcular el lote compacto da los mismos resultados que las columnas originales.
+        """
+        lote = self.crear_lote()
+        columnas = [list(columna) for columna in zip(*TestCalculoLote.CASOS[:9])]
+
+        esperado = logica_calcupension.CalculadoraPension.calcular_lote(*columnas)
+
+        self.assertEqual(lote.calcular(), esperado)
+
+    def test_tipo_sin_codigo(self):
+        """
+        Error al agregar un tipo o género que no tiene código.
+        """
+        lote = logica_calcupension.LoteSolicitudes()
+
+        with self.assertRaises(logica_calcupension.ErrorTipoPension):
+            lote.agregar("Orfandad", 3_500_000, 700, None, None, 0)
+
+        with self.assertRaises(logica_calcupension.ErrorGenero):
+            lote.agregar("Vejez", 3_500_000, 1300, "Otro", 62, 0)
+
+
+class TestValidacionSinExcepciones(unittest.TestCase):
+    """
+    Pruebas de la validación por máscara de errores (validar y validar_lote).
+    """
+
+    def test_reporta_todas_las_reglas(self):
+        """
+        Una solicitud que incumple varias reglas las reporta todas.
+        """
+        solicitud = logica_calcupension.SolicitudPension("Vejez", 0, 400, "Mujer", 45, 0)
+
+        mascara: int = logica_calcupension.CalculadoraPension.validar(solicitud)
+
+        self.assertEqual(
+            logica_calcupension.errores_de_mascara(mascara),
+            [
+                logica_calcupension.ErrorIBL,
+                logica_calcupension.ErrorSemanasCotizadas,
+                logica_calcupension.ErrorEdadMinimaMujeres,
+            ]
+        )
+        self.assertEqual(logica_calcupension.primer_error(mascara), logica_calcupension.CODIGO_ERROR_IBL)
+
+    def test_primer_error_coincide_con_excepcion(self):
+        """
+        El primer error de la máscara es la excepción que lanza el cálculo individual.
+        """
+        for caso in TestCalculoLote.CASOS:
+            solicitud = logica_calcupension.SolicitudPension(*caso)
+            mascara = logica_calcupension.CalculadoraPension.validar(solicitud)
+            try:
+                logica_calcupension.CalculadoraPension.calcular_tasa_reemplazo(solicitud)
+                esperado = logica_calcupension.CODIGO_OK
+            except tuple(logica_calcupension.CODIGOS_ERROR) as error:
+                esperado = logica_calcupension.CODIGOS_ERROR[type(error)]
+
+            self.assertEqual(logica_calcupension.primer_error(mascara), esperado, caso)
+
+    def test_validar_lote(self):
+        """
+        validar_lote coincide fila a fila con validar.
+        """
+        columnas = [list(columna) for columna in zip(*TestCalculoLote.CASOS)]
+
+        mascaras = logica_calcupension.CalculadoraPension.validar_lote(*columnas)
+
+        self.assertEqual(
+            list(mascaras),
+            [
+                logica_calcupension.CalculadoraPension.validar(logica_calcupension.SolicitudPension(*caso))
+                for caso in TestCalculoLote.CASOS
+            ]
+        )
+
+
 if __name__ == '__main__':
     """
     Punto de entrada del archivo de pruebas.
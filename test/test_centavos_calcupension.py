@@ -0,0 +1,209 @@
+"""
+Módulo de pruebas unitarias para el cálculo en punto fijo.
+
+Las pruebas cubren:
+
+- Conversión a centavos y redondeo con empates lejos de cero
+- Valores no finitos o no numéricos rechazados con ValueError
+- Coeficientes compilados que se liberan con las reglas
+- Valores conocidos de tasa y mesada
+- Redondeo de la mesada al peso
+- Coincidencia entre cálculo individual y por lote
+- Comparación con el cálculo en float
+- Códigos de error de las filas inválidas
+- IBL no finito en un lote (se marca la fila y el lote continúa)
+"""
+
+import copy
+import gc
+import random
+import unittest
+import sys
+sys.path.append("src")
+from decimal import Decimal
+from calcupension.model import centavos_calcupension
+from calcupension.model import logica_calcupension
+from calcupension.model import reglas_calcupension
+
+
+def columnas(filas):
+    return [list(columna) for columna in zip(*filas)]
+
+
+class TestCentavosCalcupension(unittest.TestCase):
+    """
+    Pruebas de a_centavos, calcular_centavos y calcular_lote_centavos.
+    """
+
+    def test_a_centavos(self):
+        """
+        Los float se toman por su representación decimal y se redondean al centavo.
+        """
+        self.assertEqual(centavos_calcupension.a_centavos(3_000_000), 300_000_000)
+        self.assertEqual(centavos_calcupension.a_centavos(1.005), 101)
+        self.assertEqual(centavos_calcupension.a_centavos(2.675), 268)
+        self.assertEqual(centavos_calcupension.a_centavos(-1.005), -101)
+        self.assertEqual(centavos_calcupension.a_centavos(1.004), 100)
+        self.assertEqual(centavos_calcupension.a_centavos("1750905.5"), 175_090_550)
+        self.assertEqual(centavos_calcupension.a_centavos(Decimal("1E+3")), 100_000)
+        self.assertEqual(centavos_calcupension.a_centavos(1e20), 10**22)
+
+    def test_a_centavos_invalido(self):
+        """
+        NaN, infinito y textos no numéricos se rechazan con un ValueError claro.
+        """
+        for valor in (float("nan"), float("inf"), -float("inf"), Decimal("NaN"), "1.2.3", "mil"):
+            with self.assertRaises(ValueError) as contexto:
+                centavos_calcupension.a_centavos(valor)
+            self.assertIn("centavos", str(contexto.exception))
+
+    def test_compiladas_se_liberan(self):
+        """
+        Los coeficientes de unas reglas no las mantienen vivas.
+        """
+        definicion = copy.deepcopy(reglas_calcupension.REGLAS_2026)
+        reglas = reglas_calcupension.ReglasPension(dict(definicion, version="prueba-centavos"))
+        solicitud = logica_calcupension.SolicitudPension("Vejez", 3_000_000, 1300, "Hombre", 62, 0)
+        centavos_calcupension.calcular_centavos(solicitud, reglas)
+        self.assertIn(reglas, centavos_calcupension._COMPILADAS)
+
+        cantidad = len(centavos_calcupension._COMPILADAS)
+        del reglas
+        gc.collect()
+        self.assertEqual(len(centavos_calcupension._COMPILADAS), cantidad - 1)
+
+    def test_dividir_redondeando(self):
+        """
+        Los empates se redondean lejos de cero.
+        """
+        self.assertEqual(centavos_calcupension.dividir_redondeando(5, 2), 3)
+        self.assertEqual(centavos_calcupension.dividir_redondeando(-5, 2), -3)
+        self.assertEqual(centavos_calcupension.dividir_redondeando(7, 3), 2)
+        self.assertEqual(centavos_calcupension.dividir_redondeando(7, -2), -4)
+
+    def test_valor_conocido(self):
+        """
+        Vejez con IBL de 3.000.000 y 1300 semanas.
+        """
+        solicitud = logica_calcupension.SolicitudPension("Vejez", 3_000_000, 1300, "Hombre", 62, 0)
+        tasa, mesada = centavos_calcupension.calcular_centavos(solicitud)
+
+        self.assertEqual(tasa, 64_643_300)
+        self.assertEqual(mesada, 193_929_900)
+        self.assertEqual(centavos_calcupension.formatear_tasa(tasa), "64.643300")
+        self.assertEqual(centavos_calcupension.formatear_centavos(mesada), "1939299.00")
+
+    def test_redondeo_al_peso(self):
+        """
+        Con UNIDAD_PESO la mesada es múltiplo de 100 centavos.
+        """
+        solicitud = logica_calcupension.SolicitudPension("Sobreviviente", 2_345_678.91, 733, "Mujer", 60, 0)
+        _, centavos = centavos_calcupension.calcular_centavos(solicitud)
+        _, pesos = centavos_calcupension.calcular_centavos(
+            solicitud, unidad_mesada=centavos_calcupension.UNIDAD_PESO
+        )
+
+        self.assertEqual(pesos % 100, 0)
+        self.assertLessEqual(abs(pesos - centavos), 50)
+
+    def test_mesada_minima(self):
+        """
+        La mesada de Vejez no baja del salario mínimo.
+        """
+        solicitud = logica_calcupension.SolicitudPension("Vejez", 1_000_000, 1300, "Mujer", 57, 0)
+        _, mesada = centavos_calcupension.calcular_centavos(solicitud)
+
+        self.assertEqual(mesada, 175_090_500)
+
+    def test_validaciones(self):
+        """
+        Las solicitudes inválidas lanzan las mismas excepciones que el cálculo en float.
+        """
+        solicitud = logica_calcupension.SolicitudPension("Vejez", 3_000_000, 1000, "Hombre", 62, 0)
+
+        with self.assertRaises(logica_calcupension.ErrorSemanasCotizadas):
+            centavos_calcupension.calcular_centavos(solicitud)
+
+    def test_lote_igual_a_individual(self):
+        """
+        El lote produce lo mismo que el cálculo fila por fila y marca las inválidas.
+        """
+        filas = [
+            ("Vejez", 3_000_000, 1300, "Hombre", 62, 0),
+            ("Invalidez", 2_800_000, 900, "Mujer", 40, 65),
+            ("Invalidez", 2_800_000, 900, "Mujer", 40, 30),
+            ("Sobreviviente", 700_000.555, 700, "Hombre", 30, 0),
+            ("Vejez", 3_000_000, -1, "Hombre", 62, 0),
+        ]
+        tasas, mesadas, codigos = centavos_calcupension.calcular_lote_centavos(*columnas(filas))
+
+        for i in (0, 1, 3):
+            tasa, mesada = centavos_calcupension.calcular_centavos(logica_calcupension.SolicitudPension(*filas[i]))
+            self.assertEqual((tasas[i], mesadas[i], codigos[i]), (tasa, mesada, 0))
+
+        self.assertEqual(codigos[2], logica_calcupension.CODIGOS_ERROR[logica_calcupension.ErrorPCLInvalidez])
+        self.assertEqual(codigos[4], logica_calcupension.CODIGOS_ERROR[logica_calcupension.ErrorValoresNegativos])
+        self.assertEqual((tasas[4], mesadas[4]), (0, 0))
+
+    def test_lote_ibl_no_finito(self):
+        """
+        Un IBL NaN o infinito marca su fila como IBL inválido sin detener el lote.
+        """
+        filas = [
+            ("Vejez", 3_000_000, 1300, "Hombre", 62, 0),
+            ("Vejez", float("nan"), 1300, "Hombre", 62, 0),
+            ("Sobreviviente", float("inf"), 700, "Mujer", None, 0),
+            ("Invalidez", 2_800_000, 900, "Mujer", 40, 65),
+        ]
+        tasas, mesadas, codigos = centavos_calcupension.calcular_lote_centavos(*columnas(filas))
+
+        self.assertEqual(list(codigos), [0, logica_calcupension.CODIGO_ERROR_IBL, logica_calcupension.CODIGO_ERROR_IBL, 0])
+        self.assertEqual((tasas[1], mesadas[1], tasas[2], mesadas[2]), (0, 0, 0, 0))
+        for i in (0, 3):
+            tasa, mesada = centavos_calcupension.calcular_centavos(logica_calcupension.SolicitudPension(*filas[i]))
+            self.assertEqual((tasas[i], mesadas[i]), (tasa, mesada))
+
+    def test_ingresos_en_centavos(self):
+        """
+        La columna de IBL puede venir ya en centavos.
+        """
+        filas = [("Vejez", 3_000_000.25, 1350, "Hombre", 65, 0)]
+        en_pesos = centavos_calcupension.calcular_lote_centavos(*columnas(filas))
+        filas = [("Vejez", 300_000_025, 1350, "Hombre", 65, 0)]
+        en_centavos = centavos_calcupension.calcular_lote_centavos(*columnas(filas), ingresos_en_centavos=True)
+
+        self.assertEqual(list(map(list, en_pesos)), list(map(list, en_centavos)))
+
+    def test_cruce_con_float(self):
+        """
+        Sobre casos aleatorios, la tasa coincide con el float a la millonésima y
+        la mesada difiere solo por el redondeo de la tasa.
+        """
+        generador = random.Random(17)
+        filas = [
+            (
+                generador.choice(logica_calcupension.TIPOS_PENSION),
+                round(generador.uniform(1, 30_000_000), generador.choice((0, 2))),
+                generador.randint(0, 2600),
+                generador.choice(("Hombre", "Mujer")),
+                generador.randint(57, 80),
+                round(generador.uniform(0, 100), 1),
+            )
+            for _ in range(5000)
+        ]
+        datos = columnas(filas)
+        tasas_float, mesadas_float, codigos_float = logica_calcupension.CalculadoraPension.calcular_lote(*datos)
+        tasas, mesadas, codigos = centavos_calcupension.calcular_lote_centavos(*datos)
+
+        self.assertEqual(list(codigos), list(codigos_float))
+        for i, ibl in enumerate(datos[1]):
+            if codigos[i]:
+                continue
+            self.assertLessEqual(abs(tasas[i] - tasas_float[i] * 1_000_000), 0.5 + 1e-6)
+            # Media millonésima de punto porcentual sobre el IBL, más medio centavo.
+            tolerancia = ibl * 0.5e-6 + 0.5 + 1e-6
+            self.assertLessEqual(abs(mesadas[i] - mesadas_float[i] * 100), tolerancia)
+
+
+if __name__ == "__main__":
+    unittest.main()
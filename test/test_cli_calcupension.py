@@ -0,0 +1,165 @@
+"""
+Módulo de pruebas unitarias para la línea de comandos de un solo cálculo.
+
+Las pruebas cubren:
+
+- Cálculo de un caso desde opciones con salida JSON
+- Errores de validación y de uso con su código de salida
+- IBL y PCL no finitos (opciones y constantes JSON) como entrada inválida
+- Modo servidor con solicitudes JSON por línea
+- Importaciones mínimas y presupuesto de tiempo de arranque
+"""
+
+import io
+import json
+import os
+import subprocess
+import time
+import unittest
+import sys
+sys.path.append("src")
+from calcupension.view import cli_calcupension
+
+
+PRESUPUESTO_ARRANQUE = 0.25
+"""
+Segundos que el comando puede tardar por encima de un intérprete vacío.
+"""
+
+MODULOS_PROHIBIDOS = ("argparse", "asyncio", "csv", "mmap", "tempfile", "concurrent.futures", "sqlite3")
+
+
+def ejecutar(*argumentos, entrada: str | None = None) -> subprocess.CompletedProcess:
+    entorno = dict(os.environ, PYTHONPATH="src")
+    return subprocess.run(
+        [sys.executable, *argumentos], input=entrada, capture_output=True, text=True, env=entorno
+    )
+
+
+class TestCliCalcupension(unittest.TestCase):
+    """
+    Pruebas de cli_calcupension.
+    """
+
+    def test_un_caso(self):
+        """
+        Un caso válido imprime tasa y mesada en JSON con código de salida 0.
+        """
+        salida = io.StringIO()
+        sys.stdout, anterior = salida, sys.stdout
+        try:
+            codigo = cli_calcupension.main([
+                "--tipo", "Vejez", "--ibl=3000000", "--semanas", "1300", "--genero", "Hombre", "--edad", "62"
+            ])
+        finally:
+            sys.stdout = anterior
+
+        respuesta = json.loads(salida.getvalue())
+        self.assertEqual(codigo, cli_calcupension.SALIDA_OK)
+        self.assertAlmostEqual(respuesta["tasa_reemplazo"], 64.64, 2)
+        self.assertAlmostEqual(respuesta["mesada"], 1_939_299, 0)
+
+    def test_errores(self):
+        """
+        Los errores de validación y de uso tienen códigos de salida distintos.
+        """
+        codigo, respuesta = cli_calcupension.calcular_registro(
+            {"tipo": "Vejez", "ingreso_base_liquidacion": "3000000", "semanas": "100",
+             "genero": "Hombre", "edad": "62"}
+        )
+        self.assertEqual(codigo, cli_calcupension.SALIDA_ERROR_VALIDACION)
+        self.assertEqual(respuesta["error"]["codigo"], "ErrorSemanasCotizadas")
+
+        codigo, respuesta = cli_calcupension.calcular_registro({"tipo": "Vejez", "semanas": "1300"})
+        self.assertEqual(codigo, cli_calcupension.SALIDA_ERROR_USO)
+
+        with self.assertRaises(ValueError):
+            cli_calcupension.leer_opciones(["--salario", "10"])
+
+    def test_no_finitos(self):
+        """
+        --ibl nan y las constantes NaN/Infinity de JSON son entrada inválida; la salida es JSON estricto.
+        """
+        for opciones in (["--ibl", "nan"], ["--ibl", "inf"]):
+            resultado = ejecutar(
+                "-m", "calcupension.view.cli_calcupension", "--tipo", "Sobreviviente", "--semanas", "700",
+                *opciones
+            )
+            self.assertEqual(resultado.returncode, cli_calcupension.SALIDA_ERROR_USO)
+            respuesta = json.loads(resultado.stdout, parse_constant=self.fail)
+            self.assertEqual(respuesta["error"]["codigo"], "EntradaInvalida")
+
+        codigo, respuesta = cli_calcupension.calcular_registro(
+            {"tipo": "Invalidez", "ingreso_base_liquidacion": "3000000", "semanas": "900",
+             "porcentaje_perdida_capacidad_laboral": "nan"}
+        )
+        self.assertEqual(codigo, cli_calcupension.SALIDA_ERROR_USO)
+
+        entrada = io.StringIO(
+            '{"id": NaN, "tipo": "Sobreviviente", "ingreso_base_liquidacion": 3500000, "semanas": 700}\n'
+            '{"id": 2, "tipo": "Sobreviviente", "ingreso_base_liquidacion": Infinity, "semanas": 700}\n'
+        )
+        salida = io.StringIO()
+        cli_calcupension.servidor(entrada, salida)
+
+        respuestas = [json.loads(linea, parse_constant=self.fail) for linea in salida.getvalue().splitlines()]
+        self.assertEqual([respuesta["error"]["codigo"] for respuesta in respuestas], ["EntradaInvalida"] * 2)
+
+    def test_servidor(self):
+        """
+        El modo servidor responde una línea por solicitud y devuelve el id.
+        """
+        entrada = io.StringIO(
+            '{"id": "a", "tipo": "Sobreviviente", "ingreso_base_liquidacion": 3500000, "semanas": 700}\n'
+            "\n"
+            "no es json\n"
+            '{"id": "b", "tipo": "Vejez", "ingreso_base_liquidacion": -1, "semanas": 1300, "edad": 62}\n'
+        )
+        salida = io.StringIO()
+
+        cli_calcupension.servidor(entrada, salida)
+
+        respuestas = [json.loads(linea) for linea in salida.getvalue().splitlines()]
+        self.assertEqual(len(respuestas), 3)
+        self.assertEqual(respuestas[0]["id"], "a")
+        self.assertAlmostEqual(respuestas[0]["tasa_reemplazo"], 53.00, 2)
+        self.assertEqual(respuestas[1]["error"]["codigo"], "EntradaInvalida")
+        self.assertEqual(respuestas[2], {"id": "b", "error": {
+            "codigo": "ErrorIBL", "mensaje": "Error: El Ingreso Base de Liquidación debe ser mayor a 0."
+        }})
+
+    def test_importaciones_minimas(self):
+        """
+        El comando no importa módulos que el cálculo no necesita.
+        """
+        resultado = ejecutar("-c", "import sys, calcupension.view.cli_calcupension; print(' '.join(sys.modules))")
+
+        modulos = set(resultado.stdout.split())
+        self.assertIn("calcupension.model.logica_calcupension", modulos)
+        for modulo in MODULOS_PROHIBIDOS:
+            self.assertNotIn(modulo, modulos)
+
+    def test_presupuesto_arranque(self):
+        """
+        Un caso completo en un proceso nuevo tarda poco más que un intérprete vacío.
+        """
+        def medir(*argumentos) -> float:
+            tiempos = []
+            for _ in range(3):
+                inicio = time.perf_counter()
+                resultado = ejecutar(*argumentos)
+                tiempos.append(time.perf_counter() - inicio)
+                self.assertEqual(resultado.returncode, 0, resultado.stderr)
+            return min(tiempos)
+
+        vacio = medir("-c", "pass")
+        comando = medir(
+            "-m", "calcupension.view.cli_calcupension",
+            "--tipo", "Vejez", "--ibl", "3000000", "--semanas", "1300", "--genero", "Hombre", "--edad", "62"
+        )
+
+        self.assertLess(comando - vacio, PRESUPUESTO_ARRANQUE)
+
+
+if __name__ == '__main__':
+    unittest.main()
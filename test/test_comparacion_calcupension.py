@@ -0,0 +1,150 @@
+"""
+Módulo de pruebas unitarias para la comparación entre versiones de reglas.
+
+Las pruebas cubren:
+
+- Coincidencia bit a bit con calcular_lote por cada versión
+- Versión ganadora por mesada o por tasa
+- Validaciones que dependen de la versión (semanas y edades mínimas)
+- Versiones sin un tipo de pensión y solicitudes inválidas en todas
+- Entradas inválidas
+"""
+
+import copy
+import random
+import unittest
+import sys
+sys.path.append("src")
+from calcupension.model import comparacion_calcupension
+from calcupension.model import logica_calcupension
+from calcupension.model import reglas_calcupension
+
+
+def registrar_version(version: str, **cambios) -> reglas_calcupension.ReglasPension:
+    """
+    Registra una copia de las reglas 2026 con otra versión y los cambios indicados.
+    """
+    definicion = copy.deepcopy(reglas_calcupension.REGLAS_2026)
+    definicion["version"] = version
+    definicion.update(cambios)
+    return reglas_calcupension.registrar_reglas(definicion)
+
+
+ANTERIOR = registrar_version(
+    "prueba-anterior", smmlv=1_423_500, semanas_minimas_vejez=1150, edades_minimas={"Hombre": 60, "Mujer": 55}
+)
+VIGENTE = reglas_calcupension.obtener_reglas("2026")
+
+
+class TestComparacionCalcupension(unittest.TestCase):
+    """
+    Pruebas de comparar y comparar_lote.
+    """
+
+    def test_coincide_con_calcular_lote(self):
+        """
+        Cada columna es igual, bit a bit, a calcular_lote con esa versión.
+        """
+        generador = random.Random(23)
+        filas = [
+            (
+                generador.choice(logica_calcupension.TIPOS_PENSION + ("Otro",)),
+                generador.choice((-1, 0, generador.uniform(5e5, 3e7))),
+                generador.randint(-1, 2500),
+                generador.choice(logica_calcupension.GENEROS + (None,)),
+                generador.choice((generador.randint(50, 70), None)),
+                generador.uniform(30, 100),
+            )
+            for _ in range(3000)
+        ]
+        columnas = list(zip(*filas))
+        versiones = (ANTERIOR, VIGENTE)
+
+        ganadoras, tasas, mesadas, codigos = comparacion_calcupension.comparar_lote(*columnas, versiones)
+
+        for indice, reglas in enumerate(versiones):
+            esperado = logica_calcupension.CalculadoraPension.calcular_lote(*columnas, reglas)
+            self.assertEqual(codigos[indice], esperado[2])
+            self.assertEqual([valor.hex() for valor in tasas[indice]], [valor.hex() for valor in esperado[0]])
+            self.assertEqual([valor.hex() for valor in mesadas[indice]], [valor.hex() for valor in esperado[1]])
+
+        for i, ganadora in enumerate(ganadoras):
+            validas = [k for k in range(2) if codigos[k][i] == logica_calcupension.CODIGO_OK]
+            if not validas:
+                self.assertEqual(ganadora, comparacion_calcupension.SIN_GANADORA)
+            else:
+                self.assertEqual(ganadora, max(validas, key=lambda k: (mesadas[k][i], -k)))
+
+    def test_ganadora(self):
+        """
+        Con IBL alto gana la versión con mayor tasa; con IBL bajo, la de mayor mesada mínima.
+        """
+        solicitud = logica_calcupension.SolicitudPension("Vejez", 3_000_000, 1300, "Hombre", 62, 0)
+        resultado = comparacion_calcupension.comparar(solicitud, (VIGENTE, ANTERIOR))
+
+        self.assertEqual(resultado.versiones, ("2026", "prueba-anterior"))
+        self.assertEqual(resultado.version_ganadora, "2026")
+        self.assertGreater(resultado.mesadas[0], resultado.mesadas[1])
+
+        # Con el SMMLV como mesada mínima gana la versión con SMMLV más alto, aunque la tasa sea menor.
+        tipos = copy.deepcopy(reglas_calcupension.REGLAS_2026["tipos"])
+        tipos["Vejez"]["bandas_pcl"][0]["base"] = 70
+        tasa_alta = registrar_version("prueba-tasa-alta", smmlv=1_000_000, tipos=tipos)
+        solicitud = logica_calcupension.SolicitudPension("Vejez", 2_000_000, 1300, "Hombre", 62, 0)
+        por_mesada = comparacion_calcupension.comparar(solicitud, (tasa_alta, "2026"))
+        por_tasa = comparacion_calcupension.comparar(
+            solicitud, (tasa_alta, "2026"), comparacion_calcupension.CRITERIO_TASA
+        )
+        self.assertEqual(por_mesada.version_ganadora, "2026")
+        self.assertEqual(por_tasa.version_ganadora, "prueba-tasa-alta")
+        self.assertEqual(por_mesada.como_dict()["mesada"], VIGENTE.smmlv)
+
+    def test_validaciones_por_version(self):
+        """
+        Una solicitud que solo cumple los requisitos de la versión anterior la tiene como ganadora.
+        """
+        solicitud = logica_calcupension.SolicitudPension("Vejez", 3_000_000, 1200, "Mujer", 56, 0)
+        resultado = comparacion_calcupension.comparar(solicitud, (VIGENTE, ANTERIOR))
+
+        self.assertEqual(resultado.codigos[0], logica_calcupension.CODIGO_ERROR_SEMANAS)
+        self.assertEqual(resultado.codigos[1], logica_calcupension.CODIGO_OK)
+        self.assertEqual(resultado.ganadora, 1)
+        self.assertIsNone(resultado.como_dict()["versiones"][0]["tasa"])
+
+        solicitud = logica_calcupension.SolicitudPension("Vejez", 3_000_000, 1300, "Mujer", 56, 0)
+        resultado = comparacion_calcupension.comparar(solicitud, (VIGENTE, ANTERIOR))
+        self.assertEqual(resultado.codigos[0], logica_calcupension.CODIGO_ERROR_EDAD_MUJERES)
+
+    def test_sin_ganadora(self):
+        """
+        Una solicitud inválida en todas las versiones, o un tipo que una versión no tiene.
+        """
+        solicitud = logica_calcupension.SolicitudPension("Vejez", 0, 1300, "Hombre", 62, 0)
+        resultado = comparacion_calcupension.comparar(solicitud, (VIGENTE, ANTERIOR))
+        self.assertIsNone(resultado.ganadora)
+        self.assertEqual(set(resultado.codigos), {logica_calcupension.CODIGO_ERROR_IBL})
+
+        tipos = {tipo: parametros for tipo, parametros in reglas_calcupension.REGLAS_2026["tipos"].items()
+                 if tipo != "Invalidez"}
+        sin_invalidez = registrar_version("prueba-sin-invalidez", tipos=tipos)
+        solicitud = logica_calcupension.SolicitudPension("Invalidez", 3_000_000, 900, "Mujer", 40, 70)
+        resultado = comparacion_calcupension.comparar(solicitud, (sin_invalidez, VIGENTE))
+        self.assertEqual(resultado.codigos[0], logica_calcupension.CODIGO_ERROR_TIPO)
+        self.assertEqual(resultado.ganadora, 1)
+
+    def test_entradas_invalidas(self):
+        """
+        Sin versiones, con un criterio desconocido o con columnas de distinta longitud.
+        """
+        solicitud = logica_calcupension.SolicitudPension("Vejez", 3_000_000, 1300, "Hombre", 62, 0)
+
+        with self.assertRaises(ValueError):
+            comparacion_calcupension.comparar(solicitud, ())
+        with self.assertRaises(ValueError):
+            comparacion_calcupension.comparar(solicitud, (VIGENTE,), "edad")
+        with self.assertRaises(ValueError):
+            comparacion_calcupension.comparar_lote(("Vejez",), (), (), (), (), (), (VIGENTE,))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,160 @@
+"""
+Módulo de pruebas unitarias para las pruebas diferenciales.
+
+Las pruebas cubren:
+
+- Todas las rutas coinciden con el oráculo en una muestra
+- Generación reproducible y concentrada en las fronteras, con valores no finitos y vejez sin edad
+- IBL de frontera (tope, piso y mesada mínima)
+- Detección y reducción de discrepancias en una ruta defectuosa
+- Excepciones del oráculo comparadas con el código de la ruta
+- Línea de comandos y rutas desconocidas
+"""
+
+import contextlib
+import io
+import math
+import random
+import unittest
+import sys
+sys.path.append("src")
+from unittest import mock
+from calcupension.model import diferencial_calcupension
+from calcupension.model import logica_calcupension
+from calcupension.model import reglas_calcupension
+
+
+def _ruta_defectuosa(filas, reglas):
+    """
+    calcular_lote con un error deliberado en la tasa cuando hay más de 2000 semanas.
+    """
+    tasas, mesadas, codigos = logica_calcupension.CalculadoraPension.calcular_lote(*zip(*filas), reglas)
+    for i, fila in enumerate(filas):
+        if fila[2] > 2000 and not codigos[i]:
+            tasas[i] += 1e-9
+    return tasas, mesadas, codigos
+
+
+class TestDiferencialCalcupension(unittest.TestCase):
+    """
+    Pruebas de ejecutar, generar_casos, fronteras_ibl y reducir.
+    """
+
+    def test_todas_las_rutas_coinciden(self):
+        """
+        En una muestra con fronteras, todas las rutas coinciden con el oráculo.
+        """
+        resultado = diferencial_calcupension.ejecutar(casos=3000, semilla=21, tamano_fragmento=1500)
+
+        self.assertTrue(resultado.exitoso, resultado.como_texto())
+        self.assertEqual(set(resultado.rutas), set(diferencial_calcupension.RUTAS))
+
+    def test_generacion_reproducible_con_fronteras(self):
+        """
+        La misma semilla genera los mismos casos, que incluyen las fronteras de las reglas.
+        """
+        reglas = reglas_calcupension.REGLAS_VIGENTES
+        casos = list(diferencial_calcupension.generar_casos(random.Random(3), 20_000, reglas))
+        self.assertEqual(casos, list(diferencial_calcupension.generar_casos(random.Random(3), 20_000, reglas)))
+
+        semanas = {fila[2] for fila in casos}
+        edades = {fila[4] for fila in casos}
+        pcl = {fila[5] for fila in casos}
+        self.assertTrue({499, 500, 501, 550, 1299, 1300, 1301, 1350}.issubset(semanas))
+        self.assertTrue({56, 57, 58, 61, 62, 63}.issubset(edades))
+        self.assertIn(50.0, pcl)
+        self.assertIn(66.0, pcl)
+        self.assertTrue(any(50 < valor < 50.000001 for valor in pcl))
+        self.assertTrue(any(fila[4] is None for fila in casos if fila[0] == "Vejez"))
+        self.assertTrue(any(not math.isfinite(fila[1]) for fila in casos))
+        self.assertTrue(any(not math.isfinite(fila[5]) for fila in casos))
+
+    def test_fronteras_ibl(self):
+        """
+        Los IBL de frontera llevan la tasa de Vejez al tope y al piso, y la mesada al SMMLV.
+        """
+        reglas = reglas_calcupension.REGLAS_VIGENTES
+        calculadora = logica_calcupension.CalculadoraPension
+        valores = diferencial_calcupension.fronteras_ibl("Vejez", 2000, 0, reglas)
+
+        def tasa(ibl):
+            return calculadora.calcular_tasa_reemplazo(
+                logica_calcupension.SolicitudPension("Vejez", ibl, 2000, "Hombre", 62, 0)
+            )
+
+        tasas = [tasa(ibl) for ibl in valores]
+        self.assertIn(80, tasas)
+        self.assertIn(55, tasas)
+        # Alrededor de la mesada mínima: justo debajo se aplica el piso y justo encima no.
+        mesadas = [calculadora.calcular_pension(tasa(ibl), ibl, "Vejez") for ibl in valores]
+        self.assertTrue(any(abs(mesada - reglas.smmlv) < 1 and mesada != reglas.smmlv for mesada in mesadas))
+
+    def test_detecta_y_reduce(self):
+        """
+        Una ruta defectuosa se detecta y su discrepancia se reduce.
+        """
+        rutas = dict(diferencial_calcupension.RUTAS)
+        rutas["defectuosa"] = (_ruta_defectuosa, diferencial_calcupension.COMPARACION_EXACTA)
+
+        with mock.patch.object(diferencial_calcupension, "RUTAS", rutas):
+            resultado = diferencial_calcupension.ejecutar(
+                casos=2000, semilla=4, rutas=("lote", "defectuosa"), maximo_discrepancias=2
+            )
+
+        self.assertFalse(resultado.exitoso)
+        self.assertEqual(resultado.fallas["lote"], 0)
+        self.assertGreater(resultado.fallas["defectuosa"], 0)
+        self.assertEqual(len(resultado.discrepancias["defectuosa"]), 2)
+
+        discrepancia = resultado.discrepancias["defectuosa"][0]
+        self.assertGreater(discrepancia.reducida[2], 2000)
+        self.assertLessEqual(discrepancia.reducida[2], discrepancia.fila[2])
+        self.assertNotEqual(discrepancia.esperado[0], discrepancia.obtenido[0])
+        self.assertIn("defectuosa", resultado.como_texto())
+
+    def test_excepcion_del_oraculo(self):
+        """
+        Si el oráculo lanza una excepción inesperada, la discrepancia la reporta por su nombre.
+        """
+        def check_edad(genero, edad, reglas=None):
+            # Comportamiento anterior: comparar None con la edad mínima lanza TypeError.
+            if genero == "Hombre" and edad < reglas.edades_minimas["Hombre"]:
+                raise logica_calcupension.ErrorEdadMinimaHombres(edad)
+            if genero == "Mujer" and edad < reglas.edades_minimas["Mujer"]:
+                raise logica_calcupension.ErrorEdadMinimaMujeres(edad)
+
+        with mock.patch.object(logica_calcupension.CalculadoraPension, "check_edad", staticmethod(check_edad)):
+            resultado = diferencial_calcupension.ejecutar(casos=3000, semilla=5, rutas=("lote",))
+
+        self.assertFalse(resultado.exitoso)
+        discrepancia = resultado.discrepancias["lote"][0]
+        self.assertEqual(discrepancia.fila[0], "Vejez")
+        self.assertIsNone(discrepancia.fila[4])
+        self.assertEqual(discrepancia.esperado[2], "TypeError")
+        self.assertNotEqual(discrepancia.obtenido[2], "TypeError")
+
+    def test_reducir(self):
+        """
+        La reducción simplifica los campos mientras la condición siga fallando.
+        """
+        fila = ("Vejez", 3_456_789.12, 1777, "Hombre", 63, 12.5)
+        reducida = diferencial_calcupension.reducir(fila, lambda propuesta: propuesta[2] >= 1000)
+
+        self.assertEqual(reducida, ("Vejez", 0.0, 1000, "Hombre", 0, 0.0))
+
+    def test_linea_de_comandos(self):
+        """
+        La línea de comandos termina con 0 si todo coincide; una ruta desconocida es un error.
+        """
+        salida = io.StringIO()
+        with contextlib.redirect_stdout(salida):
+            codigo = diferencial_calcupension.main(["--casos", "500", "--rutas", "lote", "cache", "--procesos", "1"])
+
+        self.assertEqual(codigo, 0)
+        self.assertIn("500 casos", salida.getvalue())
+        with self.assertRaises(ValueError):
+            diferencial_calcupension.ejecutar(casos=10, rutas=("inexistente",))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+"""
+Módulo de pruebas unitarias para el recálculo incremental.
+
+Las pruebas cubren:
+
+- Recálculo solo de los afiliados con cambios
+- Recálculo por cambio del SMMLV (solo los tipos que dependen de él)
+- Altas y bajas
+- Lotes de cambios con error (incluido un cambio sin id): no se aplica ninguno
+- Resultados NaN que no cambian no se reportan como diferencias
+- Persistencia de la fotografía
+"""
+
+import copy
+import os
+import tempfile
+import unittest
+import sys
+sys.path.append("src")
+from calcupension.model import incremental_calcupension
+from calcupension.model import logica_calcupension
+from calcupension.model import reglas_calcupension
+
+
+PORTAFOLIO = [
+    (1, "Vejez", 3_000_000, 1300, "Hombre", 62, 0),
+    (2, "Vejez", 1_400_000, 1400, "Mujer", 57, 0),
+    (3, "Sobreviviente", 3_500_000, 700, None, None, 0),
+    (4, "Invalidez", 2_800_000, 900, "Mujer", 53, 65),
+    (5, "Vejez", 2_000_000, 400, "Mujer", 58, 0),
+]
+
+
+class TestIncrementalCalcupension(unittest.TestCase):
+    """
+    Pruebas de MotorIncremental.
+    """
+
+    def crear_motor(self) -> incremental_calcupension.MotorIncremental:
+        motor = incremental_calcupension.MotorIncremental()
+        motor.cargar_inicial(PORTAFOLIO)
+        return motor
+
+    def test_solo_cambios(self):
+        """
+        Solo el afiliado con semanas nuevas se recalcula y aparece en las diferencias.
+        """
+        motor = self.crear_motor()
+
+        diferencias = motor.aplicar_cambios([{"id": 1, "semanas": 1500}, {"id": 3, "semanas": 700}])
+
+        self.assertEqual([diferencia["id"] for diferencia in diferencias], [1])
+        solicitud = logica_calcupension.SolicitudPension("Vejez", 3_000_000, 1500, "Hombre", 62, 0)
+        tasa = logica_calcupension.CalculadoraPension.calcular_tasa_reemplazo(solicitud)
+        self.assertEqual(diferencias[0]["tasa_nueva"], tasa)
+        self.assertAlmostEqual(diferencias[0]["mesada_anterior"], 1_939_299, 0)
+
+    def test_cambio_de_smmlv(self):
+        """
+        Un nuevo SMMLV recalcula todas las filas de vejez y ninguna de los otros tipos.
+        """
+        motor = self.crear_motor()
+        definicion = copy.deepcopy(reglas_calcupension.REGLAS_2026)
+        definicion["version"] = "prueba-incremental"
+        definicion["smmlv"] = 2_000_000
+        reglas = reglas_calcupension.ReglasPension(definicion)
+
+        self.assertEqual(
+            incremental_calcupension.tipos_afectados(reglas_calcupension.REGLAS_2026, definicion), {"Vejez"}
+        )
+
+        diferencias = motor.aplicar_cambios([], reglas)
+
+        self.assertEqual(sorted(diferencia["id"] for diferencia in diferencias), [1, 2])
+        mesada_2 = next(d for d in diferencias if d["id"] == 2)["mesada_nueva"]
+        self.assertEqual(mesada_2, 2_000_000)
+        self.assertIs(motor.reglas, reglas)
+
+    def test_altas_y_bajas(self):
+        """
+        Las altas se calculan y las bajas se reportan y eliminan.
+        """
+        motor = self.crear_motor()
+
+        diferencias = motor.aplicar_cambios([
+            {"id": 6, "tipo": "Invalidez", "ingreso_base_liquidacion": 4_000_000, "semanas": 1000,
+             "genero": "Hombre", "edad": 55, "porcentaje_perdida_capacidad_laboral": 70},
+            {"id": 5, "baja": True},
+        ])
+
+        self.assertEqual(len(motor), 5)
+        por_id = {diferencia["id"]: diferencia for diferencia in diferencias}
+        self.assertAlmostEqual(por_id[6]["tasa_nueva"], 74.00, 2)
+        self.assertIsNone(por_id[5]["mesada_nueva"])
+
+        with self.assertRaises(ValueError):
+            motor.aplicar_cambios([{"id": 7, "semanas": 100}])
+
+    def test_cambios_con_error_no_se_aplican(self):
+        """
+        Si un cambio del lote falla, el portafolio y las reglas quedan como estaban.
+        """
+        motor = self.crear_motor()
+        antes = copy.deepcopy(motor.afiliados)
+        definicion = copy.deepcopy(reglas_calcupension.REGLAS_2026)
+        definicion["version"] = "prueba-incremental-error"
+        definicion["smmlv"] = 2_000_000
+        reglas = reglas_calcupension.ReglasPension(definicion)
+
+        with self.assertRaises(ValueError):
+            motor.aplicar_cambios([{"id": 1, "semanas": 2000}, {"id": 5, "baja": True}, {"id": 7, "semanas": 5}])
+        with self.assertRaises(TypeError):
+            motor.aplicar_cambios([{"id": 1, "semanas": 2000}, {"id": 2, "semanas": "1500"}], reglas)
+        with self.assertRaises(ValueError):
+            motor.aplicar_cambios([{"id": 1, "semanas": 2000}, {"semanas": 1500}])
+
+        self.assertEqual(motor.afiliados, antes)
+        self.assertIsNot(motor.reglas, reglas)
+        self.assertEqual(motor.aplicar_cambios([]), [])
+
+        diferencias = motor.aplicar_cambios([{"id": 1, "semanas": 2000}])
+        self.assertEqual([diferencia["id"] for diferencia in diferencias], [1])
+        self.assertNotEqual(diferencias[0]["tasa_nueva"], antes[1][6])
+
+    def test_resultados_nan_sin_cambios(self):
+        """
+        Un afiliado con IBL NaN cuyo resultado sigue siendo NaN no aparece en las diferencias.
+        """
+        motor = self.crear_motor()
+        motor.cargar_inicial([(8, "Sobreviviente", float("nan"), 700, None, None, 0)])
+
+        self.assertEqual(motor.aplicar_cambios([{"id": 8, "semanas": 700}]), [])
+
+        diferencias = motor.aplicar_cambios([{"id": 8, "ingreso_base_liquidacion": 3_500_000}])
+        self.assertEqual([diferencia["id"] for diferencia in diferencias], [8])
+        self.assertAlmostEqual(diferencias[0]["mesada_nueva"], 1_855_000, 0)
+
+    def test_guardar_y_cargar(self):
+        """
+        La fotografía guardada se recupera con los mismos datos y reglas.
+        """
+        motor = self.crear_motor()
+
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "fotografia.jsonl")
+            motor.guardar(ruta)
+            recuperado = incremental_calcupension.MotorIncremental.cargar(ruta)
+
+        self.assertEqual(recuperado.afiliados, motor.afiliados)
+        self.assertIs(recuperado.reglas, reglas_calcupension.obtener_reglas("2026"))
+        self.assertEqual(recuperado.aplicar_cambios([{"id": 2, "edad": 58}]), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
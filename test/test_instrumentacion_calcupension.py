@@ -0,0 +1,121 @@
+"""
+Módulo de pruebas unitarias para la instrumentación de etapas.
+
+Las pruebas cubren:
+
+- Restauración de las funciones originales al desactivarse
+- Tiempos por etapa, tipo y resultado, y conteo de fallos
+- Exportación en JSON y formato Prometheus
+- Etapas propias y perfil del modo masivo
+"""
+
+import json
+import os
+import tempfile
+import unittest
+import sys
+sys.path.append("src")
+from calcupension.model import instrumentacion_calcupension
+from calcupension.model import logica_calcupension
+from calcupension.view import lote_calcupension
+
+
+class TestInstrumentacionCalcupension(unittest.TestCase):
+    """
+    Pruebas de Instrumentacion.
+    """
+
+    def test_activar_y_restaurar(self):
+        """
+        Las funciones se reemplazan solo mientras la instrumentación está activa.
+        """
+        original = logica_calcupension.CalculadoraPension.calcular_tasa_reemplazo
+
+        with instrumentacion_calcupension.Instrumentacion() as instrumentacion:
+            self.assertIsNot(logica_calcupension.CalculadoraPension.calcular_tasa_reemplazo, original)
+            self.assertIs(instrumentacion_calcupension.activa(), instrumentacion)
+            with self.assertRaises(RuntimeError):
+                instrumentacion_calcupension.Instrumentacion().activar()
+
+        self.assertIs(logica_calcupension.CalculadoraPension.calcular_tasa_reemplazo, original)
+        self.assertIsNone(instrumentacion_calcupension.activa())
+
+    def test_etapas_y_fallos(self):
+        """
+        Cada llamada se registra con su tipo y su resultado, y los fallos se cuentan.
+        """
+        valida = logica_calcupension.SolicitudPension("Vejez", 3_000_000, 1300, "Hombre", 62, 0)
+        invalida = logica_calcupension.SolicitudPension("Invalidez", 3_000_000, 900, "Mujer", 53, 40)
+
+        with instrumentacion_calcupension.Instrumentacion() as instrumentacion:
+            logica_calcupension.CalculadoraPension.calcular_tasa_reemplazo(valida)
+            with self.assertRaises(logica_calcupension.ErrorPCLInvalidez):
+                logica_calcupension.CalculadoraPension.calcular_tasa_reemplazo(invalida)
+            logica_calcupension.CalculadoraPension.calcular_lote(*zip(
+                ("Vejez", 3_000_000, 1300, "Hombre", 62, 0),
+                ("Vejez", 2_000_000, 400, "Mujer", 58, 0),
+                ("Vejez", -5, 1300, "Mujer", 58, 0),
+            ))
+
+        histogramas = instrumentacion.histogramas
+        self.assertEqual(histogramas[("calcular_tasa_reemplazo", "Vejez", "ok")].cantidad, 1)
+        self.assertEqual(histogramas[("calcular_tasa_reemplazo", "Invalidez", "ErrorPCLInvalidez")].cantidad, 1)
+        self.assertEqual(histogramas[("check_pcl", "", "ErrorPCLInvalidez")].cantidad, 1)
+        self.assertEqual(instrumentacion.filas["calcular_lote"], 3)
+        self.assertEqual(instrumentacion.fallos[("calcular_lote", "ErrorSemanasCotizadas")], 1)
+        self.assertEqual(instrumentacion.fallos[("calcular_lote", "ErrorIBL")], 1)
+
+    def test_exportar(self):
+        """
+        Los reportes JSON y Prometheus contienen las etapas medidas.
+        """
+        instrumentacion = instrumentacion_calcupension.Instrumentacion()
+        with instrumentacion:
+            with instrumentacion_calcupension.etapa("lectura", filas=10):
+                pass
+        # Sin instrumentación activa, etapa no registra nada.
+        with instrumentacion_calcupension.etapa("lectura"):
+            pass
+
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta_json = os.path.join(directorio, "perfil.json")
+            ruta_prom = os.path.join(directorio, "perfil.prom")
+            instrumentacion.exportar(ruta_json)
+            instrumentacion.exportar(ruta_prom)
+
+            with open(ruta_json, encoding="utf-8") as archivo:
+                reporte = json.load(archivo)
+            with open(ruta_prom, encoding="utf-8") as archivo:
+                prometheus = archivo.read()
+
+        self.assertEqual(reporte["filas"], {"lectura": 10})
+        self.assertEqual(reporte["etapas"][0]["cantidad"], 1)
+        self.assertIn('calcupension_duracion_segundos_count{etapa="lectura",tipo="",resultado="ok"} 1', prometheus)
+        self.assertIn('le="+Inf"} 1', prometheus)
+
+    def test_perfil_modo_masivo(self):
+        """
+        La opción --perfil del modo masivo escribe el reporte con calcular_lote y escritura.
+        """
+        with tempfile.TemporaryDirectory() as directorio:
+            entrada = os.path.join(directorio, "entrada.csv")
+            with open(entrada, "w", encoding="utf-8") as archivo:
+                archivo.write(
+                    "tipo,ingreso_base_liquidacion,semanas,genero,edad,porcentaje_perdida_capacidad_laboral\n"
+                    "Vejez,3000000,1300,Hombre,62,0\n"
+                    "Vejez,2000000,400,Mujer,58,0\n"
+                )
+            perfil = os.path.join(directorio, "perfil.txt")
+
+            lote_calcupension.main(["lote", entrada, os.path.join(directorio, "salida.csv"), "--perfil", perfil])
+
+            with open(perfil, encoding="utf-8") as archivo:
+                reporte = archivo.read()
+
+        self.assertIn("calcular_lote", reporte)
+        self.assertIn("escritura", reporte)
+        self.assertIn("ErrorSemanasCotizadas", reporte)
+
+
+if __name__ == '__main__':
+    unittest.main()
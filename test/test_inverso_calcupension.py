@@ -0,0 +1,169 @@
+"""
+Módulo de pruebas unitarias para el cálculo inverso.
+
+Las pruebas cubren:
+
+- Semanas mínimas (comparadas con búsqueda exhaustiva)
+- Objetivos inalcanzables por el tope
+- IBL mínimo para una mesada
+- PCL mínima por bandas
+- Resolución por lote con solicitudes inválidas
+- Validación de la solicitud salvo la variable buscada (edad en vejez, PCL en invalidez)
+"""
+
+import math
+import unittest
+import sys
+sys.path.append("src")
+from calcupension.model import inverso_calcupension
+from calcupension.model import logica_calcupension
+
+
+def tasa(tipo, ibl, semanas, pcl):
+    solicitud = logica_calcupension.SolicitudPension(tipo, ibl, semanas, "Hombre", 62, pcl)
+    return logica_calcupension.CalculadoraPension.calcular_tasa_reemplazo(solicitud)
+
+
+def mesada(tipo, ibl, semanas, pcl):
+    return logica_calcupension.CalculadoraPension.calcular_pension(tasa(tipo, ibl, semanas, pcl), ibl, tipo)
+
+
+class TestInversoCalcupension(unittest.TestCase):
+    """
+    Pruebas de semanas_minimas, ibl_minimo, pcl_minima y resolver_lote.
+    """
+
+    def test_semanas_minimas_igual_a_busqueda(self):
+        """
+        El resultado coincide con recorrer las semanas una a una.
+        """
+        casos = [
+            ("Vejez", 3_000_000, 70, None, 0),
+            ("Vejez", 8_000_000, None, 5_000_000, 0),
+            ("Sobreviviente", 2_000_000, 60.5, None, 0),
+            ("Invalidez", 2_800_000, 66, None, 70),
+        ]
+        for tipo, ibl, tasa_objetivo, mesada_objetivo, pcl in casos:
+            resultado = inverso_calcupension.semanas_minimas(
+                tipo, ibl, tasa_objetivo, mesada_objetivo, pcl
+            )
+            if tasa_objetivo is not None:
+                cumple = lambda semanas: tasa(tipo, ibl, semanas, pcl) >= tasa_objetivo
+            else:
+                cumple = lambda semanas: mesada(tipo, ibl, semanas, pcl) >= mesada_objetivo
+            minimo = 1300 if tipo == "Vejez" else 0
+            esperado = next(semanas for semanas in range(minimo, 5000) if cumple(semanas))
+
+            self.assertEqual(resultado.valor, esperado, (tipo, ibl, tasa_objetivo, mesada_objetivo))
+
+    def test_mesada_minima_y_tope(self):
+        """
+        La mesada mínima ya alcanza objetivos bajos; sobre el tope no hay solución.
+        """
+        self.assertEqual(
+            inverso_calcupension.semanas_minimas("Vejez", 1_000_000, mesada_objetivo=1_700_000).valor, 1300
+        )
+
+        resultado = inverso_calcupension.semanas_minimas("Vejez", 3_000_000, tasa_objetivo=81)
+        self.assertFalse(resultado.alcanzable)
+        self.assertEqual(resultado.motivo, inverso_calcupension.MOTIVO_TOPE)
+
+    def test_mesada_en_el_tope(self):
+        """
+        Una mesada que el tope no alcanza por redondeo se rechaza; la que sí, termina en las semanas del tope.
+        """
+        ibl = 13_498_382.261231663
+        resultado = inverso_calcupension.semanas_minimas("Vejez", ibl, mesada_objetivo=10_798_705.808985332)
+        self.assertEqual(resultado.motivo, inverso_calcupension.MOTIVO_TOPE)
+        self.assertLess(mesada("Vejez", ibl, 5000, 0), 10_798_705.808985332)
+
+        objetivo = mesada("Vejez", ibl, 5000, 0)
+        resultado = inverso_calcupension.semanas_minimas("Vejez", ibl, mesada_objetivo=objetivo)
+        esperado = next(semanas for semanas in range(1300, 5000) if mesada("Vejez", ibl, semanas, 0) >= objetivo)
+        self.assertEqual(resultado.valor, esperado)
+
+    def test_ibl_minimo(self):
+        """
+        El IBL retornado alcanza la mesada y el valor inmediatamente menor no.
+        """
+        for tipo, semanas, objetivo, pcl in [
+            ("Vejez", 1500, 3_000_000, 0),
+            ("Vejez", 2600, 9_000_000, 0),
+            ("Sobreviviente", 700, 2_000_000, 0),
+            ("Invalidez", 900, 2_000_000, 80),
+        ]:
+            resultado = inverso_calcupension.ibl_minimo(tipo, semanas, objetivo, pcl)
+            ibl = resultado.valor
+
+            self.assertGreaterEqual(mesada(tipo, ibl, semanas, pcl), objetivo)
+            self.assertLess(mesada(tipo, math.nextafter(ibl, 0), semanas, pcl), objetivo)
+
+        resultado = inverso_calcupension.ibl_minimo("Vejez", 1500, 1_000_000)
+        self.assertEqual((resultado.valor, resultado.estricto), (0.0, True))
+
+    def test_pcl_minima(self):
+        """
+        La PCL mínima es el límite inferior de la primera banda que alcanza el objetivo.
+        """
+        self.assertEqual(
+            inverso_calcupension.pcl_minima("Invalidez", 3_000_000, 500, tasa_objetivo=45),
+            inverso_calcupension.ResultadoInverso(50, estricto=True)
+        )
+        self.assertEqual(
+            inverso_calcupension.pcl_minima("Invalidez", 3_000_000, 500, tasa_objetivo=54),
+            inverso_calcupension.ResultadoInverso(66, estricto=True)
+        )
+        self.assertEqual(
+            inverso_calcupension.pcl_minima("Invalidez", 3_000_000, 500, tasa_objetivo=90).motivo,
+            inverso_calcupension.MOTIVO_TOPE
+        )
+
+    def test_resolver_lote(self):
+        """
+        El lote resuelve cada cliente y reporta las solicitudes inválidas.
+        """
+        filas = [
+            ("Vejez", 3_000_000, 1300, "Hombre", 62, 0),
+            ("Vejez", -1, 1300, "Hombre", 62, 0),
+            ("Jubilacion", 3_000_000, 1300, "Hombre", 62, 0),
+        ]
+
+        resultados = inverso_calcupension.resolver_lote("semanas", filas, [70, 70, 70], objetivo="tasa")
+
+        self.assertEqual(resultados[0], inverso_calcupension.semanas_minimas("Vejez", 3_000_000, 70))
+        self.assertEqual(resultados[1].motivo, "ErrorIBL")
+        self.assertEqual(resultados[2].motivo, "ErrorTipoPension")
+        with self.assertRaises(ValueError):
+            inverso_calcupension.resolver_lote("ingreso_base_liquidacion", filas, [70] * 3, objetivo="tasa")
+
+    def test_validaciones_distintas_de_la_variable(self):
+        """
+        Una edad insuficiente en vejez o una PCL de 50 o menos en invalidez
+        invalidan la solicitud; la validación de la variable buscada se ignora.
+        """
+        with self.assertRaises(logica_calcupension.ErrorPCLInvalidez):
+            inverso_calcupension.semanas_minimas(
+                "Invalidez", 3_000_000, tasa_objetivo=60, porcentaje_perdida_capacidad_laboral=30
+            )
+        with self.assertRaises(logica_calcupension.ErrorEdadMinimaHombres):
+            inverso_calcupension.semanas_minimas("Vejez", 3_000_000, 70, genero="Hombre", edad=40)
+
+        filas = [
+            ("Vejez", 3_000_000, 0, "Hombre", 40, 0),
+            ("Invalidez", 3_000_000, 500, "Mujer", 30, 30),
+            ("Vejez", 3_000_000, 0, "Mujer", 58, 0),
+        ]
+        resultados = inverso_calcupension.resolver_lote("semanas", filas, [70] * 3, objetivo="tasa")
+
+        self.assertEqual(resultados[0], inverso_calcupension.ResultadoInverso(motivo="ErrorEdadMinimaHombres"))
+        self.assertEqual(resultados[1], inverso_calcupension.ResultadoInverso(motivo="ErrorPCLInvalidez"))
+        self.assertEqual(resultados[2], inverso_calcupension.semanas_minimas("Vejez", 3_000_000, 70))
+
+        resultados = inverso_calcupension.resolver_lote(
+            "porcentaje_perdida_capacidad_laboral", filas[1:2], [45], objetivo="tasa"
+        )
+        self.assertEqual(resultados[0], inverso_calcupension.ResultadoInverso(50, estricto=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,398 @@
+"""
+Módulo de pruebas unitarias para el modo de cálculo masivo.
+
+Las pruebas cubren:
+
+- Procesamiento de archivos CSV y JSONL
+- Separación de filas rechazadas con el mensaje de la consola
+- Líneas JSONL mal formadas y filas CSV con columnas de más van a rechazos
+- IBL o PCL no finitos, semanas o edad con decimales y booleanos van a rechazos
+- Procesamiento en fragmentos pequeños
+- Puntos de control: reanudar tras una interrupción da la misma salida
+"""
+
+import csv
+import json
+import os
+import random
+import subprocess
+import tempfile
+import time
+import unittest
+import sys
+sys.path.append("src")
+from unittest import mock
+from calcupension.model import logica_calcupension
+from calcupension.model import paralelo_calcupension
+from calcupension.view import lote_calcupension
+
+
+class ErrorSimulado(Exception):
+    """
+    Interrupción simulada de una ejecución (por ejemplo falta de memoria).
+    """
+
+
+class EjecutorInterrumpido:
+    """
+    Ejecutor que calcula en el proceso actual y se interrumpe después de `fragmentos` fragmentos.
+    """
+
+    def __init__(self, fragmentos: int):
+        self.fragmentos = fragmentos
+
+    def mapear(self, funcion, fragmentos):
+        ejecutor = paralelo_calcupension.EjecutorParalelo(procesos=1)
+        for numero, resultado in enumerate(ejecutor.mapear(funcion, fragmentos)):
+            if numero == self.fragmentos:
+                raise ErrorSimulado()
+            yield resultado
+
+
+def contenido_portafolio(filas: int, jsonl: bool = False, semilla: int = 24) -> str:
+    """
+    Portafolio sintético con filas válidas y rechazadas.
+    """
+    generador = random.Random(semilla)
+    registros = [
+        {
+            "id_afiliado": str(i),
+            "tipo": generador.choice(logica_calcupension.TIPOS_PENSION),
+            "ingreso_base_liquidacion": str(generador.randint(1_000_000, 20_000_000)),
+            "semanas": str(generador.randint(400, 2500)),
+            "genero": generador.choice(logica_calcupension.GENEROS),
+            "edad": str(generador.randint(50, 75)),
+            "porcentaje_perdida_capacidad_laboral": str(generador.randint(0, 100)),
+        }
+        for i in range(filas)
+    ]
+    if jsonl:
+        return "".join(json.dumps(registro) + "\n" for registro in registros)
+    return ",".join(registros[0]) + "\n" + "".join(",".join(registro.values()) + "\n" for registro in registros)
+
+
+class TestLoteCalcupension(unittest.TestCase):
+    """
+    Pruebas del procesamiento masivo de archivos.
+    """
+
+    def setUp(self):
+        """
+        Crea un directorio temporal para los archivos de cada prueba.
+        """
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+
+    def ruta(self, nombre: str) -> str:
+        return os.path.join(self.directorio.name, nombre)
+
+    def escribir(self, nombre: str, contenido: str) -> str:
+        ruta = self.ruta(nombre)
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            archivo.write(contenido)
+        return ruta
+
+    def test_csv_con_rechazos(self):
+        """
+        Las filas válidas se calculan y las inválidas van al archivo de rechazos.
+        """
+        entrada = self.escribir("entrada.csv", (
+            "id_afiliado,tipo,ingreso_base_liquidacion,semanas,genero,edad,"
+            "porcentaje_perdida_capacidad_laboral\n"
+            "1,Vejez,3000000,1300,Hombre,62,0\n"
+            "2,Vejez,2000000,400,Mujer,58,0\n"
+            "3,Sobreviviente,3500000,700,,,\n"
+            "4,Invalidez,4000000,1000,Hombre,55,abc\n"
+            "5,Invalidez,4000000,1000,Hombre,55,40\n"
+        ))
+
+        calculadas, rechazadas = lote_calcupension.procesar_archivo(
+            entrada, self.ruta("salida.csv"), self.ruta("rechazos.csv"), tamano_fragmento=2
+        )
+
+        self.assertEqual((calculadas, rechazadas), (2, 3))
+
+        with open(self.ruta("salida.csv"), encoding="utf-8") as archivo:
+            salida = list(csv.DictReader(archivo))
+        with open(self.ruta("rechazos.csv"), encoding="utf-8") as archivo:
+            rechazos = list(csv.DictReader(archivo))
+
+        self.assertEqual([fila["id_afiliado"] for fila in salida], ["1", "3"])
+        self.assertAlmostEqual(float(salida[0]["tasa_reemplazo"]), 64.64, 2)
+        self.assertAlmostEqual(float(salida[0]["mesada"]), 1_939_299, 0)
+        self.assertAlmostEqual(float(salida[1]["tasa_reemplazo"]), 53.00, 2)
+
+        self.assertEqual(
+            [(fila["id_afiliado"], fila["error"]) for fila in rechazos],
+            [
+                ("2", "Error: No cumple con las 1300 semanas mínimas."),
+                ("4", "Error: Entrada inválida. Verifique los datos."),
+                ("5", "Error: El Porcentaje de Pérdida de Capacidad Laboral debe ser mayor al 50%."),
+            ]
+        )
+
+    def test_jsonl_coincide_con_calculo_individual(self):
+        """
+        El modo JSONL produce los mismos valores que la API individual.
+        """
+        entrada = self.escribir("entrada.jsonl", (
+            '{"tipo": "Vejez", "ingreso_base_liquidacion": 2500000, "semanas": 1500,'
+            ' "genero": "Hombre", "edad": 62}\n'
+            '{"tipo": "Invalidez", "ingreso_base_liquidacion": 2800000, "semanas": 900,'
+            ' "genero": "Mujer", "edad": 53, "porcentaje_perdida_capacidad_laboral": 65}\n'
+        ))
+
+        lote_calcupension.procesar_archivo(
+            entrada, self.ruta("salida.jsonl"), self.ruta("rechazos.jsonl")
+        )
+
+        with open(self.ruta("salida.jsonl"), encoding="utf-8") as archivo:
+            salida = [json.loads(linea) for linea in archivo]
+
+        solicitud = logica_calcupension.SolicitudPension("Vejez", 2_500_000, 1500, "Hombre", 62, 0)
+        tasa = logica_calcupension.CalculadoraPension.calcular_tasa_reemplazo(solicitud)
+
+        self.assertEqual(len(salida), 2)
+        self.assertEqual(salida[0]["tasa_reemplazo"], tasa)
+        self.assertAlmostEqual(salida[1]["tasa_reemplazo"], 57.00, 2)
+
+    def test_jsonl_mal_formado(self):
+        """
+        Una línea JSONL mal formada o que no es un objeto se rechaza y el resto se calcula.
+        """
+        entrada = self.escribir("entrada.jsonl", (
+            '{"id": 1, "tipo": "Vejez", "ingreso_base_liquidacion": 3000000, "semanas": 1300,'
+            ' "genero": "Hombre", "edad": 62}\n'
+            '{"id": 2, "tipo": "Vejez", "ingreso_base_liq\n'
+            '[1, 2, 3]\n'
+            '{"id": 4, "tipo": "Sobreviviente", "ingreso_base_liquidacion": 3500000, "semanas": 700}\n'
+        ))
+
+        for extension in (".jsonl", ".csv"):
+            resultado = lote_calcupension.procesar_archivo(
+                entrada, self.ruta("salida" + extension), self.ruta("rechazos" + extension), tamano_fragmento=2
+            )
+            self.assertEqual(resultado, (2, 2))
+
+        with open(self.ruta("rechazos.jsonl"), encoding="utf-8") as archivo:
+            rechazos = [json.loads(linea) for linea in archivo]
+        self.assertEqual(rechazos, [
+            {"entrada": '{"id": 2, "tipo": "Vejez", "ingreso_base_liq', "error": lote_calcupension.MENSAJE_ENTRADA_INVALIDA},
+            {"entrada": "[1, 2, 3]", "error": lote_calcupension.MENSAJE_ENTRADA_INVALIDA},
+        ])
+
+        # En CSV la salida toma las columnas del primer registro aunque los demás traigan otras.
+        with open(self.ruta("salida.csv"), encoding="utf-8") as archivo:
+            salida = list(csv.DictReader(archivo))
+        self.assertEqual([fila["id"] for fila in salida], ["1", "4"])
+        self.assertEqual(salida[1]["edad"], "")
+
+    def test_jsonl_valores_numericos_invalidos(self):
+        """
+        IBL o PCL no finitos, semanas o edad con decimales y booleanos se rechazan en lugar de truncarse.
+        """
+        base = {"tipo": "Vejez", "ingreso_base_liquidacion": 3000000, "semanas": 1300, "genero": "Hombre", "edad": 62}
+        invalidos = [
+            {"ingreso_base_liquidacion": float("nan")},
+            {"ingreso_base_liquidacion": float("inf")},
+            {"tipo": "Invalidez", "porcentaje_perdida_capacidad_laboral": float("nan")},
+            {"semanas": 1299.9},
+            {"edad": 61.5},
+            {"semanas": True},
+            {"edad": False},
+        ]
+        lineas = [json.dumps(dict(base, id=0, semanas=1300.0))]
+        lineas += [json.dumps(dict(base, id=i, **cambio)) for i, cambio in enumerate(invalidos, 1)]
+        entrada = self.escribir("entrada.jsonl", "\n".join(lineas) + "\n")
+
+        resultado = lote_calcupension.procesar_archivo(
+            entrada, self.ruta("salida.jsonl"), self.ruta("rechazos.jsonl"), tamano_fragmento=3
+        )
+
+        self.assertEqual(resultado, (1, len(invalidos)))
+        with open(self.ruta("rechazos.jsonl"), encoding="utf-8") as archivo:
+            rechazos = [json.loads(linea) for linea in archivo]
+        self.assertEqual([fila["id"] for fila in rechazos], list(range(1, len(invalidos) + 1)))
+        self.assertTrue(all(fila["error"] == lote_calcupension.MENSAJE_ENTRADA_INVALIDA for fila in rechazos))
+
+        entrada = self.escribir("entrada.csv", (
+            "id_afiliado,tipo,ingreso_base_liquidacion,semanas,genero,edad,"
+            "porcentaje_perdida_capacidad_laboral\n"
+            "1,Vejez,nan,1300,Hombre,62,0\n"
+            "2,Invalidez,3000000,1300,Hombre,62,inf\n"
+            "3,Vejez,3000000,1299.9,Hombre,62,0\n"
+        ))
+        resultado = lote_calcupension.procesar_archivo(entrada, self.ruta("salida.csv"), self.ruta("rechazos.csv"))
+        self.assertEqual(resultado, (0, 3))
+
+    def test_csv_con_columnas_de_mas(self):
+        """
+        Una fila CSV con más columnas que el encabezado se rechaza sin interrumpir el archivo.
+        """
+        entrada = self.escribir("entrada.csv", (
+            "id_afiliado,tipo,ingreso_base_liquidacion,semanas,genero,edad,"
+            "porcentaje_perdida_capacidad_laboral\n"
+            "1,Vejez,3000000,1300,Hombre,62,0\n"
+            "2,Vejez,3000000,1300,Hombre,62,0,sobra\n"
+            "3,Sobreviviente,3500000,700,,,\n"
+        ))
+
+        resultado = lote_calcupension.procesar_archivo(entrada, self.ruta("salida.csv"), self.ruta("rechazos.csv"))
+
+        self.assertEqual(resultado, (2, 1))
+        with open(self.ruta("rechazos.csv"), encoding="utf-8") as archivo:
+            rechazos = list(csv.DictReader(archivo))
+        self.assertEqual(
+            [(fila["id_afiliado"], fila["edad"], fila["error"]) for fila in rechazos],
+            [("2", "62", lote_calcupension.MENSAJE_ENTRADA_INVALIDA)]
+        )
+
+        lote_calcupension.convertir_archivo(entrada, self.ruta("portafolio.cpb"), self.ruta("rechazos_cpb.csv"))
+        with open(self.ruta("rechazos_cpb.csv"), encoding="utf-8") as archivo:
+            self.assertEqual([fila["id_afiliado"] for fila in csv.DictReader(archivo)], ["2"])
+
+    def test_ruta_rechazos_por_defecto(self):
+        """
+        El archivo de rechazos por defecto se deriva del archivo de salida.
+        """
+        self.assertEqual(
+            lote_calcupension.ruta_rechazos_por_defecto("salida.csv"), "salida_rechazos.csv"
+        )
+
+    def leer(self, nombre: str) -> bytes:
+        with open(self.ruta(nombre), "rb") as archivo:
+            return archivo.read()
+
+    def ejecutar_con_interrupcion(self, extension: str, **interrupcion):
+        """
+        Procesa un portafolio sin interrupciones y luego con una interrupción y
+        reanudación, y verifica que las salidas son idénticas.
+        """
+        entrada = self.escribir("entrada" + extension, contenido_portafolio(500, extension == ".jsonl"))
+        esperado = lote_calcupension.procesar_archivo(
+            entrada, self.ruta("esperada" + extension), self.ruta("esperados_rechazos" + extension),
+            tamano_fragmento=40
+        )
+
+        salida = self.ruta("salida" + extension)
+        rechazos = self.ruta("rechazos" + extension)
+        punto_control = self.ruta("salida.checkpoint")
+        with self.assertRaises(ErrorSimulado):
+            lote_calcupension.procesar_archivo(
+                entrada, salida, rechazos, tamano_fragmento=40, ruta_punto_control=punto_control, **interrupcion
+            )
+        estado = lote_calcupension.cargar_punto_control(punto_control)
+        self.assertEqual(estado["registros"], 120)
+
+        resultado = lote_calcupension.procesar_archivo(
+            entrada, salida, rechazos, tamano_fragmento=40, ruta_punto_control=punto_control, reanudar=True
+        )
+
+        self.assertEqual(resultado, esperado)
+        self.assertEqual(self.leer("salida" + extension), self.leer("esperada" + extension))
+        self.assertEqual(self.leer("rechazos" + extension), self.leer("esperados_rechazos" + extension))
+        self.assertFalse(os.path.exists(punto_control))
+
+    def test_reanudar_csv(self):
+        """
+        Una ejecución interrumpida en el cuarto fragmento se reanuda con la misma salida.
+        """
+        self.ejecutar_con_interrupcion(".csv", ejecutor=EjecutorInterrumpido(3))
+
+    def test_reanudar_jsonl(self):
+        """
+        Lo mismo con JSONL.
+        """
+        self.ejecutar_con_interrupcion(".jsonl", ejecutor=EjecutorInterrumpido(3))
+
+    def test_interrupcion_antes_del_punto_control(self):
+        """
+        Si la interrupción llega después de escribir un fragmento pero antes de
+        guardar su punto de control, lo escrito de más se descarta al reanudar.
+        """
+        guardar = lote_calcupension.guardar_punto_control
+        llamadas = []
+
+        def guardar_hasta_tres(ruta, estado):
+            llamadas.append(ruta)
+            if len(llamadas) == 4:
+                raise ErrorSimulado()
+            guardar(ruta, estado)
+
+        with mock.patch.object(lote_calcupension, "guardar_punto_control", guardar_hasta_tres):
+            self.ejecutar_con_interrupcion(".csv")
+
+    def test_reanudar_sin_punto_control(self):
+        """
+        Sin punto de control, --reanudar procesa el archivo desde el principio.
+        """
+        entrada = self.escribir("entrada.csv", contenido_portafolio(50))
+
+        resultado = lote_calcupension.procesar_archivo(
+            entrada, self.ruta("salida.csv"), self.ruta("rechazos.csv"), tamano_fragmento=20, reanudar=True
+        )
+
+        self.assertEqual(sum(resultado), 50)
+        self.assertFalse(os.path.exists(self.ruta("salida.csv.checkpoint")))
+
+    def test_punto_control_de_otra_entrada(self):
+        """
+        No se reanuda con un punto de control de una entrada que cambió.
+        """
+        entrada = self.escribir("entrada.csv", contenido_portafolio(100))
+        punto_control = self.ruta("salida.checkpoint")
+        with self.assertRaises(ErrorSimulado):
+            lote_calcupension.procesar_archivo(
+                entrada, self.ruta("salida.csv"), self.ruta("rechazos.csv"), tamano_fragmento=20,
+                ejecutor=EjecutorInterrumpido(2), ruta_punto_control=punto_control
+            )
+
+        self.escribir("entrada.csv", contenido_portafolio(120))
+        with self.assertRaises(ValueError):
+            lote_calcupension.procesar_archivo(
+                entrada, self.ruta("salida.csv"), self.ruta("rechazos.csv"),
+                ruta_punto_control=punto_control, reanudar=True
+            )
+
+    def test_proceso_terminado(self):
+        """
+        Un proceso terminado a la fuerza a mitad del archivo se reanuda desde la línea de comandos.
+        """
+        entrada = self.escribir("entrada.csv", contenido_portafolio(40_000))
+        salida = self.ruta("salida.csv")
+        punto_control = salida + lote_calcupension.EXTENSION_PUNTO_CONTROL
+        comando = [
+            sys.executable, "-m", "calcupension.view.lote_calcupension", "lote", entrada, salida,
+            "--tamano-fragmento", "200",
+        ]
+        entorno = dict(os.environ, PYTHONPATH="src")
+
+        proceso = subprocess.Popen(
+            comando + ["--checkpoint", punto_control], stdout=subprocess.DEVNULL, env=entorno
+        )
+        limite = time.monotonic() + 60
+        while time.monotonic() < limite and proceso.poll() is None:
+            estado = lote_calcupension.cargar_punto_control(punto_control)
+            if estado is not None and estado["registros"] >= 2000:
+                break
+            time.sleep(0.005)
+        proceso.kill()
+        proceso.wait()
+        self.assertLess(lote_calcupension.cargar_punto_control(punto_control)["registros"], 40_000)
+
+        subprocess.run(comando + ["--reanudar"], check=True, stdout=subprocess.DEVNULL, env=entorno)
+        lote_calcupension.procesar_archivo(entrada, self.ruta("esperada.csv"), self.ruta("esperados_rechazos.csv"))
+
+        self.assertEqual(self.leer("salida.csv"), self.leer("esperada.csv"))
+        self.assertEqual(self.leer("salida_rechazos.csv"), self.leer("esperados_rechazos.csv"))
+
+    def test_reanudar_con_entrada_binaria(self):
+        """
+        Los puntos de control no aplican al formato binario.
+        """
+        with self.assertRaises(SystemExit):
+            lote_calcupension.main(["lote", "entrada.cpb", "salida.cpb", "--reanudar"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+"""
+Módulo de pruebas unitarias para la simulación Monte Carlo.
+
+Las pruebas cubren:
+
+- Afiliados que ya cumplen los requisitos (sin incertidumbre)
+- Probabilidad de cumplir semanas y edad
+- Probabilidad de invalidez
+- Reproducibilidad con la semilla, por fragmentos y procesos
+- Modelos de carrera personalizados
+- Percentiles y entradas inválidas
+"""
+
+import unittest
+import sys
+sys.path.append("src")
+from calcupension.model import logica_calcupension
+from calcupension.model import montecarlo_calcupension
+
+
+class CarreraFija(montecarlo_calcupension.ModeloCarrera):
+    """
+    Modelo sin incertidumbre: el afiliado cotiza todo el año hasta la edad mínima.
+    """
+
+    def simular(self, generador, fila, cantidad, reglas, columnas):
+        _, ibl, semanas, genero, edad, _ = fila
+        edad_solicitud = max(edad, reglas.edades_minimas[genero])
+        semanas_solicitud = semanas + 52 * (edad_solicitud - edad)
+        for columna, valor in zip(columnas, ("Vejez", ibl, semanas_solicitud, genero, edad_solicitud, 0)):
+            columna.extend([valor] * cantidad)
+
+
+class TestMonteCarloCalcupension(unittest.TestCase):
+    """
+    Pruebas de simular, ModeloCarrera y percentiles.
+    """
+
+    def test_afiliado_que_ya_cumple(self):
+        """
+        Sin años por delante, todos los escenarios dan el cálculo directo.
+        """
+        fila = ("Vejez", 3_000_000, 1300, "Hombre", 70, 0)
+        modelo = montecarlo_calcupension.ModeloCarrera(probabilidad_invalidez=0)
+        resultado = next(montecarlo_calcupension.simular([fila], escenarios=200, modelo=modelo))
+
+        solicitud = logica_calcupension.SolicitudPension(*fila)
+        tasa = logica_calcupension.CalculadoraPension.calcular_tasa_reemplazo(solicitud)
+
+        self.assertEqual(resultado.escenarios, 200)
+        self.assertEqual(resultado.probabilidad_elegible, 1.0)
+        self.assertEqual(set(resultado.percentiles_tasa.values()), {tasa})
+
+    def test_semanas_inalcanzables(self):
+        """
+        Si no alcanza a cotizar las semanas mínimas, ningún escenario de vejez es elegible.
+        """
+        fila = ("Vejez", 3_000_000, 0, "Hombre", 61, 0)
+        modelo = montecarlo_calcupension.ModeloCarrera(probabilidad_invalidez=0)
+        resultado = next(montecarlo_calcupension.simular([fila], escenarios=500, modelo=modelo))
+
+        self.assertEqual(resultado.probabilidad_semanas, 0.0)
+        self.assertEqual(resultado.probabilidad_elegible, 0.0)
+        self.assertIsNone(resultado.percentiles_mesada)
+
+    def test_edad_anticipada(self):
+        """
+        Los retrasos negativos producen solicitudes que no cumplen la edad.
+        """
+        fila = ("Vejez", 3_000_000, 1500, "Mujer", 40, 0)
+        modelo = montecarlo_calcupension.ModeloCarrera(
+            retrasos_retiro=((-1, 0.3), (0, 0.7)), probabilidad_invalidez=0
+        )
+        resultado = next(montecarlo_calcupension.simular([fila], escenarios=5000, modelo=modelo))
+
+        self.assertAlmostEqual(resultado.probabilidad_edad, 0.7, delta=0.03)
+        self.assertEqual(resultado.probabilidad_semanas, 1.0)
+        self.assertAlmostEqual(resultado.probabilidad_elegible, 0.7, delta=0.03)
+
+    def test_probabilidad_invalidez(self):
+        """
+        Con dos años por delante, la invalidez ocurre con probabilidad 1 - (1 - p)^2.
+        """
+        fila = ("Vejez", 3_000_000, 1300, "Hombre", 60, 0)
+        modelo = montecarlo_calcupension.ModeloCarrera(retrasos_retiro=((0, 1),), probabilidad_invalidez=0.1)
+        resultado = next(montecarlo_calcupension.simular([fila], escenarios=20_000, modelo=modelo))
+
+        self.assertAlmostEqual(resultado.probabilidad_invalidez, 1 - 0.9 ** 2, delta=0.015)
+
+    def test_reproducible(self):
+        """
+        El resultado depende de la semilla, no de fragmentos ni procesos.
+        """
+        filas = [("Vejez", 2_000_000 + 10_000 * i, 800 + 10 * i, "Hombre", 45 + i % 15, 0) for i in range(12)]
+
+        def ejecutar(**opciones):
+            return [
+                resultado.como_dict()
+                for resultado in montecarlo_calcupension.simular(filas, escenarios=100, semilla=7, **opciones)
+            ]
+
+        base = ejecutar()
+        self.assertEqual(ejecutar(tamano_fragmento=300), base)
+        self.assertEqual(ejecutar(procesos=2, tamano_fragmento=400), base)
+        otra_semilla = list(montecarlo_calcupension.simular(filas, escenarios=100, semilla=8))
+        self.assertNotEqual([resultado.como_dict() for resultado in otra_semilla], base)
+
+    def test_modelo_personalizado(self):
+        """
+        Una subclase de ModeloCarrera define sus propios escenarios.
+        """
+        fila = ("Vejez", 3_000_000, 1040, "Hombre", 57, 0)
+        resultado = next(montecarlo_calcupension.simular([fila], escenarios=10, modelo=CarreraFija()))
+
+        solicitud = logica_calcupension.SolicitudPension("Vejez", 3_000_000, 1300, "Hombre", 62, 0)
+        tasa = logica_calcupension.CalculadoraPension.calcular_tasa_reemplazo(solicitud)
+        self.assertEqual(resultado.percentiles_tasa[50], tasa)
+
+    def test_percentiles(self):
+        """
+        Percentiles con interpolación lineal.
+        """
+        self.assertEqual(
+            montecarlo_calcupension.percentiles([1, 2, 3, 4, 5], (0, 25, 50, 100)),
+            {0: 1, 25: 2, 50: 3, 100: 5},
+        )
+        self.assertEqual(montecarlo_calcupension.percentiles([0, 10], (50,)), {50: 5})
+        self.assertIsNone(montecarlo_calcupension.percentiles([]))
+
+    def test_entradas_invalidas(self):
+        """
+        Afiliados sin edad no se simulan; parámetros inválidos se rechazan.
+        """
+        resultado = next(montecarlo_calcupension.simular([("Vejez", 3_000_000, 1300, "Hombre", None, 0)]))
+        self.assertEqual(resultado.escenarios, 0)
+
+        with self.assertRaises(ValueError):
+            next(montecarlo_calcupension.simular([], escenarios=0))
+        with self.assertRaises(ValueError):
+            montecarlo_calcupension.ModeloCarrera(probabilidad_invalidez=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
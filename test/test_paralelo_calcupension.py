@@ -0,0 +1,93 @@
+"""
+Módulo de pruebas unitarias para la ejecución en paralelo.
+
+Las pruebas cubren:
+
+- Resultados idénticos al cálculo por lotes en un solo proceso
+- Orden de salida igual al orden de entrada
+- Reporte de rendimiento por proceso
+"""
+
+import os
+import tempfile
+import unittest
+import sys
+sys.path.append("src")
+from calcupension.model import logica_calcupension
+from calcupension.model import paralelo_calcupension
+from calcupension.view import lote_calcupension
+
+
+def generar_filas(cantidad: int) -> list:
+    """
+    Genera filas determinísticas que cubren los tres tipos de pensión y errores.
+    """
+    tipos = ["Vejez", "Sobreviviente", "Invalidez"]
+    filas = []
+    for i in range(cantidad):
+        filas.append((
+            tipos[i % 3],
+            1_000_000 + 37_000 * i,
+            1200 + (i * 7) % 400,
+            "Hombre" if i % 2 else "Mujer",
+            55 + i % 10,
+            45 + i % 30,
+        ))
+    return filas
+
+
+class TestParaleloCalcupension(unittest.TestCase):
+    """
+    Pruebas del ejecutor paralelo.
+    """
+
+    def test_paralelo_coincide_con_lote(self):
+        """
+        El cálculo con varios procesos coincide fila a fila y en orden con calcular_lote.
+        """
+        filas = generar_filas(500)
+        tasas, mesadas, codigos = logica_calcupension.CalculadoraPension.calcular_lote(*zip(*filas))
+
+        ejecutor = paralelo_calcupension.EjecutorParalelo(procesos=2)
+        resultados = list(paralelo_calcupension.calcular_en_paralelo(
+            filas, tamano_fragmento=37, ejecutor=ejecutor
+        ))
+
+        self.assertEqual(len(resultados), len(filas))
+        for i, (tasa, mesada, codigo) in enumerate(resultados):
+            self.assertEqual(codigo, codigos[i])
+            if codigo == logica_calcupension.CODIGO_OK:
+                self.assertEqual(tasa, tasas[i])
+                self.assertEqual(mesada, mesadas[i])
+
+        self.assertEqual(ejecutor.reporte.registros, len(filas))
+        self.assertIn("registros/s", ejecutor.reporte.como_texto())
+
+    def test_archivo_en_paralelo(self):
+        """
+        El modo masivo con varios procesos produce el mismo archivo que con uno.
+        """
+        with tempfile.TemporaryDirectory() as directorio:
+            entrada = os.path.join(directorio, "entrada.csv")
+            with open(entrada, "w", encoding="utf-8") as archivo:
+                archivo.write(",".join(lote_calcupension.CAMPOS_ENTRADA) + "\n")
+                for fila in generar_filas(300):
+                    archivo.write(",".join(str(valor) for valor in fila) + "\n")
+
+            salidas = []
+            for procesos in (1, 3):
+                salida = os.path.join(directorio, f"salida_{procesos}.csv")
+                rechazos = os.path.join(directorio, f"rechazos_{procesos}.csv")
+                lote_calcupension.procesar_archivo(
+                    entrada, salida, rechazos, tamano_fragmento=25,
+                    ejecutor=paralelo_calcupension.EjecutorParalelo(procesos)
+                )
+                with open(salida, encoding="utf-8") as archivo_salida, \
+                        open(rechazos, encoding="utf-8") as archivo_rechazos:
+                    salidas.append((archivo_salida.read(), archivo_rechazos.read()))
+
+            self.assertEqual(salidas[0], salidas[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""
+Módulo de pruebas unitarias para la proyección de mesadas.
+
+Las pruebas cubren:
+
+- Indexación por IPC
+- Mesada mínima de vejez que sigue al SMMLV
+- Ponderación por supervivencia
+- Totales iguales con cualquier tamaño de fragmento
+"""
+
+import unittest
+import sys
+sys.path.append("src")
+from calcupension.model import proyeccion_calcupension
+from calcupension.model import reglas_calcupension
+
+
+SMMLV = reglas_calcupension.REGLAS_VIGENTES.smmlv
+
+FILAS = [
+    ("Vejez", 3_000_000, 1300, "Hombre", 62, 0),
+    ("Vejez", 1_400_000, 1400, "Mujer", 57, 0),
+    ("Sobreviviente", 3_500_000, 700, None, None, 0),
+    ("Invalidez", 2_800_000, 900, "Mujer", 53, 65),
+    ("Vejez", 2_000_000, 400, "Mujer", 58, 0),
+]
+
+
+class TestProyeccionCalcupension(unittest.TestCase):
+    """
+    Pruebas de proyectar_anios y proyectar.
+    """
+
+    def test_indexacion_y_mesada_minima(self):
+        """
+        Las mesadas crecen con el IPC y la de vejez mínima sigue al SMMLV.
+        """
+        anios = list(proyeccion_calcupension.proyectar_anios(
+            FILAS[:2], anios=3, ipc=0.05, crecimiento_smmlv=[0.10, 0.0], mortalidad=False
+        ))
+
+        anio, smmlv, mesadas, supervivencia, codigos = anios[-1]
+        self.assertEqual(anio, 2)
+        self.assertAlmostEqual(smmlv, SMMLV * 1.10, 2)
+        self.assertAlmostEqual(mesadas[0], 1_939_299 * 1.05 ** 2, 0)
+        # Año 1: el SMMLV crece 10 % y eleva la mesada; año 2: solo se indexa por IPC.
+        self.assertAlmostEqual(mesadas[1], SMMLV * 1.10 * 1.05, 2)
+        self.assertEqual(list(supervivencia), [1.0, 1.0])
+        self.assertEqual(list(codigos), [0, 0])
+
+    def test_supervivencia(self):
+        """
+        La supervivencia decrece cada año y las mujeres sobreviven más.
+        """
+        filas = [("Vejez", 3_000_000, 1300, "Hombre", 62, 0), ("Vejez", 3_000_000, 1300, "Mujer", 62, 0)]
+        supervivencias = [
+            list(supervivencia)
+            for _, _, _, supervivencia, _ in proyeccion_calcupension.proyectar_anios(filas, anios=10)
+        ]
+
+        self.assertEqual(supervivencias[0], [1.0, 1.0])
+        for anterior, siguiente in zip(supervivencias, supervivencias[1:]):
+            self.assertLess(siguiente[0], anterior[0])
+        self.assertLess(supervivencias[-1][0], supervivencias[-1][1])
+
+    def test_totales_por_fragmentos(self):
+        """
+        Los totales no dependen del tamaño del fragmento y excluyen los rechazados.
+        """
+        completo = proyeccion_calcupension.proyectar(FILAS, anios=5, tasa_descuento=0.03)
+        fragmentado = proyeccion_calcupension.proyectar(FILAS, anios=5, tasa_descuento=0.03, tamano_fragmento=2)
+
+        self.assertEqual((completo.pensionados, completo.rechazados), (4, 1))
+        self.assertEqual((fragmentado.pensionados, fragmentado.rechazados), (4, 1))
+        for total, parcial in zip(completo.mesada_esperada, fragmentado.mesada_esperada):
+            self.assertAlmostEqual(total, parcial, 4)
+        self.assertAlmostEqual(completo.valor_presente, fragmentado.valor_presente, 2)
+        self.assertEqual(completo.pensionados_esperados[0], 4)
+        self.assertAlmostEqual(completo.flujo_anual[0], completo.mesada_esperada[0] * 13, 4)
+
+    def test_ipc_incompleto(self):
+        """
+        Una serie de IPC con menos años de los proyectados lanza ValueError.
+        """
+        with self.assertRaises(ValueError):
+            proyeccion_calcupension.proyectar(FILAS, anios=5, ipc=[0.04, 0.03])
+
+
+if __name__ == '__main__':
+    unittest.main()
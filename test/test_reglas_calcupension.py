@@ -0,0 +1,180 @@
+"""
+Módulo de pruebas unitarias para las reglas pensionales versionadas.
+
+Las pruebas cubren:
+
+- Equivalencia de la versión vigente con los casos conocidos
+- Uso de varias versiones de reglas a la vez
+- Carga de reglas desde JSON y serialización con pickle
+- Tablas de tramos: mismo resultado bit a bit que la regla escrita y exportación
+"""
+
+import copy
+import itertools
+import json
+import math
+import os
+import pickle
+import tempfile
+import unittest
+import sys
+sys.path.append("src")
+from calcupension.model import logica_calcupension
+from calcupension.model import reglas_calcupension
+
+
+def tasa_directa(parametros: dict, smmlv: float, ibl: float, semanas: int, pcl: float) -> float:
+    """
+    La regla escrita con condiciones, como referencia para las tablas de tramos.
+    """
+    for banda in parametros["bandas_pcl"]:
+        if banda["pcl_hasta"] is None or pcl <= banda["pcl_hasta"]:
+            break
+
+    if parametros["pendiente_ibl"]:
+        tasa = banda["base"] - (ibl / smmlv) * parametros["pendiente_ibl"]
+    else:
+        tasa = banda["base"]
+
+    if semanas > parametros["semanas_umbral"]:
+        tasa = tasa + (semanas - parametros["semanas_umbral"]) / parametros["semanas_paso"] * banda["incremento"]
+
+    if parametros["tope"] is not None and tasa > parametros["tope"]:
+        tasa = parametros["tope"]
+    elif parametros["piso"] is not None and tasa < parametros["piso"]:
+        tasa = parametros["piso"]
+    return tasa
+
+
+def reglas_con_smmlv(version: str, smmlv: float) -> dict:
+    """
+    Retorna una copia de las reglas 2026 con otra versión y otro SMMLV.
+    """
+    definicion = copy.deepcopy(reglas_calcupension.REGLAS_2026)
+    definicion["version"] = version
+    definicion["smmlv"] = smmlv
+    return definicion
+
+
+class TestReglasCalcupension(unittest.TestCase):
+    """
+    Pruebas de la compilación y selección de reglas.
+    """
+
+    def test_version_vigente(self):
+        """
+        Por defecto la calculadora usa la versión vigente.
+        """
+        self.assertEqual(reglas_calcupension.obtener_reglas().version, "2026")
+        self.assertIs(
+            reglas_calcupension.obtener_reglas("2026"), reglas_calcupension.obtener_reglas("2026")
+        )
+
+    def test_versiones_en_paralelo(self):
+        """
+        Dos versiones con distinto SMMLV dan tasas y mesadas distintas sin afectarse.
+        """
+        anterior = reglas_calcupension.registrar_reglas(reglas_con_smmlv("prueba-2025", 1_423_500))
+        solicitud = logica_calcupension.SolicitudPension("Vejez", 3_000_000, 1300, "Hombre", 62, 0)
+
+        tasa_vigente = logica_calcupension.CalculadoraPension.calcular_tasa_reemplazo(solicitud)
+        tasa_anterior = logica_calcupension.CalculadoraPension.calcular_tasa_reemplazo(solicitud, anterior)
+
+        self.assertAlmostEqual(tasa_vigente, 64.64, 2)
+        self.assertAlmostEqual(tasa_anterior, 65.50 - 3_000_000 / 1_423_500 * 0.50, 10)
+
+        mesada = logica_calcupension.CalculadoraPension.calcular_pension(10, 3_000_000, "Vejez", anterior)
+        self.assertEqual(mesada, 1_423_500)
+
+    def test_establecer_reglas_vigentes(self):
+        """
+        Cambiar las reglas vigentes cambia el cálculo por defecto.
+        """
+        reglas_calcupension.registrar_reglas(reglas_con_smmlv("prueba-smmlv", 2_000_000))
+        vigentes = reglas_calcupension.obtener_reglas()
+        self.addCleanup(reglas_calcupension.establecer_reglas_vigentes, vigentes)
+
+        reglas_calcupension.establecer_reglas_vigentes("prueba-smmlv")
+        mesada = logica_calcupension.CalculadoraPension.calcular_pension(10, 3_000_000, "Vejez")
+
+        self.assertEqual(mesada, 2_000_000)
+
+    def test_cargar_desde_json(self):
+        """
+        Una definición guardada en JSON se carga, compila y registra.
+        """
+        definicion = reglas_con_smmlv("prueba-json", 1_600_000)
+
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "reglas.json")
+            with open(ruta, "w", encoding="utf-8") as archivo:
+                json.dump(definicion, archivo)
+
+            reglas = reglas_calcupension.cargar_reglas(ruta)
+
+        self.assertEqual(reglas.version, "prueba-json")
+        self.assertIs(reglas_calcupension.obtener_reglas("prueba-json"), reglas)
+        self.assertEqual(reglas.tasas["Invalidez"](1, 1000, 70), 74.0)
+
+    def test_pickle(self):
+        """
+        Las reglas compiladas se pueden enviar a otros procesos.
+        """
+        reglas = pickle.loads(pickle.dumps(reglas_calcupension.obtener_reglas()))
+
+        self.assertEqual(reglas.tasas["Sobreviviente"](1, 700, 0), 53.0)
+
+    def test_tablas_bit_a_bit(self):
+        """
+        La tasa evaluada con la tabla de tramos es idéntica a la regla escrita, incluidas las fronteras.
+        """
+        reglas = reglas_calcupension.obtener_reglas()
+        smmlv = reglas.smmlv
+        ingresos = [1, 1_000_000, smmlv, 3_000_000, 20 * smmlv, 21 * smmlv, 10 ** 9, math.inf, math.nan]
+        ingresos += [math.nextafter(ingreso, -math.inf) for ingreso in (smmlv, 21 * smmlv)]
+        semanas = [0, 499, 500, 501, 550, 1299, 1300, 1301, 1350, 2050, 2051, 5000]
+        pcl = [0, 50, 66, math.nextafter(66, -math.inf), math.nextafter(66, math.inf), 100, math.nan]
+
+        for tipo, parametros in reglas.definicion["tipos"].items():
+            for ibl, semanas_fila, pcl_fila in itertools.product(ingresos, semanas, pcl):
+                esperada = tasa_directa(parametros, smmlv, ibl, semanas_fila, pcl_fila)
+                obtenida = reglas.tasas[tipo](ibl, semanas_fila, pcl_fila)
+                self.assertEqual(
+                    (type(obtenida), repr(obtenida)), (type(esperada), repr(esperada)),
+                    (tipo, ibl, semanas_fila, pcl_fila)
+                )
+
+    def test_exportar_tablas(self):
+        """
+        Las tablas se exportan a JSON con sus tramos, piso y tope.
+        """
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "tablas.json")
+            datos = reglas_calcupension.exportar_tablas(ruta=ruta)
+            with open(ruta, encoding="utf-8") as archivo:
+                self.assertEqual(json.load(archivo), datos)
+
+        invalidez = datos["tipos"]["Invalidez"]
+        self.assertEqual((invalidez["piso"], invalidez["tope"]), (45, 75))
+        self.assertEqual(datos["tipos"]["Sobreviviente"]["piso"], None)
+        self.assertEqual(len(invalidez["tramos"]), 4)
+        self.assertEqual(invalidez["tramos"][3], {
+            "pcl_desde": 66, "pcl_hasta": None, "semanas_desde": 500, "semanas_hasta": None,
+            "ordenada": 54, "pendiente_semanas": 0.04, "pendiente_ibl_smmlv": 0,
+        })
+        self.assertIn("65.5 + 0.03 * (semanas - 1300) - 0.5 * IBL/SMMLV",
+                      reglas_calcupension.obtener_reglas().tablas["Vejez"].como_texto())
+
+    def test_bandas_desordenadas(self):
+        """
+        Bandas de PCL fuera de orden no se pueden compilar en una tabla.
+        """
+        definicion = reglas_con_smmlv("prueba-bandas", 1_750_905)
+        definicion["tipos"]["Invalidez"]["bandas_pcl"].insert(0, {"pcl_hasta": 80, "base": 40, "incremento": 1})
+
+        with self.assertRaises(ValueError):
+            reglas_calcupension.ReglasPension(definicion)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+"""
+Módulo de pruebas unitarias para el servicio HTTP de cálculo.
+
+Las pruebas cubren:
+
+- Cálculo de una solicitud y de una lista de solicitudes
+- Respuestas de error con el código de la excepción personalizada
+- Agrupación de solicitudes concurrentes en un mismo lote
+- Métricas de latencia y cola
+- Aislamiento de una fila que hace fallar el lote
+- Content-Length inválido (400), errores inesperados (500), IBL NaN (400) y resultados NaN como null
+"""
+
+import asyncio
+import json
+import unittest
+import sys
+sys.path.append("src")
+from unittest import mock
+from calcupension.view import servicio_calcupension
+
+
+async def peticion(puerto: int, metodo: str, ruta: str, datos=None) -> tuple:
+    """
+    Envía una petición HTTP y retorna (estado, cuerpo JSON).
+    """
+    lector, escritor = await asyncio.open_connection("127.0.0.1", puerto)
+    cuerpo = b"" if datos is None else json.dumps(datos).encode("utf-8")
+    escritor.write(
+        f"{metodo} {ruta} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n"
+        f"Content-Length: {len(cuerpo)}\r\n\r\n".encode("latin-1") + cuerpo
+    )
+    await escritor.drain()
+    respuesta = await lector.read()
+    escritor.close()
+
+    encabezado, _, contenido = respuesta.partition(b"\r\n\r\n")
+    estado = int(encabezado.split(b" ")[1])
+
+    def no_estandar(constante):
+        raise ValueError(f"JSON no estándar: {constante}")
+
+    return estado, json.loads(contenido, parse_constant=no_estandar)
+
+
+class TestServicioCalcupension(unittest.TestCase):
+    """
+    Pruebas del servicio HTTP con agrupación de solicitudes.
+    """
+
+    def ejecutar(self, prueba):
+        """
+        Inicia el servicio en un puerto libre, ejecuta `prueba(servicio)` y lo cierra.
+        """
+        async def envoltura():
+            servicio = servicio_calcupension.ServicioCalculo(
+                servicio_calcupension.AgrupadorSolicitudes(ventana=0.02)
+            )
+            await servicio.iniciar(puerto=0)
+            try:
+                return await prueba(servicio)
+            finally:
+                await servicio.cerrar()
+
+        return asyncio.run(envoltura())
+
+    def test_calculo_y_error(self):
+        """
+        Una solicitud válida retorna tasa y mesada; una inválida el código de error.
+        """
+        async def prueba(servicio):
+            valida = await peticion(servicio.puerto, "POST", "/calcular", {
+                "tipo": "Vejez", "ingreso_base_liquidacion": 3_000_000, "semanas": 1300,
+                "genero": "Hombre", "edad": 62,
+            })
+            invalida = await peticion(servicio.puerto, "POST", "/calcular", {
+                "tipo": "Invalidez", "ingreso_base_liquidacion": 4_000_000, "semanas": 1000,
+                "genero": "Hombre", "edad": 55, "porcentaje_perdida_capacidad_laboral": 40,
+            })
+            entrada = await peticion(servicio.puerto, "POST", "/calcular", {"tipo": "Vejez"})
+            return valida, invalida, entrada
+
+        valida, invalida, entrada = self.ejecutar(prueba)
+
+        self.assertEqual(valida[0], 200)
+        self.assertAlmostEqual(valida[1]["tasa_reemplazo"], 64.64, 2)
+        self.assertAlmostEqual(valida[1]["mesada"], 1_939_299, 0)
+
+        self.assertEqual(invalida[0], 422)
+        self.assertEqual(invalida[1]["error"]["codigo"], "ErrorPCLInvalidez")
+
+        self.assertEqual(entrada[0], 400)
+        self.assertEqual(entrada[1]["error"]["codigo"], "EntradaInvalida")
+
+    def test_agrupacion_y_metricas(self):
+        """
+        Peticiones concurrentes se calculan en un mismo lote y se reflejan en las métricas.
+        """
+        async def prueba(servicio):
+            datos = {"tipo": "Sobreviviente", "ingreso_base_liquidacion": 3_500_000, "semanas": 700}
+            respuestas = await asyncio.gather(*(
+                peticion(servicio.puerto, "POST", "/calcular", datos) for _ in range(20)
+            ))
+            lista = await peticion(servicio.puerto, "POST", "/calcular", [datos, datos])
+            metricas = await peticion(servicio.puerto, "GET", "/metricas")
+            return respuestas, lista, metricas
+
+        respuestas, lista, metricas = self.ejecutar(prueba)
+
+        self.assertTrue(all(respuesta[1]["tasa_reemplazo"] == 53.0 for respuesta in respuestas))
+        self.assertEqual(len(lista[1]), 2)
+
+        estado, valores = metricas
+        self.assertEqual(estado, 200)
+        self.assertEqual(valores["calculadas"], 22)
+        self.assertLess(valores["lotes"], 22)
+        self.assertEqual(valores["cola"], 0)
+        self.assertGreaterEqual(valores["latencia_p99_ms"], valores["latencia_p50_ms"])
+
+    def test_fila_que_falla_aislada(self):
+        """
+        Si una fila hace fallar calcular_lote, solo esa recibe la excepción.
+        """
+        async def prueba():
+            agrupador = servicio_calcupension.AgrupadorSolicitudes(ventana=0.01)
+            return await asyncio.gather(
+                agrupador.calcular(("Sobreviviente", 3_500_000, 700, None, None, 0)),
+                agrupador.calcular(("Sobreviviente", 3_500_000, "700", None, None, 0)),
+                return_exceptions=True,
+            ), agrupador.metricas()
+
+        (valida, invalida), metricas = asyncio.run(prueba())
+
+        self.assertEqual(valida, (53.0, 1_855_000.0, 0))
+        self.assertIsInstance(invalida, TypeError)
+        self.assertEqual((metricas["lotes"], metricas["calculadas"]), (1, 2))
+
+    def test_errores_http_y_no_finitos(self):
+        """
+        Un Content-Length inválido o un IBL NaN dan 400, un error inesperado 500
+        y un resultado NaN se responde como null.
+        """
+        async def prueba(servicio):
+            lector, escritor = await asyncio.open_connection("127.0.0.1", servicio.puerto)
+            escritor.write(b"POST /calcular HTTP/1.1\r\nContent-Length: abc\r\n\r\n")
+            await escritor.drain()
+            longitud = await lector.read()
+            escritor.close()
+
+            nan = await peticion(servicio.puerto, "POST", "/calcular", {
+                "tipo": "Sobreviviente", "ingreso_base_liquidacion": float("nan"), "semanas": 700,
+            })
+
+            async def falla(fila):
+                raise RuntimeError("falla")
+
+            async def no_finito(fila):
+                return 53.0, float("nan"), 0
+
+            datos = {"tipo": "Sobreviviente", "ingreso_base_liquidacion": 3_500_000, "semanas": 700}
+            with mock.patch.object(servicio.agrupador, "calcular", no_finito):
+                resultado_nan = await peticion(servicio.puerto, "POST", "/calcular", datos)
+            with mock.patch.object(servicio.agrupador, "calcular", falla):
+                interno = await peticion(servicio.puerto, "POST", "/calcular", datos)
+                lista = await peticion(servicio.puerto, "POST", "/calcular", [datos, {"tipo": "Vejez"}])
+            with mock.patch.object(servicio, "enrutar", side_effect=RuntimeError("falla")):
+                enrutar = await peticion(servicio.puerto, "GET", "/salud")
+            return longitud, nan, resultado_nan, interno, lista, enrutar
+
+        longitud, nan, resultado_nan, interno, lista, enrutar = self.ejecutar(prueba)
+
+        self.assertTrue(longitud.startswith(b"HTTP/1.1 400 "))
+        self.assertEqual(nan[0], 400)
+        self.assertEqual(nan[1]["error"]["codigo"], "EntradaInvalida")
+        self.assertEqual(resultado_nan, (200, {"tasa_reemplazo": 53.0, "mesada": None}))
+        self.assertEqual(interno[0], 500)
+        self.assertEqual(interno[1]["error"]["codigo"], "ErrorInterno")
+        self.assertEqual(lista[0], 200)
+        self.assertEqual([respuesta["error"]["codigo"] for respuesta in lista[1]], ["ErrorInterno", "EntradaInvalida"])
+        self.assertEqual(enrutar[0], 500)
+
+    def test_ruta_desconocida(self):
+        """
+        Rutas desconocidas retornan 404.
+        """
+        estado, _ = self.ejecutar(lambda servicio: peticion(servicio.puerto, "GET", "/otra"))
+
+        self.assertEqual(estado, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
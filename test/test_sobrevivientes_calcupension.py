@@ -0,0 +1,185 @@
+"""
+Módulo de pruebas unitarias para el reparto de la pensión de sobrevivientes.
+
+Las pruebas cubren:
+
+- Reparto entre cónyuge e hijos y acrecimiento cuando un hijo sale
+- Padres solo sin cónyuges ni hijos; hijos que entran después
+- Coincidencia con un recorrido mes a mes en hogares aleatorios
+- Cálculo por lote (y con varios procesos) igual al individual
+- Solicitudes y beneficiarios inválidos
+"""
+
+import random
+import unittest
+import sys
+sys.path.append("src")
+from calcupension.model import logica_calcupension
+from calcupension.model import sobrevivientes_calcupension
+from calcupension.model.sobrevivientes_calcupension import Beneficiario, CONYUGE, HIJO, PADRE
+
+
+FALLECIDO = logica_calcupension.SolicitudPension("Sobreviviente", 3_500_000, 700, "Hombre", 60, 0)
+
+
+def mesadas_mes_a_mes(mesada: float, beneficiarios: list, mes: int) -> dict:
+    """
+    Reparto de un mes contando directamente quiénes tienen derecho, como referencia.
+    """
+    con_derecho = [
+        beneficiario for beneficiario in beneficiarios
+        if beneficiario.desde <= mes and (beneficiario.hasta is None or mes < beneficiario.hasta)
+    ]
+    partes = sobrevivientes_calcupension.porciones(*(
+        sum(beneficiario.parentesco == parentesco for beneficiario in con_derecho)
+        for parentesco in sobrevivientes_calcupension.PARENTESCOS
+    ))
+    grupos = dict(zip(sobrevivientes_calcupension.PARENTESCOS, partes))
+    return {
+        beneficiario.identificador: mesada * grupos[beneficiario.parentesco]
+        for beneficiario in con_derecho
+        if grupos[beneficiario.parentesco]
+    }
+
+
+def hogar_aleatorio(generador: random.Random, numero: int) -> list:
+    """
+    Hasta cinco beneficiarios con parentescos y ventanas de derecho al azar.
+    """
+    beneficiarios = []
+    for i in range(generador.randint(0, 5)):
+        desde = generador.choice((0, 0, 0, generador.randint(0, 100)))
+        hasta = generador.choice((None, desde + generador.randint(1, 200)))
+        parentesco = generador.choice(sobrevivientes_calcupension.PARENTESCOS)
+        beneficiarios.append(Beneficiario(f"{numero}-{i}", parentesco, desde, hasta))
+    return beneficiarios
+
+
+class TestSobrevivientesCalcupension(unittest.TestCase):
+    """
+    Pruebas de asignar, asignar_lote y repartir.
+    """
+
+    def test_conyuge_e_hijos(self):
+        """
+        Mitad para el cónyuge y mitad para los hijos; la parte de un hijo que sale acrece a los demás.
+        """
+        beneficiarios = [
+            Beneficiario("conyuge", CONYUGE),
+            Beneficiario("hijo-1", HIJO, 0, 120),
+            Beneficiario("hijo-2", HIJO, 0, 200),
+            Beneficiario("padre", PADRE),
+        ]
+        resultado = sobrevivientes_calcupension.asignar(FALLECIDO, beneficiarios)
+
+        tasa = logica_calcupension.CalculadoraPension.calcular_tasa_reemplazo(FALLECIDO)
+        mesada = logica_calcupension.CalculadoraPension.calcular_pension(tasa, 3_500_000, "Sobreviviente")
+        self.assertEqual(resultado.codigo, logica_calcupension.CODIGO_OK)
+        self.assertEqual((resultado.tasa, resultado.mesada), (tasa, mesada))
+
+        self.assertEqual(
+            [(tramo.beneficiario, tramo.desde, tramo.hasta, tramo.porcion) for tramo in resultado.tramos],
+            [
+                ("conyuge", 0, 200, 0.5),
+                ("hijo-1", 0, 120, 0.25),
+                ("hijo-2", 0, 120, 0.25),
+                ("hijo-2", 120, 200, 0.5),
+                ("conyuge", 200, None, 1.0),
+            ]
+        )
+        self.assertEqual(resultado.mesadas_en(150), {"conyuge": mesada / 2, "hijo-2": mesada / 2})
+        self.assertEqual(resultado.mesadas_en(10_000), {"conyuge": mesada})
+
+    def test_padres_e_hijo_posterior(self):
+        """
+        Los padres reciben solo sin cónyuges ni hijos; un hijo que entra después divide la mesada.
+        """
+        padres = sobrevivientes_calcupension.asignar(
+            FALLECIDO, [Beneficiario("madre", PADRE), Beneficiario("padre", PADRE, 0, 60)]
+        )
+        self.assertEqual(
+            [tramo.como_tupla()[:4] for tramo in padres.tramos],
+            [("madre", 0, 60, 0.5), ("padre", 0, 60, 0.5), ("madre", 60, None, 1.0)]
+        )
+
+        hogar = sobrevivientes_calcupension.asignar(
+            FALLECIDO, [Beneficiario("conyuge", CONYUGE), Beneficiario("hijo", HIJO, 5, 221)]
+        )
+        self.assertEqual(
+            [tramo.como_tupla()[:4] for tramo in hogar.tramos],
+            [("conyuge", 0, 5, 1.0), ("conyuge", 5, 221, 0.5), ("hijo", 5, 221, 0.5), ("conyuge", 221, None, 1.0)]
+        )
+        self.assertEqual(hogar.como_dict()["tramos"][0]["beneficiario"], "conyuge")
+
+    def test_coincide_mes_a_mes(self):
+        """
+        En hogares aleatorios, el barrido de eventos da el mismo reparto que recorrer mes a mes.
+        """
+        generador = random.Random(25)
+        for numero in range(300):
+            beneficiarios = hogar_aleatorio(generador, numero)
+            tramos = sobrevivientes_calcupension.repartir(1_000_000, beneficiarios)
+            resultado = sobrevivientes_calcupension.ResultadoHogar(0, 50, 1_000_000, tramos)
+
+            for mes in range(0, 320):
+                self.assertEqual(resultado.mesadas_en(mes), mesadas_mes_a_mes(1_000_000, beneficiarios, mes))
+
+            # Los tramos consecutivos de un beneficiario cambian de parte.
+            por_beneficiario = {}
+            for tramo in tramos:
+                anterior = por_beneficiario.get(tramo.beneficiario)
+                if anterior is not None and anterior.hasta == tramo.desde:
+                    self.assertNotEqual(anterior.porcion, tramo.porcion)
+                por_beneficiario[tramo.beneficiario] = tramo
+
+    def test_lote(self):
+        """
+        El lote da los mismos resultados que el cálculo individual, con uno o varios procesos.
+        """
+        generador = random.Random(7)
+        hogares = [
+            (
+                ("Sobreviviente", generador.uniform(1e6, 1e7), generador.randint(0, 1500), "Mujer", None, 0),
+                hogar_aleatorio(generador, numero),
+            )
+            for numero in range(500)
+        ]
+        hogares.append((("Vejez", 3_000_000, 1300, "Hombre", 62, 0), [Beneficiario("c", CONYUGE)]))
+
+        esperado = [sobrevivientes_calcupension.asignar(fila, beneficiarios).como_dict()
+                    for fila, beneficiarios in hogares]
+        uno = [resultado.como_dict()
+               for resultado in sobrevivientes_calcupension.asignar_lote(hogares, tamano_fragmento=64)]
+        dos = [resultado.como_dict()
+               for resultado in sobrevivientes_calcupension.asignar_lote(hogares, procesos=2, tamano_fragmento=64)]
+
+        self.assertEqual(uno, esperado)
+        self.assertEqual(dos, esperado)
+
+    def test_invalidos(self):
+        """
+        Una solicitud inválida o de otro tipo no se reparte; beneficiarios inválidos se rechazan.
+        """
+        beneficiarios = [Beneficiario("conyuge", CONYUGE)]
+
+        vejez = logica_calcupension.SolicitudPension("Vejez", 3_000_000, 1300, "Hombre", 62, 0)
+        resultado = sobrevivientes_calcupension.asignar(vejez, beneficiarios)
+        self.assertEqual(resultado.codigo, logica_calcupension.CODIGO_ERROR_TIPO)
+        self.assertEqual(resultado.tramos, [])
+
+        sin_ibl = logica_calcupension.SolicitudPension("Sobreviviente", 0, 700, "Hombre", 60, 0)
+        self.assertEqual(
+            sobrevivientes_calcupension.asignar(sin_ibl, beneficiarios).codigo, logica_calcupension.CODIGO_ERROR_IBL
+        )
+        self.assertEqual(sobrevivientes_calcupension.asignar(FALLECIDO, []).tramos, [])
+
+        with self.assertRaises(ValueError):
+            Beneficiario("x", "Primo")
+        with self.assertRaises(ValueError):
+            Beneficiario("x", HIJO, 10, 10)
+        with self.assertRaises(ValueError):
+            Beneficiario("x", HIJO, -1)
+
+
+if __name__ == "__main__":
+    unittest.main()